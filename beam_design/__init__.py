@@ -0,0 +1,38 @@
+# แพ็กเกจคำนวณคานแบบไม่มีหน้าเว็บ: import แล้วใช้ได้ทันทีโดยไม่โหลด streamlit/pandas/plotly/matplotlib
+# (numpy โหลดเมื่อเรียกฟังก์ชันแบบ batch ครั้งแรก)
+from .engine import (
+    STEEL_AREAS,
+    STIRRUP_AREAS,
+    calculate_beam_design,
+    calculate_beam_design_batch,
+    calculate_beam_design_frame,
+)
+from .trace import TraceStep, render_trace
+
+# ชื่อที่ re-export แบบโหลดเมื่อใช้งานครั้งแรก {ชื่อ: โมดูลย่อย}
+_LAZY_EXPORTS = {
+    'optimize_beam_design': 'optimizer',
+    'draw_beam_section': 'drawing',
+    'draw_beam_section_svg': 'drawing',
+    'cached_beam_design': 'cache',
+    'cache_stats': 'cache',
+    'solve_section': 'fiber',
+    'solve_rectangular_batch': 'fiber',
+    'select_bars': 'rebar',
+    'bar_combinations': 'rebar',
+    'analyze_continuous_beam': 'analysis',
+    'design_along_beam': 'analysis',
+    'check_serviceability_batch': 'serviceability',
+    'estimate_reliability': 'reliability',
+    'iter_reliability': 'reliability',
+    'lookup_capacity': 'design_tables',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        import importlib
+
+        module = importlib.import_module(f'.{_LAZY_EXPORTS[name]}', __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,290 @@
+"""
+วิเคราะห์คานต่อเนื่องหลายช่วงด้วย stiffness method หา envelope ของโมเมนต์และแรงเฉือนตลอดคานเพื่อใช้เป็น Mu/Vu
+
+    result = analyze_continuous_beam([5, 6, 5], dead_load=1500, live_load=800)
+    result['M_max'], result['M_min'], result['V_max'], result['V_min']   # ทุก station (kg-m, kg)
+    along = design_along_beam(result, fc=240, fy=4000, b=30, h=50, cover=4, ...)
+
+หน่วย: ความยาว m, น้ำหนักแผ่ kg/m, แรงจุด kg, โมเมนต์ kg-m (บวก = ท้องคานรับแรงดึง), แรงเฉือน kg
+
+แต่ละช่วงเป็น element เดียว (2 DOF ต่อจุดรองรับ) เมทริกซ์ stiffness จึงเป็นแถบกว้าง 3 แก้ด้วย banded Cholesky
+กรณีน้ำหนัก (dead load ทั้งคาน และ live load ทีละช่วง) แก้พร้อมกันเป็นหลาย column ของ right-hand side
+envelope ของการจัด live load ทุกรูปแบบ (2^จำนวนช่วง แบบ) ได้จากการรวมเฉพาะช่วงที่ให้ผลบวก (หรือลบ) ในแต่ละ station
+"""
+from .engine import STIRRUP_AREAS, calculate_beam_design_batch
+from .rebar import STIRRUP_YIELD
+
+# ตัวคูณน้ำหนัก U = 1.4D + 1.7L (วสท./ACI 318 แบบเดียวกับ φ ของ engine)
+DEAD_LOAD_FACTOR = 1.4
+LIVE_LOAD_FACTOR = 1.7
+
+# ชนิดจุดรองรับ: จำนวน DOF ที่ยึด (การเคลื่อนที่แนวดิ่ง, การหมุน)
+SUPPORTS = {'pin': (True, False), 'fixed': (True, True), 'free': (False, False)}
+
+# หน่วยน้ำหนักคอนกรีต (kg/m³) สำหรับน้ำหนักคาน
+CONCRETE_UNIT_WEIGHT = 2400
+
+STATIONS_PER_SPAN = 101
+
+
+def _per_span(value, spans, name):
+    import numpy as np
+
+    value = np.broadcast_to(np.asarray(value, dtype=float), (spans,)) if np.ndim(value) == 0 else \
+        np.asarray(value, dtype=float)
+    if value.shape != (spans,):
+        raise ValueError(f"{name} ต้องเป็นค่าเดียวหรือมี {spans} ค่า (ช่วงละค่า)")
+    return value
+
+
+def _banded_solve(band, rhs):
+    """
+    แก้ K x = rhs เมื่อ K สมมาตรบวกแน่นอนเก็บแบบแถบ band[k, i] = K[i, i + k] (k = 0..bandwidth)
+    ด้วย Cholesky K = RᵀR (R เก็บแบบเดียวกัน) rhs เป็น (n, จำนวนกรณี) แก้ทุกกรณีพร้อมกัน
+    """
+    import numpy as np
+
+    width, n = band.shape[0] - 1, band.shape[1]
+    R = np.zeros_like(band)
+    tolerance = 1e-10 * band[0].max()
+    for j in range(n):
+        lo = max(0, j - width)
+        pivot = band[0, j] - sum(R[j - k, k] ** 2 for k in range(lo, j))
+        if pivot <= tolerance:
+            raise ValueError("คานไม่มีเสถียรภาพ: จุดรองรับไม่พอ (ต้องยึดอย่างน้อย 2 จุด หรือปลายยึดแน่น 1 จุด)")
+        R[0, j] = pivot ** 0.5
+        for i in range(j + 1, min(n, j + width + 1)):
+            value = band[i - j, j] - sum(R[j - k, k] * R[i - k, k] for k in range(max(0, i - width), j))
+            R[i - j, j] = value / R[0, j]
+
+    y = np.array(rhs, dtype=float)
+    for j in range(n):
+        for k in range(max(0, j - width), j):
+            y[j] -= R[j - k, k] * y[k]
+        y[j] /= R[0, j]
+    for j in range(n - 1, -1, -1):
+        for i in range(j + 1, min(n, j + width + 1)):
+            y[j] -= R[i - j, j] * y[i]
+        y[j] /= R[0, j]
+    return y
+
+
+def _element_stiffness(EI, L):
+    import numpy as np
+
+    return EI / L**3 * np.array([
+        [12, 6 * L, -12, 6 * L],
+        [6 * L, 4 * L**2, -6 * L, 2 * L**2],
+        [-12, -6 * L, 12, -6 * L],
+        [6 * L, 2 * L**2, -6 * L, 4 * L**2],
+    ])
+
+
+def _fixed_end_forces(L, w, points):
+    """
+    แรงที่ปลายยึดแน่นกระทำต่อช่วง [V1, M1, V2, M2] (ขึ้น/ทวนเข็มเป็นบวก) ทุกกรณี: shape (4, จำนวนกรณี)
+    w: น้ำหนักแผ่ของแต่ละกรณี, points: รายการ (a, P ของแต่ละกรณี)
+    """
+    import numpy as np
+
+    fef = np.array([w * L / 2, w * L**2 / 12, w * L / 2, -w * L**2 / 12])
+    for a, P in points:
+        b = L - a
+        fef += np.array([P * b**2 * (3 * a + b) / L**3, P * a * b**2 / L**2,
+                         P * a**2 * (a + 3 * b) / L**3, -P * a**2 * b / L**2])
+    return fef
+
+
+def analyze_continuous_beam(spans, supports=None, dead_load=0.0, live_load=0.0, point_loads=(), inertia=1.0,
+                            stations=STATIONS_PER_SPAN, dead_factor=DEAD_LOAD_FACTOR,
+                            live_factor=LIVE_LOAD_FACTOR):
+    """
+    วิเคราะห์คานต่อเนื่อง spans (ความยาวแต่ละช่วง m) ภายใต้ dead/live load แผ่ (kg/m ค่าเดียวหรือช่วงละค่า)
+    และ point_loads (รายการ dict: span (เริ่มที่ 0), x (m จากปลายซ้ายของช่วง), dead, live (kg))
+    supports: ชนิดจุดรองรับทุกจุด (จำนวนช่วง + 1 จุด) จาก SUPPORTS ค่าเริ่มต้น 'pin' ทุกจุด
+    inertia: โมเมนต์ความเฉื่อยสัมพัทธ์ของแต่ละช่วง (คานหน้าตัดเดียวกันใช้ 1)
+
+    คืนค่า dict ของ array ทุก station (stations จุดต่อช่วง รวมปลายทั้งสอง):
+    x (m จากปลายซ้ายของคาน), span, M_max, M_min, V_max, V_min (envelope ของ U = dead_factor·D + live_factor·L)
+    M_cases, V_cases (ค่าไม่คูณตัวคูณ แถว 0 = dead, แถว i = live บนช่วง i-1), reactions (envelope ของแรงปฏิกิริยา)
+    """
+    import numpy as np
+
+    spans = np.asarray(spans, dtype=float)
+    n = spans.size
+    if n == 0 or (spans <= 0).any():
+        raise ValueError("ความยาวช่วงต้องมากกว่า 0 อย่างน้อย 1 ช่วง")
+    supports = ['pin'] * (n + 1) if supports is None else list(supports)
+    if len(supports) != n + 1 or any(s not in SUPPORTS for s in supports):
+        raise ValueError(f"ต้องระบุจุดรองรับ {n + 1} จุด ชนิด {tuple(SUPPORTS)}")
+    dead, live, EI = (_per_span(v, n, name) for v, name in
+                      ((dead_load, 'dead_load'), (live_load, 'live_load'), (inertia, 'inertia')))
+
+    # กรณีน้ำหนัก: 0 = dead ทั้งคาน, i = live บนช่วง i-1 (ไม่คูณตัวคูณ)
+    cases = n + 1
+    w = np.zeros((n, cases))
+    w[:, 0] = dead
+    w[np.arange(n), np.arange(1, cases)] = live
+    points = [[] for _ in range(n)]
+    for load in point_loads:
+        span, a = int(load['span']), float(load['x'])
+        if not 0 <= span < n or not 0 <= a <= spans[span]:
+            raise ValueError(f"แรงจุดอยู่นอกคาน: ช่วง {span + 1}, x = {a} m")
+        P = np.zeros(cases)
+        P[0] = load.get('dead', 0.0)
+        P[span + 1] = load.get('live', 0.0)
+        points[span].append((a, P))
+
+    # ประกอบ stiffness แบบแถบ (DOF 2i = การเคลื่อนที่, 2i+1 = การหมุน ของจุดรองรับ i) เฉพาะ DOF อิสระ
+    restrained = np.array([fixed for s in supports for fixed in SUPPORTS[s]])
+    free = np.flatnonzero(~restrained)
+    number = np.full(2 * (n + 1), -1)
+    number[free] = np.arange(free.size)
+    band = np.zeros((4, free.size))
+    loads = np.zeros((free.size, cases))
+    elements = []
+    for i, L in enumerate(spans):
+        k = _element_stiffness(EI[i], L)
+        fef = _fixed_end_forces(L, w[i], points[i])
+        dofs = number[2 * i:2 * i + 4]
+        for r in range(4):
+            if dofs[r] < 0:
+                continue
+            loads[dofs[r]] -= fef[r]
+            for c in range(4):
+                if dofs[c] >= dofs[r]:
+                    band[dofs[c] - dofs[r], dofs[r]] += k[r, c]
+        elements.append((k, fef, dofs))
+    # แถวสุดท้ายเป็นศูนย์สำหรับ DOF ที่ยึด (number = -1)
+    displacements = np.vstack([_banded_solve(band, loads) if free.size else loads, np.zeros((1, cases))])
+
+    # แรงปลายช่วง แล้วโมเมนต์/แรงเฉือนในช่วงจากสมดุลของชิ้นส่วนซ้ายของ station
+    xs, span_index, M_cases, V_cases = [], [], [], []
+    reactions = np.zeros((n + 1, cases))
+    offset = np.concatenate([[0.0], np.cumsum(spans)])
+    for i, (k, fef, dofs) in enumerate(elements):
+        u = displacements[dofs]
+        V1, M1, V2, M2 = k @ u + fef
+        reactions[i] += V1
+        reactions[i + 1] += V2
+        x = np.linspace(0.0, spans[i], stations)
+        M = -M1[:, None] + V1[:, None] * x - w[i][:, None] * x**2 / 2
+        V = V1[:, None] - w[i][:, None] * x
+        for a, P in points[i]:
+            M -= P[:, None] * np.maximum(x - a, 0.0)
+            V -= P[:, None] * (x > a)
+        xs.append(offset[i] + x)
+        span_index.append(np.full(stations, i))
+        M_cases.append(M)
+        V_cases.append(V)
+    M_cases, V_cases = np.concatenate(M_cases, axis=1), np.concatenate(V_cases, axis=1)
+
+    def envelope(values):
+        live_part = live_factor * values[1:]
+        base = dead_factor * values[0]
+        return base + np.clip(live_part, 0, None).sum(axis=0), base + np.clip(live_part, None, 0).sum(axis=0)
+
+    M_max, M_min = envelope(M_cases)
+    V_max, V_min = envelope(V_cases)
+    R_max, R_min = envelope(reactions.T)
+    supported = restrained[0::2]
+    return {
+        'x': np.concatenate(xs), 'span': np.concatenate(span_index),
+        'M_max': M_max, 'M_min': M_min, 'V_max': V_max, 'V_min': V_min,
+        'M_cases': M_cases, 'V_cases': V_cases,
+        'reactions': {'x': offset[supported], 'max': R_max[supported], 'min': R_min[supported]},
+        'spans': spans, 'supports': supports,
+    }
+
+
+def required_stirrup_spacing(Vu, fc, b, d, stirrup_type, stirrup_legs):
+    """
+    ระยะเรียงเหล็กปลอกที่ต้องการ (cm) ตามแรงเฉือน Vu (kg) แบบ ACI 318 (หน่วย kg/cm²):
+    Vs = Vu/φ - Vc, s ≤ Av·fyt·d/Vs, s ≤ Av·fyt/(3.5b) เมื่อ Vu > φVc/2, s ≤ d/2 (d/4 เมื่อ Vs > 1.1√f'c·b·d)
+    หน้าตัดเล็กเกินไป (Vs > 2.1√f'c·b·d) ได้ NaN
+    """
+    import numpy as np
+
+    phi_s = 0.75
+    Av = STIRRUP_AREAS[stirrup_type] * stirrup_legs
+    fyt = STIRRUP_YIELD[stirrup_type]
+    Vu = np.abs(np.asarray(Vu, dtype=float))
+    root = np.sqrt(fc) * b * d
+    Vc = 0.53 * root
+    Vs = Vu / phi_s - Vc
+    s_max = np.where(Vs > 1.1 * root, np.minimum(d / 4, 30), np.minimum(d / 2, 60))
+    with np.errstate(divide='ignore'):
+        s_strength = np.where(Vs > 0, Av * fyt * d / np.where(Vs > 0, Vs, 1), np.inf)
+    s_minimum = np.where(Vu > phi_s * Vc / 2, Av * fyt / (3.5 * b), np.inf)
+    spacing = np.minimum(np.minimum(s_strength, s_minimum), s_max)
+    return np.where(Vs > 2.1 * root, np.nan, spacing)
+
+
+def design_along_beam(analysis, fc, fy, b, h, cover, bottom_steel_type, bottom_steel_count, top_steel_type,
+                      top_steel_count, stirrup_type, stirrup_legs, stirrup_spacing, d_prime=4):
+    """
+    ตรวจสอบหน้าตัดทุก station ด้วย batch engine: โมเมนต์บวกใช้เหล็กล่างรับแรงดึง (เหล็กบนรับแรงอัด)
+    โมเมนต์ลบใช้เหล็กบนรับแรงดึง ตรวจเฉพาะทิศที่มีโมเมนต์ แรงเฉือนใช้ค่าสัมบูรณ์ที่มากกว่าของ envelope
+    คืนค่า dict ของ array ทุก station: Mu_pos, Mu_neg, Vu, moment_ratio (φMn/Mu ที่น้อยกว่า), shear_ratio (φVc/Vu),
+    moment_ok, shear_ok, stirrup_ok (ระยะเรียงที่ใช้ ≤ ระยะที่ต้องการ), required_spacing, design_ok
+    """
+    import numpy as np
+
+    d = h - cover
+    Mu_pos = np.clip(analysis['M_max'], 0, None)
+    Mu_neg = np.clip(-analysis['M_min'], 0, None)
+    Vu = np.maximum(np.abs(analysis['V_max']), np.abs(analysis['V_min']))
+
+    common = dict(fc=fc, fy=fy, b=b, h=h, d=d, Vu=Vu, stirrup_type=stirrup_type, stirrup_legs=stirrup_legs,
+                  stirrup_spacing=stirrup_spacing, compression_steel=True, d_prime=d_prime)
+    positive = calculate_beam_design_batch(Mu=Mu_pos, tension_steel_type=bottom_steel_type,
+                                           tension_steel_count=bottom_steel_count,
+                                           compression_steel_type=top_steel_type,
+                                           compression_steel_count=top_steel_count, **common)
+    negative = calculate_beam_design_batch(Mu=Mu_neg, tension_steel_type=top_steel_type,
+                                           tension_steel_count=top_steel_count,
+                                           compression_steel_type=bottom_steel_type,
+                                           compression_steel_count=bottom_steel_count, **common)
+
+    def flexure_ok(result, Mu):
+        return (Mu <= 0) | (result['moment_check'] & result['tension_steel_adequate'] & result['rho_check'])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        moment_ratio = np.fmin(np.where(Mu_pos > 0, positive['phi_Mn'] / Mu_pos, np.inf),
+                               np.where(Mu_neg > 0, negative['phi_Mn'] / Mu_neg, np.inf))
+        shear_ratio = np.where(Vu > 0, positive['phi_Vc'] / Vu, np.inf)
+    required_spacing = required_stirrup_spacing(Vu, fc, b, d, stirrup_type, stirrup_legs)
+    moment_ok = flexure_ok(positive, Mu_pos) & flexure_ok(negative, Mu_neg)
+    shear_ok = np.broadcast_to(positive['shear_check'], Vu.shape)
+    stirrup_ok = stirrup_spacing <= np.nan_to_num(required_spacing, nan=0.0)
+    return {
+        'Mu_pos': Mu_pos, 'Mu_neg': Mu_neg, 'Vu': Vu,
+        'moment_ratio': moment_ratio, 'shear_ratio': shear_ratio,
+        'moment_ok': moment_ok, 'shear_ok': shear_ok, 'stirrup_ok': stirrup_ok,
+        'required_spacing': required_spacing,
+        'design_ok': moment_ok & shear_ok & stirrup_ok,
+    }
+
+
+def critical_sections(analysis):
+    """
+    หน้าตัดวิกฤตของแต่ละช่วง: โมเมนต์บวกสูงสุด, โมเมนต์ลบสูงสุด (มักอยู่ที่จุดรองรับ) และแรงเฉือนสูงสุด
+    คืนค่า list ของ dict: kind ('M+', 'M-', 'V'), span, x (m), Mu (kg-m ค่าบวกของทิศนั้น
+    สำหรับ 'V' ใช้ค่าที่มากกว่าของสองทิศ), Vu (kg)
+    """
+    import numpy as np
+
+    x, span = analysis['x'], analysis['span']
+    Vu = np.maximum(np.abs(analysis['V_max']), np.abs(analysis['V_min']))
+    moments = {'M+': analysis['M_max'], 'M-': -analysis['M_min'],
+               'V': np.maximum(np.maximum(analysis['M_max'], -analysis['M_min']), 0)}
+    sections = []
+    for i in range(len(analysis['spans'])):
+        index = np.flatnonzero(span == i)
+        for kind, values in (('M+', moments['M+']), ('M-', moments['M-']), ('V', Vu)):
+            j = index[np.argmax(values[index])]
+            if values[j] <= 0:
+                continue
+            sections.append({'kind': kind, 'span': i, 'x': float(x[j]), 'Mu': float(moments[kind][j]),
+                             'Vu': float(Vu[j])})
+    return sections
@@ -0,0 +1,180 @@
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+from .disk_cache import DISK_CACHE_MIN_SECONDS, open_disk_cache
+from .drawing import draw_beam_section_svg
+from .engine import calculate_beam_design
+
+# ขนาดสูงสุดของแคช (จำนวนรายการ)
+RESULT_CACHE_SIZE = 1024
+SECTION_CACHE_SIZE = 256
+PIPELINE_CACHE_SIZE = 1024
+
+
+class LRUCache:
+    """
+    แคชขนาดจำกัดแบบ LRU ใช้ร่วมกันได้หลาย thread (ทุก session ของ Streamlit ใน process เดียวกัน)
+    นับจำนวน hit/miss เพื่อดูว่าแคชได้ผลจริง
+
+    ถ้ากำหนด disk (DiskCache) get_or_compute จะหาในดิสก์ก่อนคำนวณ และเก็บผลลงดิสก์เมื่อคำนวณนานกว่า
+    min_seconds (รายการที่คำนวณเร็วกว่าการอ่านไฟล์อยู่ในหน่วยความจำเท่านั้น)
+    """
+
+    def __init__(self, maxsize=128, disk=None, min_seconds=0.0):
+        self.maxsize = maxsize
+        self.disk = disk
+        self.min_seconds = min_seconds
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute, disk_key=None):
+        """
+        คืนค่าจากแคช ถ้าไม่มีจะหาในดิสก์ (ถ้ามี) หรือเรียก compute() แล้วเก็บผลไว้ (ไม่ถือ lock ระหว่างคำนวณ)
+        disk_key คือ key ที่ใช้บนดิสก์ (ค่าเริ่มต้นคือ key)
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+        if self.disk is not None:
+            disk_key = key if disk_key is None else disk_key
+            value = self.disk.get(disk_key, missing)
+            if value is not missing:
+                with self._lock:
+                    self.disk_hits += 1
+                self.put(key, value)
+                return value
+        start = time.perf_counter()
+        value = compute()
+        elapsed = time.perf_counter() - start
+        self.put(key, value)
+        if self.disk is not None and elapsed >= self.min_seconds:
+            self.disk.put(disk_key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.disk_hits = self.evictions = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'disk_hits': self.disk_hits,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+# แคชบนดิสก์ที่ใช้ร่วมกันทุก process (None ถ้าไม่ได้ตั้ง BEAM_DESIGN_DISK_CACHE)
+DISK_CACHE = open_disk_cache()
+
+RESULT_CACHE = LRUCache(RESULT_CACHE_SIZE, DISK_CACHE, DISK_CACHE_MIN_SECONDS)
+SECTION_CACHE = LRUCache(SECTION_CACHE_SIZE, DISK_CACHE, DISK_CACHE_MIN_SECONDS)
+# ผลของแต่ละ node ใน beam_design.pipeline (ลงดิสก์เฉพาะ node ที่ persist)
+PIPELINE_CACHE = LRUCache(PIPELINE_CACHE_SIZE, DISK_CACHE, DISK_CACHE_MIN_SECONDS)
+
+
+def normalize_value(value):
+    """
+    แปลงค่า input ให้อยู่ในรูปมาตรฐานสำหรับใช้เป็น key: ตัวเลขที่เป็นจำนวนเต็มเป็น int,
+    numpy scalar เป็นชนิด Python, list/tuple เป็น tuple
+    """
+    if hasattr(value, 'item') and not isinstance(value, (str, bytes)):
+        value = value.item()
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return int(value) if float(value).is_integer() else float(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_value(v) for v in value)
+    return value
+
+
+def memoize(cache, name=None):
+    """
+    decorator เก็บผลของฟังก์ชันไว้ใน cache โดยใช้ key เป็น (ชื่อฟังก์ชัน, อาร์กิวเมนต์ทั้งหมดที่ normalize แล้ว)
+    ฟังก์ชันจะถูกเรียกด้วยค่าที่ normalize แล้วเสมอ ผลลัพธ์ที่ได้จากแคชใช้ร่วมกัน ห้ามแก้ไข
+    ชื่อฟังก์ชันคงที่ข้าม rerun ของสคริปต์ จึงใช้กับฟังก์ชันที่ประกาศใน app.py ได้
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        prefix = name or f'{func.__module__}.{func.__qualname__}'
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = {k: normalize_value(v) for k, v in bound.arguments.items()}
+            key = (prefix, tuple(arguments.values()))
+            return cache.get_or_compute(key, lambda: func(**arguments))
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+@memoize(RESULT_CACHE, name='calculate_beam_design')
+def cached_beam_design(fc, fy, b, h, d, Mu, Vu, stirrup_type, stirrup_legs, stirrup_spacing,
+                       tension_steel_type, tension_steel_count, compression_steel=False,
+                       compression_steel_type=None, compression_steel_count=None, d_prime=4):
+    """
+    calculate_beam_design ที่เก็บผลไว้ในแคชร่วม (ผลลัพธ์เป็น dict ที่ใช้ร่วมกัน ห้ามแก้ไข)
+    """
+    return calculate_beam_design(fc, fy, b, h, d, Mu, Vu, stirrup_type, stirrup_legs, stirrup_spacing,
+                                 tension_steel_type, tension_steel_count, compression_steel,
+                                 compression_steel_type, compression_steel_count, d_prime)
+
+
+@memoize(SECTION_CACHE, name='draw_beam_section_svg')
+def cached_section_svg(b, h, cover, bar_dia, bar_count, stirrup_dia, stirrup_legs,
+                       d_prime=4, bar_dia_comp=None, bar_count_comp=None, stirrup_spacing=15):
+    """
+    ภาพตัดคานแบบ SVG ที่เก็บไว้ในแคชร่วม (วาดใหม่เฉพาะเมื่อ input เปลี่ยน)
+    """
+    return draw_beam_section_svg(b, h, cover, bar_dia, bar_count, stirrup_dia, stirrup_legs,
+                                 d_prime, bar_dia_comp, bar_count_comp, stirrup_spacing)
+
+
+def cache_stats():
+    """
+    สถิติของแคชทั้งหมด {ชื่อ: {size, maxsize, hits, misses, disk_hits, evictions, hit_rate}}
+    และ 'disk' (ดู DiskCache.stats) เมื่อเปิดใช้แคชบนดิสก์
+    """
+    stats = {'results': RESULT_CACHE.stats(), 'sections': SECTION_CACHE.stats(), 'pipeline': PIPELINE_CACHE.stats()}
+    if DISK_CACHE is not None:
+        stats['disk'] = DISK_CACHE.stats()
+    return stats
@@ -0,0 +1,490 @@
+"""
+ตรวจสอบคานจากตาราง (CSV/Parquet) โดยไม่ต้องเปิดหน้าเว็บ
+
+    python -m beam_design check schedule.csv -o results.csv --workers 4
+    python -m beam_design check schedule.csv --serviceability   # ต้องมีคอลัมน์ span, M_dead, M_live
+    python -m beam_design report schedule.csv -o report.pdf --workers 4
+    python -m beam_design reliability schedule.csv -o reliability.csv --samples 1000000 --workers 4
+    python -m beam_design tables build
+    python -m beam_design cache info --dir /var/cache/beam_design
+
+ตารางมีหนึ่งแถวต่อคาน คอลัมน์: fc, fy, b, h, cover, Mu, Vu, stirrup_type, stirrup_legs, stirrup_spacing,
+tension_steel_type, tension_steel_count และ (ถ้ามี) compression_steel_type, compression_steel_count, d_prime
+หน่วยเหมือนหน้าเว็บ (kg/cm², cm, kg-m, kg) ถ้าไม่มีคอลัมน์ d จะใช้ d = h - cover
+"""
+import argparse
+import math
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+REQUIRED_COLUMNS = (
+    'fc', 'fy', 'b', 'h', 'Mu', 'Vu', 'stirrup_type', 'stirrup_legs', 'stirrup_spacing',
+    'tension_steel_type', 'tension_steel_count',
+)
+
+# คอลัมน์ผลลัพธ์ที่เขียนต่อท้ายข้อมูลนำเข้า
+OUTPUT_COLUMNS = (
+    'As_required', 'As_provided_tension', 'As_prime', 'rho_required', 'rho_max',
+    'phi_Mn', 'phi_Vc', 'moment_check', 'shear_check', 'tension_steel_adequate',
+    'stirrup_adequate', 'rho_check', 'design_ok', 'error',
+)
+
+# คอลัมน์ข้อมูลนำเข้าและผลลัพธ์ของ --serviceability
+SERVICE_INPUT_COLUMNS = ('span', 'M_dead', 'M_live')
+SERVICE_OUTPUT_COLUMNS = (
+    'Icr', 'Ie_total', 'delta_live', 'delta_total', 'delta_live_limit', 'delta_total_limit',
+    'fs', 'max_bar_spacing', 'crack_ok', 'serviceability_ok',
+)
+
+# คอลัมน์ผลลัพธ์ของคำสั่ง reliability
+RELIABILITY_OUTPUT_COLUMNS = (
+    'samples', 'pf', 'pf_low', 'pf_high', 'beta', 'beta_low', 'beta_high', 'pf_flexure', 'pf_shear',
+)
+
+
+# ชนิดคอลัมน์ของข้อมูลนำเข้าเมื่ออ่าน CSV (pyarrow เดาชนิดจาก block แรกเท่านั้น คอลัมน์ที่ว่างทั้ง block แรก
+# เช่น compression_steel_type จะกลายเป็น null แล้วอ่าน block ถัดไปไม่ได้) จำนวนเส้นเป็น float เพื่อรับค่าแบบ "2.0"
+STRING_COLUMNS = ('stirrup_type', 'tension_steel_type', 'compression_steel_type')
+FLOAT_COLUMNS = (
+    'fc', 'fy', 'b', 'h', 'd', 'cover', 'Mu', 'Vu', 'stirrup_legs', 'stirrup_spacing', 'tension_steel_count',
+    'compression_steel_count', 'd_prime', 'span', 'M_dead', 'M_live', 'end_moment_dead', 'end_moment_live',
+    'sustained_live',
+)
+BOOL_COLUMNS = ('compression_steel', 'cantilever')
+
+
+def _csv_column_types():
+    import pyarrow as pa
+
+    types = {name: pa.string() for name in STRING_COLUMNS}
+    types.update((name, pa.float64()) for name in FLOAT_COLUMNS)
+    types.update((name, pa.bool_()) for name in BOOL_COLUMNS)
+    return types
+
+
+def _file_format(path, fmt):
+    if fmt:
+        return fmt
+    return 'parquet' if Path(str(path)).suffix.lower() in ('.parquet', '.pq') else 'csv'
+
+
+def read_chunks(path, chunksize, fmt=None):
+    """
+    อ่านตารางคานทีละประมาณ chunksize แถว (DataFrame) ไม่โหลดทั้งไฟล์เข้าหน่วยความจำ
+    """
+    if _file_format(path, fmt) == 'parquet':
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+        return
+
+    import pyarrow as pa
+    import pyarrow.csv as pv
+
+    # pyarrow อ่าน CSV เป็น block ตามจำนวน byte จึงรวม batch ให้ได้ราว chunksize แถวก่อนส่งต่อ
+    source = sys.stdin.buffer if str(path) == '-' else path
+    reader = pv.open_csv(source, read_options=pv.ReadOptions(block_size=1 << 22),
+                         convert_options=pv.ConvertOptions(column_types=_csv_column_types()))
+    batches, rows = [], 0
+    for batch in reader:
+        batches.append(batch)
+        rows += batch.num_rows
+        if rows >= chunksize:
+            yield pa.Table.from_batches(batches).to_pandas()
+            batches, rows = [], 0
+    if batches:
+        yield pa.Table.from_batches(batches).to_pandas()
+
+
+class ChunkWriter:
+    """
+    เขียนผลลัพธ์ต่อท้ายไฟล์ทีละ chunk (CSV หรือ Parquet) ใช้กับ with
+    ชนิดคอลัมน์ยึดตาม chunk แรก (chunk ถัดไปถูก cast ให้ตรงกัน)
+    """
+
+    def __init__(self, path, fmt=None):
+        self.path = path
+        self.format = _file_format(path, fmt)
+        self._writer = None
+        self._schema = None
+
+    def __enter__(self):
+        return self
+
+    def _open(self, schema):
+        if self.format == 'parquet':
+            import pyarrow.parquet as pq
+
+            return pq.ParquetWriter(self.path, schema)
+        import pyarrow.csv as pv
+
+        sink = sys.stdout.buffer if str(self.path) == '-' else self.path
+        return pv.CSVWriter(sink, schema)
+
+    def write(self, df):
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = self._open(self._schema)
+        self._writer.write_table(table.cast(self._schema))
+
+    def __exit__(self, *exc):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def check_chunk(df):
+    """
+    ตรวจสอบคานทุกแถวใน DataFrame ด้วย calculate_beam_design_batch คืนค่า DataFrame ที่เพิ่มคอลัมน์ผลลัพธ์
+    """
+    from .engine import calculate_beam_design_batch
+
+    missing = [name for name in REQUIRED_COLUMNS if name not in df]
+    if 'd' not in df and 'cover' not in df:
+        missing.append('cover')
+    if missing:
+        raise ValueError(f"ไม่พบคอลัมน์: {', '.join(missing)}")
+
+    d = df['d'] if 'd' in df else df['h'] - df['cover']
+    if 'compression_steel_count' in df:
+        comp_count = df['compression_steel_count'].fillna(0).to_numpy()
+        comp_type = (df['compression_steel_type'].to_numpy() if 'compression_steel_type' in df else None)
+        comp = (df['compression_steel'].fillna(False).astype(bool).to_numpy()
+                if 'compression_steel' in df else comp_count > 0)
+    else:
+        comp_count, comp_type, comp = 0, None, False
+
+    results = calculate_beam_design_batch(
+        df['fc'].to_numpy(), df['fy'].to_numpy(), df['b'].to_numpy(), df['h'].to_numpy(), d.to_numpy(),
+        df['Mu'].to_numpy(), df['Vu'].to_numpy(), df['stirrup_type'].to_numpy(),
+        df['stirrup_legs'].to_numpy(), df['stirrup_spacing'].to_numpy(),
+        df['tension_steel_type'].to_numpy(), df['tension_steel_count'].to_numpy(),
+        comp, comp_type, comp_count,
+        df['d_prime'].fillna(4).to_numpy() if 'd_prime' in df else 4,
+    )
+    out = df.copy()
+    for name in OUTPUT_COLUMNS:
+        out[name] = results[name]
+    return out
+
+
+def add_bar_suggestions(df):
+    """
+    เพิ่มคอลัมน์ชุดเหล็กรับแรงดึงที่พื้นที่น้อยที่สุดที่ ≥ As_required และวางเป็นชั้นเดียวได้ในความกว้าง b
+    (รวมเหล็กสองขนาดผสม ดู beam_design.rebar) คานที่ไม่มีชุดที่วางได้มีค่าว่าง
+    """
+    import numpy as np
+    import pandas as pd
+
+    from .rebar import bar_combinations
+
+    cover = df['cover'] if 'cover' in df else df['h'] - df['d']
+    selected = bar_combinations().select(df['As_required'].to_numpy(), df['b'].to_numpy(), cover.to_numpy())
+    label = (pd.Series(selected['tension_steel_count'], dtype=str) + ' ' + selected['tension_steel_type'])
+    second = ' + ' + pd.Series(selected['second_steel_count'], dtype=str) + ' ' + selected['second_steel_type']
+    label = label.where(selected['second_steel_count'] == 0, label + second)
+    out = df.copy()
+    out['suggested_steel'] = label.where(selected['found'], None).to_numpy()
+    out['suggested_As'] = selected['As_provided']
+    out['suggested_weight'] = np.round(selected['weight'], 3)
+    return out
+
+
+def add_serviceability(df):
+    """
+    เพิ่มคอลัมน์ระยะแอ่นตัวและการควบคุมรอยร้าว (ดู beam_design.serviceability) ต้องมีคอลัมน์ span (m),
+    M_dead, M_live (โมเมนต์ใช้งาน kg-m) และ (ถ้ามี) end_moment_dead, end_moment_live, cantilever, sustained_live
+    """
+    from .serviceability import check_serviceability_batch
+
+    missing = [name for name in SERVICE_INPUT_COLUMNS if name not in df]
+    if missing:
+        raise ValueError(f"ไม่พบคอลัมน์สำหรับตรวจสภาวะใช้งาน: {', '.join(missing)}")
+    d = df['d'] if 'd' in df else df['h'] - df['cover']
+    optional = {name: df[name].fillna(default).to_numpy() if name in df else default
+                for name, default in (('end_moment_dead', 0.0), ('end_moment_live', 0.0),
+                                      ('cantilever', False), ('sustained_live', 0.0))}
+    optional['cantilever'] = optional['cantilever'].astype(bool) if 'cantilever' in df else False
+    results = check_serviceability_batch(
+        df['fc'].to_numpy(), df['fy'].to_numpy(), df['b'].to_numpy(), df['h'].to_numpy(), d.to_numpy(),
+        df['span'].to_numpy(), df['M_dead'].to_numpy(), df['M_live'].to_numpy(),
+        df['tension_steel_type'].to_numpy(), df['tension_steel_count'].to_numpy(),
+        df['compression_steel_type'].to_numpy() if 'compression_steel_type' in df else None,
+        df['compression_steel_count'].fillna(0).to_numpy() if 'compression_steel_count' in df else 0,
+        df['d_prime'].fillna(4).to_numpy() if 'd_prime' in df else 4,
+        df['cover'].to_numpy() if 'cover' in df else None,
+        **optional,
+    )
+    out = df.copy()
+    for name in SERVICE_OUTPUT_COLUMNS:
+        out[name] = results[name]
+    return out
+
+
+def _iter_results(chunks, workers):
+    """
+    ประมวลผล chunk ตามลำดับ ถ้า workers > 1 ใช้ process pool โดยส่งงานค้างไว้ไม่เกิน 2 × workers chunk
+    """
+    if workers <= 1:
+        yield from map(check_chunk, chunks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for chunk in chunks:
+            pending.append(pool.submit(check_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def run_check(args):
+    start = time.perf_counter()
+    rows = failed = errors = service_failed = 0
+    chunks = read_chunks(args.input, args.chunksize, args.input_format)
+    with ChunkWriter(args.output, args.output_format) as writer:
+        for result in _iter_results(chunks, args.workers):
+            if args.suggest_bars:
+                result = add_bar_suggestions(result)
+            if args.serviceability:
+                result = add_serviceability(result)
+                service_failed += int((~result['serviceability_ok']).sum())
+            writer.write(result)
+            rows += len(result)
+            failed += int((~result['design_ok']).sum())
+            errors += int(result['error'].sum())
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        service = f"| สภาวะใช้งานไม่ผ่าน {service_failed:,} " if args.serviceability else ""
+        print(f"ตรวจสอบ {rows:,} คาน: ผ่าน {rows - failed:,} | ไม่ผ่าน {failed:,} | ข้อมูลผิดพลาด {errors:,} "
+              f"{service}| {elapsed:.2f} s ({rows / elapsed if elapsed else 0:,.0f} คาน/s)", file=sys.stderr)
+    return 1 if args.fail_on_error and failed else 0
+
+
+def _table_beams(path, chunksize, fmt):
+    for df in read_chunks(path, chunksize, fmt):
+        yield from df.to_dict('records')
+
+
+def run_report(args):
+    from .report import write_report
+
+    if Path(args.input).suffix.lower() == '.db':
+        from .project import iter_beams, open_project
+
+        conn = open_project(args.input)
+        beams = iter_beams(conn, level=args.level, failed_only=args.failed_only)
+    else:
+        if args.level is not None or args.failed_only:
+            raise ValueError('--level และ --failed-only ใช้ได้กับไฟล์โปรเจกต์ (.db) เท่านั้น')
+        conn = None
+        beams = _table_beams(args.input, 10_000, args.input_format)
+    try:
+        stats = write_report(beams, args.output, args.workers, args.chunksize, args.title)
+    finally:
+        if conn is not None:
+            conn.close()
+    if not args.quiet:
+        print(f"รายงาน {stats['beams']:,} คาน ({stats['pages']:,} หน้า): ไม่ผ่าน {stats['failed']:,} "
+              f"| ข้อมูลผิดพลาด {stats['errors']:,} | {stats['seconds']:.2f} s -> {args.output}", file=sys.stderr)
+    return 1 if args.fail_on_error and stats['failed'] else 0
+
+
+def _row_beam(record):
+    return {k: v for k, v in record.items() if not (isinstance(v, float) and v != v)}
+
+
+def run_reliability(args):
+    import json
+
+    from .reliability import estimate_reliability, resolve_variables
+
+    variables = None
+    if args.variables:
+        with open(args.variables, encoding='utf-8') as f:
+            variables = json.load(f)
+    resolve_variables(variables)
+    start = time.perf_counter()
+    rows = below = 0
+    lowest = float('inf')
+    # pool เดียวใช้ร่วมกันทุกคาน แต่ละคานใช้ seed [seed, ลำดับแถว] ผลของแต่ละแถวจึงไม่ขึ้นกับแถวอื่น
+    pool = (ProcessPoolExecutor(max_workers=args.workers, mp_context=get_context('spawn'))
+            if args.workers > 1 else None)
+    try:
+        with ChunkWriter(args.output, args.output_format) as writer:
+            for df in read_chunks(args.input, 10_000, args.input_format):
+                estimates = [estimate_reliability(_row_beam(record), variables, args.samples, args.chunksize,
+                                                  args.workers, [args.seed, rows + i], args.confidence, pool)
+                             for i, record in enumerate(df.to_dict('records'))]
+                out = df.copy()
+                for name in RELIABILITY_OUTPUT_COLUMNS:
+                    out[name] = [estimate[name] for estimate in estimates]
+                writer.write(out)
+                rows += len(out)
+                if len(out):
+                    lowest = min(lowest, out['beta'].min())
+                if args.target_beta is not None:
+                    below += int((out['beta'] < args.target_beta).sum())
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        target = f"| β < {args.target_beta} {below:,} คาน " if args.target_beta is not None else ""
+        print(f"ประเมิน {rows:,} คาน ({args.samples:,} ตัวอย่าง/คาน): β ต่ำสุด {lowest:.2f} {target}"
+              f"| {elapsed:.2f} s ({rows * args.samples / elapsed if elapsed else 0:,.0f} ตัวอย่าง/s)",
+              file=sys.stderr)
+    return 1 if below else 0
+
+
+def run_tables(args):
+    import json
+
+    from .design_tables import DEFAULT_GRID, build_tables, lookup_capacity, open_tables
+
+    if args.action == 'build':
+        start = time.perf_counter()
+        grid = {name: getattr(args, name) for name in DEFAULT_GRID if getattr(args, name)}
+        index = build_tables(args.dir, grid, args.cover)
+        if not args.quiet:
+            cells = sum(math.prod(spec['shape']) for spec in index['arrays'].values())
+            print(f"สร้างตาราง {cells:,} ค่า ({' × '.join(f'{len(v)} {k}' for k, v in index['axes'].items())}, "
+                  f"cover {index['cover']} cm) | {time.perf_counter() - start:.2f} s -> {args.dir}", file=sys.stderr)
+        return 0
+    if args.action == 'info':
+        tables = open_tables(args.dir)
+        if tables is None:
+            print(f"ไม่พบตารางที่ใช้ได้ใน {args.dir} (ยังไม่ได้สร้าง หรือสร้างจาก engine รุ่นอื่น)", file=sys.stderr)
+            return 1
+        print(json.dumps({k: v for k, v in tables.index.items() if k != 'arrays'}, ensure_ascii=False))
+        return 0
+    result = lookup_capacity(args.fc, args.fy, args.b, args.h, args.bar, args.count, args.cover_query,
+                             directory=args.dir, interpolate=not args.exact)
+    print(json.dumps(result, ensure_ascii=False))
+    return 0
+
+
+def run_cache(args):
+    import json
+
+    from .disk_cache import DiskCache
+
+    if not args.dir:
+        print("ไม่ได้กำหนดโฟลเดอร์แคช (--dir หรือ BEAM_DESIGN_DISK_CACHE)", file=sys.stderr)
+        return 2
+    cache = DiskCache(args.dir)
+    if args.action == 'evict':
+        print(f"ลบ {cache.evict():,} ไฟล์", file=sys.stderr)
+    elif args.action == 'clear':
+        cache.clear()
+    print(json.dumps(cache.stats(), ensure_ascii=False))
+    return 0
+
+
+def run_serve(args):
+    from .server import serve
+
+    return serve(args.host, args.port, args.workers, args.max_pending, args.verbose)
+
+
+def build_parser():
+    from .design_tables import DEFAULT_TABLES_DIR
+    from .disk_cache import DISK_CACHE_DIR
+    from .reliability import RELIABILITY_CHUNKSIZE
+    from .report import REPORT_CHUNKSIZE
+
+    parser = argparse.ArgumentParser(prog='python -m beam_design', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    check = commands.add_parser('check', help='ตรวจสอบคานจากตาราง CSV/Parquet')
+    check.add_argument('input', help="ไฟล์ตารางคาน (.csv, .parquet หรือ - สำหรับ CSV จาก stdin)")
+    check.add_argument('-o', '--output', default='-', help="ไฟล์ผลลัพธ์ (.csv หรือ .parquet, ค่าเริ่มต้น stdout)")
+    check.add_argument('--chunksize', type=int, default=100_000, help='จำนวนแถวต่อ chunk')
+    check.add_argument('--workers', type=int, default=1, help='จำนวน process ที่ใช้คำนวณพร้อมกัน')
+    check.add_argument('--input-format', choices=('csv', 'parquet'), help='รูปแบบไฟล์นำเข้า (ค่าเริ่มต้นดูจากนามสกุล)')
+    check.add_argument('--output-format', choices=('csv', 'parquet'), help='รูปแบบไฟล์ผลลัพธ์')
+    check.add_argument('--suggest-bars', action='store_true',
+                       help='เพิ่มคอลัมน์ชุดเหล็กรับแรงดึงที่น้อยที่สุดที่วางได้ในความกว้าง b')
+    check.add_argument('--serviceability', action='store_true',
+                       help='เพิ่มคอลัมน์ระยะแอ่นตัวและการควบคุมรอยร้าว (ต้องมีคอลัมน์ span, M_dead, M_live)')
+    check.add_argument('--fail-on-error', action='store_true', help='คืนค่า exit code 1 ถ้ามีคานที่ไม่ผ่าน')
+    check.add_argument('-q', '--quiet', action='store_true', help='ไม่แสดงสรุปผลทาง stderr')
+    check.set_defaults(func=run_check)
+
+    report = commands.add_parser('report', help='สร้างรายงาน PDF ของคานทั้งตาราง')
+    report.add_argument('input', help="ไฟล์ตารางคาน (.csv, .parquet) หรือไฟล์โปรเจกต์ (.db)")
+    report.add_argument('-o', '--output', default='report.pdf', help='ไฟล์ PDF ผลลัพธ์')
+    report.add_argument('--workers', type=int, default=1, help='จำนวน process ที่ใช้วาดหน้ารายงานพร้อมกัน')
+    report.add_argument('--chunksize', type=int, default=REPORT_CHUNKSIZE, help='จำนวนคานต่องานของ worker')
+    report.add_argument('--title', help='ชื่อเอกสาร (metadata ของ PDF)')
+    report.add_argument('--input-format', choices=('csv', 'parquet'), help='รูปแบบไฟล์นำเข้า (ค่าเริ่มต้นดูจากนามสกุล)')
+    report.add_argument('--level', help='เฉพาะคานชั้นนี้ (ไฟล์โปรเจกต์)')
+    report.add_argument('--failed-only', action='store_true', help='เฉพาะคานที่ไม่ผ่าน (ไฟล์โปรเจกต์)')
+    report.add_argument('--fail-on-error', action='store_true', help='คืนค่า exit code 1 ถ้ามีคานที่ไม่ผ่าน')
+    report.add_argument('-q', '--quiet', action='store_true', help='ไม่แสดงสรุปผลทาง stderr')
+    report.set_defaults(func=run_report)
+
+    reliability = commands.add_parser('reliability', help='ประเมิน P_f และดัชนีความน่าเชื่อถือ β ด้วย Monte Carlo')
+    reliability.add_argument('input', help="ไฟล์ตารางคาน (.csv, .parquet หรือ - สำหรับ CSV จาก stdin)")
+    reliability.add_argument('-o', '--output', default='-', help="ไฟล์ผลลัพธ์ (.csv หรือ .parquet, ค่าเริ่มต้น stdout)")
+    reliability.add_argument('--samples', type=int, default=1_000_000, help='จำนวนตัวอย่างต่อคาน')
+    reliability.add_argument('--chunksize', type=int, default=RELIABILITY_CHUNKSIZE, help='จำนวนตัวอย่างต่องานของ worker')
+    reliability.add_argument('--workers', type=int, default=1, help='จำนวน process ที่ใช้สุ่มพร้อมกัน')
+    reliability.add_argument('--seed', type=int, default=0, help='seed (ผลเหมือนเดิมเมื่อใช้ seed และ chunksize เดิม)')
+    reliability.add_argument('--confidence', type=float, default=0.95, help='ระดับความเชื่อมั่นของช่วง P_f และ β')
+    reliability.add_argument('--variables', help='ไฟล์ JSON การแจกแจงที่แทนค่าเริ่มต้น เช่น {"fc": {"cov": 0.2}}')
+    reliability.add_argument('--input-format', choices=('csv', 'parquet'), help='รูปแบบไฟล์นำเข้า (ค่าเริ่มต้นดูจากนามสกุล)')
+    reliability.add_argument('--output-format', choices=('csv', 'parquet'), help='รูปแบบไฟล์ผลลัพธ์')
+    reliability.add_argument('--target-beta', type=float, help='คืนค่า exit code 1 ถ้ามีคานที่ β ต่ำกว่าค่านี้')
+    reliability.add_argument('-q', '--quiet', action='store_true', help='ไม่แสดงสรุปผลทาง stderr')
+    reliability.set_defaults(func=run_reliability)
+
+    tables = commands.add_parser('tables', help='ตารางช่วยออกแบบ φMn, φVc ที่คำนวณไว้ล่วงหน้า (memory-mapped)')
+    tables.set_defaults(func=run_tables)
+    table_actions = tables.add_subparsers(dest='action', required=True)
+    build = table_actions.add_parser('build', help='สร้างตารางบนตารางมาตรฐาน (หรือแกนที่กำหนด)')
+    build.add_argument('--cover', type=float, default=4, help='ระยะคอนกรีตปก (cm) ของแกน h')
+    for name, unit in (('fc', 'kg/cm²'), ('fy', 'kg/cm²'), ('b', 'cm'), ('h', 'cm')):
+        build.add_argument(f'--{name}', type=float, nargs='+', help=f'ค่าบนแกน {name} ({unit}) แทนตารางมาตรฐาน')
+    build.add_argument('-q', '--quiet', action='store_true', help='ไม่แสดงสรุปผลทาง stderr')
+    table_actions.add_parser('info', help='แกนของตารางที่สร้างไว้ (JSON)')
+    lookup = table_actions.add_parser('lookup', help='กำลังของหน้าตัดเดียว (JSON) จากตาราง หรือคำนวณถ้าอยู่นอกตาราง')
+    for name in ('fc', 'fy', 'b', 'h'):
+        lookup.add_argument(f'--{name}', type=float, required=True)
+    lookup.add_argument('--cover', dest='cover_query', type=float, default=4)
+    lookup.add_argument('--bar', required=True, help='ขนาดเหล็กรับแรงดึง เช่น DB16')
+    lookup.add_argument('--count', type=int, required=True, help='จำนวนเส้น')
+    lookup.add_argument('--exact', action='store_true', help='ไม่ประมาณค่าระหว่างช่อง (คำนวณแทน)')
+    for action in (build, table_actions.choices['info'], lookup):
+        action.add_argument('--dir', default=DEFAULT_TABLES_DIR, help='โฟลเดอร์ตาราง (ค่าเริ่มต้น BEAM_DESIGN_TABLES)')
+
+    cache = commands.add_parser('cache', help='แคชผลการคำนวณและภาพบนดิสก์ที่ใช้ร่วมกันหลาย process')
+    cache.add_argument('action', choices=['info', 'evict', 'clear'],
+                       help='info: สถิติ | evict: ลบรายการเก่า/รุ่นอื่น/เกินขนาด | clear: ลบทั้งหมด')
+    cache.add_argument('--dir', default=DISK_CACHE_DIR, help='โฟลเดอร์แคช (ค่าเริ่มต้น BEAM_DESIGN_DISK_CACHE)')
+    cache.set_defaults(func=run_cache)
+
+    serve = commands.add_parser('serve', help='เปิด HTTP API (JSON) สำหรับให้โปรแกรมอื่นเรียกตรวจสอบคาน')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8000)
+    serve.add_argument('--workers', type=int, default=2, help='จำนวน process สำหรับงาน batch และภาพ PNG')
+    serve.add_argument('--max-pending', type=int, help='จำนวนงานค้างสูงสุดใน pool (ค่าเริ่มต้น 4 × workers)')
+    serve.add_argument('-v', '--verbose', action='store_true', help='แสดง log ทุกคำขอ')
+    serve.set_defaults(func=run_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"เกิดข้อผิดพลาด: {e}", file=sys.stderr)
+        return 2
@@ -0,0 +1,333 @@
+"""
+ตารางช่วยออกแบบ (design aid) ที่คำนวณไว้ล่วงหน้า: φMn ของเหล็กรับแรงดึงทุกขนาด 1–10 เส้น, φVc, ρmin และ ρmax
+บนตารางมาตรฐาน fc × fy × b × h เก็บเป็นไฟล์ .npy หนึ่งไฟล์ต่อ array พร้อม index.json (แกนของตาราง)
+
+    python -m beam_design tables build
+    python -m beam_design tables lookup --fc 240 --fy 4000 --b 30 --h 50 --bar DB16 --count 3
+
+ตารางเปิดด้วย np.load(mmap_mode='r') ซึ่งอ่านเฉพาะ header ของแต่ละไฟล์ ข้อมูลถูกอ่านจากดิสก์เฉพาะช่องที่ค้นหา
+- จุดที่อยู่บนตารางพอดีได้ค่าจากตารางโดยตรง
+- จุดที่อยู่ระหว่างช่อง (fc, fy, b, d) ได้ค่าจากการประมาณเชิงเส้นหลายมิติ (ปิดได้ด้วย interpolate=False)
+- จุดนอกตาราง ขนาดเหล็กหรือจำนวนเส้นที่ไม่มีในตาราง คำนวณด้วยสูตรของ engine
+
+ตารางเก็บ hash ของซอร์สโค้ด engine และตารางเหล็กไว้ ถ้าสูตรเปลี่ยน ตารางเก่าจะไม่ถูกใช้จนกว่าจะสร้างใหม่
+"""
+import itertools
+import json
+import math
+import os
+from bisect import bisect_right
+from pathlib import Path
+
+from .disk_cache import source_hash
+from .rebar import MAIN_BARS, MAX_BARS, STIRRUP_BARS
+
+# โฟลเดอร์ตารางเริ่มต้น
+DEFAULT_TABLES_DIR = os.environ.get('BEAM_DESIGN_TABLES', 'design_tables')
+
+# ตารางมาตรฐาน: แกนที่ประมาณค่าระหว่างช่องได้ (h คิดที่ cover ของตาราง ค้นหาด้วย d = h - cover)
+DEFAULT_GRID = {
+    'fc': (210, 240, 280, 320),
+    'fy': (3000, 4000),
+    'b': tuple(range(20, 65, 5)),
+    'h': tuple(range(30, 125, 5)),
+}
+TABLE_AXES = tuple(DEFAULT_GRID)
+
+# array ที่เก็บ {ชื่อ: แกน}
+TABLE_ARRAYS = {
+    'phi_Mn': TABLE_AXES + ('bar', 'count'),
+    'phi_Vc': TABLE_AXES,
+    'rho_min': TABLE_AXES,
+    'rho_max': TABLE_AXES,
+    'As': ('bar', 'count'),
+}
+
+# ค่าที่ได้จากการค้นหา
+CAPACITY_KEYS = ('phi_Mn', 'phi_Vc', 'rho_min', 'rho_max', 'As')
+
+# ที่มาของค่าที่ค้นหา (รหัสใน array source)
+SOURCES = ('table', 'interpolated', 'computed')
+
+INDEX_FILE = 'index.json'
+TABLE_VERSION = 1
+
+_OPENED = {}
+
+
+def engine_hash():
+    """
+    hash ของซอร์สโค้ดที่ใช้คำนวณกำลัง (engine และตารางเหล็ก)
+    """
+    return source_hash(('engine.py', 'rebar.py'))
+
+
+def compute_capacity(fc, fy, b, d, tension_steel_type, tension_steel_count):
+    """
+    กำลังจากสูตรของ engine โดยตรง รับ scalar หรือ array ที่ broadcast กันได้ คืนค่า dict ตาม CAPACITY_KEYS
+    """
+    from .engine import calculate_beam_design_batch
+
+    # Mu, Vu, h และเหล็กปลอกไม่มีผลต่อ φMn, φVc และ ρ
+    results = calculate_beam_design_batch(fc, fy, b, d, d, 0, 0, STIRRUP_BARS.names[0], 2, 10,
+                                          tension_steel_type, tension_steel_count)
+    return {'phi_Mn': results['phi_Mn'], 'phi_Vc': results['phi_Vc'], 'rho_min': results['rho_min'],
+            'rho_max': results['rho_max'], 'As': results['As_provided_tension']}
+
+
+def _save(path, array):
+    import numpy as np
+
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+def build_tables(directory=None, grid=None, cover=4, bar_types=MAIN_BARS.names, max_bars=MAX_BARS):
+    """
+    คำนวณตารางทั้งหมดด้วย batch engine ครั้งเดียวแล้วเขียนลง directory คืนค่า index
+    grid กำหนดแกนบางแกนแทน DEFAULT_GRID ได้ เช่น {'fc': (240, 280)}
+    index.json ถูกลบก่อนและเขียนทีหลังสุด ตารางที่เขียนไม่เสร็จจึงไม่ถูกเปิดใช้
+    """
+    import numpy as np
+
+    directory = Path(directory or DEFAULT_TABLES_DIR)
+    axes = {name: np.unique(np.asarray(values, dtype=float)) for name, values in {**DEFAULT_GRID, **(grid or {})}.items()}
+    fc, fy, b, h = np.meshgrid(*(axes[name] for name in TABLE_AXES), indexing='ij')
+    bars = np.asarray(bar_types)[:, None]
+    counts = np.arange(1, max_bars + 1)
+    expand = (Ellipsis, None, None)
+    full = compute_capacity(fc[expand], fy[expand], b[expand], h[expand] - cover, bars, counts)
+    arrays = {
+        'phi_Mn': full['phi_Mn'],
+        'phi_Vc': full['phi_Vc'][..., 0, 0],
+        'rho_min': full['rho_min'][..., 0, 0],
+        'rho_max': full['rho_max'][..., 0, 0],
+        'As': full['As'][(0,) * len(TABLE_AXES)],
+    }
+
+    directory.mkdir(parents=True, exist_ok=True)
+    index_path = directory / INDEX_FILE
+    index_path.unlink(missing_ok=True)
+    for name, array in arrays.items():
+        _save(directory / f'{name}.npy', np.ascontiguousarray(array, dtype=np.float64))
+    index = {
+        'version': TABLE_VERSION,
+        'engine_hash': engine_hash(),
+        'cover': cover,
+        'axes': {name: values.tolist() for name, values in axes.items()},
+        'bar_types': list(bar_types),
+        'max_bars': max_bars,
+        'arrays': {name: {'file': f'{name}.npy', 'axes': list(TABLE_ARRAYS[name]), 'shape': list(arrays[name].shape)}
+                   for name in TABLE_ARRAYS},
+    }
+    tmp = index_path.with_name(INDEX_FILE + '.tmp')
+    tmp.write_text(json.dumps(index, indent=1), encoding='utf-8')
+    os.replace(tmp, index_path)
+    return index
+
+
+def open_tables(directory=None):
+    """
+    เปิดตาราง (แคชไว้จนกว่า index.json จะเปลี่ยน) คืนค่า DesignTables หรือ None ถ้ายังไม่ได้สร้าง
+    หรือสร้างจาก engine รุ่นอื่น
+    """
+    # ถูกเรียกทุกครั้งที่ค้นหา จึงตรวจเพียง mtime ของ index.json (os.stat ครั้งเดียว)
+    key = os.path.join(directory or DEFAULT_TABLES_DIR, INDEX_FILE)
+    try:
+        stamp = os.stat(key).st_mtime_ns
+    except OSError:
+        return None
+    cached = _OPENED.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    path = Path(key)
+    try:
+        index = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    tables = None
+    if index.get('version') == TABLE_VERSION and index.get('engine_hash') == engine_hash():
+        tables = DesignTables(path.parent, index)
+    _OPENED[key] = (stamp, tables)
+    return tables
+
+
+class DesignTables:
+    """
+    ตารางที่เปิดแล้ว: arrays[ชื่อ] เป็น array แบบ memory-mapped ตามแกนใน TABLE_ARRAYS
+    """
+
+    def __init__(self, directory, index):
+        import numpy as np
+
+        self.directory = Path(directory)
+        self.index = index
+        self.cover = index['cover']
+        self.axes = {name: np.asarray(values, dtype=float) for name, values in index['axes'].items()}
+        self.bar_types = tuple(index['bar_types'])
+        self.max_bars = index['max_bars']
+        # np.asarray ของ memmap เป็น ndarray ที่ยังชี้ไปยังไฟล์เดิม (ไม่คัดลอก) แต่ index ได้เร็วกว่า memmap
+        self.arrays = {name: np.asarray(np.load(self.directory / spec['file'], mmap_mode='r'))
+                       for name, spec in index['arrays'].items()}
+        self._flat = {name: array.reshape(-1) for name, array in self.arrays.items()}
+        self._bar_positions = {name: i for i, name in enumerate(self.bar_types)}
+        self._axis_values = [index['axes'][name] for name in TABLE_AXES]
+        self._positions = [{value: i for i, value in enumerate(values)} for values in self._axis_values]
+        # ระยะห่างของตำแหน่งในแต่ละแกนของ array ตามแกน TABLE_AXES (แบบ C order)
+        sizes = [len(values) for values in self._axis_values]
+        self._strides = [math.prod(sizes[k + 1:]) for k in range(len(sizes))]
+        self._sizes = sizes
+        self._cells = self.arrays['As'].size
+
+    def axis_index(self, name, value):
+        """
+        ตำแหน่งของค่าบนแกน (ค่าต้องอยู่บนตารางพอดี)
+        """
+        matches = (self.axes[name] == value).nonzero()[0]
+        if not len(matches):
+            raise ValueError(f"{name} = {value} ไม่อยู่ในตาราง ({', '.join(f'{v:g}' for v in self.axes[name])})")
+        return int(matches[0])
+
+    def _corners(self):
+        """
+        มุมของช่อง (ด้านของแต่ละแกน) ไม่รวมด้านบนของแกนที่มีค่าเดียว
+        """
+        return [corner for corner in itertools.product((0, 1), repeat=len(TABLE_AXES))
+                if all(size > 1 or side == 0 for side, size in zip(corner, self._sizes))]
+
+    def lookup(self, fc, fy, b, d, tension_steel_type, tension_steel_count, interpolate=True):
+        """
+        φMn, φVc, ρmin, ρmax และ As ของหลายหน้าตัดพร้อมกัน (array ที่ broadcast กันได้, d = ความลึกประสิทธิผล)
+        คืนค่า dict ของ array ตาม CAPACITY_KEYS และ source (ตำแหน่งใน SOURCES)
+        """
+        import numpy as np
+
+        fc, fy, b, d, count = np.broadcast_arrays(*(np.asarray(x, dtype=float)
+                                                    for x in (fc, fy, b, d, tension_steel_count)))
+        shape = np.broadcast_shapes(fc.shape, np.shape(tension_steel_type))
+        fc, fy, b, d, count = (np.broadcast_to(x, shape) for x in (fc, fy, b, d, count))
+        bar = np.broadcast_to(np.asarray(tension_steel_type), shape)
+
+        bar_index = np.full(shape, -1)
+        for name, i in self._bar_positions.items():
+            bar_index[bar == name] = i
+        valid = (bar_index >= 0) & (count == np.round(count)) & (count >= 1) & (count <= self.max_bars)
+        exact = np.ones(shape, dtype=bool)
+        base = np.zeros(shape, dtype=np.intp)
+        weights = []
+        with np.errstate(invalid='ignore'):
+            for name, x, stride in zip(TABLE_AXES, (fc, fy, b, d + self.cover), self._strides):
+                values = self.axes[name]
+                valid &= (x >= values[0]) & (x <= values[-1])
+                if len(values) == 1:
+                    weights.append(np.zeros(shape))
+                    continue
+                i = np.clip(np.searchsorted(values, x, side='right') - 1, 0, len(values) - 2)
+                t = (x - values[i]) / (values[i + 1] - values[i])
+                exact &= (t == 0) | (t == 1)
+                base += i * stride
+                weights.append(t)
+        if not interpolate:
+            valid &= exact
+
+        # แถวที่ไม่อยู่ในตารางใช้ตำแหน่ง 0 ชั่วคราว (ค่าถูกแทนด้วยการคำนวณด้านล่าง)
+        base = np.where(valid, base, 0)
+        weights = [np.where(valid, t, 0.0) for t in weights]
+        steel = np.where(valid, bar_index * self.max_bars + count - 1, 0).astype(np.intp)
+
+        # เติมค่าลงใน array ที่สร้างไว้ (take ของ index 0 มิติคืน numpy scalar ซึ่งเขียนทับด้านล่างไม่ได้)
+        out = {name: np.zeros(shape) for name in CAPACITY_KEYS}
+        out['As'][...] = self._flat['As'].take(steel)
+        # ประมาณเชิงเส้นหลายมิติจากมุมของช่อง (มุมที่น้ำหนักเป็นศูนย์ทุกแถวไม่ต้องอ่าน)
+        for corner in self._corners():
+            w = np.ones(shape)
+            for t, side in zip(weights, corner):
+                w *= t if side else 1 - t
+            if not w.any():
+                continue
+            cell = base + sum(side * stride for side, stride in zip(corner, self._strides))
+            out['phi_Mn'] += w * self._flat['phi_Mn'].take(cell * self._cells + steel)
+            for name in ('phi_Vc', 'rho_min', 'rho_max'):
+                out[name] += w * self._flat[name].take(cell)
+
+        computed = ~valid
+        if computed.any():
+            missing = compute_capacity(fc[computed], fy[computed], b[computed], d[computed], bar[computed],
+                                       count[computed])
+            for name in CAPACITY_KEYS:
+                out[name][computed] = missing[name]
+        out['source'] = np.where(computed, 2, np.where(exact, 0, 1))
+        return out
+
+    def lookup_one(self, fc, fy, b, d, tension_steel_type, tension_steel_count, interpolate=True):
+        """
+        เหมือน lookup สำหรับหน้าตัดเดียว (Python ล้วน ไม่มีค่าใช้จ่ายของ numpy) คืนค่า dict ของ float และ source
+        หรือ None ถ้าหน้าตัดไม่อยู่ในตาราง
+        """
+        bar = self._bar_positions.get(tension_steel_type)
+        if bar is None or tension_steel_count != int(tension_steel_count) or not 1 <= tension_steel_count <= self.max_bars:
+            return None
+        # มุมของช่อง [(ตำแหน่งใน array ตามแกน TABLE_AXES, น้ำหนัก)] ค่าบนเส้นตารางพอดีใช้ด้านเดียว
+        cells = [(0, 1.0)]
+        exact = True
+        for values, positions, x, stride in zip(self._axis_values, self._positions, (fc, fy, b, d + self.cover),
+                                                self._strides):
+            position = positions.get(x)
+            if position is not None:
+                cells = [(cell + position * stride, w) for cell, w in cells]
+                continue
+            if not values[0] <= x <= values[-1]:
+                return None
+            i = min(bisect_right(values, x) - 1, len(values) - 2)
+            t = (x - values[i]) / (values[i + 1] - values[i])
+            if not interpolate:
+                return None
+            exact = False
+            cells = [(cell + position * stride, w * side) for cell, w in cells
+                     for position, side in ((i, 1 - t), (i + 1, t))]
+        steel = bar * self.max_bars + int(tension_steel_count) - 1
+        flat = self._flat
+        if exact:
+            cell = cells[0][0]
+            return {
+                'phi_Mn': flat['phi_Mn'].item(cell * self._cells + steel), 'phi_Vc': flat['phi_Vc'].item(cell),
+                'rho_min': flat['rho_min'].item(cell), 'rho_max': flat['rho_max'].item(cell),
+                'As': flat['As'].item(steel), 'source': SOURCES[0],
+            }
+        return {
+            'phi_Mn': sum(w * flat['phi_Mn'].item(cell * self._cells + steel) for cell, w in cells),
+            'phi_Vc': sum(w * flat['phi_Vc'].item(cell) for cell, w in cells),
+            'rho_min': sum(w * flat['rho_min'].item(cell) for cell, w in cells),
+            'rho_max': sum(w * flat['rho_max'].item(cell) for cell, w in cells),
+            'As': flat['As'].item(steel),
+            'source': SOURCES[1],
+        }
+
+
+def lookup_capacity(fc, fy, b, h, tension_steel_type, tension_steel_count, cover=4, d=None, directory=None,
+                    interpolate=True):
+    """
+    กำลังของหน้าตัดเดียว จากตารางถ้ามี ไม่เช่นนั้นคำนวณด้วย engine
+    คืนค่า dict: phi_Mn, phi_Vc, rho_min, rho_max, As และ source ('table', 'interpolated' หรือ 'computed')
+    """
+    from .engine import calculate_beam_design
+
+    if tension_steel_type not in MAIN_BARS.names:
+        raise ValueError(f'ไม่รู้จักชนิดเหล็ก: {tension_steel_type}')
+    d = h - cover if d is None else d
+    tables = open_tables(directory)
+    if tables is not None:
+        found = tables.lookup_one(fc, fy, b, d, tension_steel_type, tension_steel_count, interpolate)
+        if found is not None:
+            return found
+    # Mu, Vu, h และเหล็กปลอกไม่มีผลต่อกำลัง (เหมือน compute_capacity)
+    results = calculate_beam_design(fc, fy, b, d, d, 0, 0, STIRRUP_BARS.names[0], 2, 10, tension_steel_type,
+                                    tension_steel_count, with_trace=False)
+    if 'error' in results:
+        raise ValueError(results['error'])
+    found = {name: float(results[key]) for name, key in zip(CAPACITY_KEYS, (
+        'phi_Mn', 'phi_Vc', 'rho_min', 'rho_max', 'As_provided_tension'))}
+    found['source'] = SOURCES[2]
+    return found
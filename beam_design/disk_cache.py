@@ -0,0 +1,329 @@
+"""
+แคชบนดิสก์ที่ใช้ร่วมกันได้หลาย process (หลาย replica ของ Streamlit, worker ของ server/รายงาน) และคงอยู่ข้ามการ restart
+
+- key คือ sha256 ของ key ที่ normalize แล้ว (repr ของ tuple) เก็บเป็นไฟล์ pickle หนึ่งไฟล์ต่อรายการ
+  ในโฟลเดอร์ย่อยของแคชเองตามรุ่น: <directory>/beam_design-cache/<version>/<2 ตัวแรกของ hash>/<hash>.pkl
+  evict/clear แตะเฉพาะไฟล์ตามรูปแบบนี้ directory จึงเป็นโฟลเดอร์ที่ใช้ร่วมกับข้อมูลอื่นได้ (เช่น ~/.cache)
+- รุ่น (version) คือ hash ของซอร์สโค้ดที่ใช้คำนวณ (CACHE_SOURCES) และรุ่นของ Python เมื่อสูตรเปลี่ยน
+  รายการเดิมจะไม่ถูกอ่านอีกและถูกลบในการ evict ครั้งถัดไป
+- เขียนลงไฟล์ชั่วคราวในโฟลเดอร์เดียวกันแล้ว os.replace ผู้อ่านจึงเห็นไฟล์ที่สมบูรณ์เสมอ ไม่ต้องใช้ lock
+- evict ตามอายุ (mtime ซึ่งถูกแตะเมื่ออ่าน) และขนาดรวม ทุก ๆ evict_every ครั้งที่เขียน (process เดียว evict ในแต่ละครั้ง)
+
+เปิดใช้ด้วย BEAM_DESIGN_DISK_CACHE=<โฟลเดอร์> (ไฟล์เป็น pickle ต้องเป็นโฟลเดอร์ที่เขียนได้เฉพาะบริการนี้)
+"""
+import hashlib
+import os
+import pickle
+import re
+import sys
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: evict พร้อมกันได้ (การลบไฟล์ที่ถูกลบไปแล้วถูกข้าม)
+    fcntl = None
+
+# ซอร์สที่ผลในแคชขึ้นอยู่ด้วย (สูตร, trace, ภาพตัด, รายงาน, การแปลงข้อมูลคานและหน่วย, key ของ node ใน pipeline)
+CACHE_SOURCES = ('engine.py', 'rebar.py', 'trace.py', 'drawing.py', 'report.py', 'inputs.py', 'pipeline.py')
+
+DISK_CACHE_DIR = os.environ.get('BEAM_DESIGN_DISK_CACHE')
+DISK_CACHE_MAX_BYTES = int(float(os.environ.get('BEAM_DESIGN_DISK_CACHE_MB', 512)) * 2**20)
+DISK_CACHE_MAX_AGE = float(os.environ.get('BEAM_DESIGN_DISK_CACHE_DAYS', 30)) * 86400
+# เก็บลงดิสก์เฉพาะรายการที่คำนวณนานกว่านี้ (การอ่าน pickle จากดิสก์ใช้เวลาราว 50–100 µs)
+DISK_CACHE_MIN_SECONDS = float(os.environ.get('BEAM_DESIGN_DISK_CACHE_MIN_MS', 5)) / 1000
+
+# แตะ mtime ของรายการที่อ่านเมื่อเก่ากว่านี้ (ไม่ต้องเขียน metadata ทุกครั้งที่อ่าน)
+TOUCH_SECONDS = 3600
+# ไฟล์ชั่วคราวที่ค้างนานกว่านี้ถือว่าผู้เขียนหยุดทำงานไปแล้ว
+STALE_TMP_SECONDS = 3600
+LOCK_FILE = '.evict.lock'
+# โฟลเดอร์ย่อยที่แคชเป็นเจ้าของ ไฟล์นอกโฟลเดอร์นี้ไม่ถูกแตะ
+CACHE_SUBDIR = 'beam_design-cache'
+_VERSION_NAME = re.compile(r'[0-9a-f]{16}')
+_SHARD_NAME = re.compile(r'[0-9a-f]{2}')
+_ENTRY_SUFFIXES = ('.pkl', '.tmp')
+
+
+@lru_cache(maxsize=None)
+def source_hash(names=CACHE_SOURCES):
+    """
+    sha256 ของซอร์สโค้ดในแพ็กเกจตามชื่อไฟล์ที่กำหนด
+    """
+    digest = hashlib.sha256()
+    for name in names:
+        digest.update(name.encode())
+        digest.update(Path(__file__).with_name(name).read_bytes())
+    return digest.hexdigest()
+
+
+def cache_key(key):
+    """
+    hash ของ key ที่ normalize แล้ว (tuple ของ str, int, float, bool, None) คงที่ข้าม process และการ restart
+    """
+    return hashlib.sha256(repr(key).encode()).hexdigest()
+
+
+class DiskCache:
+    """
+    แคชบนดิสก์ มี get/put/get_or_compute/clear/stats แบบเดียวกับ LRUCache
+    ค่าที่ pickle ไม่ได้จะไม่ถูกเก็บ ไฟล์ที่อ่านไม่ได้ถือเป็น miss และถูกลบ
+    """
+
+    def __init__(self, directory, max_bytes=DISK_CACHE_MAX_BYTES, max_age=DISK_CACHE_MAX_AGE, version=None,
+                 evict_every=256):
+        self.directory = Path(directory)
+        self.base = self.directory / CACHE_SUBDIR
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.version = version or hashlib.sha256(
+            f'{source_hash()}-{sys.version_info[0]}.{sys.version_info[1]}'.encode()).hexdigest()[:16]
+        self.evict_every = evict_every
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+        # จำนวนรายการและขนาดรวมจากการสำรวจครั้งล่าสุด บวกที่เขียนเพิ่มหลังจากนั้น (ค่าโดยประมาณ)
+        self._entries = None
+        self._bytes = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self.root = self.base / self.version
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key):
+        digest = cache_key(key)
+        return self.root / digest[:2] / f'{digest}.pkl'
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get(self, key, default=None):
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+                mtime = os.fstat(f.fileno()).st_mtime
+        except OSError:
+            self._count('misses')
+            return default
+        try:
+            value = pickle.loads(data)
+        except Exception:
+            # ไฟล์เสียหรือสร้างจากคลาสที่เปลี่ยนไปแล้ว
+            self._count('errors')
+            self._count('misses')
+            self._unlink(path)
+            return default
+        if time.time() - mtime > TOUCH_SECONDS:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        self._count('hits')
+        return value
+
+    def put(self, key, value):
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            self._count('errors')
+            return False
+        path = self.path(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except BaseException:
+                self._unlink(tmp)
+                raise
+        except OSError:
+            self._count('errors')
+            return False
+        with self._lock:
+            self.writes += 1
+            self._pending += 1
+            if self._entries is not None:
+                self._entries += 1
+                self._bytes += len(data)
+            evict = self._pending >= self.evict_every
+            if evict:
+                self._pending = 0
+        if evict:
+            self.evict()
+        return True
+
+    def get_or_compute(self, key, compute):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            os.unlink(path)
+            return True
+        except OSError:
+            return False
+
+    def _version_dirs(self):
+        """
+        โฟลเดอร์รุ่นใต้ base (ชื่อเป็น hex 16 ตัว หรือรุ่นปัจจุบัน)
+        """
+        try:
+            entries = list(os.scandir(self.base))
+        except OSError:
+            return []
+        return [entry for entry in entries if entry.is_dir(follow_symlinks=False)
+                and (_VERSION_NAME.fullmatch(entry.name) or entry.name == self.version)]
+
+    def _shard_dirs(self):
+        """
+        [(โฟลเดอร์ shard, เป็นรุ่นปัจจุบัน)]
+        """
+        shards = []
+        for version in self._version_dirs():
+            try:
+                entries = list(os.scandir(version.path))
+            except OSError:
+                continue
+            shards.extend((entry.path, version.name == self.version) for entry in entries
+                          if entry.is_dir(follow_symlinks=False) and _SHARD_NAME.fullmatch(entry.name))
+        return shards
+
+    def _scan(self):
+        """
+        ไฟล์รายการ (.pkl) และไฟล์ชั่วคราว (.tmp) ใน shard ของทุกรุ่น: [(mtime, ขนาด, path, เป็นรุ่นปัจจุบัน)]
+        """
+        files = []
+        for shard, current in self._shard_dirs():
+            try:
+                entries = list(os.scandir(shard))
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.name.endswith(_ENTRY_SUFFIXES) or not entry.is_file(follow_symlinks=False):
+                    continue
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, entry.path, current and entry.name.endswith('.pkl')))
+        return files
+
+    def evict(self):
+        """
+        ลบรายการของรุ่นอื่น, รายการที่เก่ากว่า max_age, ไฟล์ชั่วคราวที่ค้าง และรายการที่ใช้ล่าสุดนานที่สุด
+        จนขนาดรวมเหลือไม่เกิน 90% ของ max_bytes คืนค่าจำนวนไฟล์ที่ลบ
+        """
+        lock = None
+        if fcntl is not None:
+            lock = open(self.base / LOCK_FILE, 'a')
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                # process อื่นกำลัง evict อยู่
+                lock.close()
+                return 0
+        try:
+            now = time.time()
+            removed = 0
+            kept = []
+            for mtime, size, path, current in self._scan():
+                if path.endswith('.tmp'):
+                    stale = now - mtime > STALE_TMP_SECONDS
+                else:
+                    stale = not current or now - mtime > self.max_age
+                if stale:
+                    removed += self._unlink(path)
+                elif current:
+                    kept.append((mtime, size, path))
+            total = sum(size for _, size, _ in kept)
+            if total > self.max_bytes:
+                kept.sort()
+                target = 0.9 * self.max_bytes
+                while kept and total > target:
+                    _, size, path = kept.pop(0)
+                    total -= size
+                    removed += self._unlink(path)
+            with self._lock:
+                self.evictions += removed
+                self._entries = len(kept)
+                self._bytes = total
+            self._remove_empty_dirs()
+            return removed
+        finally:
+            if lock is not None:
+                lock.close()
+
+    def _remove_empty_dirs(self):
+        """
+        ลบ shard ที่ว่างและโฟลเดอร์ของรุ่นอื่นที่ว่าง (rmdir ไม่ลบโฟลเดอร์ที่ยังมีไฟล์)
+        """
+        for shard, _ in self._shard_dirs():
+            try:
+                os.rmdir(shard)
+            except OSError:
+                pass
+        for version in self._version_dirs():
+            if version.name != self.version:
+                try:
+                    os.rmdir(version.path)
+                except OSError:
+                    pass
+
+    def clear(self):
+        """
+        ลบทุกรายการ (ทุกรุ่น) ใน beam_design-cache และรีเซ็ตตัวนับ
+        """
+        for _, _, path, _ in self._scan():
+            self._unlink(path)
+        self._remove_empty_dirs()
+        with self._lock:
+            self.hits = self.misses = self.writes = self.evictions = self.errors = 0
+            self._entries, self._bytes, self._pending = 0, 0, 0
+
+    def stats(self):
+        if self._entries is None:
+            files = [(size, current) for _, size, _, current in self._scan()]
+            with self._lock:
+                self._entries = sum(current for _, current in files)
+                self._bytes = sum(size for size, current in files if current)
+        total = self.hits + self.misses
+        return {
+            'directory': str(self.base),
+            'version': self.version,
+            'size': self._entries,
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'writes': self.writes,
+            'evictions': self.evictions,
+            'errors': self.errors,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+def open_disk_cache(directory=DISK_CACHE_DIR):
+    """
+    DiskCache ที่โฟลเดอร์ directory หรือ None ถ้าไม่ได้กำหนด (ไม่ได้ตั้ง BEAM_DESIGN_DISK_CACHE)
+    หรือสร้างโฟลเดอร์ไม่ได้
+    """
+    if not directory:
+        return None
+    try:
+        return DiskCache(directory)
+    except OSError:
+        return None
@@ -0,0 +1,245 @@
+from html import escape
+
+from .metrics import SECTION_RENDERS
+from .rebar import MAIN_BARS, STIRRUP_BARS
+
+# ชื่อเหล็กตามขนาดเส้นผ่านศูนย์กลาง (mm)
+STEEL_TYPE_MAP = dict(zip(MAIN_BARS.diameters, MAIN_BARS.names))
+STIRRUP_TYPE_MAP = dict(zip(STIRRUP_BARS.diameters, STIRRUP_BARS.names))
+
+# ตั้งค่าฟอนต์สำหรับ matplotlib
+MPL_RC = {'font.size': 9, 'axes.unicode_minus': False}
+
+
+def bar_positions(b_cm, cover_cm, bar_dia_cm, bar_count):
+    """
+    ตำแหน่งแนวนอน (cm) ของเหล็กเสริมหนึ่งชั้น วางจาก cover ถึง b - cover เท่า ๆ กัน
+    """
+    if bar_count == 1:
+        return [b_cm/2]
+    spacing = (b_cm - 2*cover_cm - bar_dia_cm) / (bar_count - 1)
+    return [cover_cm + bar_dia_cm/2 + i*spacing for i in range(bar_count)]
+
+
+# ฟังก์ชันวาดหน้าตัดคาน
+@SECTION_RENDERS.time(format='matplotlib')
+def draw_beam_section(b, h, cover, bar_dia, bar_count, stirrup_dia, stirrup_legs, 
+                     d_prime=4, bar_dia_comp=None, bar_count_comp=None, stirrup_spacing=15, ax=None):
+    """
+    วาดหน้าตัดคานคอนกรีตพร้อมเหล็กเสริม
+    สร้าง Figure โดยตรงไม่ผ่าน pyplot จึงไม่ค้างอยู่ในตัวจัดการ figure ของ pyplot (ไม่ต้อง plt.close)
+    ถ้าส่ง ax มา จะวาดลงใน Axes นั้นแทน (เช่น ในหน้ารายงาน PDF) และคืนค่า Figure ของ ax
+    """
+    import matplotlib.patches as patches
+    from matplotlib import rc_context
+    from matplotlib.figure import Figure
+
+    with rc_context(MPL_RC):
+        if ax is None:
+            # ปรับขนาดให้เหมาะสมกับเว็บและการพิมพ์
+            fig = Figure(figsize=(6, 6))  # ขนาดเดิม
+            ax = fig.subplots(1, 1)
+        else:
+            fig = None
+
+        # ปรับสเกลให้เป็น cm แทน mm
+        b_cm = b/10
+        h_cm = h/10
+        cover_cm = cover/10
+    
+        # วาดหน้าตัดคาน
+        beam_rect = patches.Rectangle((0, 0), b_cm, h_cm, linewidth=2, edgecolor='black', facecolor='lightgray', alpha=0.7)
+        ax.add_patch(beam_rect)
+    
+        # วาดเหล็กปลอก
+        stirrup_x = cover_cm/2
+        stirrup_y = cover_cm/2
+        stirrup_w = b_cm - cover_cm
+        stirrup_h = h_cm - cover_cm
+        stirrup_rect = patches.Rectangle((stirrup_x, stirrup_y), stirrup_w, stirrup_h, 
+                                       linewidth=2, edgecolor='red', facecolor='none')
+        ax.add_patch(stirrup_rect)
+
+        # คำนวณตำแหน่งเหล็กรับแรงดึง
+        if bar_count > 0:
+            bar_dia_cm = bar_dia/10  # แปลงเป็น cm
+        
+            # วาดเหล็กรับแรงดึง
+            for x_pos in bar_positions(b_cm, cover_cm, bar_dia_cm, bar_count):
+                if 0 <= x_pos <= b_cm:
+                    circle = patches.Circle((x_pos, cover_cm + bar_dia_cm/2), bar_dia_cm/2, 
+                                          facecolor='blue', edgecolor='darkblue', linewidth=1)
+                    ax.add_patch(circle)
+    
+        # วาดเหล็กรับแรงอัด (ถ้ามี)
+        if bar_dia_comp and bar_count_comp and bar_count_comp > 0:
+            bar_dia_comp_cm = bar_dia_comp/10  # แปลงเป็น cm
+        
+            for x_pos in bar_positions(b_cm, cover_cm, bar_dia_comp_cm, bar_count_comp):
+                if 0 <= x_pos <= b_cm:
+                    circle = patches.Circle((x_pos, h_cm - cover_cm - bar_dia_comp_cm/2), bar_dia_comp_cm/2, 
+                                          facecolor='green', edgecolor='darkgreen', linewidth=1)
+                    ax.add_patch(circle)
+
+        # เพิ่ม dimensions และ labels
+        ax.set_xlim(-1, b_cm+1)
+        ax.set_ylim(-1, h_cm+1)
+        ax.set_aspect('equal')
+        ax.grid(True, alpha=0.3)
+    
+        # Labels ใช้ภาษาอังกฤษ
+        ax.text(b_cm/2, -0.5, f'b = {b_cm:.0f} cm', ha='center', va='top', fontsize=9, weight='bold')
+        ax.text(-0.5, h_cm/2, f'h = {h_cm:.0f} cm', ha='center', va='center', rotation=90, fontsize=9, weight='bold')
+        ax.text(b_cm+0.3, cover_cm + (bar_dia_cm/2 if bar_count > 0 else 0), f'd = {(h_cm-cover_cm):.0f} cm', 
+                ha='left', va='center', fontsize=8)
+        if bar_dia_comp and bar_count_comp:
+            ax.text(b_cm+0.3, h_cm - cover_cm - (bar_dia_comp/10/2 if bar_dia_comp else 0), f"d' = {d_prime/10:.0f} cm", 
+                    ha='left', va='center', fontsize=8)
+    
+        # เพิ่มข้อความแสดงรายละเอียดเหล็ก
+        steel_type_map = STEEL_TYPE_MAP
+        stirrup_type_map = STIRRUP_TYPE_MAP
+    
+        tension_steel_name = steel_type_map.get(bar_dia, f'DB{bar_dia}')
+        stirrup_steel_name = stirrup_type_map.get(stirrup_dia, f'RB{stirrup_dia}')
+    
+        # ข้อความรายละเอียดเหล็กรับแรงดึง
+        ax.text(b_cm/2, cover_cm - 0.8, f'{bar_count} เส้น {tension_steel_name}', 
+                ha='center', va='top', fontsize=8, weight='bold', color='darkblue',
+                bbox=dict(boxstyle="round,pad=0.2", facecolor="lightblue", alpha=0.8))
+    
+        # ข้อความรายละเอียดเหล็กรับแรงอัด (ถ้ามี)
+        if bar_dia_comp and bar_count_comp:
+            comp_steel_name = steel_type_map.get(bar_dia_comp, f'DB{bar_dia_comp}')
+            ax.text(b_cm/2, h_cm - cover_cm + 0.8, f'{bar_count_comp} เส้น {comp_steel_name}', 
+                    ha='center', va='bottom', fontsize=8, weight='bold', color='darkgreen',
+                    bbox=dict(boxstyle="round,pad=0.2", facecolor="lightgreen", alpha=0.8))
+    
+        # ข้อความรายละเอียดเหล็กปลอก
+        ax.text(-0.8, h_cm/2, f'{stirrup_steel_name}\n{stirrup_legs} ขา\n@ {stirrup_spacing} cm', 
+                ha='center', va='center', fontsize=8, weight='bold', color='darkred',
+                bbox=dict(boxstyle="round,pad=0.2", facecolor="lightcoral", alpha=0.8))
+    
+        # Legend ใช้ภาษาอังกฤษและแสดงรายละเอียดครบ
+        legend_elements = [
+            patches.Patch(color='blue', label=f'Tension: {bar_count}×{steel_type_map.get(bar_dia, f"DB{bar_dia}")}'),
+            patches.Patch(color='red', label=f'Stirrups: {stirrup_steel_name} {stirrup_legs} legs @ {stirrup_spacing} cm'),
+        ]
+        if bar_dia_comp and bar_count_comp:
+            comp_steel_name = steel_type_map.get(bar_dia_comp, f'DB{bar_dia_comp}')
+            legend_elements.append(patches.Patch(color='green', label=f'Compression: {bar_count_comp}×{comp_steel_name}'))
+    
+        ax.legend(handles=legend_elements, loc='upper right', bbox_to_anchor=(1.5, 1), fontsize=7)
+    
+        ax.set_title('Beam Cross-Section', fontsize=10, weight='bold', pad=10)
+        ax.set_xlabel('Width (cm)', fontsize=9)
+        ax.set_ylabel('Height (cm)', fontsize=9)
+
+        if fig is None:
+            return ax.figure
+        fig.tight_layout()
+        return fig
+
+
+@SECTION_RENDERS.time(format='svg')
+def draw_beam_section_svg(b, h, cover, bar_dia, bar_count, stirrup_dia, stirrup_legs,
+                          d_prime=4, bar_dia_comp=None, bar_count_comp=None, stirrup_spacing=15,
+                          width=480):
+    """
+    วาดหน้าตัดคานเป็น SVG โดยตรง (ไม่ใช้ matplotlib) รับพารามิเตอร์เหมือน draw_beam_section (หน่วย mm)
+    คืนค่าเป็นข้อความ SVG ที่เบราว์เซอร์วาดเอง
+    """
+    b_cm = b/10
+    h_cm = h/10
+    cover_cm = cover/10
+    has_comp = bool(bar_dia_comp and bar_count_comp)
+
+    # พิกัด SVG ใช้หน่วย cm แกน y ชี้ลง ระยะขอบรอบหน้าตัดเผื่อป้ายข้อความและคำอธิบาย
+    size = max(b_cm, h_cm)
+    font = size / 22
+    left, right, top = size * 0.28, size * 0.28, size * 0.12
+    bottom = size * (0.22 + 0.06 * (3 if has_comp else 2))
+    view_w = left + b_cm + right
+    view_h = top + h_cm + bottom
+    height = width * view_h / view_w
+    stroke = size / 150
+
+    def x(value):
+        return left + value
+
+    def y(value):
+        return top + h_cm - value
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height:.0f}" '
+        f'viewBox="0 0 {view_w:.3f} {view_h:.3f}" font-family="sans-serif" font-size="{font:.3f}">',
+        f'<rect width="100%" height="100%" fill="white"/>',
+        f'<text x="{x(b_cm/2):.3f}" y="{top*0.55:.3f}" text-anchor="middle" font-weight="bold" '
+        f'font-size="{font*1.1:.3f}">Beam Cross-Section</text>',
+        # หน้าตัดคอนกรีตและเหล็กปลอก
+        f'<rect x="{x(0):.3f}" y="{y(h_cm):.3f}" width="{b_cm:.3f}" height="{h_cm:.3f}" '
+        f'fill="lightgray" fill-opacity="0.7" stroke="black" stroke-width="{stroke*2:.3f}"/>',
+        f'<rect x="{x(cover_cm/2):.3f}" y="{y(h_cm - cover_cm/2):.3f}" width="{b_cm - cover_cm:.3f}" '
+        f'height="{h_cm - cover_cm:.3f}" fill="none" stroke="red" stroke-width="{stroke*2:.3f}"/>',
+    ]
+
+    # เหล็กรับแรงดึง
+    bar_dia_cm = bar_dia/10
+    if bar_count > 0:
+        for x_pos in bar_positions(b_cm, cover_cm, bar_dia_cm, bar_count):
+            if 0 <= x_pos <= b_cm:
+                parts.append(f'<circle cx="{x(x_pos):.3f}" cy="{y(cover_cm + bar_dia_cm/2):.3f}" '
+                             f'r="{bar_dia_cm/2:.3f}" fill="blue" stroke="darkblue" stroke-width="{stroke:.3f}"/>')
+
+    # เหล็กรับแรงอัด (ถ้ามี)
+    if has_comp:
+        bar_dia_comp_cm = bar_dia_comp/10
+        for x_pos in bar_positions(b_cm, cover_cm, bar_dia_comp_cm, bar_count_comp):
+            if 0 <= x_pos <= b_cm:
+                parts.append(f'<circle cx="{x(x_pos):.3f}" cy="{y(h_cm - cover_cm - bar_dia_comp_cm/2):.3f}" '
+                             f'r="{bar_dia_comp_cm/2:.3f}" fill="green" stroke="darkgreen" stroke-width="{stroke:.3f}"/>')
+
+    # ขนาดหน้าตัด
+    parts.append(f'<text x="{x(b_cm/2):.3f}" y="{y(0) + font*1.4:.3f}" text-anchor="middle" '
+                 f'font-weight="bold">b = {b_cm:.0f} cm</text>')
+    parts.append(f'<text transform="translate({x(0) - font*0.6:.3f},{y(h_cm/2):.3f}) rotate(-90)" '
+                 f'text-anchor="middle" font-weight="bold">h = {h_cm:.0f} cm</text>')
+    parts.append(f'<text x="{x(b_cm) + font*0.4:.3f}" y="{y(cover_cm + (bar_dia_cm/2 if bar_count > 0 else 0)):.3f}" '
+                 f'dominant-baseline="middle" font-size="{font*0.9:.3f}">d = {(h_cm-cover_cm):.0f} cm</text>')
+    if has_comp:
+        parts.append(f'<text x="{x(b_cm) + font*0.4:.3f}" y="{y(h_cm - cover_cm - bar_dia_comp/20):.3f}" '
+                     f'dominant-baseline="middle" font-size="{font*0.9:.3f}">d\' = {d_prime/10:.0f} cm</text>')
+
+    # ข้อความรายละเอียดเหล็กรับแรงดึงและแรงอัด
+    tension_steel_name = STEEL_TYPE_MAP.get(bar_dia, f'DB{bar_dia}')
+    stirrup_steel_name = STIRRUP_TYPE_MAP.get(stirrup_dia, f'RB{stirrup_dia}')
+    parts.append(f'<text x="{x(b_cm/2):.3f}" y="{y(cover_cm + bar_dia_cm) - font*0.5:.3f}" text-anchor="middle" font-weight="bold" '
+                 f'fill="darkblue" font-size="{font*0.9:.3f}">{bar_count} เส้น {tension_steel_name}</text>')
+    if has_comp:
+        comp_steel_name = STEEL_TYPE_MAP.get(bar_dia_comp, f'DB{bar_dia_comp}')
+        parts.append(f'<text x="{x(b_cm/2):.3f}" y="{y(h_cm - cover_cm - bar_dia_comp_cm) + font*1.2:.3f}" text-anchor="middle" '
+                     f'font-weight="bold" fill="darkgreen" font-size="{font*0.9:.3f}">'
+                     f'{bar_count_comp} เส้น {comp_steel_name}</text>')
+
+    # คำอธิบายสัญลักษณ์
+    legend = [
+        ('blue', f'Tension: {bar_count}×{tension_steel_name}'),
+        ('red', f'Stirrups: {stirrup_steel_name} {stirrup_legs} legs @ {stirrup_spacing} cm'),
+    ]
+    if has_comp:
+        legend.append(('green', f'Compression: {bar_count_comp}×{comp_steel_name}'))
+    for i, (color, label) in enumerate(legend):
+        row_y = y(0) + size * (0.13 + 0.06 * i)
+        parts.append(f'<rect x="{x(0):.3f}" y="{row_y - font*0.8:.3f}" width="{font*1.2:.3f}" '
+                     f'height="{font*0.8:.3f}" fill="{color}"/>')
+        parts.append(f'<text x="{x(0) + font*1.6:.3f}" y="{row_y:.3f}" font-size="{font*0.9:.3f}">'
+                     f'{escape(label)}</text>')
+
+    # ข้อความเหล็กปลอกด้านซ้าย
+    label_x = x(0) - left * 0.6
+    for i, line in enumerate((stirrup_steel_name, f'{stirrup_legs} ขา', f'@ {stirrup_spacing} cm')):
+        parts.append(f'<text x="{label_x:.3f}" y="{y(h_cm/2) + (i - 1) * font * 1.2:.3f}" text-anchor="middle" '
+                     f'font-weight="bold" fill="darkred" font-size="{font*0.9:.3f}">{escape(line)}</text>')
+
+    parts.append('</svg>')
+    return ''.join(parts)
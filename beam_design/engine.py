@@ -0,0 +1,478 @@
+import math
+
+from .metrics import CALCULATION_ERRORS, CALCULATIONS
+from .rebar import MAIN_BARS, STIRRUP_BARS, bar_areas
+from .trace import NullTrace, Trace
+
+# พื้นที่หน้าตัดเหล็กเสริม (cm²) จากตารางเหล็กใน beam_design.rebar
+STEEL_AREAS = bar_areas(MAIN_BARS)
+STIRRUP_AREAS = bar_areas(STIRRUP_BARS)
+
+# ตัวนับผลของ calculate_beam_design (ผูก label ไว้ล่วงหน้า เพราะถูกเรียกบ่อย)
+CALCULATION_RESULTS = {result: CALCULATIONS.labels(result=result) for result in ('pass', 'fail', 'error')}
+
+# ผลลัพธ์แบบคอลัมน์ของ calculate_beam_design_batch
+BATCH_RESULT_KEYS = (
+    'As_required', 'As_provided_tension', 'As_prime',
+    'rho_required', 'rho_min', 'rho_max',
+    'Mn', 'phi_Mn', 'Vc', 'phi_Vc', 'Av',
+    'moment_check', 'shear_check', 'tension_steel_adequate', 'stirrup_adequate', 'rho_check',
+    'design_ok', 'error',
+)
+
+# ชื่อคอลัมน์ข้อมูลนำเข้าของ calculate_beam_design_frame
+BATCH_INPUT_COLUMNS = (
+    'fc', 'fy', 'b', 'h', 'd', 'Mu', 'Vu', 'stirrup_type', 'stirrup_legs', 'stirrup_spacing',
+    'tension_steel_type', 'tension_steel_count', 'compression_steel',
+    'compression_steel_type', 'compression_steel_count', 'd_prime',
+)
+
+# หัวข้อแรกของรายละเอียดการคำนวณ
+DESIGN_SECTION = "การออกแบบคานคอนกรีต (Strength Design Method)"
+
+
+# ขั้นตอนย่อยของการออกแบบ: แต่ละฟังก์ชันรับเฉพาะค่าที่ใช้และเขียนรายละเอียดลง trace ของตัวเอง
+# calculate_beam_design เรียกต่อกันตามลำดับ ส่วน beam_design.pipeline ใช้เป็น node ที่แคชแยกกันได้
+def material_constants(fc, fy, b, h, d, trace):
+    """
+    ตัวคูณลดกำลัง φ และ β1 จากกำลังคอนกรีต
+    """
+    section = DESIGN_SECTION
+    # ค่าคงที่
+    phi_b = 0.90  # Flexure
+    phi_s = 0.75  # Shear
+    beta1 = 0.85 if fc <= 280 else max(0.65, 0.85 - 0.05 * (fc - 280) / 70)
+    
+    trace.add(section, None, "• ข้อมูลพื้นฐาน: $f'_c$ = {fc} kg/cm², $f_y$ = {fy} kg/cm²\\", fc=fc, fy=fy)
+    trace.add(section, None, "• ขนาดคาน: b = {b} cm, h = {h} cm, d = {d} cm\\", b=b, h=h, d=d)
+    trace.add(section, 'beta1', "• $β_1$ = {beta1:.3f}\\", beta1=beta1)
+    return {'phi_b': phi_b, 'phi_s': phi_s, 'beta1': beta1}
+
+
+def rho_limits(fc, fy, beta1, trace):
+    """
+    อัตราส่วนเหล็กเสริมต่ำสุดและสูงสุด
+    """
+    section = DESIGN_SECTION
+    # คำนวณ ρmin และ ρmax (แก้ไขตาม ACI 318)
+    rho_min = max(1.4 / fy, 0.8 * math.sqrt(fc) / fy)
+    rho_max = 0.75 * (0.85 * fc / fy) * (beta1 / (1 + beta1))  # แก้ไขสูตร
+    
+    trace.add(section, 'rho_min',
+              "• $ρ_{{min}}$ = max($\\frac{{1.4}}{{f_y}}$, $\\frac{{0.8\\sqrt{{f'_c}} }}{{f_y}}$) = {rho_min:.4f}\\",
+              rho_min=rho_min)
+    trace.add(section, 'rho_max',
+              "• $ρ_{{max}} = 0.75× 0.85 β_1  \\frac{{f'_c}}{{f_y}}\\cdot  \\frac{{6120}}{{6120+f_y}}$ = {rho_max:.4f} (ACI 318)\\",
+              rho_max=rho_max)
+    return {'rho_min': rho_min, 'rho_max': rho_max}
+
+
+def flexure_design(fc, fy, b, d, Mu, tension_steel_type, tension_steel_count, compression_steel,
+                   compression_steel_type, compression_steel_count, d_prime, phi_b, rho_min, rho_max, trace):
+    """
+    เหล็กรับแรงดึงที่ต้องการ เหล็กที่จัดให้ และกำลังรับโมเมนต์ φMn
+    """
+    section = DESIGN_SECTION
+    # คำนวณพื้นที่เหล็กที่ต้องการ (แก้ไขการคำนวณ Rn และหน่วยให้ถูกต้อง)
+    # แปลงหน่วย: Mu (kg-m) → N-mm
+    Mu_N_mm = Mu * 9.81 * 1000  # kg-m → N-mm (1 kg = 9.81 N, 1 m = 1000 mm)
+    b_mm = b * 10  # cm → mm
+    d_mm = d * 10  # cm → mm
+    
+    Rn = Mu_N_mm / (phi_b * b_mm * d_mm**2)  # N/mm² (หน่วยถูกต้อง)
+    
+    # ใช้สูตรง่าย ρ = Rn/fy สำหรับคานเหล็กเดี่ยว
+    rho_required = Rn / fy
+        
+    As_required = rho_required * b * d
+    
+    trace.add(section, 'Mu_N_mm', "• การแปลงหน่วย: $M_u$ = {Mu} kg-m = {Mu_N_mm:,.0f} N-mm\\", Mu=Mu, Mu_N_mm=Mu_N_mm)
+    trace.add(section, 'Rn', "• $R_n = \\frac{{M_u}}{{\\phi  b  d²}}$ ")
+    trace.add(section, 'Rn', " = $\\frac{{ {Mu_N_mm:,.0f} }} {{ 0.9×{b_mm}×{d_mm}²}}$ = {Rn:.2f} N/mm²\\",
+              Mu_N_mm=Mu_N_mm, b_mm=b_mm, d_mm=d_mm, Rn=Rn)
+    trace.add(section, 'rho_required', "• $ρ_{{required}} = \\frac{{R_n}}{{f_y }} $ = {Rn:.2f}/{fy} = {rho_required:.6f}\\",
+              Rn=Rn, fy=fy, rho_required=rho_required)
+    trace.add(section, 'As_required', "• $A_{{s~required}}$ = {As_required:.2f} cm²\\", As_required=As_required)
+    
+    # ตรวจสอบข้อกำหนด ρ (แก้ไขการเปรียบเทียบ)
+    rho_status = "OK"
+    if rho_required < rho_min:
+        rho_status = "ใช้ $ρ_{{min}}$ เนื่องจาก ρ < $ρ_{{min}}$"
+        rho_required = rho_min
+        As_required = rho_min * b * d
+        trace.add(section, None, "• เนื่องจาก $ρ_{{required}}$ = {rho_calc:.6f} < $ρ_{{min}}$ = {rho_min:.4f}\\",
+                  rho_calc=Rn/fy, rho_min=rho_min)
+        trace.add(section, 'rho_required', "• ดังนั้นใช้ $ρ = ρ_{{min}}$ = {rho_min:.4f}\\", rho_min=rho_min)
+        trace.add(section, 'As_required', "• $A_{{s,required}} = ρ_{{min}} b d$ = {rho_min:.4f}×{b}×{d} = {As_required:.2f} cm²\\",
+                  rho_min=rho_min, b=b, d=d, As_required=As_required)
+    elif rho_required > rho_max:
+        rho_status = "เกิน $ρ_{{max}}$ - ต้องใช้เหล็กรับแรงอัด"
+        
+    trace.add(section, 'rho_required',
+              "• ตรวจสอบ: $ρ_{{min}}$ = {rho_min:.4f} ≤ ρ = {rho_required:.4f} ≤ $ρ_{{max}}$ = {rho_max:.4f} → {rho_status}",
+              rho_min=rho_min, rho_required=rho_required, rho_max=rho_max, rho_status=rho_status)
+    
+    # คำนวณเหล็กที่จัดให้
+    steel_areas = STEEL_AREAS
+    As_provided_tension = steel_areas[tension_steel_type] * tension_steel_count
+    
+    section = "เหล็กรับแรงดึง"
+    tension_ok = As_provided_tension >= As_required
+    trace.add(section, None, "• เลือกใช้: {count} เส้น {steel_type}\\", count=tension_steel_count, steel_type=tension_steel_type)
+    trace.add(section, 'As_provided_tension', "• $A_{{s,provided}}$ = {As_provided_tension:.2f} cm²\\",
+              As_provided_tension=As_provided_tension)
+    trace.add(section, 'As_provided_tension',
+              "• ตรวจสอบ: $A_{{s,provided}}$ = {As_provided_tension:.2f} {op} As required = {As_required:.2f} cm² → {status}\\",
+              As_provided_tension=As_provided_tension, As_required=As_required,
+              op='≥' if tension_ok else '<', status='ผ่าน' if tension_ok else 'ไม่ผ่าน')
+    
+    # คำนวณ Mn แบบละเอียดและถูกต้อง (แยกคำนวณแรงดึงและแรงอัด)
+    As_prime = 0
+    if compression_steel and compression_steel_count > 0:
+        As_prime = steel_areas[compression_steel_type] * compression_steel_count
+        section = "เหล็กรับแรงอัด"
+        trace.add(section, None, "• เลือกใช้: {count} เส้น {steel_type}\\",
+                  count=compression_steel_count, steel_type=compression_steel_type)
+        trace.add(section, 'As_prime', "• As' = {As_prime:.2f} cm²\\", As_prime=As_prime)
+    
+    # คำนวณ a และ Mn ถูกต้องตาม ACI 318 (แก้ไขให้ละเอียดและถูกต้อง)
+    a = (As_provided_tension * fy) / (0.85 * fc * b)  # ไม่ลบ As' เพราะคิดแยก
+    
+    # ตรวจสอบ a ≤ 0.75d สำหรับ Under-reinforced section
+    a_max = 0.75 * d
+    trace.add(section, 'a', "• ตรวจสอบ a = {a:.2f} cm {op} 0.75d = {a_max:.2f} cm → {status} ",
+              a=a, a_max=a_max, op='≤' if a <= a_max else '>',
+              status='Under-reinforced' if a <= a_max else 'Over-reinforced')
+    
+    # คำนวณ Mn โดยรวมทั้งแรงดึงและแรงอัด
+    Mn_tension = As_provided_tension * fy * (d - a/2)  # โมเมนต์จากเหล็กรับแรงดึง (kg-cm)
+    Mn_compression = As_prime * fy * (d - d_prime)     # โมเมนต์จากเหล็กรับแรงอัด (kg-cm)
+    Mn_total_kg_cm = Mn_tension + Mn_compression       # รวม (kg-cm)
+    Mn = Mn_total_kg_cm / 100                          # แปลงเป็น kg-m
+        
+    phi_Mn = phi_b * Mn
+    
+    section = "การคำนวณ Mn (แก้ไขให้ถูกต้อง)"
+    trace.add(section, 'a',
+              "• $a = \\frac{{A_s×f_y}}{{0.85×f'_c×b}}$ = {As:.3f}×{fy}/(0.85×{fc}×{b}) = {a:.2f} cm\\",
+              As=As_provided_tension, fy=fy, fc=fc, b=b, a=a)
+    trace.add(section, 'Mn_tension',
+              "• $M_{{n,tension}} = A_s f_y (d-\\frac{{a}}{{2}})$ = {As:.3f}×{fy}×({d}-{a:.2f}/2)\\",
+              As=As_provided_tension, fy=fy, d=d, a=a)
+    trace.add(section, 'Mn_tension', " $~~~~~~~~~~~~~~~$= {As:.3f}×{fy}×{lever_arm:.2f} = {Mn_tension:,.0f} kg-cm\\",
+              As=As_provided_tension, fy=fy, lever_arm=d-a/2, Mn_tension=Mn_tension)
+    if As_prime > 0:
+        trace.add(section, 'Mn_compression', "• Mn_compression = As'×fy×(d-d') = {As_prime}×{fy}×({d}-{d_prime})\\",
+                  As_prime=As_prime, fy=fy, d=d, d_prime=d_prime)
+        trace.add(section, 'Mn_compression', "              = {As_prime}×{fy}×{lever_arm} = {Mn_compression:,.0f} kg-cm\\",
+                  As_prime=As_prime, fy=fy, lever_arm=d-d_prime, Mn_compression=Mn_compression)
+    trace.add(section, 'Mn_total', "• $M_{{n,total}}$ = {Mn_tension:,.0f} + {Mn_compression:,.0f} = {Mn_total:,.0f} kg-cm\\",
+              Mn_tension=Mn_tension, Mn_compression=Mn_compression, Mn_total=Mn_total_kg_cm)
+    trace.add(section, 'Mn', "• $M_n$ = {Mn_total:,.0f}/100 = {Mn:,.0f} kg-m\\", Mn_total=Mn_total_kg_cm, Mn=Mn)
+    trace.add(section, 'phi_Mn', "• $\\phi M_n$ = {phi_b}×{Mn:,.0f} = {phi_Mn:,.0f} kg-m\\", phi_b=phi_b, Mn=Mn, phi_Mn=phi_Mn)
+    trace.add(section, 'phi_Mn', "• ตรวจสอบ: $\\phi M_n$ = {phi_Mn:,.0f} {op} $M_u$ = {Mu:,.0f} kg-m → {status}",
+              phi_Mn=phi_Mn, Mu=Mu, op='≥' if phi_Mn >= Mu else '<', status='ผ่าน' if phi_Mn >= Mu else 'ไม่ผ่าน')
+    return {
+        'As_required': As_required,
+        'As_provided_tension': As_provided_tension,
+        'As_prime': As_prime,
+        'rho_required': rho_required,
+        'rho_status': rho_status,
+        'Mn': Mn,
+        'phi_Mn': phi_Mn,
+    }
+
+
+def shear_design(fc, b, d, Vu, phi_s, trace):
+    """
+    กำลังรับแรงเฉือนของคอนกรีต φVc
+    """
+    # คำนวณแรงเฉือน (แก้ไขสูตร Vc ตาม ACI 318)
+    section = "การตรวจสอบแรงเฉือน"
+    Vc = 0.53 * math.sqrt(fc) * b * d  # kg (สูตร ACI 318)
+    phi_Vc = phi_s * Vc
+    
+    trace.add(section, 'Vc', "• $V_c = 0.53\\sqrt{{f'_c}} b d = 0.53\\sqrt{{ {fc} }}×{b}×{d}$ = {Vc:,.0f} kg (ACI 318)\\",
+              fc=fc, b=b, d=d, Vc=Vc)
+    trace.add(section, 'phi_Vc', "• $\\phi V_c$ = {phi_s}×{Vc:.0f} = {phi_Vc:.0f} kg\\", phi_s=phi_s, Vc=Vc, phi_Vc=phi_Vc)
+    trace.add(section, 'phi_Vc', "• ตรวจสอบ: $\\phi V_c$ = {phi_Vc:.0f} {op} $V_u$ = {Vu} kg → {status}",
+              phi_Vc=phi_Vc, Vu=Vu, op='≥' if phi_Vc >= Vu else '<', status='ผ่าน' if phi_Vc >= Vu else 'ไม่ผ่าน')
+    return {'Vc': Vc, 'phi_Vc': phi_Vc}
+
+
+def stirrup_design(d, stirrup_type, stirrup_legs, stirrup_spacing, trace):
+    """
+    พื้นที่เหล็กปลอกและระยะเรียงสูงสุดที่อนุญาต
+    """
+    # ตรวจสอบเหล็กปลอก
+    stirrup_areas = STIRRUP_AREAS
+    Av = stirrup_areas[stirrup_type] * stirrup_legs
+    max_spacing = min(d/2, 60)  # cm
+    
+    section = "เหล็กปลอก"
+    trace.add(section, None, "• เลือกใช้: {stirrup_type} จำนวน {legs} ขา\\", stirrup_type=stirrup_type, legs=stirrup_legs)
+    trace.add(section, 'Av', "• $A_v$ = {Av:.3f} cm²\\", Av=Av)
+    trace.add(section, None, "• ระยะเรียง = {spacing} cm\\", spacing=stirrup_spacing)
+    trace.add(section, 'max_spacing', "• ระยะเรียงสูงสุดที่อนุญาต = min( $\\frac{{d}}{{2}}$, 60) = {max_spacing:.0f} cm\\",
+              max_spacing=max_spacing)
+    trace.add(section, None, "• ตรวจสอบ: {spacing} {op} {max_spacing:.0f} cm → {status}",
+              spacing=stirrup_spacing, max_spacing=max_spacing,
+              op='≤' if stirrup_spacing <= max_spacing else '>',
+              status='ผ่าน' if stirrup_spacing <= max_spacing else 'ไม่ผ่าน')
+    return {'Av': Av, 'max_spacing': max_spacing}
+
+
+def design_checks(b, h, Mu, Vu, tension_steel_type, stirrup_spacing, As_required, As_provided_tension,
+                  rho_required, rho_max, phi_Mn, phi_Vc, max_spacing, trace):
+    """
+    ผลการตรวจสอบทั้ง 5 รายการ และคำแนะนำเมื่อไม่ผ่าน
+    """
+    # สรุปผล
+    section = "สรุปผลการออกแบบ"
+    moment_check = phi_Mn >= Mu
+    shear_check = phi_Vc >= Vu
+    tension_steel_adequate = As_provided_tension >= As_required
+    stirrup_adequate = stirrup_spacing <= max_spacing
+    rho_check = rho_required <= rho_max
+    
+    # เพิ่มการแจ้งปัญหาอย่างละเอียด
+    if not (moment_check and shear_check and tension_steel_adequate and stirrup_adequate and rho_check):
+        trace.add(section, None, "\n🔴 ปัญหาที่พบ:")
+        if not moment_check:
+            trace.add(section, 'phi_Mn', "  ❌ โมเมนต์: $\\phi M_n$ = {phi_Mn:,.0f} < $M_u$ = {Mu:,.0f} kg-m",
+                      phi_Mn=phi_Mn, Mu=Mu)
+        if not shear_check:
+            trace.add(section, 'phi_Vc', "  ❌ แรงเฉือน: $\\phi V_c$ = {phi_Vc:,.0f} < $V_u$ = {Vu:,.0f} kg",
+                      phi_Vc=phi_Vc, Vu=Vu)
+        if not tension_steel_adequate:
+            trace.add(section, 'As_provided_tension',
+                      "  ❌ เหล็กรับแรงดึงไม่พอ: $A_s$ = {As:.2f} < {As_required:.2f} cm² (ขาด {shortfall:.2f} cm²)",
+                      As=As_provided_tension, As_required=As_required, shortfall=As_required-As_provided_tension)
+        if not stirrup_adequate:
+            trace.add(section, None, "  ❌ เหล็กปลอก: ระยะเรียง {spacing} > {max_spacing:.0f} cm",
+                      spacing=stirrup_spacing, max_spacing=max_spacing)
+        if not rho_check:
+            trace.add(section, 'rho_required',
+                      "  ❌ ρ เกิน: ρ = {rho_required:.4f} > $\\rho_{{max}}$ = {rho_max:.4f} (เกิน {excess:.1f}%)",
+                      rho_required=rho_required, rho_max=rho_max, excess=(rho_required/rho_max-1)*100)
+            
+        trace.add(section, None, "\n💡 แนวทางแก้ไข:")
+        if not rho_check:
+            trace.add(section, None, "  1. เพิ่มขนาดคาน (แนะนำ: b×h = {b}×{h} cm)", b=int(b*1.2), h=int(h*1.2))
+            trace.add(section, None, "  2. เพิ่มเหล็กรับแรงอัด")
+        if not tension_steel_adequate:
+            need_bars = math.ceil(As_required / STEEL_AREAS[tension_steel_type])
+            trace.add(section, None, "  3. เพิ่มเหล็กรับแรงดึงเป็น {count} เส้น {steel_type}",
+                      count=need_bars, steel_type=tension_steel_type)
+    return {
+        'moment_check': moment_check,
+        'shear_check': shear_check,
+        'tension_steel_adequate': tension_steel_adequate,
+        'stirrup_adequate': stirrup_adequate,
+        'rho_check': rho_check,
+    }
+
+
+def design_results(material, limits, flexure, shear, stirrups, checks):
+    """
+    รวมผลของแต่ละขั้นตอนเป็น dict เดียวกับ calculate_beam_design (ไม่รวม trace)
+    """
+    results = {
+        'As_required': flexure['As_required'],
+        'As_provided_tension': flexure['As_provided_tension'],
+        'As_prime': flexure['As_prime'],
+        'rho_required': flexure['rho_required'],
+        'rho_min': limits['rho_min'],
+        'rho_max': limits['rho_max'],
+        'rho_status': flexure['rho_status'],
+        'Mn': flexure['Mn'],
+        'phi_Mn': flexure['phi_Mn'],
+        'Vc': shear['Vc'],
+        'phi_Vc': shear['phi_Vc'],
+        'Av': stirrups['Av'],
+    }
+    results.update(checks)
+    results['design_ok'] = all(checks.values())
+    return results
+
+
+# ฟังก์ชันคำนวณการออกแบบคาน
+def calculate_beam_design(fc, fy, b, h, d, Mu, Vu, stirrup_type, stirrup_legs, stirrup_spacing,
+                         tension_steel_type, tension_steel_count, compression_steel=False, 
+                         compression_steel_type=None, compression_steel_count=None, d_prime=4,
+                         with_trace=True):
+    """
+    คำนวณการออกแบบคานหนึ่งตัว คืนค่าเป็น dict ของผลลัพธ์
+    results['trace'] เป็นรายการ TraceStep (หัวข้อ, สัญลักษณ์, แม่แบบ, ค่า) ที่ยังไม่จัดรูปแบบ
+    ใช้ render_trace() เพื่อแปลงเป็น Markdown/ข้อความ/HTML เมื่อจะแสดงผล
+    ถ้า with_trace=False จะไม่เก็บรายละเอียดการคำนวณ (results['trace'] เป็น None)
+    """
+    results = {}
+    trace = Trace() if with_trace else NullTrace()
+    
+    try:
+        material = material_constants(fc, fy, b, h, d, trace)
+        limits = rho_limits(fc, fy, material['beta1'], trace)
+        flexure = flexure_design(fc, fy, b, d, Mu, tension_steel_type, tension_steel_count, compression_steel,
+                                 compression_steel_type, compression_steel_count, d_prime,
+                                 material['phi_b'], limits['rho_min'], limits['rho_max'], trace)
+        shear = shear_design(fc, b, d, Vu, material['phi_s'], trace)
+        stirrups = stirrup_design(d, stirrup_type, stirrup_legs, stirrup_spacing, trace)
+        checks = design_checks(b, h, Mu, Vu, tension_steel_type, stirrup_spacing, flexure['As_required'],
+                               flexure['As_provided_tension'], flexure['rho_required'], limits['rho_max'],
+                               flexure['phi_Mn'], shear['phi_Vc'], stirrups['max_spacing'], trace)
+        results.update(design_results(material, limits, flexure, shear, stirrups, checks))
+        
+    except Exception as e:
+        results['error'] = str(e)
+        results['design_ok'] = False
+        # ข้อผิดพลาดอยู่ในหัวข้อของขั้นตอนล่าสุดที่บันทึกไว้
+        section = trace[-1].section if with_trace and trace else DESIGN_SECTION
+        trace.add(section, None, "❌ เกิดข้อผิดพลาด: {error}", error=str(e))
+        CALCULATION_ERRORS.inc(exception=type(e).__name__)
+    
+    CALCULATION_RESULTS['error' if 'error' in results else 'pass' if results['design_ok'] else 'fail'].inc()
+    results['trace'] = trace if with_trace else None
+    return results
+
+
+def _lookup_areas(table, keys, shape):
+    """
+    แปลงชื่อเหล็ก (scalar หรือ array) เป็น array ของพื้นที่ ชื่อที่ไม่รู้จักได้ค่า NaN
+    """
+    import numpy as np
+
+    keys = np.asarray(keys)
+    if keys.ndim == 0:
+        return np.full(shape, table.get(keys.item(), np.nan), dtype=float)
+    # เทียบทีละชื่อในตาราง (มีไม่กี่ชื่อ) เร็วกว่า np.unique บน array ของ string มาก
+    areas = np.full(keys.shape, np.nan)
+    for name, area in table.items():
+        areas[keys == name] = area
+    return np.broadcast_to(areas, shape)
+
+
+def calculate_beam_design_batch(fc, fy, b, h, d, Mu, Vu, stirrup_type, stirrup_legs, stirrup_spacing,
+                                tension_steel_type, tension_steel_count, compression_steel=False,
+                                compression_steel_type=None, compression_steel_count=None, d_prime=4):
+    """
+    คำนวณการออกแบบคานหลายตัวพร้อมกันด้วย NumPy
+    พารามิเตอร์เหมือน calculate_beam_design แต่รับเป็น array (หรือ scalar ที่ broadcast ได้)
+    คืนค่าเป็น dict ของ array ตาม BATCH_RESULT_KEYS โดยแต่ละแถวได้ผลเหมือนฟังก์ชัน scalar
+    แถวที่ฟังก์ชัน scalar จะเกิดข้อผิดพลาด (เช่น ชนิดเหล็กไม่ถูกต้อง, หารด้วยศูนย์) จะมี error = True
+    """
+    import numpy as np
+
+    if compression_steel_count is None:
+        compression_steel_count = 0
+    fc, fy, b, h, d, Mu, Vu, stirrup_legs, stirrup_spacing, tension_steel_count, \
+        compression_steel_count, d_prime = np.broadcast_arrays(*(
+            np.asarray(x, dtype=float) for x in (
+                fc, fy, b, h, d, Mu, Vu, stirrup_legs, stirrup_spacing, tension_steel_count,
+                compression_steel_count, d_prime)
+        ))
+    shape = np.broadcast_shapes(fc.shape, np.shape(stirrup_type), np.shape(tension_steel_type),
+                                np.shape(compression_steel), np.shape(compression_steel_type))
+    if shape != fc.shape:
+        fc, fy, b, h, d, Mu, Vu, stirrup_legs, stirrup_spacing, tension_steel_count, \
+            compression_steel_count, d_prime = (
+                np.broadcast_to(x, shape) for x in (
+                    fc, fy, b, h, d, Mu, Vu, stirrup_legs, stirrup_spacing, tension_steel_count,
+                    compression_steel_count, d_prime)
+            )
+    compression_steel = np.broadcast_to(np.asarray(compression_steel, dtype=bool), shape)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # ค่าคงที่
+        phi_b = 0.90
+        phi_s = 0.75
+        beta1 = np.where(fc <= 280, 0.85, np.maximum(0.65, 0.85 - 0.05 * (fc - 280) / 70))
+
+        # ρmin และ ρmax
+        rho_min = np.maximum(1.4 / fy, 0.8 * np.sqrt(fc) / fy)
+        rho_max = 0.75 * (0.85 * fc / fy) * (beta1 / (1 + beta1))
+
+        # พื้นที่เหล็กที่ต้องการ
+        Mu_N_mm = Mu * 9.81 * 1000
+        b_mm = b * 10
+        d_mm = d * 10
+        Rn = Mu_N_mm / (phi_b * b_mm * d_mm**2)
+        rho_required = Rn / fy
+        As_required = rho_required * b * d
+
+        use_rho_min = rho_required < rho_min
+        rho_required = np.where(use_rho_min, rho_min, rho_required)
+        As_required = np.where(use_rho_min, rho_min * b * d, As_required)
+
+        # เหล็กที่จัดให้
+        As_provided_tension = _lookup_areas(STEEL_AREAS, tension_steel_type, shape) * tension_steel_count
+        has_compression = compression_steel & (compression_steel_count > 0)
+        As_prime = np.where(
+            has_compression,
+            _lookup_areas(STEEL_AREAS, compression_steel_type, shape) * compression_steel_count,
+            0.0,
+        )
+
+        # กำลังต้านทานโมเมนต์
+        a = (As_provided_tension * fy) / (0.85 * fc * b)
+        Mn_tension = As_provided_tension * fy * (d - a/2)
+        Mn_compression = As_prime * fy * (d - d_prime)
+        Mn = (Mn_tension + Mn_compression) / 100
+        phi_Mn = phi_b * Mn
+
+        # กำลังต้านทานแรงเฉือนและเหล็กปลอก
+        Vc = 0.53 * np.sqrt(fc) * b * d
+        phi_Vc = phi_s * Vc
+        Av = _lookup_areas(STIRRUP_AREAS, stirrup_type, shape) * stirrup_legs
+        max_spacing = np.minimum(d/2, 60)
+
+        error = ~(np.isfinite(As_required) & np.isfinite(rho_max) & np.isfinite(phi_Mn)
+                  & np.isfinite(phi_Vc) & np.isfinite(Av))
+
+        ok = ~error
+        moment_check = (phi_Mn >= Mu) & ok
+        shear_check = (phi_Vc >= Vu) & ok
+        tension_steel_adequate = (As_provided_tension >= As_required) & ok
+        stirrup_adequate = (stirrup_spacing <= max_spacing) & ok
+        rho_check = (rho_required <= rho_max) & ok
+
+    return {
+        'As_required': As_required,
+        'As_provided_tension': As_provided_tension,
+        'As_prime': As_prime,
+        'rho_required': rho_required,
+        'rho_min': rho_min,
+        'rho_max': rho_max,
+        'Mn': Mn,
+        'phi_Mn': phi_Mn,
+        'Vc': Vc,
+        'phi_Vc': phi_Vc,
+        'Av': Av,
+        'moment_check': moment_check,
+        'shear_check': shear_check,
+        'tension_steel_adequate': tension_steel_adequate,
+        'stirrup_adequate': stirrup_adequate,
+        'rho_check': rho_check,
+        'design_ok': moment_check & shear_check & tension_steel_adequate & stirrup_adequate & rho_check,
+        'error': error,
+    }
+
+
+def calculate_beam_design_frame(df):
+    """
+    คำนวณจาก DataFrame ที่มีคอลัมน์ชื่อเดียวกับพารามิเตอร์ของ calculate_beam_design
+    คอลัมน์ที่ไม่มีจะใช้ค่าเริ่มต้น (ไม่มีเหล็กรับแรงอัด, d' = 4 cm) คืนค่าเป็น DataFrame ของผลลัพธ์
+    """
+    import pandas as pd
+
+    optional = {
+        'compression_steel': False,
+        'compression_steel_type': None,
+        'compression_steel_count': 0,
+        'd_prime': 4,
+    }
+    columns = {name: df[name].to_numpy() for name in BATCH_INPUT_COLUMNS if name in df}
+    for name, default in optional.items():
+        columns.setdefault(name, default)
+    results = calculate_beam_design_batch(**columns)
+    return pd.DataFrame(results, index=df.index)
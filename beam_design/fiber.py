@@ -0,0 +1,291 @@
+"""
+วิเคราะห์กำลังดัดของหน้าตัดด้วยวิธี fiber (strain compatibility)
+
+แบ่งคอนกรีตเป็นแถบแนวนอน (fiber) และเหล็กเป็นชั้น ๆ หาแกนสะเทิน c ที่ทำให้แรงลัพธ์เป็นศูนย์
+โดยให้ความเครียดที่ขอบบนเท่ากับ εcu = 0.003 แล้วคำนวณ Mn และ φ ตามความเครียดของเหล็กชั้นล่างสุด (ACI 318)
+ไม่ต้องสมมติว่าเหล็กรับแรงดึง/แรงอัดครากเหมือนสูตรใน engine และใช้ได้กับหน้าตัดสี่เหลี่ยม, T, L หรือรูปหลายเหลี่ยมใด ๆ
+
+หน่วยเหมือน engine: kg/cm², cm, cm² และ Mn เป็น kg-m
+พิกัด y วัดจากขอบบน (ผิวรับแรงอัด) ลงล่าง
+"""
+import functools
+
+ES = 2.04e6        # โมดูลัสยืดหยุ่นของเหล็ก (kg/cm²)
+EPS_CU = 0.003     # ความเครียดประลัยของคอนกรีต
+EPS_0 = 0.002      # ความเครียดที่หน่วยแรงสูงสุดของเส้นโค้ง parabolic
+STRESS_BLOCKS = ('aci', 'parabolic')
+
+
+def rectangle(b, h):
+    """
+    จุดยอดของหน้าตัดสี่เหลี่ยมผืนผ้า b × h
+    """
+    return [(0, 0), (b, 0), (b, h), (0, h)]
+
+
+def t_section(bf, hf, bw, h):
+    """
+    จุดยอดของหน้าตัดตัว T: ปีกกว้าง bf หนา hf, เอวกว้าง bw, ลึกทั้งหมด h
+    """
+    x0 = (bf - bw) / 2
+    return [(0, 0), (bf, 0), (bf, hf), (x0 + bw, hf), (x0 + bw, h), (x0, h), (x0, hf), (0, hf)]
+
+
+def l_section(bf, hf, bw, h):
+    """
+    จุดยอดของหน้าตัดตัว L (คานขอบ): ปีกยื่นไปด้านเดียว
+    """
+    return [(0, 0), (bf, 0), (bf, hf), (bw, hf), (bw, h), (0, h)]
+
+
+def beta1(fc):
+    """
+    β1 ของ ACI 318 (fc หน่วย kg/cm²) รับค่าเดี่ยวหรือ array
+    """
+    import numpy as np
+
+    return np.clip(0.85 - 0.05 * (np.asarray(fc, dtype=float) - 280) / 70, 0.65, 0.85)
+
+
+def fiber_mesh(vertices, n_fibers=100):
+    """
+    แบ่งรูปหลายเหลี่ยม (รายการจุดยอด (x, y)) เป็นแถบแนวนอนประมาณ n_fibers แถบ
+    คืนค่า (y กึ่งกลางแถบ, พื้นที่แถบ, ความหนาแถบ) เป็น array
+
+    ขอบแถบตรงกับระดับของจุดยอดทุกจุด ความกว้างในแต่ละแถบจึงเปลี่ยนแบบเชิงเส้น และพื้นที่ถูกต้องพอดี
+    """
+    import numpy as np
+
+    pts = np.asarray(vertices, dtype=float)
+    x1, y1 = pts.T
+    x2, y2 = np.roll(pts, -1, axis=0).T
+
+    levels = np.unique(y1)
+    heights = np.diff(levels)
+    counts = np.maximum(1, np.round(n_fibers * heights / heights.sum()).astype(int))
+    t = np.repeat(heights / counts, counts)
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    tops = np.repeat(levels[:-1], counts) + (np.arange(counts.sum()) - starts) * t
+    y = tops + t / 2
+
+    # ความกว้างที่ระดับ y = ผลรวม x ของขอบที่ตัดเส้นแนวนอน (มีเครื่องหมายตามทิศของขอบ)
+    ym = y[:, None]
+    crosses = (y1 <= ym) != (y2 <= ym)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = x1 + (ym - y1) * (x2 - x1) / (y2 - y1)
+        width = np.abs(np.where(crosses, x * np.sign(y2 - y1), 0.0).sum(axis=1))
+    return y, width * t, t
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_mesh(vertices, n_fibers):
+    mesh = fiber_mesh(vertices, n_fibers)
+    for array in mesh:
+        array.flags.writeable = False
+    return mesh
+
+
+def _prepare(fc, fy, beta, fiber_y, fiber_area, fiber_t, bar_y, bar_area, stress_block, Es, eps_cu):
+    """
+    คำนวณค่าที่ไม่ขึ้นกับ c ไว้ก่อนครั้งเดียว (ทุกตัวมี shape (n, ·) เพื่อเลือกเฉพาะหน้าตัดที่ยังไม่ลู่เข้าได้)
+    """
+    peak = 0.85 * fc
+    E = Es * eps_cu
+    steel = [fy, bar_y, bar_area, E * bar_y, bar_area * E * bar_y]
+    if stress_block == 'aci':
+        return [beta, peak, fiber_y - fiber_t / 2, fiber_t, peak * fiber_area,
+                peak * beta * fiber_area / fiber_t] + steel
+    k = eps_cu / EPS_0
+    return [peak, fiber_y, k * fiber_y, peak * fiber_area, 2 * k * peak * fiber_area * fiber_y] + steel
+
+
+def _section_forces(c, prep, stress_block, Es, eps_cu, moment=False):
+    """
+    แรงลัพธ์ตามแนวแกนที่ระยะแกนสะเทิน c (shape (n,)) แรงอัดเป็นบวก หน่วย kg
+    คืนค่า (N, dN/dc) หรือถ้า moment=True คืนค่า (N, โมเมนต์รอบขอบบน kg-cm, หน่วยแรงในเหล็ก)
+    """
+    import numpy as np
+
+    cc = c[:, None]
+    fy, bar_y, bar_area, Ey, AEy = prep[-5:]
+    if stress_block == 'aci':
+        # แถบที่ถูก stress block (ลึก a = β1·c) ครอบบางส่วนคิดเฉพาะส่วนที่อยู่ในบล็อก
+        beta, peak, fiber_top, fiber_t, Fmax, slope = prep[:6]
+        a = beta * cc
+        ratio = (a - fiber_top) / fiber_t
+        covered = np.minimum(np.maximum(ratio, 0.0), 1.0)
+        Fc = Fmax * covered
+        bar_concrete = np.where(bar_y < a, peak, 0.0)
+    else:
+        # parabola ถึง ε0 แล้วคงที่ถึง εcu (r = ε/ε0)
+        peak, fiber_y, ky, Fmax, slope = prep[:5]
+        k = eps_cu / EPS_0
+        r = k - ky / cc
+        rc = np.minimum(np.maximum(r, 0.0), 1.0)
+        Fc = Fmax * rc * (2 - rc)
+        r_bar = np.minimum(np.maximum(k - k * bar_y / cc, 0.0), 1.0)
+        bar_concrete = peak * r_bar * (2 - r_bar)
+
+    strain = Es * eps_cu - Ey / cc
+    fs = np.minimum(np.maximum(strain, -fy), fy)
+    # เหล็กในเขตรับแรงอัดแทนที่คอนกรีต จึงหักหน่วยแรงคอนกรีตที่ตำแหน่งเหล็กออก
+    Fs = bar_area * (fs - bar_concrete)
+    N = Fc.sum(axis=1) + Fs.sum(axis=1)
+
+    if moment:
+        yc = fiber_top + covered * fiber_t / 2 if stress_block == 'aci' else fiber_y
+        M = -(Fc * yc).sum(axis=1) - (Fs * bar_y).sum(axis=1)
+        return N, M, fs
+
+    if stress_block == 'aci':
+        dFc = np.where((ratio > 0) & (ratio < 1), slope, 0.0).sum(axis=1)
+    else:
+        dFc = (np.where((r > 0) & (r < 1), slope * (1 - r), 0.0)).sum(axis=1) / (c * c)
+    dFs = np.where(np.abs(strain) < fy, AEy, 0.0).sum(axis=1) / (c * c)
+    return N, dFc + dFs
+
+
+def solve_fibers(fiber_y, fiber_area, fiber_t, bar_y, bar_area, fc, fy, stress_block='aci',
+                 Es=ES, eps_cu=EPS_CU, tol=1e-10, max_iter=50):
+    """
+    หา Mn ของหลายหน้าตัดพร้อมกัน
+    fiber_* มี shape (n, m) และ bar_* มี shape (n, k) (เติมแถวที่ไม่ใช้ด้วยพื้นที่ 0), fc และ fy เป็นค่าเดี่ยวหรือ (n,)
+    หาแกนสะเทินด้วย Newton ที่มีช่วงครอบราก (ถ้าก้าว Newton ออกนอกช่วงจะใช้ bisection แทน)
+    ทุกรอบคำนวณเฉพาะหน้าตัดที่ยังไม่ลู่เข้า
+    คืนค่า dict ของ array: c, eps_t, phi, Mn (kg-m), phi_Mn, steel_stress, converged, iterations
+    (eps_t, phi และ phi_Mn เป็น NaN สำหรับหน้าตัดที่ไม่มีเหล็กพื้นที่มากกว่า 0)
+    """
+    import numpy as np
+
+    if stress_block not in STRESS_BLOCKS:
+        raise ValueError(f"stress_block ต้องเป็นหนึ่งใน {STRESS_BLOCKS}")
+
+    fiber_y, fiber_area, fiber_t, bar_y, bar_area = (
+        np.atleast_2d(np.asarray(v, dtype=float)) for v in (fiber_y, fiber_area, fiber_t, bar_y, bar_area))
+    n = max(fiber_y.shape[0], fiber_area.shape[0], bar_y.shape[0], bar_area.shape[0], np.size(fc), np.size(fy))
+    fc = np.broadcast_to(np.asarray(fc, dtype=float), (n,))[:, None]
+    fy = np.broadcast_to(np.asarray(fy, dtype=float), (n,))[:, None]
+    beta = beta1(fc)
+    fiber_y, fiber_area, fiber_t, bar_y, bar_area = (
+        v if v.shape[0] == n else np.broadcast_to(v, (n, v.shape[1]))
+        for v in (fiber_y, fiber_area, fiber_t, bar_y, bar_area))
+    prep = _prepare(fc, fy, beta, fiber_y, fiber_area, fiber_t, bar_y, bar_area, stress_block, Es, eps_cu)
+    options = (stress_block, Es, eps_cu)
+
+    depth = (fiber_y + fiber_t / 2).max(axis=1)
+    area = fiber_area.sum(axis=1)
+    force_scale = 0.85 * fc[:, 0] * area + (bar_area * fy).sum(axis=1)
+    lo = depth * 1e-9
+    hi = depth * 10.0
+    # ค่าเริ่มต้น: สมมติเหล็กครึ่งล่างครากและใช้ความกว้างเฉลี่ยของหน้าตัด
+    tension = np.where(bar_y > depth[:, None] / 2, bar_area, 0.0).sum(axis=1) * fy[:, 0]
+    c = tension * depth / (0.85 * fc[:, 0] * beta[:, 0] * area)
+    c = np.where((c > 0) & (c < depth), c, depth * 0.25)
+    iterations = np.zeros(n, dtype=int)
+    converged = np.zeros(n, dtype=bool)
+    active = np.arange(n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for _ in range(max_iter):
+            subset = len(active) != n
+            args = [v[active] for v in prep] if subset else prep
+            c_a = c[active] if subset else c
+            N, dN = _section_forces(c_a, args, *options)
+            negative = N < 0
+            lo_a = np.where(negative, c_a, lo[active] if subset else lo)
+            hi_a = np.where(negative, hi[active] if subset else hi, c_a)
+            done = (np.abs(N) <= tol * force_scale[active]) | (hi_a - lo_a <= tol * depth[active])
+            if done.all():
+                converged[active] = True
+                break
+            if done.any():
+                converged[active[done]] = True
+                keep = ~done
+                active, c_a, N, dN, lo_a, hi_a = active[keep], c_a[keep], N[keep], dN[keep], lo_a[keep], hi_a[keep]
+            lo[active], hi[active] = lo_a, hi_a
+            newton = c_a - N / dN
+            safe = np.isfinite(newton) & (newton > lo_a) & (newton < hi_a)
+            c[active] = np.where(safe, newton, (lo_a + hi_a) / 2)
+            iterations[active] += 1
+        _, M, fs = _section_forces(c, prep, *options, moment=True)
+
+    # φ ตามความเครียดของเหล็กชั้นที่อยู่ลึกที่สุด (ACI 318: 0.65 ถึง 0.90)
+    # หน้าตัดที่ไม่มีเหล็ก (หรือพื้นที่เหล็กเป็น 0 ทุกชั้น) ไม่มี εt และ φ จึงเป็น NaN
+    dt = np.where(bar_area > 0, bar_y, -np.inf).max(axis=1, initial=-np.inf)
+    dt = np.where(np.isfinite(dt), dt, np.nan)
+    eps_t = eps_cu * (dt - c) / c
+    eps_y = fy[:, 0] / Es
+    phi = np.minimum(np.maximum(0.65 + 0.25 * (eps_t - eps_y) / (0.005 - eps_y), 0.65), 0.90)
+    Mn = M / 100
+    return {
+        'c': c,
+        'eps_t': eps_t,
+        'phi': phi,
+        'Mn': Mn,
+        'phi_Mn': phi * Mn,
+        'steel_stress': fs,
+        'converged': converged,
+        'iterations': iterations,
+    }
+
+
+def solve_section(vertices, bars, fc, fy, n_fibers=100, stress_block='aci', Es=ES, eps_cu=EPS_CU):
+    """
+    หา Mn ของหน้าตัดเดียว
+    vertices: จุดยอดของหน้าตัด (ใช้ rectangle, t_section, l_section หรือกำหนดเอง)
+    bars: รายการ (ระยะจากขอบบน cm, พื้นที่ cm²) ของเหล็กแต่ละชั้น
+    คืนค่า dict: c, eps_t, phi, Mn (kg-m), phi_Mn, steel_stress (รายการ kg/cm² ตามลำดับ bars), converged
+    """
+    import numpy as np
+
+    y, area, t = _cached_mesh(tuple(map(tuple, vertices)), n_fibers)
+    bars = np.asarray(bars, dtype=float).reshape(-1, 2)
+    result = solve_fibers(y, area, t, bars[:, 0], bars[:, 1], fc, fy, stress_block, Es, eps_cu)
+    single = {k: v[0].item() for k, v in result.items() if k != 'steel_stress'}
+    single['steel_stress'] = result['steel_stress'][0].tolist()
+    single['stress_block'] = stress_block
+    return single
+
+
+def solve_sections(sections, fc, fy, n_fibers=100, stress_block='aci', Es=ES, eps_cu=EPS_CU):
+    """
+    หา Mn ของหลายหน้าตัดที่รูปร่างต่างกัน sections เป็นรายการ (vertices, bars) เหมือน solve_section
+    fc, fy เป็นค่าเดี่ยวหรือรายการตามจำนวนหน้าตัด คืนค่า dict ของ array เหมือน solve_fibers
+    """
+    import numpy as np
+
+    meshes = [_cached_mesh(tuple(map(tuple, vertices)), n_fibers) for vertices, _ in sections]
+    bar_sets = [np.asarray(bars, dtype=float).reshape(-1, 2) for _, bars in sections]
+    m = max(len(mesh[0]) for mesh in meshes)
+    k = max(len(bars) for bars in bar_sets)
+    fiber_y, fiber_area, fiber_t = np.zeros((3, len(sections), m))
+    fiber_t += 1.0
+    bar_y, bar_area = np.zeros((2, len(sections), k))
+    for i, ((y, area, t), bars) in enumerate(zip(meshes, bar_sets)):
+        fiber_y[i, :len(y)], fiber_area[i, :len(y)], fiber_t[i, :len(y)] = y, area, t
+        bar_y[i, :len(bars)], bar_area[i, :len(bars)] = bars[:, 0], bars[:, 1]
+    return solve_fibers(fiber_y, fiber_area, fiber_t, bar_y, bar_area, fc, fy, stress_block, Es, eps_cu)
+
+
+def solve_rectangular_batch(b, h, d, As, fc, fy, As_prime=0, d_prime=4, n_fibers=None,
+                            stress_block='aci', Es=ES, eps_cu=EPS_CU):
+    """
+    หา Mn ของคานสี่เหลี่ยมจำนวนมากพร้อมกัน (รับ array ขนาดเดียวกันหรือค่าเดี่ยว) เหล็กรับแรงดึง As ที่ระยะ d
+    และเหล็กรับแรงอัด As' ที่ระยะ d' คืนค่า dict ของ array เหมือน solve_fibers
+    ค่าเริ่มต้นของ n_fibers: ACI stress block บนหน้าตัดกว้างคงที่ใช้แถบเดียวก็ได้ผลพอดี ส่วน parabolic ใช้ 40 แถบ
+    """
+    import numpy as np
+
+    if n_fibers is None:
+        n_fibers = 1 if stress_block == 'aci' else 40
+    b, h, d, As, fc, fy, As_prime, d_prime = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (b, h, d, As, fc, fy, As_prime, d_prime)))
+    b, h = b.ravel(), h.ravel()
+    t = (h / n_fibers)[:, None]
+    fiber_y = (np.arange(n_fibers) + 0.5) * t
+    fiber_area = np.broadcast_to(b[:, None] * t, fiber_y.shape)
+    bar_y = np.stack([d_prime.ravel(), d.ravel()], axis=1)
+    bar_area = np.stack([As_prime.ravel(), As.ravel()], axis=1)
+    result = solve_fibers(fiber_y, fiber_area, np.broadcast_to(t, fiber_y.shape), bar_y, bar_area,
+                          fc.ravel(), fy.ravel(), stress_block, Es, eps_cu)
+    shape = np.shape(As) if np.ndim(As) else ()
+    return {k: (v.reshape(shape + v.shape[1:]) if v.ndim > 1 else v.reshape(shape)) for k, v in result.items()}
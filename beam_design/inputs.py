@@ -0,0 +1,66 @@
+"""
+แปลงข้อมูลคานจาก JSON หรือแถวของตาราง (ชื่อและหน่วยเดียวกับหน้าเว็บ) เป็นอาร์กิวเมนต์ของ calculate_beam_design
+และ draw_beam_section ใช้ร่วมกันระหว่าง HTTP API (beam_design.server) และรายงาน PDF (beam_design.report)
+"""
+import inspect
+
+from .cache import normalize_value
+from .engine import calculate_beam_design
+from .rebar import MAIN_BARS, STIRRUP_BARS, bar_diameters
+
+BEAM_PARAMETERS = [name for name in inspect.signature(calculate_beam_design).parameters if name != 'with_trace']
+STEEL_DIAMETERS = bar_diameters(MAIN_BARS)
+STIRRUP_DIAMETERS = bar_diameters(STIRRUP_BARS)
+
+
+class RequestError(Exception):
+    """
+    ข้อผิดพลาดที่ตอบกลับผู้เรียกได้โดยตรง (พร้อม HTTP status)
+    """
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def beam_arguments(beam):
+    """
+    แปลง JSON ของคาน 1 ตัวเป็นอาร์กิวเมนต์ของ calculate_beam_design (ถ้าไม่มี d จะใช้ h - cover)
+    """
+    if not isinstance(beam, dict):
+        raise RequestError('ข้อมูลคานต้องเป็น JSON object')
+    beam = dict(beam)
+    if 'd' not in beam and 'h' in beam and 'cover' in beam:
+        beam['d'] = beam['h'] - beam['cover']
+    required = [name for name, p in inspect.signature(calculate_beam_design).parameters.items()
+                if p.default is inspect.Parameter.empty]
+    missing = [name for name in required if name not in beam]
+    if missing:
+        raise RequestError(f"ไม่พบข้อมูล: {', '.join(missing)}")
+    if beam.get('compression_steel') is None:
+        beam['compression_steel'] = bool(beam.get('compression_steel_count'))
+    return {name: beam[name] for name in BEAM_PARAMETERS if name in beam}
+
+
+def section_arguments(beam):
+    """
+    แปลงข้อมูลคาน (cm, ชื่อเหล็ก) เป็นอาร์กิวเมนต์ของ draw_beam_section (mm, เส้นผ่านศูนย์กลาง) แบบเดียวกับหน้าเว็บ
+    """
+    args = beam_arguments(beam)
+    missing = [name for name in ('h', 'cover') if name not in beam]
+    if missing:
+        raise RequestError(f"ไม่พบข้อมูล: {', '.join(missing)}")
+    try:
+        section = {
+            'b': beam['b'] * 10, 'h': beam['h'] * 10, 'cover': beam['cover'] * 10,
+            'bar_dia': STEEL_DIAMETERS[args['tension_steel_type']], 'bar_count': args['tension_steel_count'],
+            'stirrup_dia': STIRRUP_DIAMETERS[args['stirrup_type']], 'stirrup_legs': args['stirrup_legs'],
+            'stirrup_spacing': args['stirrup_spacing'],
+        }
+        if args['compression_steel']:
+            section.update(d_prime=args.get('d_prime', 4) * 10,
+                           bar_dia_comp=STEEL_DIAMETERS[args['compression_steel_type']],
+                           bar_count_comp=args['compression_steel_count'])
+    except KeyError as e:
+        raise RequestError(f'ไม่รู้จักชนิดเหล็ก: {e.args[0]}') from None
+    return {k: normalize_value(v) for k, v in section.items()}
@@ -0,0 +1,439 @@
+"""
+ตัวชี้วัดการทำงาน (counter, histogram, gauge) ในรูปแบบข้อความของ Prometheus ใช้ไลบรารีมาตรฐานเท่านั้น
+
+ค่าทั้งหมดเป็นของ process ปัจจุบัน (worker ใน process pool มีค่าของตัวเองซึ่งไม่ถูกรวม) อ่านได้จาก
+- HTTP server ของ API: GET /metrics
+- หน้าเว็บ: BEAM_DESIGN_METRICS_PORT=9100 เปิด endpoint /metrics ใน thread แยก
+  หรือ BEAM_DESIGN_METRICS_FILE=/var/lib/node_exporter/beam_{pid}.prom เขียนไฟล์ทุก BEAM_DESIGN_METRICS_INTERVAL วินาที
+  (สำหรับ textfile collector ของ node_exporter, {pid} ถูกแทนด้วยหมายเลข process เมื่อมีหลาย replica)
+"""
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ContextDecorator
+
+METRICS_PORT = os.environ.get('BEAM_DESIGN_METRICS_PORT')
+METRICS_FILE = os.environ.get('BEAM_DESIGN_METRICS_FILE')
+METRICS_INTERVAL = float(os.environ.get('BEAM_DESIGN_METRICS_INTERVAL', 15))
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# ขอบบนของช่อง histogram (วินาที) ตั้งแต่การคำนวณคานหนึ่งตัวจนถึงการสร้างรายงาน PDF
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# session ที่มีการ rerun ภายในช่วงนี้ถือว่ายังใช้งานอยู่
+SESSION_WINDOW = 300
+
+REGISTRY = []
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if value == float('-inf'):
+        return '-Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n') for _, v in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+class Metric:
+    """
+    ฐานของตัวชี้วัด: ชื่อ, คำอธิบาย, ชื่อ label และค่าแยกตามชุดของ label (ลงทะเบียนใน REGISTRY เมื่อสร้าง)
+    """
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=(), registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.append(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} ต้องการ label: {", ".join(self.labelnames)}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def labels(self, **labels):
+        """
+        ตัวชี้วัดที่ผูกชุด label ไว้แล้ว สำหรับจุดที่ถูกเรียกบ่อย (ไม่ต้องตรวจ label ทุกครั้ง)
+        """
+        return BoundMetric(self, self._key(labels))
+
+    def _inc(self, key, amount):
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        """
+        รายการ (ชื่อ, label เพิ่มเติม, ชุดค่า label, ค่า)
+        """
+        with self._lock:
+            return [(self.name, (), key, value) for key, value in sorted(self._values.items())]
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for name, extra, key, value in self.samples():
+            lines.append(f'{name}{_format_labels(self.labelnames, key, extra)} {_format_value(value)}')
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        self._inc(self._key(labels), amount)
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(Metric):
+    """
+    ค่าที่ขึ้นลงได้ ตั้งด้วย set() หรือกำหนด func ซึ่งถูกเรียกตอน render
+    (คืนค่าตัวเลข หรือ dict {tuple ของค่า label: ตัวเลข})
+    """
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), registry=REGISTRY, func=None):
+        super().__init__(name, documentation, labelnames, registry)
+        self.func = func
+
+    def set(self, value, **labels):
+        self._set(self._key(labels), value)
+
+    def _set(self, key, value):
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        self._inc(self._key(labels), amount)
+
+    def dec(self, amount=1, **labels):
+        self._inc(self._key(labels), -amount)
+
+    def samples(self):
+        if self.func is None:
+            return super().samples()
+        try:
+            value = self.func()
+        except Exception:
+            # ตัวชี้วัดที่อ่านไม่ได้ไม่ควรทำให้ endpoint ทั้งหมดล้ม
+            return []
+        if not isinstance(value, dict):
+            return [(self.name, (), (), value)]
+        return [(self.name, (), tuple(map(str, key)), v) for key, v in sorted(value.items())]
+
+
+class CounterFunc(Gauge):
+    """
+    counter ที่อ่านค่าจาก func ตอน render (เช่น ค่าสะสมที่ระบบหรือโมดูลอื่นนับไว้แล้ว)
+    """
+    kind = 'counter'
+
+    def __init__(self, name, documentation, func, labelnames=(), registry=REGISTRY):
+        super().__init__(name, documentation, labelnames, registry, func)
+
+
+class _Timer(ContextDecorator):
+    def __init__(self, histogram, key):
+        self.histogram = histogram
+        self.key = key
+
+    def _recreate_cm(self):
+        # ใช้เป็น decorator: แต่ละการเรียก (ซึ่งอาจพร้อมกันหลาย thread) มีเวลาเริ่มของตัวเอง
+        return _Timer(self.histogram, self.key)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram._observe(self.key, time.perf_counter() - self.start)
+        return False
+
+
+class Histogram(Metric):
+    """
+    จำนวนค่าที่ไม่เกินขอบบนของแต่ละช่อง (สะสม), ผลรวม และจำนวนค่า
+    time(**labels) ใช้เป็น context manager หรือ decorator เพื่อจับเวลาเป็นวินาที
+    """
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), registry=REGISTRY, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        self._observe(self._key(labels), value)
+
+    def _observe(self, key, value):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            state[0][i] += 1
+            state[1] += value
+            state[2] += 1
+
+    def time(self, **labels):
+        return _Timer(self, self._key(labels))
+
+    def count(self, **labels):
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, [list(state[0]), state[1], state[2]]) for key, state in self._values.items())
+        samples = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                samples.append((f'{self.name}_bucket', (('le', _format_value(bound)),), key, cumulative))
+            samples.append((f'{self.name}_sum', (), key, total))
+            samples.append((f'{self.name}_count', (), key, count))
+        return samples
+
+
+class BoundMetric:
+    """
+    ผลของ metric.labels(...): inc/dec/set/observe/time ของชุด label เดียว
+    """
+
+    def __init__(self, metric, key):
+        self.metric = metric
+        self.key = key
+
+    def inc(self, amount=1):
+        self.metric._inc(self.key, amount)
+
+    def dec(self, amount=1):
+        self.metric._inc(self.key, -amount)
+
+    def set(self, value):
+        self.metric._set(self.key, value)
+
+    def observe(self, value):
+        self.metric._observe(self.key, value)
+
+    def time(self):
+        return _Timer(self.metric, self.key)
+
+
+def render_metrics(registry=REGISTRY):
+    """
+    ตัวชี้วัดทั้งหมดในรูปแบบข้อความของ Prometheus (text exposition format 0.0.4)
+    """
+    lines = []
+    for metric in registry:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def write_metrics(path, registry=REGISTRY):
+    """
+    เขียนตัวชี้วัดลงไฟล์ (เขียนไฟล์ชั่วคราวแล้ว os.replace ผู้อ่านจึงไม่เห็นไฟล์ที่เขียนไม่เสร็จ)
+    """
+    path = str(path).replace('{pid}', str(os.getpid()))
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(render_metrics(registry))
+    os.replace(tmp, path)
+    return path
+
+
+# ---- ตัวชี้วัดของโปรแกรม ----
+
+CALCULATIONS = Counter('beam_design_calculations_total',
+                       'จำนวนครั้งที่เรียก calculate_beam_design แยกตามผล (pass, fail, error)', ['result'])
+CALCULATION_ERRORS = Counter('beam_design_calculation_errors_total',
+                             'ข้อผิดพลาดที่ calculate_beam_design จับได้ แยกตามชนิด exception', ['exception'])
+SECTION_RENDERS = Histogram('beam_design_section_render_seconds',
+                            'เวลาวาดภาพตัดคาน (matplotlib หรือ svg) จำนวนครั้งอยู่ใน _count', ['format'])
+CHART_BUILDS = Histogram('beam_design_chart_build_seconds',
+                         'เวลาสร้างกราฟ Plotly จำนวนครั้งอยู่ใน _count', ['chart'])
+STAGE_SECONDS = Histogram('beam_design_stage_seconds',
+                          'เวลาคำนวณแต่ละ node ของ pipeline (เฉพาะที่ไม่ได้มาจากแคช)', ['stage'])
+RERUNS = Histogram('beam_design_app_rerun_seconds', 'เวลาการรันสคริปต์ของหน้าเว็บแต่ละครั้ง', ['page'])
+RERUN_PAYLOADS = Histogram('beam_design_rerun_payload_bytes',
+                           'ขนาดข้อมูล (ForwardMsg) ที่ส่งไปเบราว์เซอร์ในการรันสคริปต์แต่ละครั้ง', ['page'],
+                           buckets=(1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000, 500000, 1000000))
+HTTP_REQUESTS = Histogram('beam_design_http_request_seconds',
+                          'เวลาตอบคำขอของ HTTP API แยกตาม path และ status', ['path', 'status'])
+
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+_START_TIME = time.time()
+
+
+def session_seen(session_id):
+    """
+    บันทึกว่า session นี้เพิ่ง rerun (ใช้นับ session ที่ใช้งานอยู่)
+    """
+    now = time.monotonic()
+    with _SESSIONS_LOCK:
+        _SESSIONS[session_id] = now
+        # ลบ session ที่เงียบไปนานเมื่อ dict โตขึ้น (ไม่ต้องมี thread แยก)
+        if len(_SESSIONS) > 64 and len(_SESSIONS) % 64 == 0:
+            for key in [k for k, seen in _SESSIONS.items() if now - seen > SESSION_WINDOW]:
+                del _SESSIONS[key]
+
+
+def active_sessions():
+    now = time.monotonic()
+    with _SESSIONS_LOCK:
+        return sum(now - seen <= SESSION_WINDOW for seen in _SESSIONS.values())
+
+
+def rss_bytes():
+    """
+    หน่วยความจำที่ process ใช้อยู่ (resident set size) ใช้ /proc บน Linux ไม่เช่นนั้นใช้ค่าสูงสุดจาก getrusage
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _cpu_seconds():
+    times = os.times()
+    return times.user + times.system
+
+
+def _cache_values(field):
+    # import ตอนอ่านค่า: cache import engine ซึ่ง import โมดูลนี้
+    from .cache import cache_stats
+
+    return {(name,): stats[field] for name, stats in cache_stats().items()}
+
+
+Gauge('beam_design_active_sessions', f'จำนวน session ของหน้าเว็บที่ rerun ภายใน {SESSION_WINDOW} วินาที',
+      func=active_sessions)
+Gauge('process_resident_memory_bytes', 'หน่วยความจำที่ process ใช้อยู่ (bytes)', func=rss_bytes)
+CounterFunc('process_cpu_seconds_total', 'เวลา CPU (user + system) ของ process (วินาที)', _cpu_seconds)
+Gauge('process_start_time_seconds', 'เวลาที่ process เริ่มทำงาน (unix time)', func=lambda: _START_TIME)
+CounterFunc('beam_design_cache_hits_total', 'จำนวน hit ของแคชแต่ละชุด', lambda: _cache_values('hits'), ['cache'])
+CounterFunc('beam_design_cache_misses_total', 'จำนวน miss ของแคชแต่ละชุด', lambda: _cache_values('misses'),
+            ['cache'])
+Gauge('beam_design_cache_entries', 'จำนวนรายการในแคชแต่ละชุด', ['cache'], func=lambda: _cache_values('size'))
+
+
+class AppRun:
+    """
+    จับเวลาและวัดขนาดข้อมูลที่ส่งไปเบราว์เซอร์ของการรันสคริปต์หน้าเว็บหนึ่งครั้ง:
+    สร้างตอนต้นสคริปต์และเรียก finish() ตอนท้าย
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.start = time.perf_counter()
+        self.payload = None
+        start_exporters()
+        try:
+            from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+            ctx = get_script_run_ctx()
+        except ImportError:
+            ctx = None
+        if ctx is not None:
+            from .payload import PayloadMeter
+
+            session_seen(ctx.session_id)
+            self.payload = PayloadMeter(ctx)
+
+    def finish(self):
+        """
+        บันทึกเวลาและขนาดข้อมูลของการรันนี้ คืนค่ารายงานขนาดข้อมูล (ดู PayloadMeter.report) หรือ None
+        """
+        RERUNS.observe(time.perf_counter() - self.start, page=self.page)
+        if self.payload is None:
+            return None
+        self.payload.close()
+        RERUN_PAYLOADS.observe(self.payload.total, page=self.page)
+        return self.payload.report()
+
+
+_EXPORTERS = {}
+_EXPORTERS_LOCK = threading.Lock()
+
+
+def start_metrics_server(port, host='127.0.0.1'):
+    """
+    เปิด endpoint /metrics ใน daemon thread (ครั้งเดียวต่อ process) คืนค่า server
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = render_metrics().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, int(port)), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
+
+
+def start_metrics_writer(path, interval=METRICS_INTERVAL):
+    """
+    เขียนไฟล์ตัวชี้วัดทุก interval วินาทีใน daemon thread
+    """
+    def loop():
+        while True:
+            try:
+                write_metrics(path)
+            except OSError as e:
+                print(f'เขียนไฟล์ตัวชี้วัดไม่ได้: {e}', file=sys.stderr)
+            time.sleep(interval)
+
+    thread = threading.Thread(target=loop, name='metrics-writer', daemon=True)
+    thread.start()
+    return thread
+
+
+def start_exporters(port=METRICS_PORT, path=METRICS_FILE):
+    """
+    เปิด endpoint และ/หรือตัวเขียนไฟล์ตาม environment (ครั้งเดียวต่อ process แม้เรียกทุก rerun)
+    """
+    if not port and not path:
+        return
+    with _EXPORTERS_LOCK:
+        if port and 'server' not in _EXPORTERS:
+            try:
+                _EXPORTERS['server'] = start_metrics_server(port)
+            except OSError as e:
+                # เช่น replica อื่นใช้ port นี้อยู่แล้ว
+                print(f'เปิด endpoint ตัวชี้วัดที่ port {port} ไม่ได้: {e}', file=sys.stderr)
+                _EXPORTERS['server'] = None
+        if path and 'writer' not in _EXPORTERS:
+            _EXPORTERS['writer'] = start_metrics_writer(path)
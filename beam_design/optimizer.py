@@ -0,0 +1,186 @@
+from .engine import STEEL_AREAS, STIRRUP_AREAS, calculate_beam_design_batch
+from .rebar import MAIN_BARS, bar_diameters, layer_width
+
+# ขนาดเส้นผ่านศูนย์กลางเหล็ก (mm)
+BAR_DIAMETERS_MM = bar_diameters(MAIN_BARS)
+
+# ค่าเริ่มต้นของราคาและหน่วยน้ำหนัก
+CONCRETE_PRICE = 2500      # บาท/m³
+STEEL_PRICE = 28           # บาท/kg
+CONCRETE_DENSITY = 2400    # kg/m³
+STEEL_DENSITY = 7850       # kg/m³
+
+OBJECTIVES = ('cost', 'weight')
+
+
+def _section_quantities(b, h, cover):
+    """
+    ปริมาณต่อความยาวคาน 1 m: ปริมาตรคอนกรีต (m³) และความยาวเหล็กปลอก 2 ขา/ขาเพิ่ม (cm ต่อปลอก)
+    """
+    concrete = b * h / 1e4
+    hoop = 2 * (b - 2 * cover) + 2 * (h - 2 * cover)
+    extra_leg = h - 2 * cover
+    return concrete, hoop, extra_leg
+
+
+def _required_width(bar_dia_mm, bar_count, cover):
+    """
+    ความกว้างคานที่ต้องใช้เพื่อวางเหล็กชั้นเดียว ระยะช่องว่างระหว่างเหล็ก ≥ max(2.5 cm, db)
+    """
+    return 2 * cover + layer_width(((bar_dia_mm, bar_count),))
+
+
+def optimize_beam_design(Mu, Vu, fc, fy, b_values, h_values, cover=4,
+                         bar_types=tuple(STEEL_AREAS), bar_counts=range(2, 11),
+                         stirrup_types=tuple(STIRRUP_AREAS), stirrup_legs=(2, 3, 4),
+                         stirrup_spacings=range(5, 31), top_n=10, objective='cost',
+                         concrete_price=CONCRETE_PRICE, steel_price=STEEL_PRICE,
+                         check_fit=True, block_size=64):
+    """
+    ค้นหาแบบคาน (b, h, เหล็กรับแรงดึง, เหล็กปลอก) ที่ผ่านทุกการตรวจสอบของ calculate_beam_design
+    และมีราคา (objective='cost', บาท/m) หรือน้ำหนัก (objective='weight', kg/m) ต่ำที่สุด top_n แบบ
+
+    การค้นหาแยกตามหน้าตัด: ตรวจ ρ และแรงเฉือนของทุกหน้าตัดพร้อมกันก่อน แล้วเรียงหน้าตัดตามขอบล่างของราคา
+    (คอนกรีต + เหล็กขั้นต่ำ As_required + เหล็กปลอกที่ถูกที่สุด) และประเมินเหล็กเสริมทีละกลุ่ม
+    หยุดเมื่อขอบล่างของหน้าตัดถัดไปแพงกว่าแบบที่ top_n ที่พบแล้ว
+    check_fit=True จะตัดชุดเหล็กที่วางเป็นชั้นเดียวในความกว้าง b ไม่ได้
+
+    คืนค่าเป็น dict: 'designs' (list ของ dict เรียงจากถูกไปแพง) และ 'stats' (จำนวนที่ประเมิน/ตัดทิ้ง)
+    แบบที่เลือกถูกยืนยันด้วยการคำนวณจริง แบบที่ไม่ผ่านทุกเงื่อนไขถูกตัดออกและนับใน stats['designs_rejected']
+    """
+    import numpy as np
+
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective ต้องเป็นหนึ่งใน {OBJECTIVES}")
+
+    # ราคาต่อหน่วย: 'cost' ใช้บาท, 'weight' ใช้ kg
+    if objective == 'cost':
+        concrete_unit, steel_unit = concrete_price, steel_price
+    else:
+        concrete_unit, steel_unit = CONCRETE_DENSITY, 1.0
+    steel_kg_per_cm3 = STEEL_DENSITY * 1e-6
+
+    # ---- ขั้นที่ 1: ตรวจหน้าตัดทุกขนาดพร้อมกัน (ρ และแรงเฉือนไม่ขึ้นกับเหล็กที่เลือก) ----
+    b_grid, h_grid = np.meshgrid(np.asarray(b_values, dtype=float), np.asarray(h_values, dtype=float),
+                                 indexing='ij')
+    b_sec, h_sec = b_grid.ravel(), h_grid.ravel()
+    d_sec = h_sec - cover
+    section = calculate_beam_design_batch(
+        fc, fy, b_sec, h_sec, d_sec, Mu, Vu, 'RB6', 2, 5, 'DB12', 0)
+    feasible = section['rho_check'] & section['shear_check']
+    b_sec, h_sec, d_sec = b_sec[feasible], h_sec[feasible], d_sec[feasible]
+    As_required = section['As_required'][feasible]
+    stats = {'sections': int(feasible.size), 'sections_feasible': int(feasible.sum()),
+             'sections_evaluated': 0, 'combinations_evaluated': int(feasible.size), 'designs_rejected': 0}
+    if b_sec.size == 0:
+        return {'designs': [], 'stats': stats}
+
+    concrete, hoop, extra_leg = _section_quantities(b_sec, h_sec, cover)
+    concrete_cost = concrete * concrete_unit
+
+    # ---- ตัวเลือกเหล็กปลอก: ราคาต่อ m ของแต่ละ (ชนิด, ขา, ระยะ) ----
+    st_type, st_legs, st_spacing = (np.array(x).ravel() for x in np.meshgrid(
+        np.array(stirrup_types), np.asarray(stirrup_legs), np.asarray(stirrup_spacings), indexing='ij'))
+    st_area = np.array([STIRRUP_AREAS[t] for t in st_type])
+    st_spacing = st_spacing.astype(float)
+    # ความยาวปลอกต่อ m (cm) × พื้นที่ 1 ขา → ปริมาตรเหล็ก (cm³) ต่อความยาวคาน 1 m
+    st_volume = (st_area[None, :] * (hoop[:, None] + (st_legs[None, :] - 2) * extra_leg[:, None])
+                 * (100 / st_spacing[None, :]))
+    st_cost = st_volume * steel_kg_per_cm3 * steel_unit
+    max_spacing = np.minimum(d_sec / 2, 60)
+    st_cost = np.where(st_spacing[None, :] <= max_spacing[:, None], st_cost, np.inf)
+    stats['combinations_evaluated'] += int(st_cost.size)
+
+    # ---- ตัวเลือกเหล็กรับแรงดึง ----
+    bar_type, bar_count = (np.array(x).ravel() for x in np.meshgrid(
+        np.array(bar_types), np.asarray(bar_counts), indexing='ij'))
+    bar_area = np.array([STEEL_AREAS[t] for t in bar_type]) * bar_count
+    bar_cost_per_m = bar_area * 100 * steel_kg_per_cm3 * steel_unit
+    bar_width = np.array([_required_width(BAR_DIAMETERS_MM[t], n, cover)
+                          for t, n in zip(bar_type, bar_count)])
+    bar_unit_cost = 100 * steel_kg_per_cm3 * steel_unit  # ราคาเหล็กต่อ cm² ต่อ m
+
+    # ขอบล่างของราคาแต่ละหน้าตัด แล้วเรียงจากถูกไปแพง
+    best_st = np.argsort(st_cost, axis=1)[:, :top_n]
+    best_st_cost = np.take_along_axis(st_cost, best_st, axis=1)
+    lower_bound = concrete_cost + As_required * bar_unit_cost + best_st_cost[:, 0]
+    order = np.argsort(lower_bound, kind='stable')
+    order = order[np.isfinite(lower_bound[order])]
+
+    # ---- ขั้นที่ 2: branch-and-bound ทีละกลุ่มหน้าตัด ----
+    candidates = []  # (ราคา, index หน้าตัด, index เหล็กรับแรงดึง, index เหล็กปลอก)
+    threshold = np.inf
+    for start in range(0, order.size, block_size):
+        block = order[start:start + block_size]
+        block = block[lower_bound[block] <= threshold]
+        if block.size == 0:
+            break
+        stats['sections_evaluated'] += int(block.size)
+
+        nb, nbar = block.size, bar_area.size
+        flex = calculate_beam_design_batch(
+            fc, fy, b_sec[block, None], h_sec[block, None], d_sec[block, None], Mu, Vu,
+            'RB6', 2, 5, bar_type[None, :], bar_count[None, :])
+        stats['combinations_evaluated'] += nb * nbar
+        ok = flex['moment_check'] & flex['tension_steel_adequate']
+        if check_fit:
+            ok &= bar_width[None, :] <= b_sec[block, None]
+        cost_bars = np.where(ok, bar_cost_per_m[None, :], np.inf)
+
+        keep = min(top_n, nbar)
+        best_bar = np.argsort(cost_bars, axis=1)[:, :keep]
+        best_bar_cost = np.take_along_axis(cost_bars, best_bar, axis=1)
+
+        # รวมราคาแบบแยกส่วน: คอนกรีต + เหล็กรับแรงดึง + เหล็กปลอก (top_n × top_n ต่อหน้าตัด)
+        total = (concrete_cost[block, None, None] + best_bar_cost[:, :, None]
+                 + best_st_cost[block, None, :])
+        sec_idx = np.broadcast_to(block[:, None, None], total.shape).ravel()
+        bar_idx = np.broadcast_to(best_bar[:, :, None], total.shape).ravel()
+        st_idx = np.broadcast_to(best_st[block, None, :], total.shape).ravel()
+        total = total.ravel()
+        finite = np.isfinite(total)
+        candidates.append((total[finite], sec_idx[finite], bar_idx[finite], st_idx[finite]))
+
+        merged = [np.concatenate(parts) for parts in zip(*candidates)]
+        if merged[0].size > top_n:
+            top = np.argpartition(merged[0], top_n - 1)[:top_n]
+            merged = [part[top] for part in merged]
+        candidates = [tuple(merged)]
+        if merged[0].size >= top_n:
+            threshold = merged[0].max()
+
+    if not candidates or candidates[0][0].size == 0:
+        return {'designs': [], 'stats': stats}
+    total, sec_idx, bar_idx, st_idx = candidates[0]
+    order = np.argsort(total, kind='stable')[:top_n]
+    total, sec_idx, bar_idx, st_idx = (np.asarray(x)[order] for x in (total, sec_idx, bar_idx, st_idx))
+
+    # ---- ยืนยันผลด้วยการคำนวณจริงของแบบที่เลือก ----
+    final = calculate_beam_design_batch(
+        fc, fy, b_sec[sec_idx], h_sec[sec_idx], d_sec[sec_idx], Mu, Vu,
+        st_type[st_idx], st_legs[st_idx], st_spacing[st_idx], bar_type[bar_idx], bar_count[bar_idx])
+    stats['designs_rejected'] = int((~final['design_ok']).sum())
+
+    designs = []
+    for i in np.flatnonzero(final['design_ok']):
+        s, k, j = sec_idx[i], bar_idx[i], st_idx[i]
+        steel_volume = bar_area[k] * 100 + st_volume[s, j]
+        designs.append({
+            'b': float(b_sec[s]),
+            'h': float(h_sec[s]),
+            'd': float(d_sec[s]),
+            'tension_steel_type': str(bar_type[k]),
+            'tension_steel_count': int(bar_count[k]),
+            'stirrup_type': str(st_type[j]),
+            'stirrup_legs': int(st_legs[j]),
+            'stirrup_spacing': float(st_spacing[j]),
+            'As_required': float(final['As_required'][i]),
+            'As_provided_tension': float(final['As_provided_tension'][i]),
+            'phi_Mn': float(final['phi_Mn'][i]),
+            'phi_Vc': float(final['phi_Vc'][i]),
+            'concrete_volume': float(concrete[s]),
+            'steel_weight': float(steel_volume * steel_kg_per_cm3),
+            objective: float(total[i]),
+        })
+    return {'designs': designs, 'stats': stats}
+
@@ -0,0 +1,149 @@
+"""
+ลดขนาดข้อมูลที่ส่งไปเบราว์เซอร์ในแต่ละ rerun และวัดขนาดที่ส่งจริง
+
+Streamlit ส่งทุก element เป็น ForwardMsg ใหม่ทุกครั้งที่รันสคริปต์ (element ที่ใหญ่ตั้งแต่ 10 KB ส่งเป็น hash
+ของเนื้อหาเมื่อเบราว์เซอร์มีอยู่แล้ว) การลดส่วนใหญ่มาจากการบีบอัด websocket (permessage-deflate) ที่เปิดใน
+.streamlit/config.toml: ข้อความของการรันต่อเนื่องกันซ้ำกันเกือบทั้งหมด จึงบีบได้ราว 10 เท่า
+compact_figure และ minify_css ลดขนาดก่อนบีบอัด PayloadMeter วัดขนาดที่ส่งในแต่ละการรัน
+"""
+import re
+from functools import lru_cache
+
+# ชนิด trace ที่กราฟในแอปใช้ (template แบบย่อเก็บค่าเริ่มต้นของชนิดเหล่านี้เท่านั้น)
+FIGURE_TRACES = ('bar', 'scatter', 'scattergl')
+# จำนวนหลักของตำแหน่งสีใน colorscale ของ template
+TEMPLATE_DIGITS = 3
+
+
+def _round_floats(value, digits):
+    if isinstance(value, float):
+        return round(value, digits)
+    if isinstance(value, dict):
+        return {k: _round_floats(v, digits) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_round_floats(v, digits) for v in value]
+    return value
+
+
+@lru_cache(maxsize=None)
+def compact_template():
+    """
+    template 'streamlit' (สีของธีมถูกแทนที่ฝั่งเบราว์เซอร์) ที่เหลือค่าเริ่มต้นเฉพาะชนิด trace ใน FIGURE_TRACES
+    และตำแหน่งใน colorscale สั้นลง: ราว 1.3 KB แทน 3.4 KB ต่อกราฟ
+    """
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    # streamlit ลงทะเบียน template 'streamlit' ตอน import โมดูล plotly_chart
+    import streamlit.elements.plotly_chart  # noqa: F401
+
+    template = pio.templates['streamlit'].to_plotly_json()
+    data = {name: traces for name, traces in template.get('data', {}).items() if name in FIGURE_TRACES}
+    return go.layout.Template(layout=_round_floats(template['layout'], TEMPLATE_DIGITS), data=data)
+
+
+def compact_figure(fig):
+    """
+    ลดขนาด JSON ของกราฟที่ส่งไปเบราว์เซอร์: ใช้ compact_template และเก็บข้อมูลตัวเลขที่เป็น numpy เป็น float32
+    (plotly ส่ง numpy array เป็น base64 ครึ่งหนึ่งของ float64 ละเอียดพอสำหรับการแสดงผล) คืนค่า fig เดิม
+    """
+    import numpy as np
+
+    fig.layout.template = compact_template()
+    for trace in fig.data:
+        for name in ('x', 'y', 'z', 'customdata'):
+            value = getattr(trace, name, None)
+            if isinstance(value, np.ndarray) and value.dtype == np.float64:
+                # plotly ไม่แทนค่าที่เท่ากับค่าเดิม (float32 ที่ค่าเป็นจำนวนเต็ม) จึงล้างก่อน
+                trace[name] = None
+                trace[name] = value.astype(np.float32)
+    return fig
+
+
+_CSS_COMMENTS = re.compile(r'/\*.*?\*/', re.S)
+_CSS_SPACES = re.compile(r'\s*([{};,>])\s*')
+# ช่องว่างก่อน : ในตัวเลือก (เช่น "div :hover") มีความหมาย ลบเฉพาะหลัง :
+_CSS_COLONS = re.compile(r':\s+')
+
+
+@lru_cache(maxsize=None)
+def minify_css(css):
+    """
+    ลบ comment ช่องว่าง และ ; ตัวสุดท้ายของแต่ละ block ใน CSS
+    """
+    css = _CSS_COMMENTS.sub('', css)
+    css = _CSS_SPACES.sub(r'\1', ' '.join(css.split()))
+    css = _CSS_COLONS.sub(':', css)
+    return css.replace(';}', '}').strip()
+
+
+def _message_kind(msg):
+    kind = msg.WhichOneof('type')
+    if kind == 'delta':
+        delta = msg.delta.WhichOneof('type')
+        if delta == 'new_element':
+            return msg.delta.new_element.WhichOneof('type')
+        return delta
+    return kind
+
+
+class PayloadMeter:
+    """
+    นับขนาด ForwardMsg ที่ส่งไปเบราว์เซอร์ระหว่างการรันหนึ่งครั้ง (ห่อ _enqueue ของ ScriptRunContext)
+    ขนาดเป็นขนาด protobuf ก่อนการบีบอัดของ websocket ข้อความที่ส่งเป็น hash นับเป็นชนิด 'ref_hash'
+    """
+    # เก็บ bytes ของข้อความไว้ใน report['raw'] ด้วย (สำหรับประมาณขนาดหลังบีบอัดใน benchmarks)
+    keep = False
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        # (ชนิด, ขนาดที่ส่ง, hash, ขนาดเมื่อส่งเป็น hash หรือ None ถ้าแคชไม่ได้)
+        self.messages = []
+        # (bytes ของข้อความ, bytes เมื่อส่งเป็น hash หรือ None) เมื่อ keep
+        self.raw = []
+        original = ctx._enqueue
+        # meter ของการรันก่อนหน้าที่ไม่ได้ close (สคริปต์หยุดกลางทาง)
+        while isinstance(getattr(original, '__self__', None), PayloadMeter):
+            original = original.__self__.original
+        self.original = original
+        ctx._enqueue = self.enqueue
+
+    def enqueue(self, msg):
+        self.original(msg)
+        ref = None
+        if msg.metadata.cacheable:
+            from streamlit.runtime.forward_msg_cache import create_reference_msg
+
+            ref = create_reference_msg(msg)
+        self.messages.append((_message_kind(msg), msg.ByteSize(), msg.hash, ref and ref.ByteSize()))
+        if self.keep:
+            self.raw.append((msg.SerializeToString(), ref and ref.SerializeToString()))
+
+    def close(self):
+        if self.ctx._enqueue == self.enqueue:
+            self.ctx._enqueue = self.original
+
+    @property
+    def total(self):
+        return sum(size for _, size, _, _ in self.messages)
+
+    def report(self):
+        """
+        {'bytes': รวม, 'messages': จำนวน, 'refs': จำนวนที่ส่งเป็น hash, 'kinds': {ชนิด: [จำนวน, bytes]},
+        'sent': รายการ (ชนิด, bytes, hash, bytes เมื่อส่งเป็น hash)} ของการรันนี้ และ 'raw' เมื่อ keep
+        """
+        kinds = {}
+        for kind, size, _, _ in self.messages:
+            entry = kinds.setdefault(kind, [0, 0])
+            entry[0] += 1
+            entry[1] += size
+        report = {
+            'bytes': self.total,
+            'messages': len(self.messages),
+            'refs': kinds.get('ref_hash', [0])[0],
+            'kinds': dict(sorted(kinds.items(), key=lambda item: -item[1][1])),
+            'sent': list(self.messages),
+        }
+        if self.keep:
+            report['raw'] = list(self.raw)
+        return report
@@ -0,0 +1,222 @@
+"""
+คำนวณแบบเพิ่มส่วน (incremental) ด้วยกราฟพึ่งพาของขั้นตอนการออกแบบ
+
+แต่ละ node รับค่า input ที่ตั้งชื่อไว้หรือผลของ node อื่น และถูกแคชตาม input ของตัวเองเท่านั้น
+เมื่อแก้ค่าใดค่าหนึ่ง (เช่น Vu) จะคำนวณใหม่เฉพาะ node ที่อยู่ปลายน้ำของค่านั้น:
+
+    fc, fy ─→ materials ─→ rho_limits ─→ flexure ─→ checks ─→ design
+                      └──────────────→ shear ───┘
+    d, stirrup_* ─────────────────→ stirrups ──┘
+
+pipeline.run(inputs) คืนค่า PipelineRun ที่บอกด้วยว่ารอบนี้ node ใดถูกคำนวณจริง (ran) และ node ใดได้จากแคช
+node ที่เพิ่มด้วย persist=True (เช่นรายงาน PDF) ถูกเก็บในแคชบนดิสก์ด้วย (ถ้าเปิดใช้ ดู beam_design.disk_cache)
+"""
+import hashlib
+import inspect
+import time
+from collections import namedtuple
+
+from .cache import PIPELINE_CACHE, normalize_value
+from .engine import (
+    CALCULATION_RESULTS,
+    design_checks,
+    design_results,
+    flexure_design,
+    material_constants,
+    rho_limits,
+    shear_design,
+    stirrup_design,
+)
+from .metrics import CALCULATION_ERRORS, STAGE_SECONDS
+from .trace import Trace
+
+Node = namedtuple('Node', ['name', 'func', 'inputs', 'persist'])
+
+# ผลการรันหนึ่งครั้ง: ค่าของทุก node ที่ร้องขอ, ชื่อ node ที่คำนวณใหม่ และชื่อ node ที่ได้จากแคช (ตามลำดับการรัน)
+PipelineRun = namedtuple('PipelineRun', ['values', 'ran', 'cached'])
+
+
+class Pipeline:
+    """
+    กราฟของ node ที่เพิ่มตามลำดับการพึ่งพา (input ของ node ต้องเป็นชื่อ input ภายนอกหรือ node ที่เพิ่มไว้ก่อน)
+    ชื่อที่ไม่ใช่ node ถือเป็น input ภายนอกที่ต้องส่งให้ run()
+    """
+
+    def __init__(self, cache=PIPELINE_CACHE):
+        self.nodes = {}
+        self.cache = cache
+
+    def add(self, name, func, inputs, persist=False):
+        if name in self.nodes:
+            raise ValueError(f'มี node ชื่อ {name} อยู่แล้ว')
+        # key บนดิสก์รวม hash ของซอร์สของ node เอง แก้ฟังก์ชันของ node แล้วผลเดิมบนดิสก์จะไม่ถูกใช้
+        self.nodes[name] = Node(name, func, tuple(inputs), _source_digest(func) if persist else None)
+        return func
+
+    def node(self, *inputs, name=None, persist=False):
+        """
+        decorator สำหรับเพิ่มฟังก์ชันเป็น node ฟังก์ชันถูกเรียกด้วย input ตามลำดับที่ระบุ
+        persist=True: เก็บผลในแคชบนดิสก์ด้วย (ใช้กับ node ที่คำนวณนานและผล pickle ได้ ต้นน้ำต้องเป็น input ภายนอก
+        หรือ node ที่ persist เช่นกัน)
+        """
+        def decorator(func):
+            return self.add(name or func.__name__, func, inputs, persist)
+        return decorator
+
+    def external_inputs(self):
+        """
+        ชื่อ input ภายนอกทั้งหมดที่ node ใช้
+        """
+        names = []
+        for node in self.nodes.values():
+            names.extend(name for name in node.inputs if name not in self.nodes and name not in names)
+        return names
+
+    def downstream(self, changed):
+        """
+        ชื่อ node ที่ต้องคำนวณใหม่เมื่อ input (หรือ node) ในรายการ changed เปลี่ยน
+        """
+        affected = set(changed)
+        for node in self.nodes.values():
+            if affected.intersection(node.inputs):
+                affected.add(node.name)
+        return [name for name in self.nodes if name in affected]
+
+    def _required(self, targets):
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name in needed or name not in self.nodes:
+                continue
+            needed.add(name)
+            stack.extend(self.nodes[name].inputs)
+        return [name for name in self.nodes if name in needed]
+
+    def run(self, inputs, targets=None):
+        """
+        คำนวณ node ที่ร้องขอ (ค่าเริ่มต้น: ทุก node) จาก inputs {ชื่อ: ค่า}
+        key ของแต่ละ node คือ input ภายนอกที่ normalize แล้วและ key ของ node ต้นน้ำ
+        จึงไม่ต้อง hash ผลลัพธ์ของ node (เช่น dict หรือกราฟ) ผลที่ได้จากแคชใช้ร่วมกัน ห้ามแก้ไข
+        """
+        names = self._required(targets if targets is not None else self.nodes)
+        keys, values, ran, cached = {}, {}, [], []
+        for name in names:
+            node = self.nodes[name]
+            parts = []
+            for dep in node.inputs:
+                if dep in self.nodes:
+                    parts.append(keys[dep])
+                elif dep in inputs:
+                    parts.append(normalize_value(inputs[dep]))
+                else:
+                    raise KeyError(f'node {name} ต้องการ input: {dep}')
+            keys[name] = key = (name, tuple(parts))
+            args = [values[dep] if dep in self.nodes else inputs[dep] for dep in node.inputs]
+            if node.persist:
+                computed = []
+                value = self.cache.get_or_compute(key, lambda: computed.append(name) or _call(node, args),
+                                                  disk_key=(key, node.persist))
+                (ran if computed else cached).append(name)
+            else:
+                missing = object()
+                value = self.cache.get(key, missing)
+                if value is missing:
+                    value = _call(node, args)
+                    self.cache.put(key, value)
+                    ran.append(name)
+                else:
+                    cached.append(name)
+            values[name] = value
+        return PipelineRun(values, ran, cached)
+
+
+def _call(node, args):
+    """
+    เรียกฟังก์ชันของ node และบันทึกเวลาใน beam_design_stage_seconds
+    """
+    start = time.perf_counter()
+    value = node.func(*args)
+    STAGE_SECONDS.observe(time.perf_counter() - start, stage=node.name)
+    return value
+
+
+def _source_digest(func):
+    """
+    hash ของซอร์สของฟังก์ชัน (bytecode ถ้าหาซอร์สไม่ได้)
+    """
+    try:
+        source = inspect.getsource(func).encode()
+    except (OSError, TypeError):
+        source = func.__code__.co_code
+    return hashlib.sha256(source).hexdigest()[:16]
+
+
+def _stage(func, *args):
+    """
+    เรียกขั้นตอนของ engine ด้วย Trace ของตัวเอง คืนค่า (ผลลัพธ์, trace)
+    ข้อผิดพลาดถูกนับเหมือนใน calculate_beam_design แล้วส่งต่อ
+    """
+    trace = Trace()
+    try:
+        return func(*args, trace), trace
+    except Exception as e:
+        CALCULATION_ERRORS.inc(exception=type(e).__name__)
+        CALCULATION_RESULTS['error'].inc()
+        raise
+
+
+def design_pipeline(cache=PIPELINE_CACHE):
+    """
+    pipeline ของ calculate_beam_design แยกเป็นขั้นตอน ผลของ node 'design' เหมือน calculate_beam_design ทุกค่า
+    (รวม trace) ต่างกันเพียงข้อผิดพลาดจะถูกส่งต่อเป็น exception แทนการเก็บใน results['error']
+
+    input ภายนอก: fc, fy, b, h, d, Mu, Vu, stirrup_type, stirrup_legs, stirrup_spacing,
+    tension_steel_type, tension_steel_count, compression_steel, compression_steel_type,
+    compression_steel_count, d_prime
+    """
+    pipeline = Pipeline(cache)
+
+    @pipeline.node('fc', 'fy', 'b', 'h', 'd')
+    def materials(fc, fy, b, h, d):
+        return _stage(material_constants, fc, fy, b, h, d)
+
+    @pipeline.node('fc', 'fy', 'materials', name='rho_limits')
+    def limits(fc, fy, materials):
+        return _stage(rho_limits, fc, fy, materials[0]['beta1'])
+
+    @pipeline.node('fc', 'fy', 'b', 'd', 'Mu', 'tension_steel_type', 'tension_steel_count', 'compression_steel',
+                   'compression_steel_type', 'compression_steel_count', 'd_prime', 'materials', 'rho_limits')
+    def flexure(fc, fy, b, d, Mu, tension_steel_type, tension_steel_count, compression_steel,
+                compression_steel_type, compression_steel_count, d_prime, materials, limits):
+        return _stage(flexure_design, fc, fy, b, d, Mu, tension_steel_type, tension_steel_count, compression_steel,
+                      compression_steel_type, compression_steel_count, d_prime,
+                      materials[0]['phi_b'], limits[0]['rho_min'], limits[0]['rho_max'])
+
+    @pipeline.node('fc', 'b', 'd', 'Vu', 'materials')
+    def shear(fc, b, d, Vu, materials):
+        return _stage(shear_design, fc, b, d, Vu, materials[0]['phi_s'])
+
+    @pipeline.node('d', 'stirrup_type', 'stirrup_legs', 'stirrup_spacing')
+    def stirrups(d, stirrup_type, stirrup_legs, stirrup_spacing):
+        return _stage(stirrup_design, d, stirrup_type, stirrup_legs, stirrup_spacing)
+
+    @pipeline.node('b', 'h', 'Mu', 'Vu', 'tension_steel_type', 'stirrup_spacing',
+                   'rho_limits', 'flexure', 'shear', 'stirrups')
+    def checks(b, h, Mu, Vu, tension_steel_type, stirrup_spacing, limits, flexure, shear, stirrups):
+        flexure = flexure[0]
+        return _stage(design_checks, b, h, Mu, Vu, tension_steel_type, stirrup_spacing, flexure['As_required'],
+                      flexure['As_provided_tension'], flexure['rho_required'], limits[0]['rho_max'],
+                      flexure['phi_Mn'], shear[0]['phi_Vc'], stirrups[0]['max_spacing'])
+
+    @pipeline.node('materials', 'rho_limits', 'flexure', 'shear', 'stirrups', 'checks')
+    def design(*stages):
+        results = design_results(*(result for result, _ in stages))
+        trace = Trace()
+        for _, steps in stages:
+            trace.extend(steps)
+        results['trace'] = trace
+        CALCULATION_RESULTS['pass' if results['design_ok'] else 'fail'].inc()
+        return results
+
+    return pipeline
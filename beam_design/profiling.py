@@ -0,0 +1,95 @@
+"""
+จับเวลาแต่ละขั้นตอนของการรันหน้าเว็บ (เปิดใช้เมื่อต้องการเท่านั้น)
+
+เปิดด้วย environment variable BEAM_PROFILE=1 หรือ query parameter ?profile=1
+เมื่อปิดอยู่จะใช้ NullTimer ซึ่งไม่ทำอะไรเลย (เหมือน NullTrace ใน trace.py)
+"""
+import os
+import time
+
+ENV_VAR = 'BEAM_PROFILE'
+QUERY_PARAM = 'profile'
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+
+def profiling_enabled(query_params=None):
+    """
+    True ถ้าเปิดการจับเวลาไว้ด้วย environment variable หรือ query parameter
+    """
+    if os.environ.get(ENV_VAR, '').lower() in TRUE_VALUES:
+        return True
+    return bool(query_params) and str(query_params.get(QUERY_PARAM, '')).lower() in TRUE_VALUES
+
+
+class StageTimer:
+    """
+    จับเวลาแบบ lap: lap(name) บันทึกเวลาตั้งแต่ lap ก่อนหน้า (หรือตอนสร้าง) ในชื่อ name
+    """
+
+    def __init__(self):
+        self.stages = []
+        self.start = self._last = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self.stages.append((name, now - self._last))
+        self._last = now
+
+    def total(self):
+        return self._last - self.start
+
+    def breakdown(self):
+        """
+        รายการ {ขั้นตอน, ms, %} รวมชื่อซ้ำเข้าด้วยกัน เรียงตามลำดับที่เกิดขึ้น
+        """
+        totals = {}
+        for name, seconds in self.stages:
+            totals[name] = totals.get(name, 0.0) + seconds
+        total = self.total() or 1.0
+        return [{'ขั้นตอน': name, 'ms': seconds * 1000, '%': seconds / total * 100}
+                for name, seconds in totals.items()]
+
+
+class NullTimer:
+    """
+    timer ที่ไม่บันทึกอะไร ใช้เมื่อปิดการจับเวลา
+    """
+    stages = ()
+
+    def lap(self, name):
+        pass
+
+
+def make_timer(enabled):
+    return StageTimer() if enabled else NullTimer()
+
+
+def start_profile():
+    """
+    เริ่ม cProfile สำหรับการรันครั้งนี้ คืนค่า None ถ้ามี profiler อื่นทำงานอยู่ (เช่น อีก session)
+    """
+    import cProfile
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        return None
+    return profiler
+
+
+def finish_profile(profiler, limit=30):
+    """
+    หยุด profiler คืนค่า (ข้อมูลรูปแบบเดียวกับไฟล์ .prof ที่เปิดด้วย pstats ได้, สรุปฟังก์ชันที่ใช้เวลามากที่สุด)
+    """
+    import io
+    import marshal
+    import pstats
+
+    profiler.disable()
+    profiler.create_stats()
+    # ต้อง dump ก่อนสร้าง pstats.Stats เพราะ Stats จะย้าย profiler.stats ออกไป
+    dump = marshal.dumps(profiler.stats)
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(limit)
+    return dump, stream.getvalue()
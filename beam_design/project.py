@@ -0,0 +1,262 @@
+"""
+เก็บคานทั้งโปรเจกต์ (รหัสคาน, ชั้น, ข้อมูลนำเข้าและผลการตรวจสอบ) ในฐานข้อมูล SQLite ไฟล์เดียว
+
+    conn = open_project('project.db')
+    upsert_beams(conn, beams)       # เพิ่ม/แก้ไขตาม (level, mark) แถวที่ข้อมูลไม่เปลี่ยนจะไม่ถูกแตะ
+    recompute(conn)                 # คำนวณใหม่เฉพาะแถวที่ข้อมูลเปลี่ยน (stale = 1) ด้วย batch engine
+    query_beams(conn, level='3', max_moment_ratio=1.05)
+
+แต่ละแถวเก็บ hash ของข้อมูลนำเข้าไว้ จึงรู้ได้ทันทีว่าแถวใดต้องคำนวณใหม่โดยไม่ต้องเทียบทุกคอลัมน์
+คอลัมน์ที่ใช้ค้นหาบ่อย (ชั้น, อัตราส่วน φMn/Mu และ φVc/Vu, คานที่ไม่ผ่าน) มี index
+"""
+import hashlib
+import math
+import sqlite3
+
+# ข้อมูลนำเข้าของคานแต่ละตัว {ชื่อคอลัมน์: ชนิดใน SQLite} หน่วยเหมือนหน้าเว็บ ใช้ cover แทน d
+INPUT_COLUMNS = {
+    'fc': 'REAL', 'fy': 'REAL', 'b': 'REAL', 'h': 'REAL', 'cover': 'REAL', 'Mu': 'REAL', 'Vu': 'REAL',
+    'stirrup_type': 'TEXT', 'stirrup_legs': 'INTEGER', 'stirrup_spacing': 'REAL',
+    'tension_steel_type': 'TEXT', 'tension_steel_count': 'INTEGER',
+    'compression_steel_type': 'TEXT', 'compression_steel_count': 'INTEGER', 'd_prime': 'REAL',
+}
+
+# ค่าเริ่มต้นของคอลัมน์ที่ไม่ต้องระบุ (ไม่มีเหล็กรับแรงอัด)
+OPTIONAL_INPUTS = {'compression_steel_type': None, 'compression_steel_count': 0, 'd_prime': 4.0}
+
+# ผลการตรวจสอบที่เก็บต่อจากข้อมูลนำเข้า
+RESULT_COLUMNS = {
+    'As_required': 'REAL', 'As_provided_tension': 'REAL', 'rho_required': 'REAL', 'rho_max': 'REAL',
+    'phi_Mn': 'REAL', 'phi_Vc': 'REAL', 'moment_ratio': 'REAL', 'shear_ratio': 'REAL',
+    'moment_check': 'INTEGER', 'shear_check': 'INTEGER', 'tension_steel_adequate': 'INTEGER',
+    'stirrup_adequate': 'INTEGER', 'rho_check': 'INTEGER', 'design_ok': 'INTEGER', 'error': 'INTEGER',
+}
+
+# ลำดับที่เรียงผลการค้นหาได้ (ทุกแบบมี index รองรับ)
+ORDER_BY = {
+    'mark': 'level, mark',
+    'moment_ratio': 'moment_ratio, level, mark',
+    'shear_ratio': 'shear_ratio, level, mark',
+}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS beams (
+    id INTEGER PRIMARY KEY,
+    level TEXT NOT NULL DEFAULT '',
+    mark TEXT NOT NULL,
+    {', '.join(f'{name} {kind}' for name, kind in INPUT_COLUMNS.items())},
+    input_hash TEXT NOT NULL,
+    stale INTEGER NOT NULL DEFAULT 1,
+    {', '.join(f'{name} {kind}' for name, kind in RESULT_COLUMNS.items())},
+    UNIQUE (level, mark)
+);
+CREATE INDEX IF NOT EXISTS idx_beams_level_moment ON beams (level, moment_ratio);
+CREATE INDEX IF NOT EXISTS idx_beams_level_shear ON beams (level, shear_ratio);
+CREATE INDEX IF NOT EXISTS idx_beams_moment ON beams (moment_ratio);
+CREATE INDEX IF NOT EXISTS idx_beams_shear ON beams (shear_ratio);
+CREATE INDEX IF NOT EXISTS idx_beams_failed ON beams (level, mark) WHERE design_ok = 0;
+CREATE INDEX IF NOT EXISTS idx_beams_stale ON beams (id) WHERE stale = 1;
+"""
+
+
+def open_project(path):
+    """
+    เปิด (หรือสร้าง) ไฟล์โปรเจกต์ คืนค่า sqlite3.Connection ที่สร้างตารางและ index ไว้แล้ว
+    """
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    if path != ':memory:':
+        # WAL: อ่าน (หน้าเว็บหลาย session) ได้ระหว่างที่มีการเขียน
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+# (ชื่อคอลัมน์, ฟังก์ชันแปลงชนิด) ตามลำดับ INPUT_COLUMNS เตรียมไว้ครั้งเดียวเพราะ _normalize ถูกเรียกทุกแถว
+_CONVERTERS = tuple((name, {'REAL': float, 'INTEGER': int, 'TEXT': str}[kind]) for name, kind in INPUT_COLUMNS.items())
+
+
+def _normalize(beam):
+    """
+    แปลงข้อมูลคาน (dict) เป็น tuple ตามลำดับ INPUT_COLUMNS โดยแปลงชนิดให้ตรงกัน
+    (เช่น b = 30 และ 30.0 ได้ hash เดียวกัน) ค่าว่าง/NaN ของคอลัมน์ที่ไม่บังคับใช้ค่าเริ่มต้น
+    """
+    values = []
+    for name, convert in _CONVERTERS:
+        value = beam.get(name)
+        if value is None or value != value:
+            if name not in OPTIONAL_INPUTS:
+                raise ValueError(f"คาน {beam.get('mark')}: ไม่พบข้อมูล {name}")
+            value = OPTIONAL_INPUTS[name]
+            if value is None:
+                values.append(None)
+                continue
+        values.append(convert(value))
+    return tuple(values)
+
+
+def input_hash(values):
+    """
+    hash ของข้อมูลนำเข้าที่ normalize แล้ว ใช้ตัดสินว่าแถวต้องคำนวณใหม่หรือไม่
+    """
+    return hashlib.blake2b(repr(values).encode(), digest_size=12).hexdigest()
+
+
+def upsert_beams(conn, beams):
+    """
+    เพิ่มหรือแก้ไขคานตาม (level, mark) จาก iterable ของ dict หรือ DataFrame
+    แถวที่ hash ของข้อมูลนำเข้าเท่าเดิมจะไม่ถูกเขียนทับ (ผลการตรวจสอบเดิมยังใช้ได้)
+    แถวที่เพิ่มใหม่หรือข้อมูลเปลี่ยนจะถูกตั้ง stale = 1 คืนค่าจำนวนแถวดังกล่าว
+    """
+    if hasattr(beams, 'to_dict'):
+        beams = beams.to_dict('records')
+    columns = ['level', 'mark', *INPUT_COLUMNS, 'input_hash']
+    updates = ', '.join(f'{name} = excluded.{name}' for name in [*INPUT_COLUMNS, 'input_hash'])
+    sql = (f"INSERT INTO beams ({', '.join(columns)}, stale) VALUES ({', '.join('?' * len(columns))}, 1) "
+           f"ON CONFLICT (level, mark) DO UPDATE SET {updates}, stale = 1 "
+           f"WHERE beams.input_hash != excluded.input_hash")
+
+    def rows():
+        for beam in beams:
+            if not beam.get('mark'):
+                raise ValueError("คานทุกตัวต้องมีรหัส (mark)")
+            values = _normalize(beam)
+            level = beam.get('level')
+            level = '' if level is None or level != level else str(level)
+            yield (level, str(beam['mark']), *values, input_hash(values))
+
+    before = conn.total_changes
+    with conn:
+        conn.executemany(sql, rows())
+    return conn.total_changes - before
+
+
+def delete_beams(conn, keys):
+    """
+    ลบคานตามรายการ (level, mark) คืนค่าจำนวนแถวที่ลบ
+    """
+    before = conn.total_changes
+    with conn:
+        conn.executemany('DELETE FROM beams WHERE level = ? AND mark = ?', keys)
+    return conn.total_changes - before
+
+
+def recompute(conn, chunksize=20_000):
+    """
+    คำนวณผลการตรวจสอบใหม่เฉพาะแถวที่ stale = 1 ทีละ chunk ด้วย calculate_beam_design_batch
+    คืนค่าจำนวนแถวที่คำนวณ
+    """
+    import numpy as np
+
+    from .engine import calculate_beam_design_batch
+
+    select = f"SELECT id, {', '.join(INPUT_COLUMNS)} FROM beams WHERE stale = 1 LIMIT {int(chunksize)}"
+    update = (f"UPDATE beams SET {', '.join(f'{name} = ?' for name in RESULT_COLUMNS)}, stale = 0 "
+              f"WHERE id = ?")
+    total = 0
+    while True:
+        rows = conn.execute(select).fetchall()
+        if not rows:
+            break
+        columns = dict(zip(['id', *INPUT_COLUMNS], zip(*rows)))
+        numeric = {name: np.array(columns[name], dtype=float)
+                   for name, kind in INPUT_COLUMNS.items() if kind != 'TEXT'}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            results = calculate_beam_design_batch(
+                numeric['fc'], numeric['fy'], numeric['b'], numeric['h'], numeric['h'] - numeric['cover'],
+                numeric['Mu'], numeric['Vu'], np.array(columns['stirrup_type']), numeric['stirrup_legs'],
+                numeric['stirrup_spacing'], np.array(columns['tension_steel_type']),
+                numeric['tension_steel_count'], numeric['compression_steel_count'] > 0,
+                np.array(columns['compression_steel_type']), numeric['compression_steel_count'],
+                numeric['d_prime'],
+            )
+            results['moment_ratio'] = results['phi_Mn'] / numeric['Mu']
+            results['shear_ratio'] = results['phi_Vc'] / numeric['Vu']
+        # ค่า NaN/inf ของแถวที่ผิดพลาดเก็บเป็น NULL
+        values = [
+            results[name].astype(int).tolist() if kind == 'INTEGER'
+            else [v if math.isfinite(v) else None for v in results[name].tolist()]
+            for name, kind in RESULT_COLUMNS.items()
+        ]
+        with conn:
+            conn.executemany(update, zip(*values, columns['id']))
+        total += len(rows)
+    conn.execute('PRAGMA optimize')
+    return total
+
+
+def _where(level=None, failed_only=False, max_moment_ratio=None, max_shear_ratio=None, mark=None):
+    clauses, params = [], []
+    if level is not None:
+        clauses.append('level = ?')
+        params.append(str(level))
+    if failed_only:
+        clauses.append('design_ok = 0')
+    if max_moment_ratio is not None:
+        clauses.append('moment_ratio < ?')
+        params.append(float(max_moment_ratio))
+    if max_shear_ratio is not None:
+        clauses.append('shear_ratio < ?')
+        params.append(float(max_shear_ratio))
+    if mark:
+        clauses.append("mark LIKE ? ESCAPE '\\'")
+        params.append(mark.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+    return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+
+def query_beams(conn, level=None, failed_only=False, max_moment_ratio=None, max_shear_ratio=None, mark=None,
+                order_by='mark', limit=50, offset=0):
+    """
+    ค้นหาคานตามเงื่อนไข (ทุกเงื่อนไขเชื่อมด้วย AND) คืนค่า list ของ dict ทีละหน้า (limit/offset)
+    level: ชั้น, failed_only: เฉพาะคานที่ไม่ผ่าน, max_moment_ratio/max_shear_ratio: φMn/Mu หรือ φVc/Vu น้อยกว่าค่านี้,
+    mark: รหัสคานขึ้นต้นด้วยข้อความนี้, order_by: หนึ่งใน ORDER_BY
+    """
+    if order_by not in ORDER_BY:
+        raise ValueError(f"order_by ต้องเป็นหนึ่งใน {tuple(ORDER_BY)}")
+    where, params = _where(level, failed_only, max_moment_ratio, max_shear_ratio, mark)
+    rows = conn.execute(f'SELECT * FROM beams{where} ORDER BY {ORDER_BY[order_by]} LIMIT ? OFFSET ?',
+                        [*params, int(limit), int(offset)])
+    return [dict(row) for row in rows]
+
+
+def iter_beams(conn, level=None, failed_only=False, max_moment_ratio=None, max_shear_ratio=None, mark=None,
+               order_by='mark'):
+    """
+    คานทุกตัวที่ตรงเงื่อนไข (เงื่อนไขเหมือน query_beams) ทีละแถวจาก cursor ไม่โหลดทั้งตารางเข้าหน่วยความจำ
+    """
+    if order_by not in ORDER_BY:
+        raise ValueError(f"order_by ต้องเป็นหนึ่งใน {tuple(ORDER_BY)}")
+    where, params = _where(level, failed_only, max_moment_ratio, max_shear_ratio, mark)
+    for row in conn.execute(f'SELECT * FROM beams{where} ORDER BY {ORDER_BY[order_by]}', params):
+        yield dict(row)
+
+
+def count_beams(conn, level=None, failed_only=False, max_moment_ratio=None, max_shear_ratio=None, mark=None):
+    """
+    จำนวนคานที่ตรงเงื่อนไข (เงื่อนไขเหมือน query_beams) ใช้คำนวณจำนวนหน้า
+    """
+    where, params = _where(level, failed_only, max_moment_ratio, max_shear_ratio, mark)
+    return conn.execute(f'SELECT COUNT(*) FROM beams{where}', params).fetchone()[0]
+
+
+def project_summary(conn):
+    """
+    สรุปรายชั้น: list ของ dict (level, beams, failed, errors, stale) เรียงตามชื่อชั้น
+    """
+    rows = conn.execute(
+        'SELECT level, COUNT(*) AS beams, SUM(design_ok = 0) AS failed, SUM(error = 1) AS errors, '
+        'SUM(stale) AS stale FROM beams GROUP BY level ORDER BY level'
+    )
+    return [dict(row) for row in rows]
+
+
+def beam_design_inputs(beam):
+    """
+    แปลงแถวของโปรเจกต์เป็นข้อมูลสำหรับหน้าออกแบบ (loaded_design)
+    ค่าตัวเลขปัดเป็นจำนวนเต็มเพราะ widget ของหน้าออกแบบรับเฉพาะจำนวนเต็ม
+    """
+    design = {name: beam[name] if kind == 'TEXT' else round(beam[name])
+              for name, kind in INPUT_COLUMNS.items() if beam[name] is not None}
+    design['compression_steel'] = bool(beam['compression_steel_count'])
+    return design
@@ -0,0 +1,187 @@
+"""
+ตารางเหล็กเสริม (ชื่อ, ขนาด, พื้นที่) ที่ใช้ร่วมกันทั้งแพ็กเกจ และดัชนีชุดเหล็กรับแรงดึงสำหรับเลือกเหล็กที่น้อยที่สุด
+
+ชุดเหล็กคือเหล็กขนาดเดียว n เส้น หรือเหล็กสองขนาดผสมกัน (เหล็กเส้นใหญ่อยู่ที่มุม 2 เส้นขึ้นไป) วางเป็นชั้นเดียว
+ดัชนีเก็บชุดเหล็กที่เรียงตามพื้นที่ไว้แยกตามความกว้างที่ชุดนั้นต้องใช้ การหาชุดที่พื้นที่น้อยที่สุด ≥ As_required
+และวางได้ในความกว้าง b จึงเป็น binary search (np.searchsorted) ครั้งเดียวสำหรับทุกคานใน batch
+
+    >>> select_bars(As_required=10.5, b=30, cover=4)['label']
+    '3 DB20 + 1 DB12'
+
+น้ำหนักต่อเมตรแปรผันตามพื้นที่ (STEEL_UNIT_WEIGHT) ชุดที่พื้นที่น้อยที่สุดจึงเป็นชุดที่เบาที่สุดด้วย
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+# ตารางเหล็กแบบคอลัมน์: ชื่อ, เส้นผ่านศูนย์กลาง (mm), พื้นที่หน้าตัด (cm²)
+BarTable = namedtuple('BarTable', ['names', 'diameters', 'areas'])
+
+# เหล็กรับแรงดึง/แรงอัด
+MAIN_BARS = BarTable(
+    names=('DB12', 'DB16', 'DB20', 'DB25', 'DB32'),
+    diameters=(12, 16, 20, 25, 32),
+    areas=(1.13, 2.01, 3.14, 4.91, 8.04),
+)
+
+# เหล็กปลอก
+STIRRUP_BARS = BarTable(
+    names=('RB6', 'RB9', 'DB12'),
+    diameters=(6, 9, 12),
+    areas=(0.283, 0.636, 1.131),
+)
+
+# กำลังครากของเหล็กปลอก (kg/cm²): เหล็กกลม RB เป็น SR24, เหล็กข้ออ้อย DB เป็น SD40
+STIRRUP_YIELD = {name: 2400 if name.startswith('RB') else 4000 for name in STIRRUP_BARS.names}
+
+# น้ำหนักเหล็กต่อความยาว 1 m ต่อพื้นที่ 1 cm² (ความหนาแน่น 7850 kg/m³)
+STEEL_UNIT_WEIGHT = 0.785
+
+# ระยะช่องว่างระหว่างเหล็กขั้นต่ำ (cm) ใช้ค่าที่มากกว่าระหว่างค่านี้กับขนาดเหล็กเส้นใหญ่สุด
+MIN_CLEAR_SPACING = 2.5
+
+# จำนวนเส้นสูงสุดต่อชั้นเริ่มต้นของดัชนี (เท่ากับจำนวนเส้นสูงสุดในหน้าเว็บ)
+MAX_BARS = 10
+
+
+def bar_areas(table):
+    """
+    {ชื่อ: พื้นที่ (cm²)} ของตารางเหล็ก
+    """
+    return dict(zip(table.names, table.areas))
+
+
+def bar_diameters(table):
+    """
+    {ชื่อ: เส้นผ่านศูนย์กลาง (mm)} ของตารางเหล็ก
+    """
+    return dict(zip(table.names, table.diameters))
+
+
+def layer_width(bars):
+    """
+    ความกว้าง (cm) ที่เหล็กชั้นเดียวใช้ ไม่รวม cover: ผลรวมขนาดเหล็ก + ช่องว่างระหว่างเหล็ก
+    bars เป็นรายการ (เส้นผ่านศูนย์กลาง mm, จำนวนเส้น)
+    """
+    bars = [(diameter / 10, count) for diameter, count in bars if count > 0]
+    count = sum(n for _, n in bars)
+    if count == 0:
+        return 0.0
+    largest = max(db for db, _ in bars)
+    return sum(db * n for db, n in bars) + (count - 1) * max(MIN_CLEAR_SPACING, largest)
+
+
+def bar_label(main_type, main_count, second_type='', second_count=0):
+    """
+    ข้อความของชุดเหล็ก เช่น '3 DB16' หรือ '2 DB25 + 1 DB12'
+    """
+    label = f"{main_count} {main_type}"
+    return f"{label} + {second_count} {second_type}" if second_count else label
+
+
+class BarCombinations:
+    """
+    ดัชนีชุดเหล็กรับแรงดึงที่เรียงตามพื้นที่ (สร้างผ่าน bar_combinations() เพื่อใช้ดัชนีเดิมซ้ำ)
+
+    ชุดเหล็กถูกเก็บเป็น array แบบคอลัมน์ (main_type, main_count, second_type, second_count, area, width)
+    และตาราง keys ขนาด (จำนวนความกว้างที่ต่างกัน × จำนวนชุด): แถว j เรียงพื้นที่ของชุดที่กว้างไม่เกิน widths[j]
+    ต่อท้ายด้วยค่าว่าง key ของแถว j บวก j × stride ไว้ ทั้งตารางจึงเรียงกันเป็น array เดียว
+    """
+
+    def __init__(self, bar_types=MAIN_BARS.names, max_bars=MAX_BARS, mixed=True):
+        import numpy as np
+
+        diameters, areas = bar_diameters(MAIN_BARS), bar_areas(MAIN_BARS)
+        unknown = [name for name in bar_types if name not in diameters]
+        if unknown:
+            raise ValueError(f"ไม่รู้จักเหล็ก: {', '.join(unknown)}")
+        types = sorted(set(bar_types), key=diameters.get, reverse=True)
+
+        rows = []  # (เหล็กหลัก, จำนวน, เหล็กรอง, จำนวน)
+        for i, large in enumerate(types):
+            rows.extend((large, n, '', 0) for n in range(2, max_bars + 1))
+            if mixed:
+                for small in types[i + 1:]:
+                    rows.extend((large, n_large, small, n_small)
+                                for n_large in range(2, max_bars)
+                                for n_small in range(1, max_bars - n_large + 1))
+
+        area = np.array([areas[m] * nm + (areas[s] * ns if ns else 0.0) for m, nm, s, ns in rows])
+        width = np.array([layer_width(((diameters[m], nm), (diameters.get(s, 0), ns))) for m, nm, s, ns in rows])
+        count = np.array([nm + ns for _, nm, _, ns in rows])
+        # เรียงตามพื้นที่ ถ้าเท่ากันเลือกชุดที่จำนวนเส้นน้อยกว่า แล้วจึงแคบกว่า
+        order = np.lexsort((width, count, area))
+        self.main_type = np.array([rows[i][0] for i in order])
+        self.main_count = np.array([rows[i][1] for i in order])
+        self.second_type = np.array([rows[i][2] for i in order])
+        self.second_count = np.array([rows[i][3] for i in order])
+        self.area, self.width = area[order], width[order]
+
+        self.widths = np.unique(self.width)
+        fits = self.width[None, :] <= self.widths[:, None]
+        self.sizes = fits.sum(axis=1)
+        size = self.area.size
+        self.stride = float(np.ceil(self.area.max())) + 1
+        columns = np.arange(size)
+        # ตำแหน่งในแต่ละแถวของชุดที่วางได้ (เรียงตามพื้นที่อยู่แล้ว) ช่องที่เหลือเป็นค่าว่าง
+        self.ids = np.full((self.widths.size, size), -1)
+        keys = np.full((self.widths.size, size), self.stride - 0.5)
+        for j in range(self.widths.size):
+            chosen = columns[fits[j]]
+            self.ids[j, :chosen.size] = chosen
+            keys[j, :chosen.size] = self.area[chosen]
+        self.keys = (keys + self.stride * np.arange(self.widths.size)[:, None]).ravel()
+
+    def __len__(self):
+        return self.area.size
+
+    def select(self, As_required, b, cover=4):
+        """
+        ชุดเหล็กที่พื้นที่น้อยที่สุดที่ ≥ As_required และวางได้ในความกว้าง b (cm, หักด้านละ cover)
+        รับค่า scalar หรือ array (broadcast กัน) คืนค่า dict ของ array:
+        found, index (ลำดับชุดในดัชนี หรือ -1), tension_steel_type, tension_steel_count,
+        second_steel_type, second_steel_count, As_provided, weight (kg/m), required_width (cm รวม cover)
+        """
+        import numpy as np
+
+        As_required, b, cover = np.broadcast_arrays(
+            np.asarray(As_required, dtype=float), np.asarray(b, dtype=float), np.asarray(cover, dtype=float))
+        row = np.searchsorted(self.widths, b - 2 * cover, side='right') - 1
+        valid = (row >= 0) & np.isfinite(As_required) & (As_required <= self.area.max())
+        row = np.where(valid, row, 0)
+        column = np.searchsorted(self.keys, row * self.stride + np.maximum(As_required, 0)) - row * len(self)
+        found = valid & (column < self.sizes[row])
+        index = np.where(found, self.ids[row, np.where(found, column, 0)], -1)
+
+        safe = np.where(found, index, 0)
+        return {
+            'found': found,
+            'index': index,
+            'tension_steel_type': np.where(found, self.main_type[safe], ''),
+            'tension_steel_count': np.where(found, self.main_count[safe], 0),
+            'second_steel_type': np.where(found, self.second_type[safe], ''),
+            'second_steel_count': np.where(found, self.second_count[safe], 0),
+            'As_provided': np.where(found, self.area[safe], np.nan),
+            'weight': np.where(found, self.area[safe] * STEEL_UNIT_WEIGHT, np.nan),
+            'required_width': np.where(found, self.width[safe] + 2 * cover, np.nan),
+        }
+
+
+@lru_cache(maxsize=8)
+def bar_combinations(bar_types=MAIN_BARS.names, max_bars=MAX_BARS, mixed=True):
+    """
+    ดัชนีชุดเหล็ก (สร้างครั้งแรกแล้วใช้ซ้ำ) bar_types ต้องเป็น tuple
+    """
+    return BarCombinations(tuple(bar_types), max_bars, mixed)
+
+
+def select_bars(As_required, b, cover=4, bar_types=MAIN_BARS.names, max_bars=MAX_BARS, mixed=True):
+    """
+    ชุดเหล็กที่พื้นที่น้อยที่สุดสำหรับคาน 1 ตัว คืนค่า dict (ค่าแบบ Python และ label) หรือ None ถ้าไม่มีชุดที่วางได้
+    """
+    selected = bar_combinations(tuple(bar_types), max_bars, mixed).select(As_required, b, cover)
+    if not selected['found']:
+        return None
+    result = {name: value.item() for name, value in selected.items() if name not in ('found', 'index')}
+    result['label'] = bar_label(result['tension_steel_type'], result['tension_steel_count'],
+                                result['second_steel_type'], result['second_steel_count'])
+    return result
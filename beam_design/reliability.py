@@ -0,0 +1,233 @@
+"""
+ความน่าเชื่อถือของคาน (Monte Carlo): สุ่ม fc, fy, b, d และแรงกระทำ Mu, Vu ตามการแจกแจงที่กำหนด
+แล้วนับกรณีที่กำลังระบุ (ไม่คูณ φ) น้อยกว่าแรงกระทำ ได้ความน่าจะเป็นที่จะวิบัติ P_f และดัชนี β = -Φ⁻¹(P_f)
+
+    from beam_design.reliability import iter_reliability
+    for estimate in iter_reliability(beam, samples=10_000_000, workers=4):
+        print(estimate['samples'], estimate['pf'], estimate['beta'])
+
+กำลังคำนวณด้วยสูตรเดียวกับ calculate_beam_design_batch: Mn (เหล็กรับแรงดึงและแรงอัด) และ Vc = 0.53√fc·b·d
+ส่วนแรงกระทำสุ่มรอบ Mu, Vu ที่ป้อน (เป็นค่าที่คูณตัวคูณน้ำหนักแล้ว ค่าเฉลี่ยจริงจึงต่ำกว่า ดู bias)
+
+ตัวอย่างถูกแบ่งเป็นกลุ่มละ chunksize แต่ละกลุ่มมี seed ของตัวเองจาก SeedSequence.spawn
+ผลจึงเหมือนเดิมทุกครั้งเมื่อใช้ seed, samples และ chunksize เดียวกัน ไม่ว่าจะใช้กี่ worker
+กลุ่มถูกส่งเข้า process pool ค้างไว้ไม่เกิน 2 × workers กลุ่ม และเก็บเฉพาะจำนวนที่นับได้
+หน่วยความจำจึงคงที่ไม่ว่าจะสุ่มกี่ตัวอย่าง
+"""
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from statistics import NormalDist
+
+from .engine import BATCH_INPUT_COLUMNS
+
+# ตัวแปรสุ่ม {ชื่อ: การแจกแจง} bias = ค่าเฉลี่ย/ค่าที่ป้อน, cov = ส่วนเบี่ยงเบนมาตรฐาน/ค่าเฉลี่ย
+# ค่าเริ่มต้นโดยประมาณจากงานสอบเทียบ ACI 318 (กำลังวัสดุ, ขนาดหน้าตัด) และ Mu, Vu ที่ป้อนเป็นค่าคูณตัวคูณแล้ว
+# (ตัวคูณน้ำหนักเฉลี่ยราว 1.55 ค่าเฉลี่ยของแรงกระทำจริงจึงราว 0.65 เท่า)
+DEFAULT_VARIABLES = {
+    'fc': {'distribution': 'lognormal', 'bias': 1.15, 'cov': 0.15},
+    'fy': {'distribution': 'lognormal', 'bias': 1.10, 'cov': 0.08},
+    'b': {'distribution': 'normal', 'bias': 1.00, 'cov': 0.02},
+    'd': {'distribution': 'normal', 'bias': 0.98, 'cov': 0.04},
+    'Mu': {'distribution': 'gumbel', 'bias': 0.65, 'cov': 0.20},
+    'Vu': {'distribution': 'gumbel', 'bias': 0.65, 'cov': 0.20},
+}
+
+DISTRIBUTIONS = ('fixed', 'normal', 'lognormal', 'gumbel')
+
+# ค่าเริ่มต้นของจำนวนตัวอย่างต่อกลุ่ม (งานหนึ่งชิ้นของ worker, ราว 40 MB)
+RELIABILITY_CHUNKSIZE = 200_000
+
+# โหมดการวิบัติที่นับ: ดัด, เฉือน และอย่างใดอย่างหนึ่ง (ระบบอนุกรม)
+FAILURE_MODES = ('flexure', 'shear', 'any')
+
+EULER_GAMMA = 0.5772156649015329
+
+
+def resolve_variables(variables=None):
+    """
+    รวมการแจกแจงที่กำหนดเข้ากับ DEFAULT_VARIABLES (กำหนดเฉพาะบางค่าได้ เช่น {'fc': {'cov': 0.2}})
+    """
+    resolved = {name: dict(spec) for name, spec in DEFAULT_VARIABLES.items()}
+    for name, spec in (variables or {}).items():
+        if name not in resolved:
+            raise ValueError(f"ไม่รู้จักตัวแปรสุ่ม: {name} (ใช้ได้: {', '.join(DEFAULT_VARIABLES)})")
+        resolved[name].update(spec)
+    for name, spec in resolved.items():
+        if spec['distribution'] not in DISTRIBUTIONS:
+            raise ValueError(f"ไม่รู้จักการแจกแจง {spec['distribution']!r} ของ {name} (ใช้ได้: {', '.join(DISTRIBUTIONS)})")
+        if spec['bias'] <= 0 or spec['cov'] < 0:
+            raise ValueError(f"{name}: bias ต้องมากกว่า 0 และ cov ต้องไม่ติดลบ")
+    return resolved
+
+
+def sample_variable(rng, spec, nominal, size):
+    """
+    สุ่มตัวแปร 1 ตัว size ค่า ค่าเฉลี่ย = bias × nominal และ cov ตาม spec (normal ตัดที่ 0)
+    """
+    import numpy as np
+
+    mean = spec['bias'] * nominal
+    std = spec['cov'] * mean
+    distribution = spec['distribution']
+    if distribution == 'fixed' or std == 0:
+        return np.full(size, float(mean))
+    if distribution == 'normal':
+        return np.maximum(rng.normal(mean, std, size), 0.0)
+    if distribution == 'lognormal':
+        sigma = math.sqrt(math.log1p(spec['cov'] ** 2))
+        return rng.lognormal(math.log(mean) - sigma ** 2 / 2, sigma, size)
+    # gumbel (ค่าสูงสุด): scale = σ√6/π, loc = μ - γ·scale
+    scale = std * math.sqrt(6) / math.pi
+    return rng.gumbel(mean - EULER_GAMMA * scale, scale, size)
+
+
+def beam_inputs(beam):
+    """
+    อาร์กิวเมนต์ของ calculate_beam_design_batch จาก dict ของคาน (ถ้าไม่มี d จะใช้ h - cover)
+    """
+    beam = dict(beam)
+    if 'd' not in beam:
+        beam['d'] = beam['h'] - beam['cover']
+    if beam.get('compression_steel') is None:
+        beam['compression_steel'] = bool(beam.get('compression_steel_count'))
+    missing = [name for name in BATCH_INPUT_COLUMNS[:12] if name not in beam]
+    if missing:
+        raise ValueError(f"ไม่พบข้อมูล: {', '.join(missing)}")
+    return {name: beam[name] for name in BATCH_INPUT_COLUMNS if name in beam}
+
+
+def count_failures(beam, variables, size, seed):
+    """
+    สุ่ม size ตัวอย่างด้วย seed (SeedSequence) แล้วนับจำนวนที่วิบัติ คืนค่า (size, ดัด, เฉือน, อย่างใดอย่างหนึ่ง)
+    """
+    import numpy as np
+
+    from .engine import calculate_beam_design_batch
+
+    rng = np.random.default_rng(seed)
+    # สุ่มตามลำดับของ DEFAULT_VARIABLES เสมอ ผลจึงไม่ขึ้นกับลำดับใน dict ที่ส่งมา
+    sampled = {name: sample_variable(rng, variables[name], beam[name], size) for name in DEFAULT_VARIABLES}
+    results = calculate_beam_design_batch(**{**beam, **sampled})
+    flexure = ~(results['Mn'] >= sampled['Mu'])
+    shear = ~(results['Vc'] >= sampled['Vu'])
+    return size, int(flexure.sum()), int(shear.sum()), int((flexure | shear).sum())
+
+
+def reliability_index(pf):
+    """
+    β = -Φ⁻¹(P_f) (P_f = 0 ได้ inf)
+    """
+    if pf <= 0:
+        return math.inf
+    if pf >= 1:
+        return -math.inf
+    return -NormalDist().inv_cdf(pf)
+
+
+def wilson_interval(failures, samples, confidence=0.95):
+    """
+    ช่วงความเชื่อมั่นของ P_f แบบ Wilson (ใช้ได้แม้ยังไม่พบการวิบัติเลย)
+    """
+    if samples == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = failures / samples
+    denominator = 1 + z ** 2 / samples
+    center = (p + z ** 2 / (2 * samples)) / denominator
+    half = z * math.sqrt(p * (1 - p) / samples + z ** 2 / (4 * samples ** 2)) / denominator
+    low = 0.0 if failures == 0 else max(0.0, center - half)
+    return low, 1.0 if failures == samples else min(1.0, center + half)
+
+
+def reliability_estimate(counts, confidence=0.95):
+    """
+    ค่าประมาณจากจำนวนที่นับได้ {samples, flexure, shear, any}: P_f, β และช่วงความเชื่อมั่นของแต่ละโหมด
+    (ชื่อไม่มีต่อท้ายคือโหมด any) cov คือสัมประสิทธิ์การแปรผันของค่าประมาณ P_f
+    """
+    n = counts['samples']
+    estimate = {'samples': n, 'failures': counts['any'], 'confidence': confidence}
+    for mode in FAILURE_MODES:
+        suffix = '' if mode == 'any' else f'_{mode}'
+        pf = counts[mode] / n if n else math.nan
+        low, high = wilson_interval(counts[mode], n, confidence)
+        estimate.update({
+            f'pf{suffix}': pf, f'pf{suffix}_low': low, f'pf{suffix}_high': high,
+            f'beta{suffix}': reliability_index(pf), f'beta{suffix}_low': reliability_index(high),
+            f'beta{suffix}_high': reliability_index(low),
+        })
+    pf = estimate['pf']
+    estimate['cov'] = math.sqrt((1 - pf) / (n * pf)) if n and pf > 0 else math.inf
+    return estimate
+
+
+def _iter_counts(jobs, workers, pool):
+    """
+    นับการวิบัติของแต่ละกลุ่มตามลำดับ ถ้า workers > 1 ใช้ process pool (ส่งงานค้างไว้ไม่เกิน 2 × workers กลุ่ม)
+    """
+    if workers <= 1 and pool is None:
+        for job in jobs:
+            yield count_failures(*job)
+        return
+    owns_pool = pool is None
+    if owns_pool:
+        # spawn: เรียกจากหน้าเว็บ (หลาย thread) ได้อย่างปลอดภัย
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'))
+    try:
+        pending = []
+        for job in jobs:
+            pending.append(pool.submit(count_failures, *job))
+            if len(pending) >= 2 * max(workers, 1):
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+    finally:
+        if owns_pool:
+            pool.shutdown(cancel_futures=True)
+
+
+def iter_reliability(beam, variables=None, samples=1_000_000, chunksize=RELIABILITY_CHUNKSIZE, workers=1,
+                     seed=0, confidence=0.95, pool=None):
+    """
+    ประเมินความน่าเชื่อถือของคาน 1 ตัว (dict อาร์กิวเมนต์ของ calculate_beam_design หรือมี cover แทน d)
+    คืนค่าประมาณสะสม (ดู reliability_estimate และ seconds) หลังแต่ละกลุ่มเสร็จ ค่าสุดท้ายใช้ตัวอย่างครบ samples
+    seed เป็น int หรือลำดับของ int (เช่น [seed, แถว]) ส่งต่อให้ numpy.random.SeedSequence
+    pool คือ executor ที่เปิดไว้แล้ว (ใช้ร่วมกันหลายคาน) ถ้าไม่ส่งมาและ workers > 1 จะเปิดใหม่
+    """
+    import numpy as np
+
+    from .engine import calculate_beam_design
+
+    if samples < 1 or chunksize < 1:
+        raise ValueError('samples และ chunksize ต้องมากกว่า 0')
+    beam = beam_inputs(beam)
+    variables = resolve_variables(variables)
+    nominal = calculate_beam_design(**beam, with_trace=False)
+    if 'error' in nominal:
+        raise ValueError(f"ข้อมูลคานไม่ถูกต้อง: {nominal['error']}")
+
+    start = time.perf_counter()
+    sizes = [chunksize] * (samples // chunksize) + ([samples % chunksize] if samples % chunksize else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = ((beam, variables, size, child) for size, child in zip(sizes, seeds))
+    counts = dict.fromkeys(('samples',) + FAILURE_MODES, 0)
+    for size, flexure, shear, either in _iter_counts(jobs, workers, pool):
+        counts['samples'] += size
+        counts['flexure'] += flexure
+        counts['shear'] += shear
+        counts['any'] += either
+        estimate = reliability_estimate(counts, confidence)
+        estimate['seconds'] = time.perf_counter() - start
+        yield estimate
+
+
+def estimate_reliability(beam, variables=None, samples=1_000_000, chunksize=RELIABILITY_CHUNKSIZE, workers=1,
+                         seed=0, confidence=0.95, pool=None):
+    """
+    เหมือน iter_reliability แต่คืนเฉพาะค่าประมาณสุดท้าย
+    """
+    estimate = None
+    for estimate in iter_reliability(beam, variables, samples, chunksize, workers, seed, confidence, pool):
+        pass
+    return estimate
@@ -0,0 +1,521 @@
+"""
+รายงานการออกแบบคาน (PDF ขนาด A4) ของคานทั้งตารางในไฟล์เดียว หัวข้อเดียวกับหน้าเว็บ: ข้อมูลการออกแบบ,
+ผลลัพธ์หลัก, สรุปการตรวจสอบ, สรุปเหล็กเสริม, กราฟเปรียบเทียบ, ภาพตัดคาน และรายละเอียดการคำนวณ
+
+    python -m beam_design report schedule.csv -o report.pdf --workers 4
+
+คานถูกแบ่งเป็นกลุ่มละ chunksize ตัว แต่ละกลุ่มถูกวาดเป็นไฟล์ PDF ย่อย (vector) ใน process pool
+แล้วนำมาต่อท้ายไฟล์ผลลัพธ์ตามลำดับทันทีที่เสร็จ ไม่เก็บหน้าหรือภาพไว้ในหน่วยความจำ
+จึงใช้หน่วยความจำคงที่ไม่ว่าตารางคานจะยาวแค่ไหน
+"""
+import os
+import re
+import tempfile
+import textwrap
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+
+A4 = (8.27, 11.69)
+
+# ฟอนต์ที่มีอักษรไทย (ใช้ตัวแรกที่มีในเครื่อง ตัวอักษรที่ไม่มีในฟอนต์จะใช้ DejaVu Sans แทน)
+THAI_FONTS = ('Sarabun', 'TH Sarabun New', 'Noto Sans Thai', 'Leelawadee UI', 'Tahoma', 'Garuda', 'Loma')
+
+# สัญลักษณ์ในข้อความของหน้าเว็บที่ฟอนต์ทั่วไปไม่มี
+PLAIN_SYMBOLS = {'✅': '✓', '❌': '✗', '🔴': '•', '💡': '•', '⚠️': '!', '⚠': '!'}
+
+# แถวของตารางสรุปการตรวจสอบ: (รายการ, ผลที่ได้, ค่าที่ต้องการ, ผลการตรวจสอบ) เหมือนหน้าเว็บ
+CHECKS = (
+    ("โมเมนต์ดัด (φMn ≥ Mu)", lambda r, i: f"{r['phi_Mn']:,.0f} kg-m", lambda r, i: f"{i['Mu']:,.0f} kg-m",
+     'moment_check'),
+    ("แรงเฉือน (φVc ≥ Vu)", lambda r, i: f"{r['phi_Vc']:,.0f} kg", lambda r, i: f"{i['Vu']:,.0f} kg",
+     'shear_check'),
+    ("เหล็กรับแรงดึง (As ≥ As,req)", lambda r, i: f"{r['As_provided_tension']:.2f} cm²",
+     lambda r, i: f"{r['As_required']:.2f} cm²", 'tension_steel_adequate'),
+    ("เหล็กปลอก (spacing ≤ max)", lambda r, i: f"{i['stirrup_spacing']} cm",
+     lambda r, i: f"{min(i['d'] / 2, 60):.0f} cm", 'stirrup_adequate'),
+    ("อัตราเหล็ก (ρ ≤ ρmax)", lambda r, i: f"{r['rho_required']:.4f}", lambda r, i: f"{r['rho_max']:.4f}",
+     'rho_check'),
+)
+
+# จำนวนบรรทัดรายละเอียดการคำนวณต่อหน้า (หน้าแรกของรายละเอียดมีภาพตัดอยู่ด้านบน)
+TRACE_LINES_FIRST_PAGE = 36
+TRACE_LINES_PER_PAGE = 68
+TRACE_WIDTH = 115
+
+# ค่าเริ่มต้นของจำนวนคานต่อไฟล์ย่อย (งานหนึ่งชิ้นของ worker)
+REPORT_CHUNKSIZE = 20
+
+
+def report_rc():
+    """
+    rc ของ matplotlib สำหรับรายงาน: ฟอนต์ไทยที่มีในเครื่อง และฝังฟอนต์แบบ TrueType (ไฟล์เล็ก เลือกข้อความได้)
+    """
+    from matplotlib import font_manager
+
+    from .drawing import MPL_RC
+
+    installed = {font.name for font in font_manager.fontManager.ttflist}
+    return {
+        **MPL_RC,
+        'font.family': [name for name in THAI_FONTS if name in installed] + ['DejaVu Sans'],
+        'pdf.fonttype': 42,
+    }
+
+
+def _plain(text):
+    for symbol, plain in PLAIN_SYMBOLS.items():
+        text = text.replace(symbol, plain)
+    return text
+
+
+def beam_title(beam):
+    mark = beam.get('mark')
+    level = beam.get('level')
+    title = f"คาน {mark}" if mark is not None else "คาน"
+    return f"{title} ชั้น {level}" if level not in (None, '') else title
+
+
+def prepare_beam(beam):
+    """
+    คำนวณคาน 1 ตัวสำหรับรายงาน คืนค่า dict: title, inputs, section (อาร์กิวเมนต์ของ draw_beam_section),
+    results, trace ({หัวข้อ: ข้อความ}) และ error (ข้อความ หรือ None)
+    """
+    from .engine import calculate_beam_design
+    from .inputs import RequestError, beam_arguments, section_arguments
+    from .trace import render_trace
+
+    # ค่าว่างจากตาราง (None/NaN) ถือว่าไม่ได้ระบุ
+    beam = {k: v for k, v in beam.items() if v is not None and v == v}
+    if 'cover' not in beam and 'd' in beam and 'h' in beam:
+        beam['cover'] = beam['h'] - beam['d']
+    prepared = {'title': beam_title(beam), 'inputs': beam, 'section': None, 'results': None, 'trace': {},
+                'error': None}
+    try:
+        inputs = beam_arguments(beam)
+        prepared['section'] = section_arguments(beam)
+    except RequestError as e:
+        prepared['error'] = str(e)
+        return prepared
+    prepared['inputs'] = {**inputs, 'cover': beam['cover'], 'mark': beam.get('mark'), 'level': beam.get('level')}
+    results = calculate_beam_design(**inputs)
+    prepared['trace'] = render_trace(results.pop('trace'), 'text')
+    prepared['results'] = results
+    prepared['error'] = results.get('error')
+    return prepared
+
+
+def _header(fig, prepared, page, pages, generated):
+    fig.text(0.06, 0.965, "รายงานการออกแบบคานคอนกรีต (Strength Design Method)", fontsize=12, weight='bold')
+    fig.text(0.06, 0.945, f"วันที่: {generated:%d/%m/%Y %H:%M}", fontsize=8, color='dimgray')
+    fig.text(0.94, 0.945, prepared['title'], fontsize=11, weight='bold', ha='right')
+    fig.add_artist(_line(fig, 0.938))
+    fig.text(0.06, 0.02, "Strength Design Method (SDM) | หน่วย: kg, cm", fontsize=7, color='gray')
+    fig.text(0.94, 0.02, f"{prepared['title']} | หน้า {page}/{pages}", fontsize=7, color='gray', ha='right')
+
+
+def _line(fig, y):
+    from matplotlib.lines import Line2D
+
+    return Line2D([0.06, 0.94], [y, y], transform=fig.transFigure, color='gray', linewidth=0.6)
+
+
+def _heading(fig, y, text):
+    fig.text(0.06, y, text, fontsize=10.5, weight='bold')
+
+
+def _table(fig, rect, header, rows, col_widths):
+    """
+    ตารางขนาดพอดี rect (พิกัดของ figure) ช่องที่ขึ้นต้นด้วย ✓/✗ ระบายสีเขียว/แดง
+    """
+    ax = fig.add_axes(rect)
+    ax.axis('off')
+    table = ax.table(cellText=rows, colLabels=header, colWidths=col_widths, cellLoc='left', bbox=[0, 0, 1, 1])
+    table.auto_set_font_size(False)
+    table.set_fontsize(8)
+    for (row, _), cell in table.get_celld().items():
+        cell.set_edgecolor('#aaaaaa')
+        text = cell.get_text()
+        if row == 0:
+            cell.set_facecolor('#eeeeee')
+            text.set_weight('bold')
+        elif text.get_text().startswith('✓'):
+            text.set_color('darkgreen')
+        elif text.get_text().startswith('✗'):
+            text.set_color('firebrick')
+    return ax
+
+
+def _comparison_chart(ax, labels, values, colors, title, ylabel):
+    """
+    กราฟแท่งเปรียบเทียบค่าใช้งานกับกำลังต้านทาน (เหมือนกราฟบนหน้าเว็บ)
+    """
+    bars = ax.bar(labels, values, color=colors, width=0.55)
+    ax.bar_label(bars, labels=[f"{value:,.0f}" for value in values], fontsize=8, padding=2)
+    ax.set_title(title, fontsize=9.5)
+    ax.set_ylabel(ylabel, fontsize=8)
+    ax.tick_params(labelsize=8)
+    ax.margins(y=0.18)
+    ax.grid(axis='y', color='lightgray', linewidth=0.6)
+    ax.set_axisbelow(True)
+    ax.spines[['top', 'right']].set_visible(False)
+
+
+def _status(passed, ok="ผ่าน", failed="ไม่ผ่าน"):
+    return f"✓ {ok}" if passed else f"✗ {failed}"
+
+
+def _summary_page(fig, prepared):
+    """
+    หน้าแรกของคาน: ข้อมูลการออกแบบ, ผลลัพธ์หลัก, ตารางสรุปการตรวจสอบและเหล็กเสริม, กราฟเปรียบเทียบ
+    """
+    inputs, results = prepared['inputs'], prepared['results']
+    _heading(fig, 0.91, "ข้อมูลการออกแบบ")
+    columns = (
+        ("คุณสมบัติวัสดุ", (f"f'c = {inputs['fc']} kg/cm²", f"fy = {inputs['fy']} kg/cm²")),
+        ("ขนาดคาน", (f"b = {inputs['b']} cm", f"h = {inputs['h']} cm", f"d = {inputs['d']} cm",
+                     f"cover = {inputs['cover']} cm")),
+        ("แรงกระทำ", (f"Mu = {inputs['Mu']:,.0f} kg-m", f"Vu = {inputs['Vu']:,.0f} kg")),
+    )
+    for i, (title, lines) in enumerate(columns):
+        x = 0.08 + i * 0.3
+        fig.text(x, 0.885, title, fontsize=9, weight='bold')
+        for j, line in enumerate(lines):
+            fig.text(x + 0.01, 0.865 - j * 0.016, f"• {line}", fontsize=8.5)
+
+    _heading(fig, 0.79, "ผลลัพธ์การออกแบบ")
+    metrics = (
+        ("As ที่ต้องการ", f"{results['As_required']:.2f} cm²", f"ρ = {results['rho_required']:.4f}", None),
+        ("φMn", f"{results['phi_Mn']:,.0f} kg-m", _status(results['moment_check']), results['moment_check']),
+        ("φVc", f"{results['phi_Vc']:,.0f} kg", _status(results['shear_check']), results['shear_check']),
+    )
+    for i, (label, value, note, passed) in enumerate(metrics):
+        x = 0.08 + i * 0.3
+        fig.text(x, 0.765, label, fontsize=8.5, color='dimgray')
+        fig.text(x, 0.738, value, fontsize=14, weight='bold')
+        color = 'dimgray' if passed is None else ('darkgreen' if passed else 'firebrick')
+        fig.text(x, 0.718, note, fontsize=8.5, color=color)
+
+    _heading(fig, 0.68, "สรุปการตรวจสอบ")
+    rows = [[name, value(results, inputs), required(results, inputs), _status(results[key])]
+            for name, value, required, key in CHECKS]
+    _table(fig, [0.06, 0.525, 0.88, 0.14], ["รายการตรวจสอบ", "ค่าที่ได้", "ค่าที่ต้องการ", "ผลการตรวจสอบ"],
+           rows, [0.37, 0.22, 0.22, 0.19])
+
+    _heading(fig, 0.49, "สรุปเหล็กเสริมที่เลือก")
+    compression = inputs['compression_steel']
+    rows = [
+        ["เหล็กรับแรงดึง", f"{inputs['tension_steel_count']} เส้น {inputs['tension_steel_type']}",
+         f"{results['As_provided_tension']:.2f}", _status(results['tension_steel_adequate'], "เพียงพอ", "ไม่เพียงพอ")],
+        ["เหล็กรับแรงอัด",
+         f"{inputs['compression_steel_count']} เส้น {inputs['compression_steel_type']}" if compression else '-',
+         f"{results['As_prime']:.2f}" if compression else '-', "ตามที่เลือก" if compression else '-'],
+        ["เหล็กปลอก", f"{inputs['stirrup_type']} {inputs['stirrup_legs']} ขา @ {inputs['stirrup_spacing']} cm",
+         f"{results['Av']:.3f}", _status(results['stirrup_adequate'], "เหมาะสม", "ไม่เหมาะสม")],
+    ]
+    _table(fig, [0.06, 0.375, 0.88, 0.1], ["ประเภทเหล็ก", "ขนาดและจำนวน", "พื้นที่ (cm²)", "สถานะ"],
+           rows, [0.25, 0.35, 0.18, 0.22])
+
+    _heading(fig, 0.335, "กราฟเปรียบเทียบ")
+    _comparison_chart(fig.add_axes([0.1, 0.07, 0.36, 0.22]), ["Mu (ใช้งาน)", "φMn (ต้านทาน)"],
+                      [inputs['Mu'], results['phi_Mn']], ['lightcoral', 'lightgreen'],
+                      "เปรียบเทียบโมเมนต์ (kg-m)", "โมเมนต์ (kg-m)")
+    _comparison_chart(fig.add_axes([0.58, 0.07, 0.36, 0.22]), ["Vu (ใช้งาน)", "φVc (ต้านทาน)"],
+                      [inputs['Vu'], results['phi_Vc']], ['lightcoral', 'lightblue'],
+                      "เปรียบเทียบแรงเฉือน (kg)", "แรงเฉือน (kg)")
+
+
+def _trace_lines(trace):
+    """
+    รายละเอียดการคำนวณเป็นรายการ (ข้อความ, ตัวหนา) ตัดบรรทัดยาวให้พอดีความกว้างหน้า
+    """
+    lines = []
+    for section, text in trace.items():
+        lines.append((_plain(section), True))
+        for line in _plain(text).splitlines():
+            wrapped = textwrap.wrap(line, TRACE_WIDTH, subsequent_indent='   ') or ['']
+            lines.extend((part, False) for part in wrapped)
+        lines.append(('', False))
+    return lines
+
+
+def _trace_pages(lines):
+    first, rest = lines[:TRACE_LINES_FIRST_PAGE], lines[TRACE_LINES_FIRST_PAGE:]
+    return [first] + [rest[i:i + TRACE_LINES_PER_PAGE] for i in range(0, len(rest), TRACE_LINES_PER_PAGE)]
+
+
+def _draw_trace(fig, lines, top):
+    for i, (text, bold) in enumerate(lines):
+        fig.text(0.07, top - i * 0.0125, text, fontsize=8, weight='bold' if bold else 'normal')
+
+
+def beam_pages(prepared, generated):
+    """
+    สร้างหน้ารายงาน (Figure ขนาด A4) ของคาน 1 ตัวทีละหน้า
+    """
+    from matplotlib.figure import Figure
+
+    from .drawing import draw_beam_section
+
+    if prepared['results'] is None or prepared['error']:
+        fig = Figure(figsize=A4)
+        _header(fig, prepared, 1, 1, generated)
+        _heading(fig, 0.91, "ข้อมูลการออกแบบ")
+        inputs = ', '.join(f"{k} = {v}" for k, v in prepared['inputs'].items() if k not in ('mark', 'level'))
+        for i, line in enumerate(textwrap.wrap(inputs, TRACE_WIDTH)):
+            fig.text(0.07, 0.885 - i * 0.0125, line, fontsize=8)
+        fig.text(0.06, 0.8, f"✗ เกิดข้อผิดพลาด: {prepared['error']}", fontsize=10, color='firebrick', weight='bold')
+        yield fig
+        return
+
+    trace_pages = _trace_pages(_trace_lines(prepared['trace']))
+    pages = 1 + len(trace_pages)
+
+    fig = Figure(figsize=A4)
+    _header(fig, prepared, 1, pages, generated)
+    _summary_page(fig, prepared)
+    yield fig
+
+    for number, lines in enumerate(trace_pages, start=2):
+        fig = Figure(figsize=A4)
+        _header(fig, prepared, number, pages, generated)
+        top = 0.91
+        if number == 2:
+            _heading(fig, 0.91, "ภาพตัดคาน")
+            draw_beam_section(**prepared['section'], ax=fig.add_axes([0.25, 0.62, 0.4, 0.26]))
+            _heading(fig, 0.53, "รายละเอียดการคำนวณ")
+            top = 0.505
+        _draw_trace(fig, lines, top)
+        yield fig
+
+
+def render_part(beams, path, generated):
+    """
+    วาดรายงานของคานกลุ่มหนึ่งเป็นไฟล์ PDF ย่อย (รันใน worker process)
+    คืนค่ารายการสรุปของแต่ละคาน: (title, design_ok, error, จำนวนหน้า)
+    """
+    from matplotlib import rc_context
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    summary = []
+    with rc_context(report_rc()), PdfPages(path) as pdf, warnings.catch_warnings():
+        # เครื่องที่ไม่มีฟอนต์ไทยจะเตือนทุกตัวอักษรทุกหน้า (ยังสร้างรายงานได้ ตัวอักษรไทยเป็นช่องว่าง)
+        warnings.filterwarnings('ignore', message='Glyph .* missing')
+        for beam in beams:
+            prepared = prepare_beam(beam)
+            pages = 0
+            for fig in beam_pages(prepared, generated):
+                pdf.savefig(fig)
+                pages += 1
+            results = prepared['results'] or {}
+            summary.append((prepared['title'], bool(results.get('design_ok')), prepared['error'], pages))
+    return summary
+
+
+def _summary_pages(summary, generated):
+    """
+    หน้าสรุปท้ายรายงาน: จำนวนคานที่ผ่าน/ไม่ผ่าน และรายชื่อคานที่ไม่ผ่าน
+    """
+    from matplotlib.figure import Figure
+
+    failed = [(title, error) for title, ok, error, _ in summary if not ok]
+    rows_per_page = 60
+    chunks = [failed[i:i + rows_per_page] for i in range(0, len(failed), rows_per_page)] or [[]]
+    prepared = {'title': "สรุปผล"}
+    for number, chunk in enumerate(chunks, start=1):
+        fig = Figure(figsize=A4)
+        _header(fig, prepared, number, len(chunks), generated)
+        _heading(fig, 0.91, f"สรุปผล: {len(summary):,} คาน | ผ่าน {len(summary) - len(failed):,} | "
+                            f"ไม่ผ่าน {len(failed):,}")
+        if chunk:
+            fig.text(0.06, 0.885, "คานที่ไม่ผ่าน:", fontsize=9, weight='bold')
+        for i, (title, error) in enumerate(chunk):
+            note = f" - {error}" if error else ''
+            fig.text(0.08, 0.86 - i * 0.0135, f"✗ {title}{note}", fontsize=8.5, color='firebrick')
+        yield fig
+
+
+_REF = re.compile(rb'(\d+) 0 R\b')
+
+
+def _pdf_objects(data):
+    """
+    อ่านตาราง xref ของ PDF ที่ matplotlib สร้าง คืนค่า ({เลข object: (เริ่ม, จบ)}, เลข Root, เลข Info)
+    """
+    start = int(data[data.rindex(b'startxref') + 9:].split()[0])
+    trailer = data.index(b'trailer', start)
+    lines = data[start:trailer].split(b'\n')
+    first, count = (int(x) for x in lines[1].split())
+    offsets = {}
+    for number, line in enumerate(lines[2:2 + count], start=first):
+        fields = line.split()
+        if fields[2] == b'n':
+            offsets[number] = int(fields[0])
+    ordered = sorted(offsets.items(), key=lambda item: item[1])
+    ends = [offset for _, offset in ordered[1:]] + [start]
+    spans = {number: (offset, end) for (number, offset), end in zip(ordered, ends)}
+    root = int(re.search(rb'/Root (\d+) 0 R', data[trailer:]).group(1))
+    info = re.search(rb'/Info (\d+) 0 R', data[trailer:])
+    return spans, root, int(info.group(1)) if info else None
+
+
+class PdfConcatenator:
+    """
+    ต่อไฟล์ PDF ที่ matplotlib สร้าง (xref แบบตาราง ไม่มี object stream) เป็นไฟล์เดียวโดยเขียนต่อท้ายทีละไฟล์
+    object ของแต่ละไฟล์ถูกเปลี่ยนเลขต่อจากไฟล์ก่อนหน้า หน้าทั้งหมดย้ายไปอยู่ใต้ Pages เดียวกัน
+    เก็บในหน่วยความจำเพียงตำแหน่งของ object และเลขของหน้า ใช้กับ with
+    """
+
+    PAGES = 1
+    CATALOG = 2
+
+    def __init__(self, fileobj, title=None):
+        self.file = fileobj
+        self.title = title
+        self.position = 0
+        self.offsets = {}
+        self.next_number = 3
+        self.pages = []
+        self._write(b'%PDF-1.4\n%\xac\xdc \xab\xba\n')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.close()
+
+    def _write(self, data):
+        self.file.write(data)
+        self.position += len(data)
+
+    def _write_object(self, number, body):
+        self.offsets[number] = self.position
+        self._write(b'%d 0 obj\n%s\nendobj\n' % (number, body))
+
+    def add(self, data):
+        """
+        ต่อท้ายด้วยหน้าทั้งหมดของ PDF (bytes) คืนค่าจำนวนหน้าที่เพิ่ม
+        """
+        spans, root, info = _pdf_objects(data)
+        catalog = data[slice(*spans[root])]
+        pages = int(re.search(rb'/Pages (\d+) 0 R', catalog).group(1))
+        kids = re.search(rb'/Kids \[([^\]]*)\]', data[slice(*spans[pages])]).group(1)
+
+        numbers = {pages: self.PAGES}
+        for number in sorted(spans):
+            if number not in (root, pages, info):
+                numbers[number] = self.next_number
+                self.next_number += 1
+
+        def renumber(match):
+            return b'%d 0 R' % numbers[int(match.group(1))]
+
+        for number, (start, end) in sorted(spans.items(), key=lambda item: item[1]):
+            if number in (root, pages, info):
+                continue
+            body = data[start:end]
+            body = body[body.index(b'obj') + 3:body.rindex(b'endobj')].strip(b'\r\n')
+            # เปลี่ยนเลขอ้างอิงเฉพาะส่วน dictionary ไม่แตะข้อมูลใน stream
+            split = body.find(b'stream')
+            head, tail = (body, b'') if split < 0 else (body[:split], body[split:])
+            self._write_object(numbers[number], _REF.sub(renumber, head) + tail)
+
+        added = [numbers[int(number)] for number in _REF.findall(kids)]
+        self.pages.extend(added)
+        return len(added)
+
+    def close(self):
+        kids = b' '.join(b'%d 0 R' % number for number in self.pages)
+        self._write_object(self.PAGES, b'<< /Type /Pages /Kids [ %s ] /Count %d >>' % (kids, len(self.pages)))
+        self._write_object(self.CATALOG, b'<< /Type /Catalog /Pages %d 0 R >>' % self.PAGES)
+        info = self.next_number
+        title = (self.title or "รายงานการออกแบบคานคอนกรีต").encode('utf-16-be')
+        self._write_object(info, b'<< /Title <feff%s> /Producer (beam_design) /CreationDate (D:%s) >>'
+                           % (title.hex().encode(), datetime.now().strftime('%Y%m%d%H%M%S').encode()))
+        xref = self.position
+        lines = [b'xref', b'0 %d' % (info + 1), b'0000000000 65535 f ']
+        lines.extend(b'%010d 00000 n ' % self.offsets[number] for number in range(1, info + 1))
+        self._write(b'\n'.join(lines) + b'\n')
+        self._write(b'trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+                    % (info + 1, self.CATALOG, info, xref))
+
+
+def _chunks(beams, size):
+    chunk = []
+    for beam in beams:
+        chunk.append(beam)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _iter_parts(beams, directory, workers, chunksize, generated):
+    """
+    วาดไฟล์ย่อยตามลำดับ ถ้า workers > 1 ใช้ process pool โดยส่งงานค้างไว้ไม่เกิน 2 × workers กลุ่ม
+    คืนค่า (path, summary) ตามลำดับคาน
+    """
+    parts = ((chunk, os.path.join(directory, f'part-{i:06d}.pdf')) for i, chunk in enumerate(_chunks(beams, chunksize)))
+    if workers <= 1:
+        for chunk, path in parts:
+            yield path, render_part(chunk, path, generated)
+        return
+    # spawn: เรียกจากหน้าเว็บ (หลาย thread) ได้อย่างปลอดภัย
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as pool:
+        pending = []
+        for chunk, path in parts:
+            pending.append((path, pool.submit(render_part, chunk, path, generated)))
+            if len(pending) >= 2 * workers:
+                path, future = pending.pop(0)
+                yield path, future.result()
+        for path, future in pending:
+            yield path, future.result()
+
+
+def write_report(beams, output, workers=1, chunksize=REPORT_CHUNKSIZE, title=None, progress=None):
+    """
+    เขียนรายงาน PDF ของคานทุกตัวใน beams (iterable ของ dict ชื่อคอลัมน์เหมือน python -m beam_design check
+    และ mark, level ถ้ามี) ลงใน output (path หรือไฟล์แบบ binary) ต่อท้ายด้วยหน้าสรุปผล
+    progress(จำนวนคานที่เสร็จ) ถูกเรียกทุกครั้งที่ต่อไฟล์ย่อยเสร็จ
+    คืนค่า dict: beams, failed, errors, pages, seconds
+    """
+    from matplotlib import rc_context
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    start = time.perf_counter()
+    generated = datetime.now()
+    summary = []
+    owns_file = isinstance(output, (str, os.PathLike))
+    fileobj = open(output, 'wb') if owns_file else output
+    try:
+        with tempfile.TemporaryDirectory() as directory, PdfConcatenator(fileobj, title) as pdf:
+            for path, part in _iter_parts(beams, directory, workers, chunksize, generated):
+                with open(path, 'rb') as f:
+                    pdf.add(f.read())
+                os.remove(path)
+                summary.extend(part)
+                if progress:
+                    progress(len(summary))
+            path = os.path.join(directory, 'summary.pdf')
+            with rc_context(report_rc()), PdfPages(path) as summary_pdf, warnings.catch_warnings():
+                warnings.filterwarnings('ignore', message='Glyph .* missing')
+                for fig in _summary_pages(summary, generated):
+                    summary_pdf.savefig(fig)
+            with open(path, 'rb') as f:
+                pdf.add(f.read())
+            pages = len(pdf.pages)
+    finally:
+        if owns_file:
+            fileobj.close()
+    return {
+        'beams': len(summary),
+        'failed': sum(not ok for _, ok, _, _ in summary),
+        'errors': sum(error is not None for _, _, error, _ in summary),
+        'pages': pages,
+        'seconds': time.perf_counter() - start,
+    }
+
@@ -0,0 +1,285 @@
+"""
+HTTP API (JSON) สำหรับให้โปรแกรมอื่นเรียกตรวจสอบคาน ใช้ไลบรารีมาตรฐานของ Python เท่านั้น
+
+    python -m beam_design serve --port 8000 --workers 4
+
+GET  /health        สถานะ server และสถิติแคช
+GET  /metrics       ตัวชี้วัดของ process ในรูปแบบ Prometheus (ดู beam_design.metrics)
+POST /check         ตรวจสอบคาน 1 ตัว (ผลเหมือน calculate_beam_design) ใส่ "trace": "markdown" | "text" | "html"
+                    เพื่อขอรายละเอียดการคำนวณ
+POST /check/batch   {"beams": [...]} ตรวจสอบหลายคานในคำขอเดียวด้วย batch engine
+POST /section       ภาพตัดคาน ?format=svg (ค่าเริ่มต้น) หรือ ?format=png
+POST /capacity      φMn, φVc, ρmin, ρmax ของหน้าตัด (fc, fy, b, h, cover หรือ d, tension_steel_type,
+                    tension_steel_count) จากตารางช่วยออกแบบ (beam_design.design_tables) ถ้าสร้างไว้
+
+ข้อมูลคานใช้ชื่อและหน่วยเดียวกับหน้าเว็บ (fc, fy, b, h, cover หรือ d, Mu, Vu, stirrup_type, ...)
+งานหนัก (batch และภาพ PNG) ส่งไปทำใน process pool ที่จำกัดจำนวนงานค้าง ถ้าเต็มจะตอบ 503
+รองรับ HTTP/1.1 keep-alive
+"""
+import json
+import math
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import get_context
+from urllib.parse import parse_qs, urlsplit
+
+from .cache import SECTION_CACHE, cache_stats, cached_beam_design, cached_section_svg
+from .design_tables import lookup_capacity
+from .inputs import RequestError, beam_arguments, section_arguments
+from .metrics import CONTENT_TYPE, HTTP_REQUESTS, render_metrics
+from .trace import render_trace
+
+MAX_BODY_BYTES = 16 * 2**20
+JOB_TIMEOUT = 60
+# path ที่บันทึกแยกในตัวชี้วัด (path อื่นรวมเป็น 'other' เพื่อไม่ให้จำนวนชุด label โตไม่จำกัด)
+METRIC_PATHS = ('/health', '/metrics', '/check', '/check/batch', '/section', '/capacity')
+
+
+def _jsonable(value):
+    """
+    แปลงผลลัพธ์ให้เป็น JSON มาตรฐาน (NaN/inf เป็น null, numpy scalar เป็นชนิด Python)
+    """
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if hasattr(value, 'item') and not isinstance(value, (str, bytes)):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def check_beam(beam):
+    """
+    ตรวจสอบคาน 1 ตัว (ใช้แคชร่วมกับหน้าเว็บ) คืนค่า dict ที่แปลงเป็น JSON ได้
+    """
+    trace_format = beam.get('trace') if isinstance(beam, dict) else None
+    results = cached_beam_design(**beam_arguments(beam))
+    body = {k: v for k, v in results.items() if k != 'trace'}
+    if trace_format:
+        if trace_format not in ('markdown', 'text', 'html'):
+            raise RequestError(f'ไม่รู้จักรูปแบบ trace: {trace_format}')
+        body['trace'] = render_trace(results['trace'], trace_format)
+    return _jsonable(body)
+
+
+def check_beams(beams):
+    """
+    ตรวจสอบหลายคานด้วย batch engine (รันใน worker process) คืนค่ารายการผลลัพธ์ตามลำดับเดิม
+    """
+    import numpy as np
+    import pandas as pd
+
+    from .cli import OUTPUT_COLUMNS, check_chunk
+
+    result = check_chunk(pd.DataFrame(beams))
+    columns = []
+    for name in OUTPUT_COLUMNS:
+        values = result[name].to_numpy()
+        if values.dtype.kind == 'f' and not np.isfinite(values).all():
+            values = np.where(np.isfinite(values), values, None)
+        columns.append(values.tolist())
+    return [dict(zip(OUTPUT_COLUMNS, row)) for row in zip(*columns)]
+
+
+def section_capacity(section):
+    """
+    กำลังของหน้าตัดจากตารางช่วยออกแบบ (หรือคำนวณถ้าอยู่นอกตาราง) คืนค่า dict พร้อม source
+    """
+    if not isinstance(section, dict):
+        raise RequestError('ข้อมูลหน้าตัดต้องเป็น JSON object')
+    missing = [name for name in ('fc', 'fy', 'b', 'tension_steel_type', 'tension_steel_count') if name not in section]
+    if 'd' not in section and not ('h' in section and 'cover' in section):
+        missing.append('h, cover (หรือ d)')
+    if missing:
+        raise RequestError(f"ไม่พบข้อมูล: {', '.join(missing)}")
+    d = section['d'] if 'd' in section else section['h'] - section['cover']
+    return _jsonable(lookup_capacity(section['fc'], section['fy'], section['b'], section.get('h'),
+                                     section['tension_steel_type'], section['tension_steel_count'], d=d,
+                                     interpolate=section.get('interpolate', True)))
+
+
+def render_section_png(section):
+    """
+    วาดภาพตัดด้วย matplotlib แล้วคืนค่าเป็น PNG bytes (รันใน worker process)
+    """
+    import io
+
+    from .drawing import draw_beam_section
+
+    buffer = io.BytesIO()
+    draw_beam_section(**section).savefig(buffer, format='png', dpi=150, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+class WorkerPool:
+    """
+    process pool ที่จำกัดจำนวนงานค้าง (กำลังทำ + รอคิว) ไม่เกิน max_pending งาน
+    """
+
+    def __init__(self, workers, max_pending=None):
+        self.workers = workers
+        self.max_pending = max_pending or 4 * workers
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        # spawn: ไม่ fork process ที่มีหลาย thread ของ server อยู่
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'))
+
+    def run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise RequestError('server ไม่ว่าง ลองใหม่ภายหลัง', status=503)
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result(timeout=JOB_TIMEOUT)
+
+    def shutdown(self):
+        self._executor.shutdown(cancel_futures=True)
+
+
+class BeamRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # ส่ง header และ body คนละครั้ง ถ้าเปิด Nagle คำขอบน keep-alive จะรอ delayed ACK ~40 ms
+    disable_nagle_algorithm = True
+    server_version = 'BeamDesign/1.0'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type):
+        path = urlsplit(self.path).path
+        HTTP_REQUESTS.observe(time.perf_counter() - self._start, path=path if path in METRIC_PATHS else 'other',
+                              status=status)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if status == 503:
+            self.send_header('Retry-After', '1')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode(), 'application/json; charset=utf-8')
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            raise RequestError('ข้อมูลมีขนาดใหญ่เกินไป', status=413)
+        try:
+            return json.loads(self.rfile.read(length) or b'{}')
+        except ValueError as e:
+            raise RequestError(f'JSON ไม่ถูกต้อง: {e}') from None
+
+    def _handle(self, route):
+        try:
+            route()
+        except RequestError as e:
+            self._send_json(e.status, {'error': str(e)})
+        except (TypeError, ValueError) as e:
+            self._send_json(400, {'error': str(e)})
+        except Exception as e:
+            self.log_error('%s: %s', type(e).__name__, e)
+            self._send_json(500, {'error': f'{type(e).__name__}: {e}'})
+
+    def do_GET(self):
+        self._start = time.perf_counter()
+        path = urlsplit(self.path).path
+        if path == '/health':
+            self._handle(lambda: self._send_json(200, {
+                'status': 'ok', 'workers': self.server.pool.workers, 'cache': cache_stats(),
+            }))
+        elif path == '/metrics':
+            self._handle(lambda: self._send(200, render_metrics().encode(), CONTENT_TYPE))
+        else:
+            self._send_json(404, {'error': f'ไม่พบ {path}'})
+
+    def do_POST(self):
+        self._start = time.perf_counter()
+        url = urlsplit(self.path)
+        routes = {'/check': self._check, '/check/batch': self._check_batch, '/section': self._section,
+                  '/capacity': self._capacity}
+        # อ่าน body ก่อนเสมอ เพื่อให้ใช้ connection เดิมต่อได้
+        try:
+            self._body = self._read_json()
+        except RequestError as e:
+            self.close_connection = True
+            self._send_json(e.status, {'error': str(e)})
+            return
+        self._query = parse_qs(url.query)
+        if url.path not in routes:
+            self._send_json(404, {'error': f'ไม่พบ {url.path}'})
+            return
+        self._handle(routes[url.path])
+
+    def _check(self):
+        self._send_json(200, check_beam(self._body))
+
+    def _check_batch(self):
+        beams = self._body.get('beams') if isinstance(self._body, dict) else self._body
+        if not isinstance(beams, list) or not all(isinstance(beam, dict) for beam in beams):
+            raise RequestError('ต้องส่ง {"beams": [ {...}, ... ]}')
+        results = self.server.pool.run(check_beams, beams) if beams else []
+        self._send_json(200, {'count': len(results), 'results': results})
+
+    def _section(self):
+        # ตรวจข้อมูลก่อน (body ที่ไม่ใช่ JSON object ตอบ 400)
+        section = section_arguments(self._body)
+        fmt = self._query.get('format', [self._body.get('format', 'svg')])[0]
+        if fmt == 'svg':
+            self._send(200, cached_section_svg(**section).encode(), 'image/svg+xml')
+        elif fmt == 'png':
+            key = ('section_png', tuple(sorted(section.items())))
+            png = SECTION_CACHE.get_or_compute(key, lambda: self.server.pool.run(render_section_png, section))
+            self._send(200, png, 'image/png')
+        else:
+            raise RequestError(f'ไม่รู้จักรูปแบบภาพ: {fmt}')
+
+    def _capacity(self):
+        self._send_json(200, section_capacity(self._body))
+
+
+class BeamServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, workers=2, max_pending=None, verbose=False):
+        super().__init__(address, BeamRequestHandler)
+        self.pool = WorkerPool(workers, max_pending)
+        self.verbose = verbose
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown()
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(host='127.0.0.1', port=8000, workers=2, max_pending=None, verbose=False):
+    """
+    เปิด server จนกว่าจะกด Ctrl+C หรือได้รับ SIGTERM (systemd, docker stop) ทั้งสองกรณีปิด server
+    และ process pool ก่อนจบ (ถ้าไม่ปิด worker ของ pool จะค้างอยู่)
+    """
+    previous = None
+    if threading.current_thread() is threading.main_thread():
+        previous = signal.signal(signal.SIGTERM, _interrupt)
+    try:
+        with BeamServer((host, port), workers, max_pending, verbose) as server:
+            print(f'Beam design API: http://{host}:{server.server_address[1]} (workers={workers})',
+                  file=sys.stderr)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+    finally:
+        if previous is not None:
+            signal.signal(signal.SIGTERM, previous)
+    return 0
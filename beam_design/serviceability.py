@@ -0,0 +1,245 @@
+"""
+ตรวจสอบสภาวะใช้งาน (serviceability): ระยะแอ่นตัวจาก Ie ของ Branson และระยะเรียงเหล็กเพื่อควบคุมรอยร้าว (ACI 318)
+
+    result = check_serviceability_batch(fc=240, fy=4000, b=30, h=60, d=55, span=6,
+                                        M_dead=4500, M_live=2400, tension_steel_type='DB20', tension_steel_count=4)
+    result['delta_live'], result['delta_total'], result['crack_ok'], result['serviceability_ok']
+
+รับ array (หรือ scalar ที่ broadcast ได้) เหมือน calculate_beam_design_batch เช่น คานทั้งตาราง × หลายระดับน้ำหนัก
+หน่วย: kg/cm², cm, โมเมนต์ใช้งาน (ไม่คูณตัวคูณ) kg-m, ความยาวช่วง m, ระยะแอ่นตัว cm
+"""
+from .engine import STEEL_AREAS, _lookup_areas
+
+# โมดูลัสยืดหยุ่นของเหล็ก (kg/cm²) และของคอนกรีต Ec = 15100√f'c (คอนกรีตน้ำหนักปกติ)
+STEEL_MODULUS = 2.04e6
+CONCRETE_MODULUS_FACTOR = 15100
+
+# โมดูลัสแตกร้าว fr = 2.0√f'c (kg/cm²)
+RUPTURE_FACTOR = 2.0
+
+# ตัวคูณระยะแอ่นตัวระยะยาว ξ (5 ปีขึ้นไป)
+LONG_TERM_FACTOR = 2.0
+
+# ระยะแอ่นตัวที่ยอมให้ L/ค่า: จาก live load และหลังติดตั้งส่วนที่ไม่ใช่โครงสร้าง (ระยะยาว + live load)
+LIVE_DEFLECTION_LIMIT = 360
+TOTAL_DEFLECTION_LIMIT = 240
+
+# ระยะเรียงเหล็กควบคุมรอยร้าว s ≤ 38(2855/fs) - 2.5cc และ ≤ 30(2855/fs) cm (2855 kg/cm² = 280 MPa)
+CRACK_STRESS = 2855
+
+# คอลัมน์ผลลัพธ์ของ check_serviceability_batch
+SERVICE_RESULT_KEYS = (
+    'Ec', 'n', 'Ig', 'Mcr', 'c_cracked', 'Icr', 'Ie_dead', 'Ie_total',
+    'delta_dead', 'delta_live', 'delta_long', 'delta_total', 'delta_live_limit', 'delta_total_limit',
+    'fs', 'bar_spacing', 'max_bar_spacing',
+    'live_deflection_ok', 'total_deflection_ok', 'crack_ok', 'serviceability_ok', 'error',
+)
+
+
+def cracked_section(n, b, d, As, As_prime, d_prime):
+    """
+    แกนสะเทินและโมเมนต์ความเฉื่อยของหน้าตัดแตกร้าว (transformed section, เหล็กรับแรงอัดใช้ (n-1)As')
+    คืนค่า (c, Icr) หน่วย cm, cm⁴
+    """
+    import numpy as np
+
+    # b c²/2 + [(n-1)As' + nAs] c - [(n-1)As' d' + nAs d] = 0
+    compression = (n - 1) * As_prime
+    B = compression + n * As
+    C = compression * d_prime + n * As * d
+    c = (-B + np.sqrt(B**2 + 2 * b * C)) / b
+    Icr = b * c**3 / 3 + compression * (c - d_prime)**2 + n * As * (d - c)**2
+    return c, Icr
+
+
+def effective_inertia(Ig, Icr, Mcr, Ma):
+    """
+    Ie ของ Branson = (Mcr/Ma)³Ig + [1 - (Mcr/Ma)³]Icr ≤ Ig (|Ma| ≤ Mcr ได้ Ig)
+    """
+    import numpy as np
+
+    Ma = np.abs(Ma)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(Ma > Mcr, Mcr / Ma, 1.0) ** 3
+    return np.minimum(ratio * Ig + (1 - ratio) * Icr, Ig)
+
+
+def check_serviceability_batch(fc, fy, b, h, d, span, M_dead, M_live, tension_steel_type, tension_steel_count,
+                               compression_steel_type=None, compression_steel_count=0, d_prime=4, cover=None,
+                               end_moment_dead=0.0, end_moment_live=0.0, cantilever=False, sustained_live=0.0,
+                               time_factor=LONG_TERM_FACTOR, live_limit=LIVE_DEFLECTION_LIMIT,
+                               total_limit=TOTAL_DEFLECTION_LIMIT):
+    """
+    ตรวจระยะแอ่นตัวและการควบคุมรอยร้าวของคานหลายตัวพร้อมกัน คืนค่า dict ของ array ตาม SERVICE_RESULT_KEYS
+
+    M_dead, M_live: โมเมนต์ใช้งานที่กลางช่วง (คานยื่น: ที่จุดรองรับ ค่าบวก) end_moment_*: ผลรวมโมเมนต์ที่ปลายช่วง
+    ทั้งสอง (ค่าลบเมื่อเป็นโมเมนต์ลบ) ระยะแอ่นตัว Δ = 5L²(Mm + 0.1(Ma + Mb))/(48EcIe) คานยื่น Δ = ML²/(4EcIe)
+    ระยะยาว = ξ/(1 + 50ρ') × (Δ dead + sustained_live × Δ live), fs จากหน้าตัดแตกร้าวภายใต้ M_dead + M_live
+    cover: ระยะจากผิวคอนกรีตถึงศูนย์กลางเหล็กรับแรงดึง (ค่าเริ่มต้น h - d) ใช้ทั้งด้านข้างและด้านล่าง
+    ระยะเรียงเหล็ก s = (b - 2 cover)/(n - 1) วัดศูนย์กลางถึงศูนย์กลาง ระยะหุ้มผิว cc = cover - db/2
+    """
+    import numpy as np
+
+    fc, fy, b, h, d, span, M_dead, M_live, tension_steel_count, compression_steel_count, d_prime, \
+        end_moment_dead, end_moment_live, sustained_live, time_factor, live_limit, total_limit = \
+        np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (
+            fc, fy, b, h, d, span, M_dead, M_live, tension_steel_count, compression_steel_count, d_prime,
+            end_moment_dead, end_moment_live, sustained_live, time_factor, live_limit, total_limit)))
+    shape = np.broadcast_shapes(fc.shape, np.shape(tension_steel_type), np.shape(compression_steel_type),
+                                np.shape(cantilever), np.shape(cover))
+    fc, fy, b, h, d, span, M_dead, M_live, tension_steel_count, compression_steel_count, d_prime, \
+        end_moment_dead, end_moment_live, sustained_live, time_factor, live_limit, total_limit = (
+            np.broadcast_to(x, shape) for x in (
+                fc, fy, b, h, d, span, M_dead, M_live, tension_steel_count, compression_steel_count, d_prime,
+                end_moment_dead, end_moment_live, sustained_live, time_factor, live_limit, total_limit))
+    cover = h - d if cover is None else np.broadcast_to(np.asarray(cover, dtype=float), shape)
+    cantilever = np.broadcast_to(np.asarray(cantilever, dtype=bool), shape)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        bar_area = _lookup_areas(STEEL_AREAS, tension_steel_type, shape)
+        As = bar_area * tension_steel_count
+        As_prime = np.where(compression_steel_count > 0,
+                            _lookup_areas(STEEL_AREAS, compression_steel_type, shape) * compression_steel_count, 0.0)
+        As_prime = np.nan_to_num(As_prime)
+
+        # หน้าตัดไม่แตกร้าวและแตกร้าว
+        Ec = CONCRETE_MODULUS_FACTOR * np.sqrt(fc)
+        n = STEEL_MODULUS / Ec
+        Ig = b * h**3 / 12
+        Mcr = RUPTURE_FACTOR * np.sqrt(fc) * Ig / (h / 2) / 100
+        c, Icr = cracked_section(n, b, d, As, As_prime, d_prime)
+
+        # ระยะแอ่นตัวทันที: Ie ภายใต้ dead และ dead + live, Δlive = Δ(D+L) - ΔD
+        L = span * 100
+        coefficient = np.where(cantilever, 1 / 4, 5 / 48) * L**2
+        M_total = M_dead + M_live
+        Ie_dead = effective_inertia(Ig, Icr, Mcr, M_dead)
+        Ie_total = effective_inertia(Ig, Icr, Mcr, M_total)
+        end_total = end_moment_dead + end_moment_live
+        delta_dead = coefficient * 100 * np.where(cantilever, M_dead, M_dead + 0.1 * end_moment_dead) / (Ec * Ie_dead)
+        delta_both = coefficient * 100 * np.where(cantilever, M_total, M_total + 0.1 * end_total) / (Ec * Ie_total)
+        delta_live = delta_both - delta_dead
+
+        # ระยะแอ่นตัวระยะยาวจากน้ำหนักคงค้าง
+        rho_prime = As_prime / (b * d)
+        delta_long = time_factor / (1 + 50 * rho_prime) * (delta_dead + sustained_live * delta_live)
+        delta_total = delta_long + delta_live
+        delta_live_limit = L / live_limit
+        delta_total_limit = L / total_limit
+
+        # ควบคุมรอยร้าว: หน่วยแรงในเหล็กภายใต้โมเมนต์ใช้งาน และระยะเรียงเหล็ก
+        fs = n * M_total * 100 * (d - c) / Icr
+        db = np.sqrt(4 * bar_area / np.pi)
+        clear_cover = cover - db / 2
+        # ระยะศูนย์กลางถึงศูนย์กลางของเหล็ก (cover วัดถึงศูนย์กลางเหล็กอยู่แล้ว)
+        bar_spacing = (b - 2 * cover) / np.maximum(tension_steel_count - 1, 1)
+        ratio = CRACK_STRESS / np.where(fs > 0, fs, np.nan)
+        max_bar_spacing = np.fmin(38 * ratio - 2.5 * clear_cover, 30 * ratio)
+        max_bar_spacing = np.where(fs > 0, max_bar_spacing, np.inf)
+
+        error = ~(np.isfinite(Icr) & np.isfinite(delta_total) & np.isfinite(fs) & np.isfinite(bar_spacing))
+        ok = ~error
+        live_deflection_ok = (delta_live <= delta_live_limit) & ok
+        total_deflection_ok = (delta_total <= delta_total_limit) & ok
+        crack_ok = (bar_spacing <= max_bar_spacing) & ok
+
+    return {
+        'Ec': Ec,
+        'n': n,
+        'Ig': Ig,
+        'Mcr': Mcr,
+        'c_cracked': c,
+        'Icr': Icr,
+        'Ie_dead': Ie_dead,
+        'Ie_total': Ie_total,
+        'delta_dead': delta_dead,
+        'delta_live': delta_live,
+        'delta_long': delta_long,
+        'delta_total': delta_total,
+        'delta_live_limit': delta_live_limit,
+        'delta_total_limit': delta_total_limit,
+        'fs': fs,
+        'bar_spacing': bar_spacing,
+        'max_bar_spacing': max_bar_spacing,
+        'live_deflection_ok': live_deflection_ok,
+        'total_deflection_ok': total_deflection_ok,
+        'crack_ok': crack_ok,
+        'serviceability_ok': live_deflection_ok & total_deflection_ok & crack_ok,
+        'error': error,
+    }
+
+
+def span_service_moments(analysis):
+    """
+    โมเมนต์ใช้งานสำหรับระยะแอ่นตัวของแต่ละช่วงจากผลของ analyze_continuous_beam (ไม่คูณตัวคูณ)
+    live load จัดเฉพาะช่วงที่ทำให้โมเมนต์ที่หน้าตัดกลางช่วง (โมเมนต์บวกสูงสุด) มากที่สุด
+    ช่วงปลายที่ต่อกับปลายอิสระเป็นคานยื่น: ใช้โมเมนต์ลบที่จุดรองรับ
+    คืนค่า dict ของ array ช่วงละค่า: span, M_dead, M_live, end_moment_dead, end_moment_live, cantilever, station
+    """
+    import numpy as np
+
+    spans, M_cases = analysis['spans'], analysis['M_cases']
+    count = spans.size
+    supports = analysis['supports']
+    result = {name: np.zeros(count) for name in ('M_dead', 'M_live', 'end_moment_dead', 'end_moment_live')}
+    result['span'] = spans
+    result['cantilever'] = np.zeros(count, dtype=bool)
+    result['station'] = np.zeros(count, dtype=int)
+    for i in range(count):
+        index = np.flatnonzero(analysis['span'] == i)
+        first, last = index[0], index[-1]
+        cantilever = supports[i] == 'free' or supports[i + 1] == 'free'
+        if cantilever:
+            # โมเมนต์ที่ปลายยึด (ปลายอิสระมีโมเมนต์ศูนย์)
+            j = last if supports[i] == 'free' else first
+            pattern = M_cases[1:, j] < 0
+            result['M_dead'][i] = -M_cases[0, j]
+            result['M_live'][i] = -M_cases[1:, j][pattern].sum()
+        else:
+            j = index[np.argmax(M_cases[0, index] + np.clip(M_cases[1:, index], 0, None).sum(axis=0))]
+            pattern = M_cases[1:, j] > 0
+            result['M_dead'][i] = M_cases[0, j]
+            result['M_live'][i] = M_cases[1:, j][pattern].sum()
+            result['end_moment_dead'][i] = M_cases[0, first] + M_cases[0, last]
+            result['end_moment_live'][i] = (M_cases[1:, first][pattern].sum() + M_cases[1:, last][pattern].sum())
+        result['cantilever'][i] = cantilever
+        result['station'][i] = j
+    return result
+
+
+def serviceability_along_beam(analysis, fc, fy, b, h, cover, bottom_steel_type, bottom_steel_count, top_steel_type,
+                              top_steel_count, sustained_live=0.0, time_factor=LONG_TERM_FACTOR):
+    """
+    ตรวจสภาวะใช้งานของคานต่อเนื่องจากผลของ analyze_continuous_beam ในการเรียก batch สองครั้ง
+    คืนค่า dict: 'stations' (ทุก station: Ma, fs, bar_spacing, max_bar_spacing, crack_ok โดยโมเมนต์บวกใช้เหล็กล่าง
+    โมเมนต์ลบใช้เหล็กบน ตามค่าที่มากกว่าของ envelope ใช้งาน) และ 'spans' (ผลของ check_serviceability_batch
+    ช่วงละแถว รวมคอลัมน์ของ span_service_moments)
+    """
+    import numpy as np
+
+    d = h - cover
+    M_cases = analysis['M_cases']
+    M_pos = M_cases[0] + np.clip(M_cases[1:], 0, None).sum(axis=0)
+    M_neg = -(M_cases[0] + np.clip(M_cases[1:], None, 0).sum(axis=0))
+    negative = M_neg > M_pos
+    Ma = np.clip(np.where(negative, M_neg, M_pos), 0, None)
+    stations = check_serviceability_batch(
+        fc, fy, b, h, d, 0.0, Ma, 0.0,
+        np.where(negative, top_steel_type, bottom_steel_type), np.where(negative, top_steel_count, bottom_steel_count),
+        np.where(negative, bottom_steel_type, top_steel_type), np.where(negative, bottom_steel_count, top_steel_count),
+        d_prime=cover, cover=cover)
+
+    moments = span_service_moments(analysis)
+    top = moments['cantilever']
+    spans = check_serviceability_batch(
+        fc, fy, b, h, d, moments['span'], moments['M_dead'], moments['M_live'],
+        np.where(top, top_steel_type, bottom_steel_type), np.where(top, top_steel_count, bottom_steel_count),
+        np.where(top, bottom_steel_type, top_steel_type), np.where(top, bottom_steel_count, top_steel_count),
+        d_prime=cover, cover=cover, end_moment_dead=moments['end_moment_dead'],
+        end_moment_live=moments['end_moment_live'], cantilever=top, sustained_live=sustained_live,
+        time_factor=time_factor)
+    return {
+        'stations': {'Ma': Ma, 'negative': negative,
+                     **{name: stations[name] for name in ('fs', 'bar_spacing', 'max_bar_spacing', 'crack_ok')}},
+        'spans': {**moments, **spans},
+    }
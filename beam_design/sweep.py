@@ -0,0 +1,64 @@
+"""
+ประเมินการออกแบบบนตาราง 2 มิติ (เช่น b × h หรือ ขนาดเหล็ก × จำนวนเส้น) ด้วย batch engine ในครั้งเดียว
+ใช้กับหน้า Sweep เพื่อเลือกขนาดหน้าตัดโดยไม่ต้องกดคำนวณทีละค่า
+"""
+from .engine import calculate_beam_design_batch
+
+# ตัวแปรที่ใช้เป็นแกนของ sweep ได้ {ชื่อพารามิเตอร์: ชื่อแกน}
+SWEEP_AXES = {
+    'b': 'ความกว้าง b (cm)',
+    'h': 'ความสูง h (cm)',
+    'tension_steel_type': 'ขนาดเหล็กรับแรงดึง',
+    'tension_steel_count': 'จำนวนเส้นเหล็กรับแรงดึง',
+    'stirrup_spacing': 'ระยะเรียงเหล็กปลอก (cm)',
+}
+
+
+def sweep_design(base, x_name, x_values, y_name, y_values):
+    """
+    ตรวจสอบคานทุกจุดบนตาราง x × y โดยค่าอื่นเท่ากับ base (ชื่อเหมือน calculate_beam_design แต่ใช้ cover แทน d)
+    คืนค่า dict: x, y (ค่าบนแกน), ผลของ batch engine ทุกค่าเป็น array shape (len(y), len(x))
+    และ moment_ratio (φMn/Mu), shear_ratio (φVc/Vu)
+    """
+    import numpy as np
+
+    for name in (x_name, y_name):
+        if name not in SWEEP_AXES:
+            raise ValueError(f"แกนต้องเป็นหนึ่งใน {tuple(SWEEP_AXES)}")
+    if x_name == y_name:
+        raise ValueError("แกน x และ y ต้องเป็นคนละตัวแปร")
+
+    x = np.asarray(list(x_values))
+    y = np.asarray(list(y_values))
+    X, Y = np.meshgrid(x, y)
+    inputs = {k: v for k, v in base.items() if k != 'cover'}
+    inputs[x_name] = X
+    inputs[y_name] = Y
+    inputs['d'] = np.asarray(inputs['h'], dtype=float) - base['cover']
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = calculate_beam_design_batch(**inputs)
+        result['moment_ratio'] = result['phi_Mn'] / np.asarray(base['Mu'], dtype=float)
+        result['shear_ratio'] = result['phi_Vc'] / np.asarray(base['Vu'], dtype=float)
+    shape = X.shape
+    result = {k: np.broadcast_to(v, shape) for k, v in result.items()}
+    result['x'] = x
+    result['y'] = y
+    return result
+
+
+def downsample_grid(result, max_points):
+    """
+    ลดจำนวนจุดสำหรับแสดงผลโดยเลือกทุก ๆ k แถว/คอลัมน์ (k เท่ากันทั้งสองแกน) ให้เหลือไม่เกิน max_points
+    คืนค่า (ผลที่ลดแล้ว, k)
+    """
+    import math
+
+    rows, cols = len(result['y']), len(result['x'])
+    step = max(1, math.ceil(math.sqrt(rows * cols / max_points)))
+    if step == 1:
+        return result, 1
+    sampled = {k: v[::step, ::step] for k, v in result.items() if k not in ('x', 'y')}
+    sampled['x'] = result['x'][::step]
+    sampled['y'] = result['y'][::step]
+    return sampled, step
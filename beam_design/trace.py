@@ -0,0 +1,105 @@
+import re
+from collections import namedtuple
+
+# ขั้นตอนการคำนวณหนึ่งบรรทัด: หัวข้อ, ปริมาณหลักของบรรทัด (หรือ None), แม่แบบ str.format และค่าที่ใช้เติม
+TraceStep = namedtuple('TraceStep', ['section', 'symbol', 'template', 'values'])
+
+
+class Trace(list):
+    """
+    รายการขั้นตอนการคำนวณ เก็บเฉพาะแม่แบบและตัวเลข ยังไม่จัดรูปแบบเป็นข้อความ
+    """
+
+    def add(self, section, symbol, template, **values):
+        self.append(TraceStep(section, symbol, template, values))
+
+
+class NullTrace:
+    """
+    ใช้แทน Trace เมื่อไม่ต้องการรายละเอียดการคำนวณ (batch/optimizer) ทุกการเรียกไม่ทำอะไร
+    """
+
+    def add(self, section, symbol, template, **values):
+        pass
+
+
+def format_step(step):
+    """
+    เติมค่าลงในแม่แบบของขั้นตอน ได้ข้อความ Markdown/LaTeX แบบเดียวกับที่แสดงบนหน้าเว็บ
+    """
+    return step.template.format(**step.values)
+
+
+def group_trace(trace):
+    """
+    จัดกลุ่มขั้นตอนตามหัวข้อ (เรียงตามลำดับที่พบ) คืนค่าเป็น dict {หัวข้อ: [TraceStep, ...]}
+    """
+    groups = {}
+    for step in trace:
+        groups.setdefault(step.section, []).append(step)
+    return groups
+
+
+def render_markdown(steps):
+    """
+    แปลงขั้นตอนเป็น Markdown ที่มีสูตร LaTeX สำหรับ st.markdown
+    """
+    return '\n'.join(line for line in map(format_step, steps) if line.strip())
+
+
+_FRAC = re.compile(r'\\frac\{\s*([^{}]*?)\s*\}\s*\{\s*([^{}]*?)\s*\}')
+_SQRT = re.compile(r'\\sqrt\{\s*([^{}]*?)\s*\}')
+_SUBSCRIPT = re.compile(r'_\{+([^{}]*)\}+')
+_LATEX_SYMBOLS = {
+    '\\phi': 'φ', '\\rho': 'ρ', '\\cdot': '·', '\\ge': '≥', '\\le': '≤', "f'_c": "f'c",
+}
+
+
+def latex_to_text(line):
+    """
+    แปลงบรรทัด Markdown/LaTeX เป็นข้อความธรรมดา (ใช้ในรายงานและ CLI)
+    """
+    line = line.replace('$', '').rstrip().rstrip('\\').rstrip()
+    line = line.replace('~', ' ')
+    line = _SQRT.sub(r'√(\1)', line)
+    for _ in range(3):
+        line = _FRAC.sub(r'(\1)/(\2)', line)
+    for latex, text in _LATEX_SYMBOLS.items():
+        line = line.replace(latex, text)
+    line = _SUBSCRIPT.sub(r'_\1', line)
+    line = line.replace('{', '').replace('}', '').replace('\\', '')
+    return re.sub(r' {2,}', ' ', line)
+
+
+def render_text(steps):
+    """
+    แปลงขั้นตอนเป็นข้อความธรรมดา บรรทัดละหนึ่งขั้นตอน
+    """
+    lines = (latex_to_text(format_step(step)) for step in steps)
+    return '\n'.join(line for line in lines if line.strip())
+
+
+def render_html(steps):
+    """
+    แปลงขั้นตอนเป็นรายการ HTML (ข้อความธรรมดา ไม่ต้องใช้ MathJax)
+    """
+    import html
+
+    items = ''.join(f'<li>{html.escape(line.strip())}</li>' for line in render_text(steps).split('\n'))
+    return f'<ul>{items}</ul>'
+
+
+RENDERERS = {
+    'markdown': render_markdown,
+    'text': render_text,
+    'html': render_html,
+}
+
+
+def render_trace(trace, fmt='markdown'):
+    """
+    แปลงรายละเอียดการคำนวณทั้งหมดเป็นข้อความตามรูปแบบ fmt ('markdown', 'text', 'html')
+    คืนค่าเป็น dict {หัวข้อ: ข้อความ} ตามลำดับหัวข้อ
+    """
+    render = RENDERERS[fmt]
+    return {section: render(steps) for section, steps in group_trace(trace).items()}
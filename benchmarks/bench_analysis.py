@@ -0,0 +1,73 @@
+"""
+วัดเวลาวิเคราะห์คานต่อเนื่อง (beam_design.analysis) และตรวจหน้าตัดทุก station ที่จำนวนช่วงต่าง ๆ
+
+ตัวอย่าง:
+    python benchmarks/bench_analysis.py --spans 2 5 10 --stations 101
+
+ตรวจด้วยว่า envelope จากการรวมเฉพาะช่วงที่ให้ผลบวก/ลบ ตรงกับการไล่จัด live load ทุกรูปแบบ (2^จำนวนช่วง แบบ)
+"""
+import argparse
+import itertools
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np  # noqa: E402
+
+from beam_design.analysis import (  # noqa: E402
+    DEAD_LOAD_FACTOR,
+    LIVE_LOAD_FACTOR,
+    analyze_continuous_beam,
+    design_along_beam,
+)
+
+
+def brute_force_envelope(M_cases):
+    """
+    envelope ของโมเมนต์จากทุกรูปแบบการจัด live load (แต่ละช่วงมีหรือไม่มี live load)
+    """
+    spans = M_cases.shape[0] - 1
+    patterns = np.array(list(itertools.product((0.0, 1.0), repeat=spans)))
+    totals = DEAD_LOAD_FACTOR * M_cases[0] + LIVE_LOAD_FACTOR * patterns @ M_cases[1:]
+    return totals.max(axis=0), totals.min(axis=0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--spans', type=int, nargs='+', default=[2, 5, 10])
+    parser.add_argument('--stations', type=int, default=101)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'spans':>5} {'stations':>9} {'analysis ms':>12} {'design ms':>10} {'patterns':>9} {'brute ms':>9}")
+    for n in args.spans:
+        spans = rng.uniform(3, 8, n).round(1)
+        point_loads = [{'span': i, 'x': spans[i] / 2, 'dead': 1000.0, 'live': 500.0} for i in range(0, n, 2)]
+        kwargs = dict(supports=['fixed'] + ['pin'] * n, dead_load=rng.uniform(1000, 2500, n),
+                      live_load=rng.uniform(300, 1200, n), point_loads=point_loads, stations=args.stations)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            analysis = analyze_continuous_beam(spans, **kwargs)
+        solve = (time.perf_counter() - start) / args.repeat
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            design_along_beam(analysis, 240, 4000, 30, 60, 4, 'DB20', 3, 'DB20', 4, 'RB9', 2, 15)
+        design = (time.perf_counter() - start) / args.repeat
+
+        start = time.perf_counter()
+        M_max, M_min = brute_force_envelope(analysis['M_cases'])
+        brute = time.perf_counter() - start
+        assert np.allclose(M_max, analysis['M_max']) and np.allclose(M_min, analysis['M_min']), \
+            'envelope ไม่ตรงกับการไล่จัด live load ทุกรูปแบบ'
+        print(f"{n:>5} {analysis['x'].size:>9,} {solve * 1000:>12.2f} {design * 1000:>10.2f} "
+              f"{2 ** n:>9,} {brute * 1000:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+เปรียบเทียบความเร็ว calculate_beam_design (วนลูปทีละคาน) กับ calculate_beam_design_batch
+
+ตัวอย่าง:
+    python benchmarks/bench_batch.py --rows 10000 1000000
+
+การวนลูป scalar สำหรับจำนวนแถวมาก ๆ จะวัดจากตัวอย่าง --scalar-sample แถวแล้วประมาณเวลาเชิงเส้น
+และตรวจว่าผลของทั้งสองวิธีตรงกันทุกค่าในแถวตัวอย่าง
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from beam_design.engine import (  # noqa: E402
+    BATCH_RESULT_KEYS,
+    STEEL_AREAS,
+    STIRRUP_AREAS,
+    calculate_beam_design,
+    calculate_beam_design_batch,
+)
+
+
+def random_schedule(n, seed=0):
+    """
+    สร้างตารางคานแบบสุ่มในช่วงเดียวกับ input ของหน้าเว็บ
+    """
+    rng = np.random.default_rng(seed)
+    h = rng.integers(6, 31, n) * 5
+    cover = rng.integers(2, 9, n)
+    compression_steel = rng.random(n) < 0.3
+    return {
+        'fc': rng.integers(15, 51, n) * 10,
+        'fy': rng.integers(12, 22, n) * 200,
+        'b': rng.integers(4, 21, n) * 5,
+        'h': h,
+        'd': h - cover,
+        'Mu': rng.integers(10, 501, n) * 100,
+        'Vu': rng.integers(20, 401, n) * 50,
+        'stirrup_type': rng.choice(list(STIRRUP_AREAS), n),
+        'stirrup_legs': rng.integers(2, 7, n),
+        'stirrup_spacing': rng.integers(5, 31, n),
+        'tension_steel_type': rng.choice(list(STEEL_AREAS), n),
+        'tension_steel_count': rng.integers(1, 11, n),
+        'compression_steel': compression_steel,
+        'compression_steel_type': rng.choice(list(STEEL_AREAS), n),
+        'compression_steel_count': np.where(compression_steel, rng.integers(0, 9, n), 0),
+        'd_prime': rng.integers(2, 11, n),
+    }
+
+
+def run_scalar(schedule, n):
+    """
+    เรียก calculate_beam_design ทีละแถว แล้วรวมผลเป็นคอลัมน์
+    """
+    rows = [{k: v[i].item() for k, v in schedule.items()} for i in range(n)]
+    start = time.perf_counter()
+    results = [calculate_beam_design(**row) for row in rows]
+    elapsed = time.perf_counter() - start
+    columns = {key: np.array([r.get(key, np.nan) for r in results]) for key in BATCH_RESULT_KEYS
+               if key != 'error'}
+    return elapsed, columns
+
+
+def check_identical(scalar, batch, n):
+    """
+    ตรวจว่าผลแบบ batch ตรงกับแบบ scalar ทุกค่า (เทียบแบบ bit-for-bit)
+    """
+    for key, expected in scalar.items():
+        actual = batch[key][:n]
+        if not np.array_equal(actual, expected.astype(actual.dtype), equal_nan=True):
+            mismatch = np.flatnonzero(actual != expected)[0]
+            raise AssertionError(f'{key} ไม่ตรงกันที่แถว {mismatch}: {actual[mismatch]!r} != {expected[mismatch]!r}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 1_000_000])
+    parser.add_argument('--scalar-sample', type=int, default=20_000,
+                        help='จำนวนแถวสูงสุดที่วนลูป scalar จริง (ที่เหลือประมาณเชิงเส้น)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>10} {'scalar (s)':>12} {'batch (s)':>10} {'speedup':>9}")
+    for n in args.rows:
+        schedule = random_schedule(n, args.seed)
+        sample = min(n, args.scalar_sample)
+        scalar_time, scalar_columns = run_scalar(schedule, sample)
+        scalar_time *= n / sample
+
+        batch_time = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            batch = calculate_beam_design_batch(**schedule)
+            batch_time = min(batch_time, time.perf_counter() - start)
+        check_identical(scalar_columns, batch, sample)
+
+        estimated = '*' if sample < n else ' '
+        print(f'{n:>10,} {scalar_time:>11.3f}{estimated} {batch_time:>10.4f} {scalar_time / batch_time:>8.0f}x')
+    if any(n > args.scalar_sample for n in args.rows):
+        print(f'* ประมาณจากการวนลูป {args.scalar_sample:,} แถว')
+
+
+if __name__ == '__main__':
+    main()
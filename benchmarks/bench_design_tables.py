@@ -0,0 +1,95 @@
+"""
+วัดเวลาค้นหากำลังหน้าตัดจากตารางช่วยออกแบบ (beam_design.design_tables) เทียบกับการคำนวณด้วย engine
+ทั้งทีละหน้าตัดและทีละหลายแถว และความคลาดเคลื่อนของการประมาณเชิงเส้นที่จุดระหว่างเส้นตาราง
+(ตรวจสอบก่อนว่าการค้นหาหน้าตัดเดียวนอกตารางคำนวณแทนได้ถูกต้อง)
+
+ตัวอย่าง:
+    python benchmarks/bench_design_tables.py --rows 100000 --repeat 2000
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from beam_design.design_tables import (_OPENED, build_tables, compute_capacity, lookup_capacity,  # noqa: E402
+                                       open_tables)
+from beam_design.engine import calculate_beam_design  # noqa: E402
+
+
+def per_call_us(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(argv=None):
+    import numpy as np
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000, help='จำนวนแถวของการค้นหาแบบ batch')
+    parser.add_argument('--repeat', type=int, default=2000, help='จำนวนครั้งของการค้นหาทีละหน้าตัด')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        build_tables(directory)
+        built = time.perf_counter() - start
+        size = sum(p.stat().st_size for p in Path(directory).iterdir())
+        _OPENED.clear()
+        start = time.perf_counter()
+        tables = open_tables(directory)
+        opened = time.perf_counter() - start
+        print(f"สร้างตาราง {built:.3f} s ({size / 1024:,.0f} KB), เปิดครั้งแรก {opened * 1000:.1f} ms")
+
+        # ตรวจสอบ: หน้าตัดเดียว (scalar) ที่อยู่นอกตารางต้องคำนวณแทนได้ และได้ค่าเดียวกับ compute_capacity
+        off_grid = (240, 4000, 30, 200, 'DB16', 3)
+        found = tables.lookup(*off_grid)
+        exact = compute_capacity(*off_grid)
+        assert int(found['source']) == 2, found
+        for name in exact:
+            assert np.allclose(found[name], exact[name], equal_nan=True), (name, found[name], exact[name])
+
+        print(f"\n{'ทีละหน้าตัด':<24} {'µs/ครั้ง':>10}")
+        for label, func in (
+            ('ตาราง (ค่าบนเส้นตาราง)', lambda: lookup_capacity(240, 4000, 30, 50, 'DB16', 3, directory=directory)),
+            ('ตาราง (ประมาณเชิงเส้น)', lambda: lookup_capacity(250, 4000, 32, 53, 'DB16', 3, directory=directory)),
+            ('calculate_beam_design', lambda: calculate_beam_design(250, 4000, 32, 49, 49, 0, 0, 'RB6', 2, 10,
+                                                                    'DB16', 3, with_trace=False)),
+        ):
+            print(f"{label:<24} {per_call_us(func, args.repeat):>10.1f}")
+
+        # จุดสุ่มภายในตาราง ทั้งบนเส้นตาราง (exact) และระหว่างเส้น
+        rng = np.random.default_rng(args.seed)
+        axes = tables.axes
+        n = args.rows
+        grid = {name: rng.choice(values, n) for name, values in axes.items()}
+        between = {name: rng.uniform(values[0], values[-1], n) for name, values in axes.items()}
+        bar = rng.choice(tables.bar_types, n)
+        count = rng.integers(1, tables.max_bars + 1, n)
+
+        print(f"\n{'batch ' + format(n, ','):<24} {'ms':>10}")
+        for label, points in (('บนเส้นตาราง', grid), ('ระหว่างเส้น', between)):
+            d = points['h'] - tables.cover
+            start = time.perf_counter()
+            found = tables.lookup(points['fc'], points['fy'], points['b'], d, bar, count)
+            looked = time.perf_counter() - start
+            start = time.perf_counter()
+            exact = compute_capacity(points['fc'], points['fy'], points['b'], d, bar, count)
+            computed = time.perf_counter() - start
+            print(f"{'ตาราง ' + label:<24} {looked * 1000:>10.1f}")
+            print(f"{'compute_capacity':<24} {computed * 1000:>10.1f}")
+            error = np.abs(found['phi_Mn'] - exact['phi_Mn']) / np.maximum(np.abs(exact['phi_Mn']), 1)
+            # หน้าตัดเหล็กน้อย (a ≤ 0.75d) ที่ใช้ออกแบบจริง
+            a = exact['As'] * points['fy'] / (0.85 * points['fc'] * points['b'])
+            under = a <= 0.75 * d
+            print(f"  φMn คลาดเคลื่อน p50 {np.percentile(error, 50):.3%}, p99 {np.percentile(error, 99):.3%}, "
+                  f"สูงสุด (a ≤ 0.75d) {error[under].max():.3%}")
+
+
+if __name__ == '__main__':
+    main()
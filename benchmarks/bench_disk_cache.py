@@ -0,0 +1,102 @@
+"""
+วัดผลของแคชบนดิสก์ (beam_design.disk_cache) เมื่อหลาย process ใช้โฟลเดอร์เดียวกัน:
+รอบแรก (ดิสก์ว่าง) เทียบกับรอบที่สองซึ่งเป็น process ใหม่ทั้งหมด (เหมือน restart หรือ replica อื่น)
+แล้วให้ทุก process เขียน/อ่าน key ชุดเดียวกันพร้อมกันและตรวจว่าไม่มีค่าที่อ่านได้เสียหาย
+
+ตัวอย่าง:
+    python benchmarks/bench_disk_cache.py --processes 4 --sections 8 --beams 2000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def _sections(count):
+    return [{'fc': 240, 'fy': 4000, 'Mu': 5500, 'Vu': 3000, 'b': 25 + 5 * (i % 6), 'h': 40 + 10 * (i // 6),
+             'cover': 4, 'stirrup_type': 'RB6', 'stirrup_legs': 2, 'stirrup_spacing': 15,
+             'tension_steel_type': 'DB16', 'tension_steel_count': 3} for i in range(count)]
+
+
+def replica(sections, beams):
+    """
+    งานของ process หนึ่ง: ภาพ PNG ของหน้าตัด (ผ่าน SECTION_CACHE แบบเดียวกับ server) และผลคำนวณคาน
+    คืนค่า (วินาทีของภาพ, วินาทีของคาน, สถิติแคช)
+    """
+    import warnings
+
+    from beam_design.cache import SECTION_CACHE, cache_stats, cached_beam_design
+    from beam_design.inputs import section_arguments
+    from beam_design.server import render_section_png
+
+    warnings.simplefilter('ignore')
+    start = time.perf_counter()
+    for beam in _sections(sections):
+        section = section_arguments(beam)
+        SECTION_CACHE.get_or_compute(('section_png', tuple(sorted(section.items()))),
+                                     lambda: render_section_png(section))
+    drawn = time.perf_counter()
+    for i in range(beams):
+        cached_beam_design(240, 4000, 30, 50, 46, 3000 + i, 3257, 'RB6', 2, 15, 'DB16', 3)
+    return drawn - start, time.perf_counter() - drawn, cache_stats()
+
+
+def hammer(keys, rounds):
+    """
+    เขียนและอ่าน key ชุดเดียวกับ process อื่นพร้อมกัน คืนค่าจำนวนค่าที่อ่านได้แต่ไม่ถูกต้อง
+    """
+    from beam_design.cache import DISK_CACHE
+
+    bad = 0
+    for r in range(rounds):
+        for k in range(keys):
+            if r % 2:
+                DISK_CACHE.put(('hammer', k), [k] * 10_000)
+            else:
+                value = DISK_CACHE.get(('hammer', k))
+                bad += value is not None and value != [k] * 10_000
+    return bad
+
+
+def run_round(label, processes, sections, beams):
+    with ProcessPoolExecutor(processes, mp_context=get_context('spawn')) as pool:
+        start = time.perf_counter()
+        results = list(pool.map(replica, [sections] * processes, [beams] * processes))
+        elapsed = time.perf_counter() - start
+    draw = max(r[0] for r in results)
+    calc = max(r[1] for r in results)
+    disk = results[-1][2]['disk']
+    print(f"{label:<10} {elapsed:>8.2f} {draw * 1000 / sections:>14.1f} {calc * 1e6 / max(beams, 1):>14.1f} "
+          f"{disk['size']:>8,} {disk['bytes'] / 2**20:>8.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, default=4, help='จำนวน process (replica) ที่ใช้โฟลเดอร์เดียวกัน')
+    parser.add_argument('--sections', type=int, default=8, help='จำนวนภาพ PNG ต่อ process')
+    parser.add_argument('--beams', type=int, default=2000, help='จำนวนคานต่อ process')
+    parser.add_argument('--hammer', type=int, default=200, help='จำนวนรอบเขียน/อ่านพร้อมกัน (0 = ไม่ทดสอบ)')
+    parser.add_argument('--dir', help='โฟลเดอร์แคช (ค่าเริ่มต้น: โฟลเดอร์ชั่วคราว)')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # process ลูกอ่านโฟลเดอร์แคชจาก environment ตอน import beam_design.cache
+        os.environ['BEAM_DESIGN_DISK_CACHE'] = args.dir or tmp
+        print(f"{'รอบ':<10} {'วินาที':>8} {'ms/ภาพ PNG':>14} {'µs/คาน':>14} {'รายการ':>8} {'MB':>8}")
+        run_round('ดิสก์ว่าง', args.processes, args.sections, args.beams)
+        run_round('restart', args.processes, args.sections, args.beams)
+        if args.hammer:
+            with ProcessPoolExecutor(args.processes, mp_context=get_context('spawn')) as pool:
+                bad = sum(pool.map(hammer, [16] * args.processes, [args.hammer] * args.processes))
+            print(f"เขียน/อ่านพร้อมกัน {args.processes} process × {args.hammer} รอบ: ค่าที่เสียหาย {bad}")
+            assert bad == 0, 'อ่านได้ค่าที่เสียหายระหว่างเขียนพร้อมกัน'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+วัดความเร็วของ fiber solver (beam_design.fiber): หน้าตัดเดียวต่อครั้ง และ batch ของคานสี่เหลี่ยมจำนวนมาก
+
+ตัวอย่าง:
+    python benchmarks/bench_fiber.py --rows 10000 100000
+
+ตรวจด้วยว่าคานเหล็กเสริมเดี่ยวที่เหล็กครากได้ Mn ตรงกับสูตรปิด As·fy·(d − a/2)
+"""
+import argparse
+import sys
+import time
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from beam_design.fiber import (  # noqa: E402
+    STRESS_BLOCKS,
+    rectangle,
+    solve_rectangular_batch,
+    solve_section,
+    t_section,
+)
+
+SINGLE_CASES = {
+    'rectangle': (rectangle(30, 50), [(46, 6.03)]),
+    'rectangle+compression': (rectangle(30, 50), [(4, 4.02), (46, 6.03)]),
+    'T (web in compression)': (t_section(60, 8, 25, 60), [(54, 40)]),
+}
+
+
+def time_single(number):
+    print(f"{'section':<24} {'stress block':<12} {'µs/section':>11} {'iterations':>11}")
+    for name, (vertices, bars) in SINGLE_CASES.items():
+        for stress_block in STRESS_BLOCKS:
+            result = solve_section(vertices, bars, 240, 4000, stress_block=stress_block)
+            seconds = min(timeit.repeat(lambda: solve_section(vertices, bars, 240, 4000, stress_block=stress_block),
+                                        number=number, repeat=5)) / number
+            print(f'{name:<24} {stress_block:<12} {seconds * 1e6:>11.0f} {result["iterations"]:>11}')
+
+
+def random_rectangles(n, seed=0):
+    rng = np.random.default_rng(seed)
+    h = rng.integers(8, 17, n) * 5.0
+    return {
+        'b': rng.integers(4, 9, n) * 5.0,
+        'h': h,
+        'd': h - 4,
+        'As': rng.uniform(2, 20, n),
+        'fc': rng.integers(18, 36, n) * 10.0,
+        'fy': rng.choice([3000.0, 4000.0], n),
+    }
+
+
+def closed_form_error(beams, result):
+    """
+    ความคลาดเคลื่อนสัมพัทธ์สูงสุดเทียบกับสูตรปิด (เฉพาะคานที่เหล็กคราก)
+    """
+    a = beams['As'] * beams['fy'] / (0.85 * beams['fc'] * beams['b'])
+    Mn = beams['As'] * beams['fy'] * (beams['d'] - a / 2) / 100
+    yielded = result['eps_t'] >= beams['fy'] / 2.04e6
+    return np.max(np.abs(result['Mn'][yielded] - Mn[yielded]) / Mn[yielded])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--number', type=int, default=300, help='จำนวนครั้งต่อรอบในการจับเวลาหน้าตัดเดียว')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    time_single(args.number)
+    print()
+    print(f"{'rows':>10} {'stress block':<12} {'time (s)':>9} {'µs/section':>11} {'max iter':>9} {'closed-form err':>16}")
+    for n in args.rows:
+        beams = random_rectangles(n, args.seed)
+        for stress_block in STRESS_BLOCKS:
+            start = time.perf_counter()
+            result = solve_rectangular_batch(**beams, stress_block=stress_block)
+            elapsed = time.perf_counter() - start
+            if not result['converged'].all():
+                raise AssertionError(f'{stress_block}: {np.count_nonzero(~result["converged"])} หน้าตัดไม่ลู่เข้า')
+            error = f'{closed_form_error(beams, result):.1e}' if stress_block == 'aci' else '-'
+            print(f'{n:>10,} {stress_block:<12} {elapsed:>9.3f} {elapsed / n * 1e6:>11.2f} '
+                  f'{result["iterations"].max():>9} {error:>16}')
+
+
+if __name__ == '__main__':
+    main()
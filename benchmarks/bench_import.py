@@ -0,0 +1,69 @@
+"""
+วัดเวลา cold import ของแพ็กเกจ beam_design เทียบกับชุด import เดิมของ app.py
+(streamlit, pandas, plotly, matplotlib, numpy) และตรวจว่าไม่มีไลบรารีหนักถูกโหลดโดยไม่จำเป็น
+
+ตัวอย่าง:
+    python benchmarks/bench_import.py --repeat 10
+
+แต่ละครั้งรัน Python ใหม่ แล้วหักเวลาเริ่ม interpreter เปล่าออก
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+HEAVY_MODULES = ('numpy', 'pandas', 'matplotlib', 'plotly', 'streamlit')
+
+TARGETS = {
+    'python (empty)': 'pass',
+    'beam_design': 'import beam_design',
+    'beam_design.cache': 'import beam_design.cache',
+    'beam_design.optimizer': 'import beam_design.optimizer',
+    'app.py imports (old)': ('import streamlit, pandas, math, plotly.graph_objects, plotly.express, '
+                             'numpy, matplotlib.pyplot, matplotlib.patches'),
+}
+
+
+def time_statement(statement, repeat):
+    """
+    เวลาเฉลี่ย (median) ในการรัน python -c statement ใน process ใหม่ (วินาที)
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', statement], check=True, cwd=ROOT)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def loaded_heavy_modules(statement):
+    """
+    รายชื่อไลบรารีหนักที่ถูกโหลดหลังรัน statement
+    """
+    probe = f"{statement}\nimport sys\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, '-c', probe], check=True, cwd=ROOT,
+                         capture_output=True, text=True).stdout.strip()
+    return out or '-'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    baseline = time_statement(TARGETS['python (empty)'], args.repeat)
+    print(f"{'target':>24} {'import (ms)':>12}  heavy modules loaded")
+    for name, statement in TARGETS.items():
+        if name == 'python (empty)':
+            print(f'{name:>24} {baseline * 1000:>12.1f}  (interpreter startup)')
+            continue
+        elapsed = time_statement(statement, args.repeat) - baseline
+        print(f'{name:>24} {elapsed * 1000:>12.1f}  {loaded_heavy_modules(statement)}')
+
+
+if __name__ == '__main__':
+    main()
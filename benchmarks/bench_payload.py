@@ -0,0 +1,78 @@
+"""
+วัดขนาดข้อมูลที่หน้าออกแบบ (app.py) ส่งไปเบราว์เซอร์ต่อการกดคำนวณหนึ่งครั้ง ด้วย streamlit AppTest
+แสดงขนาดที่ Streamlit สร้าง ขนาดเมื่อเบราว์เซอร์มีแคชของ element ที่ส่งเป็น hash ได้ และขนาดหลังบีบอัด
+--thresholds เปรียบเทียบเกณฑ์ global.minCachedMessageSize อื่นได้ (ค่าเริ่มต้นของ Streamlit 10 KB)
+
+จำลองเบราว์เซอร์: ข้อความที่แคชได้และเคยได้รับแล้วนับเป็นขนาดของข้อความที่ส่งเป็น hash
+และประมาณขนาดหลังบีบอัดของ websocket (permessage-deflate ต่อเนื่องทั้ง session) ด้วย zlib
+
+ตัวอย่าง:
+    python benchmarks/bench_payload.py
+    python benchmarks/bench_payload.py --thresholds 10000 1024
+"""
+import argparse
+import sys
+import warnings
+import zlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# (ชื่อ, ค่าที่เปลี่ยนก่อนกดคำนวณ)
+STEPS = [
+    ("กดคำนวณครั้งแรก", {}),
+    ("กดซ้ำ ค่าเดิม", {}),
+    ("เปลี่ยน Mu", {'Mu': 6000}),
+    ("เปลี่ยน b", {'b': 35}),
+]
+
+
+def run_session(threshold):
+    """
+    คืนค่า [(ชื่อขั้นตอน, bytes ที่ Streamlit สร้าง, bytes เมื่อเบราว์เซอร์มีแคช, bytes หลังบีบอัด)]
+    """
+    from streamlit import config
+    from streamlit.testing.v1 import AppTest
+
+    from beam_design.payload import PayloadMeter
+
+    PayloadMeter.keep = True
+    config.set_option('global.minCachedMessageSize', float(threshold))
+    app = AppTest.from_file(str(ROOT / 'app.py'), default_timeout=120)
+    app.run()
+    seen = set()
+    deflate = zlib.compressobj(6, zlib.DEFLATED, -15)
+    rows = []
+    for label, values in STEPS:
+        for key, value in values.items():
+            app.number_input(key=key).set_value(value)
+        next(button for button in app.button if 'คำนวณ' in button.label).click().run()
+        report = app.session_state['payload_report']
+        sent = compressed = 0
+        for (_, _, digest, ref_bytes), (data, ref_data) in zip(report['sent'], report['raw']):
+            if ref_bytes is not None and digest in seen:
+                data = ref_data
+            sent += len(data)
+            compressed += len(deflate.compress(data) + deflate.flush(zlib.Z_SYNC_FLUSH))
+        seen.update(digest for _, _, digest, ref_bytes in report['sent'] if ref_bytes is not None)
+        rows.append((label, report['bytes'], sent, compressed))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--thresholds', type=float, nargs='+', default=[10000],
+                        help='ค่า global.minCachedMessageSize (byte) ที่ต้องการเปรียบเทียบ')
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter('ignore')
+    print(f"{'เกณฑ์ (byte)':<14} {'ขั้นตอน':<18} {'สร้าง KB':>10} {'มีแคช KB':>10} {'บีบอัด KB':>10}")
+    for threshold in args.thresholds:
+        for label, generated, sent, compressed in run_session(threshold):
+            print(f"{threshold:<14,.0f} {label:<18} {generated / 1024:>10.1f} {sent / 1024:>10.1f} "
+                  f"{compressed / 1024:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+วัดความเร็วของโปรเจกต์ SQLite (beam_design.project): นำเข้า, คำนวณ, นำเข้าซ้ำเมื่อแก้บางคาน และการค้นหา
+
+ตัวอย่าง:
+    python benchmarks/bench_project.py --beams 50000 --levels 10 --changed 0.01
+
+ใช้ไฟล์ชั่วคราว (ลบเมื่อจบ) เพื่อให้ตรงกับการใช้งานจริง (WAL บนดิสก์) มากกว่า :memory:
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from beam_design.project import count_beams, open_project, query_beams, recompute, upsert_beams  # noqa: E402
+
+
+def random_beams(n, levels, seed=0):
+    rng = random.Random(seed)
+    return [{
+        'level': str(i % levels + 1), 'mark': f'B{i // levels + 1}',
+        'fc': rng.choice([210, 240, 280, 320]), 'fy': 4000,
+        'b': rng.randrange(20, 60, 5), 'h': rng.randrange(30, 100, 5), 'cover': 4,
+        'Mu': rng.randrange(1000, 30000, 100), 'Vu': rng.randrange(1000, 15000, 50),
+        'stirrup_type': rng.choice(['RB6', 'RB9']), 'stirrup_legs': 2, 'stirrup_spacing': 15,
+        'tension_steel_type': rng.choice(['DB12', 'DB16', 'DB20', 'DB25']),
+        'tension_steel_count': rng.randint(2, 8),
+    } for i in range(n)]
+
+
+def timed(label, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    count = len(result) if isinstance(result, list) else result
+    print(f'{label:<44} {elapsed * 1000:>10.1f} ms {count:>10,}')
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--beams', type=int, default=50_000)
+    parser.add_argument('--levels', type=int, default=10)
+    parser.add_argument('--changed', type=float, default=0.01, help='สัดส่วนคานที่แก้ Mu ก่อนนำเข้าซ้ำ')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    beams = random_beams(args.beams, args.levels, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = open_project(str(Path(tmp) / 'project.db'))
+        print(f"{'step':<44} {'time':>13} {'rows':>10}")
+        timed('upsert (new project)', upsert_beams, conn, beams)
+        timed('recompute (all)', recompute, conn)
+        timed('upsert (unchanged)', upsert_beams, conn, beams)
+        for beam in random.Random(args.seed + 1).sample(beams, int(len(beams) * args.changed)):
+            beam['Mu'] += 100
+        timed(f'upsert ({args.changed:.0%} changed)', upsert_beams, conn, beams)
+        timed('recompute (changed only)', recompute, conn)
+
+        level = str(min(3, args.levels))
+        timed(f'count: level {level}, φMn/Mu < 1.05', count_beams, conn, level=level, max_moment_ratio=1.05)
+        timed(f'page 1: level {level}, φMn/Mu < 1.05', query_beams, conn, level=level, max_moment_ratio=1.05)
+        timed('count: failed (all levels)', count_beams, conn, failed_only=True)
+        timed('page 20: failed (all levels)', query_beams, conn, failed_only=True, offset=19 * 50)
+        timed('page 1: lowest φVc/Vu', query_beams, conn, order_by='shear_ratio')
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+วัดความเร็วการเลือกชุดเหล็กรับแรงดึงที่น้อยที่สุด (beam_design.rebar) เทียบกับการไล่ตรวจทุกชุดเหล็ก
+
+ตัวอย่าง:
+    python benchmarks/bench_rebar.py --beams 200000
+
+ตรวจด้วยว่าผลของดัชนี (binary search) ตรงกับการไล่ตรวจทุกชุดในทุกคาน
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np  # noqa: E402
+
+from beam_design.rebar import BarCombinations, bar_combinations  # noqa: E402
+
+
+def brute_force(index, As_required, b, cover):
+    """
+    พื้นที่ของชุดที่น้อยที่สุดโดยตรวจทุกชุด (คานละแถว × ทุกชุดเหล็ก)
+    """
+    ok = ((index.area[None, :] >= As_required[:, None])
+          & (index.width[None, :] <= (b - 2 * cover)[:, None]))
+    return np.where(ok, index.area[None, :], np.inf).min(axis=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--beams', type=int, default=200_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    As_required = rng.uniform(1, 60, args.beams)
+    b = rng.integers(20, 80, args.beams).astype(float)
+    cover = np.full(args.beams, 4.0)
+
+    start = time.perf_counter()
+    index = BarCombinations()
+    print(f"build index: {len(index):,} combinations, {index.widths.size:,} widths, "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms")
+    index = bar_combinations()
+
+    start = time.perf_counter()
+    selected = index.select(As_required, b, cover)
+    indexed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = np.concatenate([brute_force(index, As_required[i:i + 10_000], b[i:i + 10_000], cover[i:i + 10_000])
+                               for i in range(0, args.beams, 10_000)])
+    brute = time.perf_counter() - start
+
+    got = np.where(selected['found'], selected['As_provided'], np.inf)
+    assert np.array_equal(got, expected), 'ผลของดัชนีไม่ตรงกับการไล่ตรวจทุกชุด'
+    print(f"{args.beams:,} beams: index {indexed * 1000:,.1f} ms | brute force {brute * 1000:,.1f} ms "
+          f"({brute / indexed:,.0f}x) | found {selected['found'].mean():.1%}")
+
+
+if __name__ == '__main__':
+    main()
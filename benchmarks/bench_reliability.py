@@ -0,0 +1,54 @@
+"""
+วัดความเร็วการสุ่ม Monte Carlo (beam_design.reliability) ที่จำนวน worker ต่าง ๆ และตรวจว่า
+ผลเหมือนกันทุกจำนวน worker (seed เดียวกัน) และหน่วยความจำสูงสุดไม่เพิ่มตามจำนวนตัวอย่าง
+
+ตัวอย่าง:
+    python benchmarks/bench_reliability.py --samples 1000000 10000000 --workers 1 2 4
+"""
+import argparse
+import resource
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from beam_design.reliability import RELIABILITY_CHUNKSIZE, estimate_reliability  # noqa: E402
+
+BEAM = {
+    'fc': 240, 'fy': 4000, 'b': 30, 'h': 50, 'cover': 4, 'Mu': 5500, 'Vu': 3257,
+    'stirrup_type': 'RB6', 'stirrup_legs': 2, 'stirrup_spacing': 15,
+    'tension_steel_type': 'DB12', 'tension_steel_count': 3,
+}
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2])
+    parser.add_argument('--chunksize', type=int, default=RELIABILITY_CHUNKSIZE)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'samples':>12} {'workers':>7} {'seconds':>8} {'samples/s':>12} {'beta':>6} {'CI':>13} "
+          f"{'peak RSS MB':>11}")
+    for n in args.samples:
+        failures = set()
+        for workers in args.workers:
+            start = time.perf_counter()
+            estimate = estimate_reliability(BEAM, samples=n, chunksize=args.chunksize, workers=workers,
+                                            seed=args.seed)
+            elapsed = time.perf_counter() - start
+            failures.add(estimate['failures'])
+            print(f"{n:>12,} {workers:>7} {elapsed:>8.2f} {n / elapsed:>12,.0f} {estimate['beta']:>6.3f} "
+                  f"{estimate['beta_low']:>6.3f}–{estimate['beta_high']:<6.3f} {peak_rss_mb():>11.0f}")
+        assert len(failures) == 1, 'จำนวนการวิบัติต่างกันเมื่อใช้จำนวน worker ต่างกัน'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+วัดเวลาสร้างรายงาน PDF (beam_design.report) ของตารางคานสุ่ม ที่จำนวน worker ต่าง ๆ
+
+ตัวอย่าง:
+    python benchmarks/bench_report.py --beams 200 --workers 1 2 4
+
+แสดงเวลา, หน้า/วินาที, ขนาดไฟล์ และหน่วยความจำสูงสุดของ process หลัก (ควรคงที่ไม่ว่าจำนวนคานเท่าใด)
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from beam_design.report import REPORT_CHUNKSIZE, write_report  # noqa: E402
+from bench_project import random_beams  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--beams', type=int, default=200)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--chunksize', type=int, default=REPORT_CHUNKSIZE)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    beams = random_beams(args.beams, 5, args.seed)
+    print(f"{'workers':>7} {'seconds':>9} {'pages':>7} {'pages/s':>9} {'MB':>7} {'max RSS MB':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in args.workers:
+            path = os.path.join(tmp, f'report-{workers}.pdf')
+            stats = write_report(beams, path, workers, args.chunksize)
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            print(f"{workers:>7} {stats['seconds']:>9.2f} {stats['pages']:>7,} "
+                  f"{stats['pages'] / stats['seconds']:>9.1f} {os.path.getsize(path) / 1e6:>7.2f} {rss:>11.0f}")
+
+
+if __name__ == '__main__':
+    main()
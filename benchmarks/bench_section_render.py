@@ -0,0 +1,107 @@
+"""
+เปรียบเทียบเวลาและหน่วยความจำในการวาดภาพตัดคาน 1,000 ครั้ง
+ระหว่าง draw_beam_section (matplotlib → PNG แบบเดียวกับ st.pyplot) และ draw_beam_section_svg
+
+ตัวอย่าง:
+    python benchmarks/bench_section_render.py --renders 1000
+
+แต่ละ backend รันใน process แยกกัน เพื่อให้ค่า peak RSS ไม่ปนกัน
+RSS growth คือ RSS ตอนจบลบ RSS หลังวาด 10% แรก (ถ้า figure รั่วค่านี้จะโตตามจำนวนครั้งที่วาด)
+"""
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+BACKENDS = ('matplotlib', 'svg')
+
+# ชุดหน้าตัดที่วนใช้ (หน่วย mm เหมือนที่หน้าเว็บส่งให้ draw_beam_section)
+CASES = [
+    (300, 500, 40, 16, 3, 6, 2, 40, None, None, 15),
+    (400, 700, 40, 25, 5, 9, 4, 50, 16, 2, 20),
+    (250, 400, 30, 12, 2, 6, 2, 40, None, None, 10),
+    (600, 1000, 50, 32, 8, 12, 4, 60, 20, 4, 25),
+]
+
+
+def current_rss_mb():
+    """
+    RSS ปัจจุบันของ process (MB) อ่านจาก /proc ถ้ามี ไม่เช่นนั้นใช้ค่า peak
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except OSError:
+        return peak_rss_mb()
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+def run_worker(backend, renders):
+    """
+    วาดภาพ renders ครั้งด้วย backend ที่เลือก แล้วพิมพ์ผลเป็น JSON
+    """
+    from beam_design.drawing import draw_beam_section, draw_beam_section_svg
+
+    def render(case):
+        if backend == 'svg':
+            return draw_beam_section_svg(*case).encode()
+        fig = draw_beam_section(*case)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=200, bbox_inches='tight')
+        return buffer.getvalue()
+
+    render(CASES[0])  # warm-up (import และ font cache)
+    warm = max(1, renders // 10)
+    payload = 0
+    start = time.perf_counter()
+    for i in range(renders):
+        payload += len(render(CASES[i % len(CASES)]))
+        if i + 1 == warm:
+            rss_after_warm = current_rss_mb()
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        'backend': backend,
+        'renders': renders,
+        'total_s': elapsed,
+        'per_render_ms': elapsed / renders * 1000,
+        'avg_bytes': payload / renders,
+        'peak_rss_mb': peak_rss_mb(),
+        'rss_growth_mb': current_rss_mb() - rss_after_warm,
+    }))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--renders', type=int, default=1000)
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument('--worker', choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(args.worker, args.renders)
+        return
+
+    print(f"{'backend':>11} {'ms/render':>10} {'total (s)':>10} {'avg size':>10} {'peak RSS':>10} {'RSS growth':>11}")
+    for backend in args.backends:
+        out = subprocess.run(
+            [sys.executable, __file__, '--worker', backend, '--renders', str(args.renders)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        r = json.loads(out.strip().splitlines()[-1])
+        print(f"{r['backend']:>11} {r['per_render_ms']:>10.2f} {r['total_s']:>10.2f} "
+              f"{r['avg_bytes'] / 1024:>8.1f}kB {r['peak_rss_mb']:>8.1f}MB {r['rss_growth_mb']:>9.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
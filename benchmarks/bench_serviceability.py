@@ -0,0 +1,69 @@
+"""
+เปรียบเทียบเวลาตรวจสภาวะใช้งาน (check_serviceability_batch) กับการตรวจกำลัง (calculate_beam_design_batch)
+บนตารางคานสุ่มชุดเดียวกัน และแบบหลายระดับน้ำหนัก (ระดับ × คาน) ในการเรียกครั้งเดียว
+
+ตัวอย่าง:
+    python benchmarks/bench_serviceability.py --rows 100000 1000000 --levels 5
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from beam_design.engine import calculate_beam_design_batch  # noqa: E402
+from beam_design.serviceability import check_serviceability_batch  # noqa: E402
+from bench_batch import random_schedule  # noqa: E402
+
+
+def service_inputs(schedule, seed=0):
+    """
+    ความยาวช่วงและโมเมนต์ใช้งานโดยประมาณจาก Mu (Mu ≈ 1.4D + 1.7L, L/D สุ่ม)
+    """
+    rng = np.random.default_rng(seed)
+    n = schedule['Mu'].size
+    ratio = rng.uniform(0.3, 1.0, n)
+    M_dead = schedule['Mu'] / (1.4 + 1.7 * ratio)
+    return {'span': rng.integers(8, 25, n) * 0.25, 'M_dead': M_dead, 'M_live': ratio * M_dead}
+
+
+def timed(function, repeat, **kwargs):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(**kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--levels', type=int, default=5, help='จำนวนระดับน้ำหนัก (ตัวคูณ 0.5–1.5 ของโมเมนต์ใช้งาน)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>10} {'strength s':>11} {'service s':>10} {'ratio':>6} {'levels s':>9} {'failed':>7}")
+    for n in args.rows:
+        schedule = random_schedule(n, args.seed)
+        service = service_inputs(schedule, args.seed)
+        section = {k: schedule[k] for k in ('fc', 'fy', 'b', 'h', 'd', 'tension_steel_type', 'tension_steel_count',
+                                            'compression_steel_type', 'd_prime')}
+        section['compression_steel_count'] = schedule['compression_steel_count']
+
+        strength, _ = timed(calculate_beam_design_batch, args.repeat, **schedule)
+        serviceability, result = timed(check_serviceability_batch, args.repeat, **section, **service)
+
+        scale = np.linspace(0.5, 1.5, args.levels)[:, None]
+        levels, _ = timed(check_serviceability_batch, 1, **section, span=service['span'],
+                          M_dead=service['M_dead'] * scale, M_live=service['M_live'] * scale)
+        print(f"{n:>10,} {strength:>11.3f} {serviceability:>10.3f} {serviceability / strength:>6.2f} "
+              f"{levels:>9.3f} {(~result['serviceability_ok']).mean():>7.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""
+ยิงคำขอพร้อมกันไปที่ HTTP API (python -m beam_design serve) แล้ววัด requests/s และ latency p50/p99
+
+ตัวอย่าง:
+    python benchmarks/load_test_api.py --endpoint check --concurrency 16 --duration 10
+    python benchmarks/load_test_api.py --endpoint batch --batch-size 1000
+    python benchmarks/load_test_api.py --url http://127.0.0.1:8000 --endpoint png --no-keepalive
+
+ถ้าไม่ระบุ --url จะเปิด server บนเครื่องใน process แยกให้เอง
+ข้อมูลคานสุ่มจากชุดคงที่ --distinct ตัว (ค่ามากทำให้แคชของ server hit น้อยลง)
+"""
+import argparse
+import http.client
+import json
+import random
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parents[1]
+
+ENDPOINTS = {
+    'check': '/check',
+    'batch': '/check/batch',
+    'svg': '/section?format=svg',
+    'png': '/section?format=png',
+}
+
+
+def random_beam(rng):
+    b = rng.choice([20, 25, 30, 35, 40])
+    h = rng.choice([40, 50, 60, 70, 80])
+    beam = {
+        'fc': rng.choice([210, 240, 280, 320]), 'fy': rng.choice([3000, 4000]),
+        'b': b, 'h': h, 'cover': 4, 'Mu': rng.randrange(2000, 30000, 100), 'Vu': rng.randrange(1000, 15000, 50),
+        'stirrup_type': rng.choice(['RB6', 'RB9']), 'stirrup_legs': 2, 'stirrup_spacing': rng.choice([10, 15, 20]),
+        'tension_steel_type': rng.choice(['DB12', 'DB16', 'DB20', 'DB25']), 'tension_steel_count': rng.randint(2, 5),
+    }
+    if rng.random() < 0.3:
+        beam.update(compression_steel=True, compression_steel_type='DB12', compression_steel_count=2, d_prime=4)
+    return beam
+
+
+def make_bodies(endpoint, distinct, batch_size, seed):
+    rng = random.Random(seed)
+    beams = [random_beam(rng) for _ in range(distinct)]
+    if endpoint == 'batch':
+        return [json.dumps({'beams': rng.choices(beams, k=batch_size)}).encode() for _ in range(16)]
+    return [json.dumps(beam).encode() for beam in beams]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers):
+    """
+    เปิด server ใน process แยก แล้วรอจนตอบ /health ได้
+    """
+    port = free_port()
+    proc = subprocess.Popen([sys.executable, '-m', 'beam_design', 'serve', '--port', str(port),
+                             '--workers', str(workers)], cwd=ROOT, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/health')
+            conn.getresponse().read()
+            return proc, f'http://127.0.0.1:{port}'
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError('เปิด server ไม่สำเร็จ')
+
+
+def stop_server(proc, timeout=30):
+    """
+    ปิด server แบบเดียวกับกด Ctrl+C (server ปิด process pool ของตัวเองก่อนจบ) ถ้าไม่จบภายใน timeout จึง kill
+    """
+    proc.send_signal(signal.SIGINT)
+    try:
+        proc.wait(timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def client(url, path, bodies, stop_at, keepalive, latencies, errors, seed):
+    """
+    ส่งคำขอวนไปจนถึงเวลา stop_at เก็บ latency (วินาที) ของคำขอที่สำเร็จ
+    """
+    target = urlsplit(url)
+    rng = random.Random(seed)
+    conn = None
+    headers = {'Content-Type': 'application/json'}
+    if not keepalive:
+        headers['Connection'] = 'close'
+    while time.perf_counter() < stop_at:
+        body = rng.choice(bodies)
+        start = time.perf_counter()
+        try:
+            if conn is None:
+                conn = http.client.HTTPConnection(target.hostname, target.port, timeout=60)
+            conn.request('POST', path, body, headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+            latencies.append(time.perf_counter() - start)
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            conn = None
+            continue
+        if not keepalive:
+            conn.close()
+            conn = None
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return float('nan')
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='server ที่เปิดอยู่แล้ว (ค่าเริ่มต้น: เปิดใหม่บนเครื่อง)')
+    parser.add_argument('--endpoint', choices=ENDPOINTS, default='check')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0, help='ระยะเวลาทดสอบ (วินาที)')
+    parser.add_argument('--warmup', type=float, default=1.0, help='ระยะเวลาอุ่นเครื่องก่อนวัด (วินาที)')
+    parser.add_argument('--batch-size', type=int, default=100, help='จำนวนคานต่อคำขอสำหรับ endpoint batch')
+    parser.add_argument('--distinct', type=int, default=500, help='จำนวนคานที่แตกต่างกันในชุดข้อมูล')
+    parser.add_argument('--workers', type=int, default=2, help='จำนวน worker ของ server ที่เปิดเอง')
+    parser.add_argument('--no-keepalive', action='store_true', help='เปิด connection ใหม่ทุกคำขอ')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    proc = None
+    url = args.url
+    if url is None:
+        proc, url = start_server(args.workers)
+    try:
+        path = ENDPOINTS[args.endpoint]
+        bodies = make_bodies(args.endpoint, args.distinct, args.batch_size, args.seed)
+        keepalive = not args.no_keepalive
+        for phase, duration in (('warmup', args.warmup), ('measure', args.duration)):
+            latencies, errors = [], []
+            stop_at = time.perf_counter() + duration
+            threads = [threading.Thread(target=client, args=(url, path, bodies, stop_at, keepalive,
+                                                             latencies, errors, args.seed + i))
+                       for i in range(args.concurrency)]
+            start = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - start
+    finally:
+        if proc is not None:
+            stop_server(proc)
+
+    latencies.sort()
+    rps = len(latencies) / elapsed
+    print(f'endpoint     : {args.endpoint} ({path}) keep-alive={keepalive} concurrency={args.concurrency}')
+    print(f'requests     : {len(latencies):,} ok, {len(errors):,} errors in {elapsed:.1f} s')
+    print(f'throughput   : {rps:,.0f} req/s' + (f' ({rps * args.batch_size:,.0f} beams/s)'
+                                                if args.endpoint == 'batch' else ''))
+    if latencies:
+        print(f'latency (ms) : p50 {percentile(latencies, 50) * 1000:.2f} | p99 {percentile(latencies, 99) * 1000:.2f}'
+              f' | mean {statistics.fmean(latencies) * 1000:.2f} | max {latencies[-1] * 1000:.2f}')
+    if errors:
+        print(f'errors       : {dict((e, errors.count(e)) for e in set(errors))}')
+
+
+if __name__ == '__main__':
+    main()
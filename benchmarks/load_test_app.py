@@ -0,0 +1,239 @@
+"""
+จำลองผู้ใช้หลายคนพร้อมกันบนหน้าออกแบบ (app.py) ด้วย streamlit AppTest แล้ววัด throughput, latency และหน่วยความจำ
+
+ตัวอย่าง:
+    python benchmarks/load_test_app.py --sessions 8 --duration 60
+    python benchmarks/load_test_app.py --sessions 4 --duration 300 --pdf --samples rss.csv --max-growth 50
+
+แต่ละ session เปิดหน้าเว็บของตัวเอง (session_state แยกกัน) แล้ววนเปลี่ยนข้อมูลในฟอร์ม กด "คำนวณ"
+และตรวจว่าได้ผลลัพธ์ครบ ทุก session อยู่ใน process เดียวกันเหมือน server จริง (แคชของ beam_design ใช้ร่วมกัน)
+AppTest ตั้งค่า runtime แบบ global ทุกครั้งที่รัน จึงรันสคริปต์ได้ทีละ session (lock) เหมือนคิวของ CPU หนึ่งตัว
+latency ที่รายงานคือเวลาตั้งแต่กดจนได้ผล (รวมเวลารอคิว) และ service คือเวลารันสคริปต์อย่างเดียว
+
+ระหว่างทดสอบเก็บ RSS ของ process, จำนวน figure ของ matplotlib ที่ยังเปิดอยู่ และจำนวน object ทุก --interval วินาที
+แล้วประมาณอัตราการเพิ่มของ RSS (MB/นาที) หลังช่วงอุ่นเครื่อง เพื่อจับหน่วยความจำรั่ว (เช่น figure ที่ไม่ได้ปิด)
+"""
+import argparse
+import csv
+import gc
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import warnings
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from load_test_api import percentile  # noqa: E402
+
+APP = str(ROOT / 'app.py')
+
+# ค่าที่สุ่มให้แต่ละครั้งที่กดคำนวณ {key ของ widget: ตัวเลือก}
+INPUT_CHOICES = {
+    'fc': [210, 240, 280, 320],
+    'fy': [3000, 4000],
+    'b': [20, 25, 30, 35, 40],
+    'h': [40, 50, 60, 70, 80],
+    'Mu': range(2000, 30000, 100),
+    'Vu': range(1000, 15000, 50),
+    'stirrup_type': ['RB6', 'RB9'],
+    'stirrup_spacing': [10, 15, 20],
+    'tension_steel_type': ['DB12', 'DB16', 'DB20', 'DB25'],
+    'tension_steel_count': [2, 3, 4, 5],
+}
+
+
+def rss_mb():
+    """
+    RSS ปัจจุบันของ process (MB) จาก /proc ถ้าไม่มี (เช่น macOS) ใช้ค่าสูงสุดจาก resource
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except OSError:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == 'darwin' else peak / 1024
+
+
+def open_figures():
+    """
+    จำนวน figure ของ matplotlib ที่ยังไม่ถูกปิด (ไม่นับถ้ายังไม่ได้ import matplotlib)
+    """
+    pyplot = sys.modules.get('matplotlib.pyplot')
+    return len(pyplot.get_fignums()) if pyplot is not None else 0
+
+
+def make_designs(distinct, seed):
+    rng = random.Random(seed)
+    return [{key: rng.choice(choices) for key, choices in INPUT_CHOICES.items()} for _ in range(distinct)]
+
+
+class LoadTest:
+    """
+    สถิติรวมของทุก session: latency, service time, ข้อผิดพลาด และตัวอย่างหน่วยความจำตามเวลา
+    """
+
+    def __init__(self, designs, pdf, think_time):
+        self.designs = designs
+        self.pdf = pdf
+        self.think_time = think_time
+        self.run_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.measuring = False
+        self.latencies = []
+        self.service = []
+        self.errors = []
+        self.reruns = 0
+        self.samples = []
+
+    def run(self, at):
+        """
+        รันสคริปต์ 1 ครั้ง คืนค่า (latency รวมรอคิว, เวลารันสคริปต์)
+        """
+        start = time.perf_counter()
+        with self.run_lock:
+            began = time.perf_counter()
+            at.run()
+            finished = time.perf_counter()
+        return finished - start, finished - began
+
+    def session(self, index, stop_at, seed):
+        from streamlit.testing.v1 import AppTest
+
+        rng = random.Random(seed)
+        at = AppTest.from_file(APP, default_timeout=120)
+        try:
+            self.run(at)
+        except Exception as e:  # noqa: BLE001 - นับเป็นข้อผิดพลาดของ session แล้วหยุด session นั้น
+            self.record_error(f'session {index}: {type(e).__name__}: {e}')
+            return
+        while time.perf_counter() < stop_at:
+            for key, value in rng.choice(self.designs).items():
+                at.session_state[key] = value
+            at.session_state['pdf_report'] = self.pdf
+            button = next(b for b in at.button if 'คำนวณ' in b.label)
+            button.click()
+            try:
+                latency, service = self.run(at)
+            except Exception as e:  # noqa: BLE001
+                self.record_error(f'{type(e).__name__}: {e}')
+                continue
+            if at.exception:
+                self.record_error(at.exception[0].message.splitlines()[0])
+            elif len(at.metric) != 3:
+                self.record_error('ไม่พบผลลัพธ์หลังกดคำนวณ')
+            elif self.measuring:
+                with self.stats_lock:
+                    self.latencies.append(latency)
+                    self.service.append(service)
+                    self.reruns += 1
+            if self.think_time:
+                time.sleep(rng.uniform(0, 2 * self.think_time))
+
+    def record_error(self, message):
+        if self.measuring:
+            with self.stats_lock:
+                self.errors.append(message)
+
+    def sampler(self, started, stop, interval):
+        while not stop.wait(interval):
+            self.samples.append({
+                'seconds': round(time.perf_counter() - started, 2),
+                'rss_mb': round(rss_mb(), 1),
+                'reruns': self.reruns,
+                'figures': open_figures(),
+                'objects': len(gc.get_objects()),
+            })
+
+
+def growth_rate(samples):
+    """
+    ความชันของ RSS (MB/นาที) แบบ least squares
+    """
+    if len(samples) < 2:
+        return float('nan')
+    xs = [s['seconds'] for s in samples]
+    ys = [s['rss_mb'] for s in samples]
+    mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+    var = sum((x - mean_x) ** 2 for x in xs)
+    return 60 * sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var if var else float('nan')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=4, help='จำนวนผู้ใช้ที่จำลองพร้อมกัน')
+    parser.add_argument('--duration', type=float, default=30.0, help='ระยะเวลาวัด (วินาที)')
+    parser.add_argument('--warmup', type=float, default=5.0, help='ระยะเวลาอุ่นเครื่องก่อนวัด (วินาที)')
+    parser.add_argument('--think-time', type=float, default=0.0, help='เวลาคิดเฉลี่ยระหว่างการกดแต่ละครั้ง (วินาที)')
+    parser.add_argument('--distinct', type=int, default=200, help='จำนวนแบบคานที่แตกต่างกัน (ค่ามาก แคช hit น้อยลง)')
+    parser.add_argument('--pdf', action='store_true', help='เปิด "สร้างรายงาน PDF" (วาดด้วย matplotlib ทุกครั้งที่คำนวณ)')
+    parser.add_argument('--interval', type=float, default=1.0, help='ระยะห่างการเก็บ RSS (วินาที)')
+    parser.add_argument('--samples', help='บันทึกตัวอย่าง RSS ตามเวลาเป็น CSV')
+    parser.add_argument('--max-growth', type=float, help='คืนค่า exit code 1 ถ้า RSS เพิ่มเร็วกว่านี้ (MB/นาที)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # ไม่มีฟอนต์ไทยในเครื่องทดสอบ ไม่ต้องแสดงคำเตือน glyph ของ matplotlib ทุกหน้า
+    warnings.filterwarnings('ignore', message='Glyph .* missing')
+    test = LoadTest(make_designs(args.distinct, args.seed), args.pdf, args.think_time)
+    started = time.perf_counter()
+    stop_at = started + args.warmup + args.duration
+    stop = threading.Event()
+    sampler = threading.Thread(target=test.sampler, args=(started, stop, args.interval), daemon=True)
+    sessions = [threading.Thread(target=test.session, args=(i, stop_at, args.seed + i))
+                for i in range(args.sessions)]
+    sampler.start()
+    for t in sessions:
+        t.start()
+    time.sleep(args.warmup)
+    test.measuring = True
+    measure_start = time.perf_counter()
+    for t in sessions:
+        t.join()
+    elapsed = time.perf_counter() - measure_start
+    stop.set()
+    sampler.join()
+
+    measured = [s for s in test.samples if s['seconds'] >= args.warmup]
+    latencies, service = sorted(test.latencies), sorted(test.service)
+    print(f'sessions     : {args.sessions} (think time {args.think_time:g} s, pdf={args.pdf}, '
+          f'{args.distinct} distinct designs)')
+    print(f'reruns       : {len(latencies):,} ok, {len(test.errors):,} errors in {elapsed:.1f} s')
+    print(f'throughput   : {len(latencies) / elapsed:,.2f} reruns/s')
+    for name, values in (('latency (ms)', latencies), ('service (ms)', service)):
+        if values:
+            print(f'{name} : p50 {percentile(values, 50) * 1000:,.0f} | p95 {percentile(values, 95) * 1000:,.0f}'
+                  f' | p99 {percentile(values, 99) * 1000:,.0f} | mean {statistics.fmean(values) * 1000:,.0f}'
+                  f' | max {values[-1] * 1000:,.0f}')
+    if measured:
+        rss = [s['rss_mb'] for s in measured]
+        growth = growth_rate(measured)
+        print(f'RSS (MB)     : start {rss[0]:,.0f} | end {rss[-1]:,.0f} | max {max(rss):,.0f} '
+              f'| growth {growth:+,.1f} MB/min')
+        print(f'figures open : {measured[-1]["figures"]} | gc objects {measured[0]["objects"]:,} -> '
+              f'{measured[-1]["objects"]:,}')
+        print(f'\n{"t (s)":>7} {"RSS MB":>8} {"reruns":>7} {"figures":>8}')
+        step = max(1, len(test.samples) // 10)
+        for s in test.samples[::step]:
+            print(f'{s["seconds"]:>7.1f} {s["rss_mb"]:>8.1f} {s["reruns"]:>7,} {s["figures"]:>8}')
+    if test.errors:
+        print(f'errors       : {dict((e, test.errors.count(e)) for e in set(test.errors))}')
+    if args.samples:
+        with open(args.samples, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['seconds', 'rss_mb', 'reruns', 'figures', 'objects'])
+            writer.writeheader()
+            writer.writerows(test.samples)
+    if args.max_growth is not None and measured and growth_rate(measured) > args.max_growth:
+        print(f'RSS เพิ่มเร็วกว่า {args.max_growth} MB/นาที', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
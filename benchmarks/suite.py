@@ -0,0 +1,295 @@
+"""
+ชุดวัดความเร็วมาตรฐาน: calculate_beam_design, draw_beam_section และการรันหน้าเว็บทั้งหน้าผ่าน AppTest
+บันทึกผลเป็น JSON แล้วเทียบกับ baseline ที่เก็บไว้ ถ้าช้าลงเกิน threshold จะแจ้งและคืนค่า exit code 1
+
+ตัวอย่าง:
+    python benchmarks/suite.py --update-baseline          # วัดแล้วเก็บเป็น baseline (benchmarks/baseline.json)
+    python benchmarks/suite.py                            # วัดแล้วเทียบกับ baseline
+    python benchmarks/suite.py --filter engine --threshold 0.1 --output results.json
+
+แต่ละ case วนรันจนใช้เวลาอย่างน้อย --min-time วินาทีต่อรอบ (แบบ timeit) ทำ --repeat รอบ
+ปิด garbage collector ระหว่างจับเวลาเหมือน timeit
+ทั้งชุดรันซ้ำใน process ใหม่ --processes ครั้ง (เวลาต่าง process อาจต่างกันหลายสิบเปอร์เซ็นต์บนเครื่องที่ใช้ร่วมกัน)
+เทียบกับ baseline ด้วยค่ากลาง (median) ของค่ากลางแต่ละ process ซึ่งไม่ไหวตามรอบที่เร็วหรือช้าผิดปกติ
+และหารด้วยเวลาของงานอ้างอิง (reference/python-loop ที่ไม่เกี่ยวกับโค้ดของเรา) เพื่อตัดผลของเครื่องที่ช้าลงทั้งเครื่อง
+baseline ขึ้นกับเครื่องที่วัด ควรวัดใหม่บนเครื่องเดียวกันก่อนเทียบ
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+DEFAULT_BASELINE = ROOT / 'benchmarks' / 'baseline.json'
+
+# (fc, fy, b, h, d, Mu, Vu, stirrup_type, stirrup_legs, stirrup_spacing, tension_type, tension_count, ...)
+ENGINE_CASES = {
+    'pass': (240, 4000, 30, 50, 46, 5500, 3257, 'RB6', 2, 15, 'DB16', 3),
+    'fail': (240, 4000, 30, 50, 46, 5500, 3257, 'RB6', 2, 15, 'DB12', 3),
+    'pass+compression': (240, 4000, 30, 50, 46, 5500, 3257, 'RB6', 2, 15, 'DB16', 3, True, 'DB12', 2, 4),
+    'fail+compression': (240, 4000, 30, 50, 46, 5500, 3257, 'RB6', 2, 15, 'DB12', 3, True, 'DB12', 2, 4),
+}
+
+
+def engine_cases():
+    from beam_design.engine import calculate_beam_design
+
+    cases = {}
+    for name, args in ENGINE_CASES.items():
+        cases[f'engine/{name}'] = lambda args=args: calculate_beam_design(*args)
+        cases[f'engine/{name}/no-trace'] = lambda args=args: calculate_beam_design(*args, with_trace=False)
+    return cases
+
+
+def drawing_cases():
+    from beam_design.drawing import draw_beam_section
+
+    cases = {}
+    for bars in range(1, 11):
+        # หน้าตัด 40x60 cm เหล็ก DB16 (หน่วย mm เหมือนที่หน้าเว็บส่งให้)
+        cases[f'draw/{bars}-bars'] = lambda bars=bars: draw_beam_section(400, 600, 40, 16, bars, 9, 2, 40)
+        cases[f'draw/{bars}-bars+compression'] = (
+            lambda bars=bars: draw_beam_section(400, 600, 40, 16, bars, 9, 2, 40, 12, 2))
+    return cases
+
+
+def app_cases():
+    from streamlit.testing.v1 import AppTest
+
+    from beam_design.cache import PIPELINE_CACHE, RESULT_CACHE, SECTION_CACHE
+
+    app = str(ROOT / 'app.py')
+
+    def initial_run():
+        AppTest.from_file(app, default_timeout=60).run()
+
+    def calculate(cold):
+        # เตรียมหน้าเว็บไว้ก่อน แล้วคืนฟังก์ชันที่วัดเฉพาะการกดปุ่ม "คำนวณ"
+        def setup():
+            at = AppTest.from_file(app, default_timeout=60).run()
+            button = next(b for b in at.sidebar.button if 'คำนวณ' in b.label)
+            if cold:
+                RESULT_CACHE.clear()
+                SECTION_CACHE.clear()
+                PIPELINE_CACHE.clear()
+            return lambda: button.click().run()
+        return setup
+
+    return {
+        'app/initial-run': initial_run,
+        'app/calculate-cold-cache': ('setup', calculate(cold=True)),
+        'app/calculate-warm-cache': ('setup', calculate(cold=False)),
+    }
+
+
+REFERENCE = 'reference/python-loop'
+
+
+def reference_work():
+    """
+    งานอ้างอิงที่ไม่ใช้โค้ดของโปรแกรม ใช้วัดว่าเครื่องเร็ว/ช้ากว่าตอนเก็บ baseline แค่ไหน
+    """
+    total = 0
+    for i in range(10_000):
+        total += i * i % 7
+    return total
+
+
+GROUPS = {'engine': engine_cases, 'draw': drawing_cases, 'app': app_cases}
+
+
+def measure(func, repeat, min_time):
+    """
+    เวลาต่อครั้ง (วินาที) ของ func ทั้ง repeat รอบ แต่ละรอบวนจนใช้เวลาอย่างน้อย min_time
+    func อาจเป็น ('setup', setup) เมื่อต้องเตรียมสถานะใหม่ก่อนวัดทุกครั้ง (วัดครั้งละ 1 loop)
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        return _measure(func, repeat, min_time)
+    finally:
+        gc.enable()
+
+
+def _measure(func, repeat, min_time):
+    if isinstance(func, tuple):
+        setup = func[1]
+        times = []
+        for _ in range(repeat):
+            run = setup()
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        return times, 1
+
+    func()  # warm-up
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+    times = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        times.append((time.perf_counter() - start) / loops)
+    return times, loops
+
+
+def environment():
+    versions = {}
+    for name in ('numpy', 'matplotlib', 'streamlit', 'pandas'):
+        try:
+            versions[name] = __import__(name).__version__
+        except ImportError:
+            versions[name] = None
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'versions': versions,
+    }
+
+
+def run_suite(groups, name_filter, repeat, min_time):
+    cases = {REFERENCE: reference_work}
+    for group in groups:
+        cases.update(GROUPS[group]())
+    results = {}
+    for name, func in cases.items():
+        if name_filter and name_filter not in name and name != REFERENCE:
+            continue
+        times, loops = measure(func, repeat, min_time)
+        results[name] = {
+            'min_s': min(times),
+            'median_s': statistics.median(times),
+            'stdev_s': statistics.stdev(times) if len(times) > 1 else 0.0,
+            'loops': loops,
+            'repeat': len(times),
+        }
+        print(f"{name:<36} {results[name]['min_s'] * 1000:>10.3f} ms  (median "
+              f"{results[name]['median_s'] * 1000:.3f} ms, {loops} loops x {len(times)})", flush=True)
+    return results
+
+
+def run_processes(args):
+    """
+    รันชุดวัดใน process ใหม่ args.processes ครั้ง แล้วรวมผล (ค่าต่ำสุดของ min_s, ค่ากลางของ median_s)
+    """
+    command = [sys.executable, __file__, '--worker', '--repeat', str(args.repeat), '--min-time', str(args.min_time),
+               '--groups', *args.groups] + (['--filter', args.filter] if args.filter else [])
+    runs = []
+    for i in range(args.processes):
+        print(f'--- process {i + 1}/{args.processes}', flush=True)
+        out = subprocess.run(command, check=True, stdout=subprocess.PIPE, text=True).stdout
+        lines = out.strip().splitlines()
+        print('\n'.join(lines[:-1]), flush=True)
+        runs.append(json.loads(lines[-1]))
+    results = {}
+    for name in runs[0]:
+        samples = [run[name] for run in runs]
+        results[name] = {
+            'min_s': min(r['min_s'] for r in samples),
+            'median_s': statistics.median(r['median_s'] for r in samples),
+            'stdev_s': statistics.fmean(r['stdev_s'] for r in samples),
+            'loops': samples[0]['loops'],
+            'repeat': sum(r['repeat'] for r in samples),
+            'processes': len(samples),
+        }
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    เทียบค่า median_s กับ baseline (ปรับตามความเร็วเครื่องด้วยงานอ้างอิง) คืนค่ารายชื่อ case ที่ช้าลงเกิน threshold
+    """
+    regressions = []
+    speed = 1.0
+    if REFERENCE in results and REFERENCE in baseline:
+        speed = results[REFERENCE]['median_s'] / baseline[REFERENCE]['median_s']
+        print(f'\nเครื่องช้ากว่าตอนเก็บ baseline {speed - 1:+.1%} (ปรับค่า change ตามนี้แล้ว)')
+    print(f"\n{'case':<36} {'baseline':>11} {'current':>11} {'change':>8}")
+    for name, result in results.items():
+        if name == REFERENCE:
+            continue
+        if name not in baseline:
+            print(f'{name:<36} {"-":>11} {result["median_s"] * 1000:>8.3f} ms {"new":>8}')
+            continue
+        before = baseline[name]['median_s']
+        change = result['median_s'] / (before * speed) - 1
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif change < -threshold:
+            flag = '  faster'
+        print(f'{name:<36} {before * 1000:>8.3f} ms {result["median_s"] * 1000:>8.3f} ms {change:>+7.1%}{flag}')
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--groups', nargs='+', choices=GROUPS, default=list(GROUPS))
+    parser.add_argument('--filter', help='วัดเฉพาะ case ที่มีข้อความนี้ในชื่อ')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help='เวลาขั้นต่ำต่อรอบ (วินาที)')
+    parser.add_argument('--processes', type=int, default=3, help='จำนวน process ที่รันชุดวัดซ้ำ')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--output', help='บันทึกผลเป็น JSON')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+    parser.add_argument('--update-baseline', action='store_true', help='เขียนผลครั้งนี้ทับ baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='สัดส่วนที่ถือว่าช้าลง (0.2 = 20%%)')
+    args = parser.parse_args(argv)
+    warnings.simplefilter('ignore')
+
+    if args.worker:
+        print(json.dumps(run_suite(args.groups, args.filter, args.repeat, args.min_time)))
+        return 0
+
+    report = {'environment': environment(), 'results': run_processes(args)}
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {'results': {}}
+        baseline['environment'] = report['environment']
+        baseline['results'].update(report['results'])
+        baseline_path.write_text(json.dumps(baseline, indent=2))
+        print(f'\nบันทึก baseline: {baseline_path}')
+        return 0
+    if not baseline_path.exists():
+        print(f'\nไม่พบ baseline ({baseline_path}) รันด้วย --update-baseline เพื่อสร้าง')
+        return 0
+
+    baseline = json.loads(baseline_path.read_text())
+    regressions = compare(report['results'], baseline['results'], args.threshold)
+    if regressions:
+        print(f'\nช้าลงเกิน {args.threshold:.0%}: {", ".join(regressions)}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
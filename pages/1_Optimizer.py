@@ -0,0 +1,114 @@
+import streamlit as st
+import pandas as pd
+
+from beam_design.engine import STEEL_AREAS, STIRRUP_AREAS
+from beam_design.metrics import AppRun
+from beam_design.optimizer import CONCRETE_PRICE, STEEL_PRICE, optimize_beam_design
+
+# ตั้งค่าหน้าเว็บ
+st.set_page_config(
+    page_title="ค้นหาแบบคานที่ประหยัดที่สุด",
+    page_icon="🔍",
+    layout="wide"
+)
+page_run = AppRun('optimizer')
+
+st.title("🔍 ค้นหาแบบคานที่ประหยัดที่สุด")
+st.markdown("**ค้นหาขนาดหน้าตัดและเหล็กเสริมที่ผ่านทุกการตรวจสอบ เรียงตามราคาหรือน้ำหนักต่อความยาว 1 m**")
+
+# Sidebar สำหรับ Input
+st.sidebar.header("📝 เงื่อนไขการค้นหา")
+
+st.sidebar.subheader("1. วัสดุและแรงกระทำ")
+fc = st.sidebar.number_input("กำลังอัดคอนกรีต $f'_c$ (kg/cm²)", min_value=150, max_value=500, value=240, step=10)
+fy = st.sidebar.number_input("กำลังดึงเหล็ก $f_y$ (kg/cm²)", min_value=2400, max_value=4200, value=4000, step=200)
+Mu = st.sidebar.number_input("โมเมนต์ดัดใช้งาน $M_u$ (kg-m)", min_value=1000, max_value=50000, value=5500, step=100)
+Vu = st.sidebar.number_input("แรงเฉือนใช้งาน $V_u$ (kg)", min_value=1000, max_value=20000, value=3257, step=50)
+cover = st.sidebar.number_input("ระยะคอนกรีตปก cover (cm)", min_value=2, max_value=8, value=4, step=1)
+
+st.sidebar.subheader("2. ช่วงขนาดหน้าตัด")
+b_range = st.sidebar.slider("ความกว้าง b (cm)", 20, 100, (20, 60), step=5)
+h_range = st.sidebar.slider("ความสูง h (cm)", 30, 150, (30, 100), step=5)
+
+st.sidebar.subheader("3. เหล็กเสริม")
+bar_types = st.sidebar.multiselect("ขนาดเหล็กรับแรงดึง", list(STEEL_AREAS), default=list(STEEL_AREAS))
+bar_counts = st.sidebar.slider("จำนวนเส้น", 1, 10, (2, 10))
+stirrup_types = st.sidebar.multiselect("เหล็กปลอก", list(STIRRUP_AREAS), default=list(STIRRUP_AREAS))
+stirrup_legs = st.sidebar.slider("จำนวนขา", 2, 6, (2, 4))
+stirrup_spacings = st.sidebar.slider("ระยะเรียง (cm)", 5, 30, (5, 30))
+
+st.sidebar.subheader("4. เกณฑ์การเลือก")
+objective = st.sidebar.radio("เรียงตาม", ['cost', 'weight'],
+                             format_func=lambda x: "ราคา (บาท/m)" if x == 'cost' else "น้ำหนัก (kg/m)")
+concrete_price = st.sidebar.number_input("ราคาคอนกรีต (บาท/m³)", min_value=0, value=CONCRETE_PRICE, step=100)
+steel_price = st.sidebar.number_input("ราคาเหล็ก (บาท/kg)", min_value=0, value=STEEL_PRICE, step=1)
+top_n = st.sidebar.number_input("จำนวนแบบที่แสดง", min_value=1, max_value=50, value=10, step=1)
+
+search = st.sidebar.button("🔍 ค้นหา", type="primary")
+
+if search:
+    if not bar_types or not stirrup_types:
+        st.warning("กรุณาเลือกขนาดเหล็กรับแรงดึงและเหล็กปลอกอย่างน้อยหนึ่งชนิด")
+    else:
+        st.session_state['optimizer_result'] = {
+            'inputs': {'fc': fc, 'fy': fy, 'Mu': Mu, 'Vu': Vu, 'cover': cover},
+            'result': optimize_beam_design(
+                Mu, Vu, fc, fy,
+                range(b_range[0], b_range[1] + 1, 5), range(h_range[0], h_range[1] + 1, 5), cover,
+                bar_types=bar_types, bar_counts=range(bar_counts[0], bar_counts[1] + 1),
+                stirrup_types=stirrup_types, stirrup_legs=range(stirrup_legs[0], stirrup_legs[1] + 1),
+                stirrup_spacings=range(stirrup_spacings[0], stirrup_spacings[1] + 1),
+                top_n=top_n, objective=objective,
+                concrete_price=concrete_price, steel_price=steel_price,
+            ),
+        }
+
+found = st.session_state.get('optimizer_result')
+if found is None:
+    st.info("👈 กำหนดเงื่อนไขในแถบด้านซ้าย แล้วกดปุ่ม 'ค้นหา'")
+else:
+    designs = found['result']['designs']
+    stats = found['result']['stats']
+    st.caption(f"หน้าตัดทั้งหมด {stats['sections']:,} | ผ่าน ρ และแรงเฉือน {stats['sections_feasible']:,} | "
+               f"ประเมินเหล็กเสริม {stats['sections_evaluated']:,} หน้าตัด | "
+               f"ตรวจสอบรวม {stats['combinations_evaluated']:,} กรณี")
+    if stats.get('designs_rejected'):
+        st.warning(f"⚠️ ตัดแบบที่ไม่ผ่านเมื่อยืนยันด้วยการคำนวณจริง {stats['designs_rejected']:,} แบบ")
+
+    if not designs:
+        st.error("❌ ไม่พบแบบที่ผ่านทุกเงื่อนไข - ลองขยายช่วงขนาดหน้าตัดหรือเพิ่มตัวเลือกเหล็กเสริม")
+    else:
+        key = 'cost' if 'cost' in designs[0] else 'weight'
+        label = "ราคา (บาท/m)" if key == 'cost' else "น้ำหนัก (kg/m)"
+        df_designs = pd.DataFrame({
+            'ลำดับ': range(1, len(designs) + 1),
+            'b×h (cm)': [f"{d['b']:.0f}×{d['h']:.0f}" for d in designs],
+            'เหล็กรับแรงดึง': [f"{d['tension_steel_count']} เส้น {d['tension_steel_type']}" for d in designs],
+            'เหล็กปลอก': [f"{d['stirrup_type']} {d['stirrup_legs']} ขา @ {d['stirrup_spacing']:.0f} cm" for d in designs],
+            'φMn (kg-m)': [f"{d['phi_Mn']:,.0f}" for d in designs],
+            'φVc (kg)': [f"{d['phi_Vc']:,.0f}" for d in designs],
+            label: [f"{d[key]:,.2f}" for d in designs],
+        })
+        st.dataframe(df_designs, use_container_width=True, hide_index=True)
+
+        rank = st.selectbox("เลือกแบบ", range(1, len(designs) + 1), format_func=lambda i: f"ลำดับที่ {i}")
+        if st.button("📥 ใช้แบบนี้ในหน้าออกแบบ"):
+            chosen = designs[rank - 1]
+            st.session_state['loaded_design'] = {
+                **found['inputs'],
+                'b': int(chosen['b']),
+                'h': int(chosen['h']),
+                'stirrup_type': chosen['stirrup_type'],
+                'stirrup_legs': chosen['stirrup_legs'],
+                'stirrup_spacing': int(chosen['stirrup_spacing']),
+                'tension_steel_type': chosen['tension_steel_type'],
+                'tension_steel_count': chosen['tension_steel_count'],
+                'compression_steel': False,
+            }
+            st.switch_page("app.py")
+
+# ส่วนท้าย
+st.markdown("---")
+st.caption("🛠️ พัฒนาโดย Sketchup & Civil Engineer | Strength Design Method (SDM) | หน่วย: kg, cm")
+
+page_run.finish()
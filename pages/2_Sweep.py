@@ -0,0 +1,193 @@
+import time
+
+import numpy as np
+import streamlit as st
+import plotly.graph_objects as go
+
+from beam_design.engine import STEEL_AREAS, STIRRUP_AREAS
+from beam_design.metrics import CHART_BUILDS, AppRun
+from beam_design.payload import compact_figure
+from beam_design.sweep import SWEEP_AXES, downsample_grid, sweep_design
+
+# จำนวนจุดสูงสุดที่ส่งไปวาดต่อกราฟ (มากกว่านี้จะเลือกทุก ๆ k แถว/คอลัมน์)
+MAX_DISPLAY_POINTS = 20000
+
+
+def _mesh(grid):
+    return np.meshgrid(grid['x'], grid['y'])
+
+
+def _layout(fig, grid, x_name, y_name, title):
+    fig.update_layout(
+        title=dict(text=title, font=dict(size=14)),
+        xaxis_title=SWEEP_AXES[x_name],
+        yaxis_title=SWEEP_AXES[y_name],
+        height=450,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        margin=dict(l=50, r=20, t=50, b=50),
+        clickmode='event+select',
+    )
+    if grid['x'].dtype.kind in 'US':
+        fig.update_xaxes(type='category')
+    return compact_figure(fig)
+
+
+def selected_design(sweep, point):
+    """
+    แปลงช่องที่คลิก (ค่า x, y) เป็นข้อมูลสำหรับหน้าออกแบบ (loaded_design)
+    """
+    design = {**sweep['base'], 'compression_steel': False}
+    for name, axis in ((sweep['x_name'], 'x'), (sweep['y_name'], 'y')):
+        value = point[axis]
+        design[name] = value if isinstance(value, str) else int(value)
+    return design
+
+
+@CHART_BUILDS.time(chart='sweep_ratio')
+def ratio_chart(grid, x_name, y_name, values, title):
+    """
+    แผนที่สีแบบ WebGL (Scattergl จุดสี่เหลี่ยม 1 จุดต่อช่อง) คลิกเลือกช่องได้
+    """
+    X, Y = (v.ravel() for v in _mesh(grid))
+    size = max(3, min(30, 500 // max(len(grid['x']), len(grid['y']))))
+    fig = go.Figure(go.Scattergl(
+        x=X, y=Y, mode='markers',
+        marker=dict(symbol='square', size=size, color=values.ravel(), colorscale='RdYlGn', cmin=0, cmax=2,
+                    colorbar=dict(title=title)),
+        hovertemplate=f"{x_name}=%{{x}}<br>{y_name}=%{{y}}<br>{title}=%{{marker.color:.2f}}<extra></extra>",
+    ))
+    return _layout(fig, grid, x_name, y_name, title)
+
+
+@CHART_BUILDS.time(chart='sweep_pass')
+def pass_chart(grid, x_name, y_name):
+    """
+    พื้นที่ที่ผ่านทุกการตรวจสอบ (เขียว) และไม่ผ่าน (แดง)
+    """
+    X, Y = _mesh(grid)
+    size = max(3, min(30, 500 // max(len(grid['x']), len(grid['y']))))
+    fig = go.Figure()
+    for passed, name, color in ((True, "ผ่าน", 'seagreen'), (False, "ไม่ผ่าน", 'indianred')):
+        mask = grid['design_ok'] == passed
+        fig.add_trace(go.Scattergl(
+            x=X[mask], y=Y[mask], mode='markers', name=name,
+            marker=dict(symbol='square', size=size, color=color),
+            hovertemplate=f"{x_name}=%{{x}}<br>{y_name}=%{{y}}<br>{name}<extra></extra>",
+        ))
+    return _layout(fig, grid, x_name, y_name, "พื้นที่ที่ผ่านทุกการตรวจสอบ")
+
+
+# ตั้งค่าหน้าเว็บ
+st.set_page_config(
+    page_title="Sweep ขนาดหน้าตัดและเหล็กเสริม",
+    page_icon="📊",
+    layout="wide"
+)
+page_run = AppRun('sweep')
+
+st.title("📊 Sweep ขนาดหน้าตัดและเหล็กเสริม")
+st.markdown("**ตรวจสอบคานทุกจุดบนตาราง b × h หรือ ขนาดเหล็ก × จำนวนเส้น แล้วคลิกที่ช่องเพื่อเปิดแบบนั้นในหน้าออกแบบ**")
+
+# Sidebar สำหรับ Input
+st.sidebar.header("📝 ข้อมูลการ sweep")
+
+st.sidebar.subheader("1. วัสดุและแรงกระทำ")
+fc = st.sidebar.number_input("กำลังอัดคอนกรีต $f'_c$ (kg/cm²)", min_value=150, max_value=500, value=240, step=10)
+fy = st.sidebar.number_input("กำลังดึงเหล็ก $f_y$ (kg/cm²)", min_value=2400, max_value=4200, value=4000, step=200)
+Mu = st.sidebar.number_input("โมเมนต์ดัดใช้งาน $M_u$ (kg-m)", min_value=1000, max_value=50000, value=5500, step=100)
+Vu = st.sidebar.number_input("แรงเฉือนใช้งาน $V_u$ (kg)", min_value=1000, max_value=20000, value=3257, step=50)
+cover = st.sidebar.number_input("ระยะคอนกรีตปก cover (cm)", min_value=2, max_value=8, value=4, step=1)
+
+st.sidebar.subheader("2. ตัวแปรที่ sweep")
+mode = st.sidebar.radio("แกนของตาราง", ['section', 'bars'],
+                        format_func=lambda x: "b × h" if x == 'section' else "ขนาดเหล็ก × จำนวนเส้น")
+
+if mode == 'section':
+    b_range = st.sidebar.slider("ความกว้าง b (cm)", 20, 100, (20, 100), step=1)
+    h_range = st.sidebar.slider("ความสูง h (cm)", 30, 150, (30, 150), step=1)
+    grid_step = st.sidebar.select_slider("ความละเอียด (cm)", [1, 2, 5, 10], value=1)
+    tension_steel_type = st.sidebar.selectbox("ขนาดเหล็กรับแรงดึง", list(STEEL_AREAS))
+    tension_steel_count = st.sidebar.number_input("จำนวนเส้นเหล็กรับแรงดึง", min_value=1, max_value=10, value=3, step=1)
+    x_name, x_values = 'b', range(b_range[0], b_range[1] + 1, grid_step)
+    y_name, y_values = 'h', range(h_range[0], h_range[1] + 1, grid_step)
+    fixed = {'tension_steel_type': tension_steel_type, 'tension_steel_count': tension_steel_count}
+else:
+    b = st.sidebar.number_input("ความกว้าง b (cm)", min_value=20, max_value=100, value=30, step=5)
+    h = st.sidebar.number_input("ความสูง h (cm)", min_value=30, max_value=150, value=50, step=5)
+    bar_types = st.sidebar.multiselect("ขนาดเหล็กรับแรงดึง", list(STEEL_AREAS), default=list(STEEL_AREAS))
+    bar_counts = st.sidebar.slider("จำนวนเส้น", 1, 10, (1, 10))
+    x_name, x_values = 'tension_steel_type', bar_types
+    y_name, y_values = 'tension_steel_count', range(bar_counts[0], bar_counts[1] + 1)
+    fixed = {'b': b, 'h': h}
+
+st.sidebar.subheader("3. เหล็กปลอก")
+stirrup_type = st.sidebar.selectbox("เลือกเหล็กปลอก", list(STIRRUP_AREAS))
+stirrup_legs = st.sidebar.number_input("จำนวนขา", min_value=2, max_value=6, value=2, step=1)
+stirrup_spacing = st.sidebar.number_input("ระยะเรียง (cm)", min_value=5, max_value=30, value=15, step=1)
+
+run = st.sidebar.button("📊 คำนวณ sweep", type="primary")
+
+if run:
+    if not x_values:
+        st.warning("กรุณาเลือกขนาดเหล็กรับแรงดึงอย่างน้อยหนึ่งชนิด")
+    else:
+        base = {
+            'fc': fc, 'fy': fy, 'Mu': Mu, 'Vu': Vu, 'cover': cover,
+            'stirrup_type': stirrup_type, 'stirrup_legs': stirrup_legs, 'stirrup_spacing': stirrup_spacing,
+            **fixed,
+        }
+        start = time.perf_counter()
+        result = sweep_design(base, x_name, x_values, y_name, y_values)
+        st.session_state['sweep_result'] = {
+            'base': base, 'x_name': x_name, 'y_name': y_name, 'result': result,
+            'seconds': time.perf_counter() - start,
+        }
+
+
+sweep = st.session_state.get('sweep_result')
+if sweep is None:
+    st.info("👈 กำหนดช่วงของตัวแปรในแถบด้านซ้าย แล้วกดปุ่ม 'คำนวณ sweep'")
+else:
+    result = sweep['result']
+    x_name, y_name = sweep['x_name'], sweep['y_name']
+    points = result['design_ok'].size
+    passed = int(result['design_ok'].sum())
+    col1, col2, col3 = st.columns(3)
+    col1.metric("จำนวนจุด", f"{points:,}")
+    col2.metric("ผ่านทุกการตรวจสอบ", f"{passed:,}", delta=f"{passed / points:.0%}")
+    col3.metric("เวลาคำนวณ", f"{sweep['seconds'] * 1000:,.1f} ms")
+
+    grid, step = downsample_grid(result, MAX_DISPLAY_POINTS)
+    if step > 1:
+        st.caption(f"แสดงทุก ๆ {step} ช่อง ({grid['design_ok'].size:,} จาก {points:,} จุด) "
+                   f"เพื่อให้เบราว์เซอร์ตอบสนองได้เร็ว ลดช่วงหรือความละเอียดเพื่อดูทุกช่อง")
+
+    charts = {
+        'sweep_pass': pass_chart(grid, x_name, y_name),
+        'sweep_moment': ratio_chart(grid, x_name, y_name, grid['moment_ratio'], "φMn/Mu"),
+        'sweep_shear': ratio_chart(grid, x_name, y_name, grid['shear_ratio'], "φVc/Vu"),
+    }
+    st.caption("คลิกที่ช่องใดก็ได้เพื่อเปิดแบบนั้นในหน้าออกแบบ (สีเขียว: อัตราส่วน ≥ 1)")
+    st.plotly_chart(charts['sweep_pass'], use_container_width=True, key='sweep_pass', on_select='rerun',
+                    selection_mode='points')
+    col1, col2 = st.columns(2)
+    for column, key in zip((col1, col2), ('sweep_moment', 'sweep_shear')):
+        with column:
+            st.plotly_chart(charts[key], use_container_width=True, key=key, on_select='rerun',
+                            selection_mode='points')
+
+    for key in charts:
+        selection = st.session_state.get(key)
+        chosen = selection and selection.get('selection', {}).get('points')
+        if chosen:
+            # ล้างการเลือกไว้ก่อน กลับมาหน้านี้อีกครั้งจะได้ไม่เปิดแบบเดิมซ้ำ
+            del st.session_state[key]
+            st.session_state['loaded_design'] = selected_design(sweep, chosen[0])
+            st.switch_page("app.py")
+
+# ส่วนท้าย
+st.markdown("---")
+st.caption("🛠️ พัฒนาโดย Sketchup & Civil Engineer | Strength Design Method (SDM) | หน่วย: kg, cm")
+
+page_run.finish()
@@ -0,0 +1,219 @@
+import io
+import math
+import os
+
+import streamlit as st
+import pandas as pd
+
+from beam_design.engine import STEEL_AREAS, STIRRUP_AREAS
+from beam_design.metrics import AppRun
+from beam_design.report import write_report
+from beam_design.project import (
+    ORDER_BY,
+    beam_design_inputs,
+    count_beams,
+    delete_beams,
+    iter_beams,
+    open_project,
+    project_summary,
+    query_beams,
+    recompute,
+    upsert_beams,
+)
+
+# ไฟล์โปรเจกต์เริ่มต้น (เปลี่ยนได้ด้วย BEAM_PROJECT_DB หรือในแถบด้านซ้าย)
+DEFAULT_PROJECT = os.environ.get('BEAM_PROJECT_DB', 'beam_project.db')
+
+# คอลัมน์ที่แสดงในตาราง {คอลัมน์ในฐานข้อมูล: หัวตาราง}
+TABLE_COLUMNS = {
+    'level': 'ชั้น', 'mark': 'คาน', 'b': 'b (cm)', 'h': 'h (cm)', 'Mu': 'Mu (kg-m)', 'Vu': 'Vu (kg)',
+    'tension_steel': 'เหล็กรับแรงดึง', 'stirrups': 'เหล็กปลอก', 'moment_ratio': 'φMn/Mu',
+    'shear_ratio': 'φVc/Vu', 'status': 'สถานะ',
+}
+
+ORDER_LABELS = {'mark': "ชั้น, รหัสคาน", 'moment_ratio': "φMn/Mu น้อยไปมาก", 'shear_ratio': "φVc/Vu น้อยไปมาก"}
+
+
+def beam_status(beam):
+    if beam['stale']:
+        return "⏳ รอคำนวณ"
+    if beam['error']:
+        return "⚠️ ข้อมูลผิดพลาด"
+    return "✅ ผ่าน" if beam['design_ok'] else "❌ ไม่ผ่าน"
+
+
+def beam_table(beams):
+    return pd.DataFrame({
+        'level': [beam['level'] for beam in beams],
+        'mark': [beam['mark'] for beam in beams],
+        'b': [f"{beam['b']:g}" for beam in beams],
+        'h': [f"{beam['h']:g}" for beam in beams],
+        'Mu': [f"{beam['Mu']:,.0f}" for beam in beams],
+        'Vu': [f"{beam['Vu']:,.0f}" for beam in beams],
+        'tension_steel': [f"{beam['tension_steel_count']} {beam['tension_steel_type']}" for beam in beams],
+        'stirrups': [f"{beam['stirrup_type']} {beam['stirrup_legs']} ขา @ {beam['stirrup_spacing']:g}"
+                     for beam in beams],
+        'moment_ratio': [beam['moment_ratio'] for beam in beams],
+        'shear_ratio': [beam['shear_ratio'] for beam in beams],
+        'status': [beam_status(beam) for beam in beams],
+    }).rename(columns=TABLE_COLUMNS)
+
+
+def read_table(uploaded):
+    if uploaded.name.lower().endswith(('.parquet', '.pq')):
+        df = pd.read_parquet(uploaded)
+    else:
+        df = pd.read_csv(uploaded)
+    if 'cover' not in df and 'd' in df and 'h' in df:
+        df['cover'] = df['h'] - df['d']
+    return df
+
+
+# ตั้งค่าหน้าเว็บ
+st.set_page_config(
+    page_title="โปรเจกต์: ตารางคานทั้งอาคาร",
+    page_icon="🗂️",
+    layout="wide"
+)
+page_run = AppRun('project')
+
+st.title("🗂️ โปรเจกต์: ตารางคานทั้งอาคาร")
+st.markdown("**เก็บคานทุกตัวของโปรเจกต์ไว้ในไฟล์ SQLite ค้นหาคานที่ไม่ผ่านหรือใกล้ขีดจำกัด และคำนวณใหม่เฉพาะคานที่แก้ไข**")
+
+# Sidebar
+st.sidebar.header("🗂️ ไฟล์โปรเจกต์")
+project_path = st.sidebar.text_input("ไฟล์ฐานข้อมูล (.db)", value=DEFAULT_PROJECT)
+conn = open_project(project_path)
+
+st.sidebar.subheader("1. นำเข้าตารางคาน")
+uploaded = st.sidebar.file_uploader("CSV หรือ Parquet", type=['csv', 'parquet'],
+                                    help="คอลัมน์: level, mark และข้อมูลเดียวกับ python -m beam_design check")
+if uploaded is not None and st.sidebar.button("📥 นำเข้า", type="primary"):
+    try:
+        changed = upsert_beams(conn, read_table(uploaded))
+    except (ValueError, KeyError) as e:
+        st.sidebar.error(f"นำเข้าไม่สำเร็จ: {e}")
+    else:
+        st.sidebar.success(f"เพิ่ม/แก้ไข {changed:,} คาน (คานที่ข้อมูลไม่เปลี่ยนไม่ต้องคำนวณใหม่)")
+
+st.sidebar.subheader("2. เพิ่ม/แก้ไขคาน")
+with st.sidebar.form('beam_form'):
+    col1, col2 = st.columns(2)
+    level = col1.text_input("ชั้น", value="1")
+    mark = col2.text_input("รหัสคาน", value="B1")
+    col1, col2 = st.columns(2)
+    fc = col1.number_input("f'c (kg/cm²)", min_value=150, max_value=500, value=240, step=10)
+    fy = col2.number_input("fy (kg/cm²)", min_value=2400, max_value=4200, value=4000, step=200)
+    b = col1.number_input("b (cm)", min_value=20, max_value=100, value=30, step=5)
+    h = col2.number_input("h (cm)", min_value=30, max_value=150, value=50, step=5)
+    Mu = col1.number_input("Mu (kg-m)", min_value=1000, max_value=50000, value=5500, step=100)
+    Vu = col2.number_input("Vu (kg)", min_value=1000, max_value=20000, value=3257, step=50)
+    cover = col1.number_input("cover (cm)", min_value=2, max_value=8, value=4, step=1)
+    tension_steel_type = col1.selectbox("เหล็กรับแรงดึง", list(STEEL_AREAS))
+    tension_steel_count = col2.number_input("จำนวนเส้น", min_value=1, max_value=10, value=3, step=1)
+    stirrup_type = col1.selectbox("เหล็กปลอก", list(STIRRUP_AREAS))
+    stirrup_legs = col2.number_input("จำนวนขา", min_value=2, max_value=6, value=2, step=1)
+    stirrup_spacing = col1.number_input("ระยะเรียง (cm)", min_value=5, max_value=30, value=15, step=1)
+    saved = st.form_submit_button("💾 บันทึกคาน")
+if saved:
+    if not mark.strip():
+        st.sidebar.error("กรุณาใส่รหัสคาน")
+    else:
+        upsert_beams(conn, [{
+            'level': level.strip(), 'mark': mark.strip(), 'fc': fc, 'fy': fy, 'b': b, 'h': h, 'cover': cover,
+            'Mu': Mu, 'Vu': Vu, 'stirrup_type': stirrup_type, 'stirrup_legs': stirrup_legs,
+            'stirrup_spacing': stirrup_spacing, 'tension_steel_type': tension_steel_type,
+            'tension_steel_count': tension_steel_count,
+        }])
+        st.sidebar.success(f"บันทึกคาน {mark.strip()} ชั้น {level.strip()} แล้ว")
+
+# คานที่ข้อมูลเปลี่ยนจะถูกคำนวณใหม่ทันที (ด้วย batch engine ครั้งเดียว) ส่วนคานอื่นใช้ผลที่เก็บไว้
+recomputed = recompute(conn)
+if recomputed:
+    st.toast(f"คำนวณใหม่ {recomputed:,} คาน")
+
+summary = project_summary(conn)
+if not summary:
+    st.info("👈 ยังไม่มีคานในโปรเจกต์นี้ - นำเข้าตารางคานหรือเพิ่มคานในแถบด้านซ้าย")
+else:
+    total = sum(row['beams'] for row in summary)
+    failed = sum(row['failed'] for row in summary)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("จำนวนคาน", f"{total:,}")
+    col2.metric("ไม่ผ่าน", f"{failed:,}")
+    col3.metric("จำนวนชั้น", f"{len(summary):,}")
+
+    with st.expander("📊 สรุปรายชั้น"):
+        st.dataframe(pd.DataFrame(summary).rename(columns={
+            'level': 'ชั้น', 'beams': 'จำนวนคาน', 'failed': 'ไม่ผ่าน', 'errors': 'ข้อมูลผิดพลาด', 'stale': 'รอคำนวณ',
+        }), use_container_width=True, hide_index=True)
+
+    # ตัวกรอง (ทุกเงื่อนไขใช้ index ของฐานข้อมูล จึงตอบได้ในระดับ ms แม้มีหลายหมื่นคาน)
+    st.subheader("🔎 ค้นหาคาน")
+    col1, col2, col3, col4 = st.columns(4)
+    levels = [row['level'] for row in summary]
+    level_filter = col1.selectbox("ชั้น", [None, *levels], format_func=lambda x: "ทุกชั้น" if x is None else x)
+    mark_filter = col2.text_input("รหัสคานขึ้นต้นด้วย")
+    max_moment_ratio = col3.number_input("φMn/Mu น้อยกว่า", min_value=0.0, value=None, step=0.05,
+                                         placeholder="ไม่กรอง")
+    max_shear_ratio = col4.number_input("φVc/Vu น้อยกว่า", min_value=0.0, value=None, step=0.05,
+                                        placeholder="ไม่กรอง")
+    col1, col2, col3, col4 = st.columns(4)
+    failed_only = col1.checkbox("เฉพาะคานที่ไม่ผ่าน")
+    order_by = col2.selectbox("เรียงตาม", list(ORDER_BY), format_func=ORDER_LABELS.get)
+    page_size = col3.selectbox("แถวต่อหน้า", [25, 50, 100, 200], index=1)
+
+    filters = {
+        'level': level_filter, 'failed_only': failed_only, 'max_moment_ratio': max_moment_ratio,
+        'max_shear_ratio': max_shear_ratio, 'mark': mark_filter.strip() or None,
+    }
+    matched = count_beams(conn, **filters)
+    pages = max(1, math.ceil(matched / page_size))
+    page = col4.number_input(f"หน้า (จาก {pages:,})", min_value=1, max_value=pages, value=1, step=1)
+    beams = query_beams(conn, **filters, order_by=order_by, limit=page_size, offset=(page - 1) * page_size)
+
+    st.caption(f"พบ {matched:,} คาน | แสดง {len(beams):,} คาน (หน้า {page:,}/{pages:,})")
+    if beams:
+        st.dataframe(
+            beam_table(beams), use_container_width=True, hide_index=True,
+            column_config={
+                'φMn/Mu': st.column_config.NumberColumn(format="%.2f"),
+                'φVc/Vu': st.column_config.NumberColumn(format="%.2f"),
+            },
+        )
+
+        col1, col2, col3 = st.columns([2, 1, 1])
+        chosen = col1.selectbox("เลือกคาน", range(len(beams)),
+                                format_func=lambda i: f"ชั้น {beams[i]['level']} - {beams[i]['mark']}")
+        if col2.button("📐 เปิดในหน้าออกแบบ"):
+            st.session_state['loaded_design'] = beam_design_inputs(beams[chosen])
+            st.switch_page("app.py")
+        if col3.button("🗑️ ลบคานนี้"):
+            delete_beams(conn, [(beams[chosen]['level'], beams[chosen]['mark'])])
+            st.rerun()
+
+        # รายงาน PDF ของทุกคานที่ตรงตัวกรอง (ไม่ใช่เฉพาะหน้านี้) วาดด้วย process pool เมื่อคานมาก
+        col1, col2 = st.columns([3, 1])
+        col1.caption(f"รายงาน PDF ของคานที่ตรงตัวกรองทั้งหมด {matched:,} คาน (ประมาณ 3 หน้าต่อคาน)")
+        if col2.button("📄 สร้างรายงาน PDF"):
+            progress = st.progress(0.0, text="กำลังสร้างรายงาน...")
+            buffer = io.BytesIO()
+            stats = write_report(
+                iter_beams(conn, **filters, order_by=order_by), buffer,
+                workers=min(4, os.cpu_count() or 1) if matched > 20 else 1,
+                progress=lambda done: progress.progress(min(done / matched, 1.0), text=f"{done:,}/{matched:,} คาน"),
+            )
+            progress.empty()
+            st.session_state['project_report'] = buffer.getvalue()
+            st.success(f"สร้างรายงาน {stats['beams']:,} คาน ({stats['pages']:,} หน้า) ใน {stats['seconds']:.1f} s")
+        if 'project_report' in st.session_state:
+            st.download_button("📥 ดาวน์โหลดรายงาน PDF", st.session_state['project_report'],
+                               file_name="beam_report.pdf", mime="application/pdf", on_click='ignore')
+
+conn.close()
+
+# ส่วนท้าย
+st.markdown("---")
+st.caption("🛠️ พัฒนาโดย Sketchup & Civil Engineer | Strength Design Method (SDM) | หน่วย: kg, cm")
+
+page_run.finish()
@@ -0,0 +1,276 @@
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+import plotly.graph_objects as go
+
+from beam_design.analysis import (
+    CONCRETE_UNIT_WEIGHT,
+    DEAD_LOAD_FACTOR,
+    LIVE_LOAD_FACTOR,
+    STATIONS_PER_SPAN,
+    SUPPORTS,
+    analyze_continuous_beam,
+    critical_sections,
+    design_along_beam,
+)
+from beam_design.metrics import CHART_BUILDS, AppRun
+from beam_design.payload import compact_figure
+from beam_design.rebar import MAIN_BARS, STIRRUP_BARS
+from beam_design.serviceability import LONG_TERM_FACTOR, serviceability_along_beam
+
+# ช่วงค่าที่หน้าออกแบบรับได้ (ต้องตรงกับ min/max ของ number_input ใน app.py)
+DESIGN_PAGE_LIMITS = {'Mu': (1000, 50000), 'Vu': (1000, 20000)}
+
+SUPPORT_LABELS = {'pin': "ยึดหมุน", 'fixed': "ยึดแน่น", 'free': "ปลายอิสระ"}
+SECTION_LABELS = {'M+': "โมเมนต์บวกสูงสุด", 'M-': "โมเมนต์ลบสูงสุด", 'V': "แรงเฉือนสูงสุด"}
+
+DEFAULT_SPANS = pd.DataFrame({'length': [5.0, 6.0, 5.0], 'dead_load': [1500.0] * 3, 'live_load': [800.0] * 3})
+DEFAULT_POINT_LOADS = pd.DataFrame({'span': pd.Series([], dtype=int), 'x': pd.Series([], dtype=float),
+                                    'dead': pd.Series([], dtype=float), 'live': pd.Series([], dtype=float)})
+
+
+@CHART_BUILDS.time(chart='envelope')
+def envelope_chart(analysis, upper, lower, title, unit):
+    """
+    กราฟ envelope (ค่าสูงสุด/ต่ำสุดตลอดคาน) พร้อมเส้นแบ่งจุดรองรับ
+    """
+    fig = go.Figure()
+    for values, name, color in ((upper, "สูงสุด", 'indianred'), (lower, "ต่ำสุด", 'steelblue')):
+        fig.add_trace(go.Scatter(x=analysis['x'], y=values, mode='lines', name=name, line=dict(color=color),
+                                 fill='tozeroy', hovertemplate=f"x=%{{x:.2f}} m<br>%{{y:,.0f}} {unit}<extra></extra>"))
+    for x in np.concatenate([[0.0], np.cumsum(analysis['spans'])]):
+        fig.add_vline(x=x, line=dict(color='gray', width=1, dash='dot'))
+    fig.update_layout(
+        title=dict(text=title, font=dict(size=14)),
+        xaxis_title="ระยะจากปลายซ้าย (m)",
+        yaxis_title=unit,
+        height=350,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        margin=dict(l=50, r=20, t=50, b=50),
+    )
+    return compact_figure(fig)
+
+
+@CHART_BUILDS.time(chart='stirrup_spacing')
+def spacing_chart(analysis, along, stirrup_spacing):
+    """
+    ระยะเรียงเหล็กปลอกที่ต้องการตลอดคานเทียบกับระยะที่ใช้
+    """
+    required = np.minimum(along['required_spacing'], 60)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=analysis['x'], y=required, mode='lines', name="ระยะที่ต้องการ",
+                             line=dict(color='seagreen'),
+                             hovertemplate="x=%{x:.2f} m<br>s ≤ %{y:.1f} cm<extra></extra>"))
+    fig.add_hline(y=stirrup_spacing, line=dict(color='indianred', dash='dash'),
+                  annotation_text=f"ระยะที่ใช้ {stirrup_spacing} cm")
+    fig.update_layout(
+        title=dict(text="ระยะเรียงเหล็กปลอก", font=dict(size=14)),
+        xaxis_title="ระยะจากปลายซ้าย (m)",
+        yaxis_title="cm",
+        height=300,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        margin=dict(l=50, r=20, t=50, b=50),
+    )
+    return compact_figure(fig)
+
+
+def section_design(section, inputs):
+    """
+    แปลงหน้าตัดวิกฤตเป็นข้อมูลสำหรับหน้าออกแบบ (loaded_design) โมเมนต์ลบใช้เหล็กบนเป็นเหล็กรับแรงดึง
+    """
+    negative = section['kind'] == 'M-'
+    tension, compression = ('top', 'bottom') if negative else ('bottom', 'top')
+    Mu = int(np.clip(round(section['Mu']), *DESIGN_PAGE_LIMITS['Mu']))
+    Vu = int(np.clip(round(section['Vu']), *DESIGN_PAGE_LIMITS['Vu']))
+    return {
+        'fc': inputs['fc'], 'fy': inputs['fy'], 'b': inputs['b'], 'h': inputs['h'], 'cover': inputs['cover'],
+        'Mu': Mu, 'Vu': Vu,
+        'stirrup_type': inputs['stirrup_type'], 'stirrup_legs': inputs['stirrup_legs'],
+        'stirrup_spacing': inputs['stirrup_spacing'],
+        'tension_steel_type': inputs[f'{tension}_steel_type'],
+        'tension_steel_count': inputs[f'{tension}_steel_count'],
+        'compression_steel': True,
+        'compression_steel_type': inputs[f'{compression}_steel_type'],
+        'compression_steel_count': inputs[f'{compression}_steel_count'],
+        'd_prime': inputs['cover'],
+    }
+
+
+# ตั้งค่าหน้าเว็บ
+st.set_page_config(
+    page_title="วิเคราะห์คานต่อเนื่อง",
+    page_icon="📐",
+    layout="wide"
+)
+page_run = AppRun('analysis')
+
+st.title("📐 วิเคราะห์คานต่อเนื่อง")
+st.markdown("**หา envelope ของโมเมนต์และแรงเฉือนจากการจัด live load ทุกรูปแบบ "
+            f"(U = {DEAD_LOAD_FACTOR}D + {LIVE_LOAD_FACTOR}L) แล้วตรวจสอบหน้าตัดทุกจุดตลอดคาน**")
+
+# Sidebar สำหรับ Input
+st.sidebar.header("📝 ข้อมูลคาน")
+
+st.sidebar.subheader("1. วัสดุและหน้าตัด")
+fc = st.sidebar.number_input("กำลังอัดคอนกรีต $f'_c$ (kg/cm²)", min_value=150, max_value=500, value=240, step=10)
+fy = st.sidebar.number_input("กำลังดึงเหล็ก $f_y$ (kg/cm²)", min_value=2400, max_value=4200, value=4000, step=200)
+b = st.sidebar.number_input("ความกว้าง b (cm)", min_value=20, max_value=100, value=30, step=5)
+h = st.sidebar.number_input("ความสูง h (cm)", min_value=30, max_value=150, value=60, step=5)
+cover = st.sidebar.number_input("ระยะคอนกรีตปก cover (cm)", min_value=2, max_value=8, value=4, step=1)
+
+st.sidebar.subheader("2. เหล็กเสริม")
+bottom_steel_type = st.sidebar.selectbox("เหล็กล่าง (โมเมนต์บวก)", MAIN_BARS.names, index=2)
+bottom_steel_count = st.sidebar.number_input("จำนวนเส้นเหล็กล่าง", min_value=2, max_value=10, value=3, step=1)
+top_steel_type = st.sidebar.selectbox("เหล็กบน (โมเมนต์ลบ)", MAIN_BARS.names, index=2)
+top_steel_count = st.sidebar.number_input("จำนวนเส้นเหล็กบน", min_value=2, max_value=10, value=4, step=1)
+stirrup_type = st.sidebar.selectbox("เหล็กปลอก", STIRRUP_BARS.names, index=1)
+stirrup_legs = st.sidebar.number_input("จำนวนขา", min_value=2, max_value=6, value=2, step=1)
+stirrup_spacing = st.sidebar.number_input("ระยะเรียง (cm)", min_value=5, max_value=30, value=15, step=1)
+
+st.sidebar.subheader("3. จุดรองรับและน้ำหนัก")
+left_support = st.sidebar.selectbox("ปลายซ้าย", list(SUPPORTS), format_func=SUPPORT_LABELS.get)
+right_support = st.sidebar.selectbox("ปลายขวา", list(SUPPORTS), format_func=SUPPORT_LABELS.get)
+self_weight = st.sidebar.checkbox("รวมน้ำหนักคาน (dead load)", value=True)
+sustained_live = st.sidebar.slider("สัดส่วน live load ที่คงค้าง (ระยะแอ่นตัวระยะยาว)", 0.0, 1.0, 0.0, step=0.05)
+stations = st.sidebar.select_slider("จำนวนจุดต่อช่วง", [21, 51, STATIONS_PER_SPAN, 201, 501],
+                                    value=STATIONS_PER_SPAN)
+
+st.subheader("ช่วงคาน")
+st.caption("จุดรองรับภายในเป็นแบบยึดหมุน • น้ำหนักแผ่ไม่รวมตัวคูณ (kg/m)")
+spans_table = st.data_editor(
+    DEFAULT_SPANS, num_rows='dynamic', use_container_width=True, key='analysis_spans',
+    column_config={
+        'length': st.column_config.NumberColumn("ความยาว (m)", min_value=0.5, max_value=30.0, step=0.1),
+        'dead_load': st.column_config.NumberColumn("Dead load (kg/m)", min_value=0.0, step=100.0),
+        'live_load': st.column_config.NumberColumn("Live load (kg/m)", min_value=0.0, step=100.0),
+    },
+)
+with st.expander("แรงจุด"):
+    point_table = st.data_editor(
+        DEFAULT_POINT_LOADS, num_rows='dynamic', use_container_width=True, key='analysis_points',
+        column_config={
+            'span': st.column_config.NumberColumn("ช่วงที่", min_value=1, step=1),
+            'x': st.column_config.NumberColumn("ระยะจากปลายซ้ายของช่วง (m)", min_value=0.0, step=0.1),
+            'dead': st.column_config.NumberColumn("Dead (kg)", min_value=0.0, step=100.0),
+            'live': st.column_config.NumberColumn("Live (kg)", min_value=0.0, step=100.0),
+        },
+    )
+
+spans_table = spans_table.dropna(subset=['length'])
+point_table = point_table.dropna(subset=['span', 'x']).fillna(0.0)
+if spans_table.empty:
+    st.info("กรุณาใส่ช่วงคานอย่างน้อย 1 ช่วง")
+    st.stop()
+
+inputs = {
+    'fc': fc, 'fy': fy, 'b': b, 'h': h, 'cover': cover,
+    'bottom_steel_type': bottom_steel_type, 'bottom_steel_count': bottom_steel_count,
+    'top_steel_type': top_steel_type, 'top_steel_count': top_steel_count,
+    'stirrup_type': stirrup_type, 'stirrup_legs': stirrup_legs, 'stirrup_spacing': stirrup_spacing,
+}
+extra_dead = CONCRETE_UNIT_WEIGHT * b * h / 1e4 if self_weight else 0.0
+n = len(spans_table)
+try:
+    start = time.perf_counter()
+    analysis = analyze_continuous_beam(
+        spans_table['length'].to_numpy(float),
+        supports=[left_support] + ['pin'] * (n - 1) + [right_support],
+        dead_load=spans_table['dead_load'].fillna(0.0).to_numpy(float) + extra_dead,
+        live_load=spans_table['live_load'].fillna(0.0).to_numpy(float),
+        point_loads=[{'span': int(row.span) - 1, 'x': row.x, 'dead': row.dead, 'live': row.live}
+                     for row in point_table.itertuples()],
+        stations=stations,
+    )
+    along = design_along_beam(analysis, **inputs)
+    service = serviceability_along_beam(
+        analysis, fc, fy, b, h, cover, bottom_steel_type, bottom_steel_count, top_steel_type, top_steel_count,
+        sustained_live=sustained_live)
+    seconds = time.perf_counter() - start
+except ValueError as e:
+    st.error(f"❌ {e}")
+    st.stop()
+
+sections = critical_sections(analysis)
+col1, col2, col3, col4, col5 = st.columns(5)
+col1.metric("Mu⁺ สูงสุด", f"{along['Mu_pos'].max():,.0f} kg-m")
+col2.metric("Mu⁻ สูงสุด", f"{along['Mu_neg'].max():,.0f} kg-m")
+col3.metric("Vu สูงสุด", f"{along['Vu'].max():,.0f} kg")
+col4.metric("จุดที่ผ่านทุกการตรวจสอบ", f"{int(along['design_ok'].sum()):,} / {along['design_ok'].size:,}")
+col5.metric("เวลาวิเคราะห์ + ตรวจสอบ", f"{seconds * 1000:,.1f} ms")
+
+if along['design_ok'].all():
+    st.success("✅ หน้าตัดผ่านทุกการตรวจสอบตลอดความยาวคาน")
+else:
+    failed = [name for name, key in (("กำลังรับโมเมนต์", 'moment_ok'), ("แรงเฉือน φVc", 'shear_ok'),
+                                     ("ระยะเรียงเหล็กปลอก", 'stirrup_ok')) if not along[key].all()]
+    st.error(f"❌ ไม่ผ่าน: {', '.join(failed)}")
+
+col1, col2 = st.columns(2)
+with col1:
+    st.plotly_chart(envelope_chart(analysis, analysis['M_max'], analysis['M_min'], "Envelope โมเมนต์ดัด", "kg-m"),
+                    use_container_width=True)
+with col2:
+    st.plotly_chart(envelope_chart(analysis, analysis['V_max'], analysis['V_min'], "Envelope แรงเฉือน", "kg"),
+                    use_container_width=True)
+st.plotly_chart(spacing_chart(analysis, along, stirrup_spacing), use_container_width=True)
+
+st.subheader("หน้าตัดวิกฤต")
+if sections:
+    index = np.searchsorted(analysis['x'], [section['x'] for section in sections])
+    st.dataframe(pd.DataFrame({
+        'ช่วง': [section['span'] + 1 for section in sections],
+        'ตำแหน่ง': [SECTION_LABELS[section['kind']] for section in sections],
+        'x (m)': [f"{section['x']:.2f}" for section in sections],
+        'Mu (kg-m)': [f"{section['Mu']:,.0f}" for section in sections],
+        'Vu (kg)': [f"{section['Vu']:,.0f}" for section in sections],
+        'φMn/Mu': along['moment_ratio'][index],
+        's ที่ต้องการ (cm)': along['required_spacing'][index],
+    }), use_container_width=True, hide_index=True)
+
+    chosen = st.selectbox("เลือกหน้าตัด", range(len(sections)),
+                          format_func=lambda i: f"ช่วง {sections[i]['span'] + 1}: "
+                                                f"{SECTION_LABELS[sections[i]['kind']]} @ {sections[i]['x']:.2f} m")
+    if st.button("📥 ออกแบบหน้าตัดนี้ในหน้าออกแบบ"):
+        st.session_state['loaded_design'] = section_design(sections[chosen], inputs)
+        st.switch_page("app.py")
+
+st.subheader("แรงปฏิกิริยา (kg)")
+st.dataframe(pd.DataFrame({
+    'x (m)': analysis['reactions']['x'],
+    'สูงสุด': analysis['reactions']['max'],
+    'ต่ำสุด': analysis['reactions']['min'],
+}), use_container_width=True, hide_index=True)
+
+st.subheader("สภาวะใช้งาน")
+st.caption(f"น้ำหนักใช้งาน (ไม่คูณตัวคูณ) • Ie ของ Branson ที่หน้าตัดโมเมนต์บวกสูงสุด (คานยื่น: ที่จุดรองรับ) "
+           f"• ระยะยาว ξ = {LONG_TERM_FACTOR} • ระยะเรียงเหล็กควบคุมรอยร้าวตาม ACI 318")
+spans_service = service['spans']
+st.dataframe(pd.DataFrame({
+    'ช่วง': np.arange(1, spans_service['span'].size + 1),
+    'L (m)': spans_service['span'],
+    'Ie (cm⁴)': spans_service['Ie_total'].round(0),
+    'Δ live (cm)': spans_service['delta_live'].round(2),
+    'L/360 (cm)': spans_service['delta_live_limit'].round(2),
+    'Δ ระยะยาว + live (cm)': spans_service['delta_total'].round(2),
+    'L/240 (cm)': spans_service['delta_total_limit'].round(2),
+    'สถานะ': np.where(spans_service['live_deflection_ok'] & spans_service['total_deflection_ok'],
+                      "✅ ผ่าน", "❌ ไม่ผ่าน"),
+}), use_container_width=True, hide_index=True)
+stations_service = service['stations']
+if stations_service['crack_ok'].all():
+    st.success("✅ ระยะเรียงเหล็กผ่านเกณฑ์ควบคุมรอยร้าวตลอดคาน")
+else:
+    worst = np.argmax(stations_service['bar_spacing'] - stations_service['max_bar_spacing'])
+    st.error(f"❌ ระยะเรียงเหล็ก {stations_service['bar_spacing'][worst]:.1f} cm เกินเกณฑ์ควบคุมรอยร้าว "
+             f"{stations_service['max_bar_spacing'][worst]:.1f} cm ที่ x = {analysis['x'][worst]:.2f} m "
+             f"(fs = {stations_service['fs'][worst]:,.0f} kg/cm²)")
+
+# ส่วนท้าย
+st.markdown("---")
+st.caption("🛠️ พัฒนาโดย Sketchup & Civil Engineer | Strength Design Method (SDM) | หน่วย: kg, cm, m")
+
+page_run.finish()
@@ -0,0 +1,179 @@
+import math
+import os
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from beam_design.engine import STEEL_AREAS, STIRRUP_AREAS
+from beam_design.metrics import CHART_BUILDS, AppRun
+from beam_design.payload import compact_figure
+from beam_design.reliability import DEFAULT_VARIABLES, DISTRIBUTIONS, RELIABILITY_CHUNKSIZE, iter_reliability
+
+# ชื่อตัวแปรสุ่มที่แสดงในตาราง
+VARIABLE_LABELS = {
+    'fc': "กำลังอัดคอนกรีต f'c",
+    'fy': "กำลังดึงเหล็ก fy",
+    'b': "ความกว้าง b",
+    'd': "ความลึกประสิทธิผล d",
+    'Mu': "โมเมนต์ดัด Mu",
+    'Vu': "แรงเฉือน Vu",
+}
+
+SAMPLE_SIZES = [100_000, 1_000_000, 10_000_000, 100_000_000]
+
+
+def _beta_text(beta):
+    return "∞" if math.isinf(beta) else f"{beta:.2f}"
+
+
+@CHART_BUILDS.time(chart='reliability_convergence')
+def convergence_chart(history):
+    """
+    β สะสมตามจำนวนตัวอย่าง พร้อมช่วงความเชื่อมั่น
+    """
+    finite = [e for e in history if not math.isinf(e['beta'])]
+    fig = go.Figure()
+    if finite:
+        x = [e['samples'] for e in finite]
+        fig.add_trace(go.Scatter(x=x + x[::-1], y=[e['beta_high'] if not math.isinf(e['beta_high']) else e['beta']
+                                                    for e in finite] + [e['beta_low'] for e in finite[::-1]],
+                                 fill='toself', fillcolor='rgba(70,130,180,0.2)', line=dict(width=0),
+                                 name=f"ช่วงความเชื่อมั่น {finite[-1]['confidence']:.0%}", hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=x, y=[e['beta'] for e in finite], mode='lines', name="β",
+                                 line=dict(color='steelblue', width=2)))
+    fig.update_layout(
+        title=dict(text="ค่าประมาณ β ตามจำนวนตัวอย่าง", font=dict(size=14)),
+        xaxis_title="จำนวนตัวอย่าง", yaxis_title="β", xaxis_type='log',
+        height=380, plot_bgcolor='white', paper_bgcolor='white', margin=dict(l=50, r=20, t=50, b=50),
+    )
+    return compact_figure(fig)
+
+
+# ตั้งค่าหน้าเว็บ
+st.set_page_config(
+    page_title="ความน่าเชื่อถือของคาน",
+    page_icon="🎲",
+    layout="wide"
+)
+page_run = AppRun('reliability')
+
+st.title("🎲 ความน่าเชื่อถือของคาน (Monte Carlo)")
+st.markdown("**สุ่มกำลังวัสดุ ขนาดหน้าตัด และแรงกระทำ แล้วประเมินความน่าจะเป็นที่จะวิบัติ $P_f$ และดัชนี β**")
+
+# ค่าเริ่มต้นจากแบบที่กดคำนวณล่าสุดในหน้าออกแบบ
+design = st.session_state.get('design_inputs', {})
+
+# Sidebar สำหรับ Input
+st.sidebar.header("📝 ข้อมูลคาน")
+
+st.sidebar.subheader("1. วัสดุและแรงกระทำ (ค่าที่ใช้ออกแบบ)")
+fc = st.sidebar.number_input("กำลังอัดคอนกรีต $f'_c$ (kg/cm²)", min_value=150, max_value=500,
+                             value=design.get('fc', 240), step=10)
+fy = st.sidebar.number_input("กำลังดึงเหล็ก $f_y$ (kg/cm²)", min_value=2400, max_value=5000,
+                             value=design.get('fy', 4000), step=100)
+Mu = st.sidebar.number_input("โมเมนต์ดัดใช้งาน $M_u$ (kg-m)", min_value=1000, max_value=50000,
+                             value=design.get('Mu', 5500), step=100)
+Vu = st.sidebar.number_input("แรงเฉือนใช้งาน $V_u$ (kg)", min_value=1000, max_value=20000,
+                             value=design.get('Vu', 3257), step=50)
+
+st.sidebar.subheader("2. หน้าตัดและเหล็กเสริม")
+b = st.sidebar.number_input("ความกว้าง b (cm)", min_value=15, max_value=100, value=design.get('b', 30), step=5)
+h = st.sidebar.number_input("ความสูง h (cm)", min_value=30, max_value=150, value=design.get('h', 50), step=5)
+cover = st.sidebar.number_input("ระยะคอนกรีตปก cover (cm)", min_value=2, max_value=8, value=design.get('cover', 4), step=1)
+bar_names = list(STEEL_AREAS)
+tension_steel_type = st.sidebar.selectbox("ขนาดเหล็กรับแรงดึง", bar_names,
+                                          index=bar_names.index(design.get('tension_steel_type', 'DB12')))
+tension_steel_count = st.sidebar.number_input("จำนวนเส้นเหล็กรับแรงดึง", min_value=1, max_value=10,
+                                              value=design.get('tension_steel_count', 3), step=1)
+compression_steel_count = st.sidebar.number_input(
+    "จำนวนเส้นเหล็กรับแรงอัด (0 = ไม่ใช้)", min_value=0, max_value=10,
+    value=design.get('compression_steel_count', 2) if design.get('compression_steel') else 0, step=1)
+compression_steel_type = st.sidebar.selectbox("ขนาดเหล็กรับแรงอัด", bar_names,
+                                              index=bar_names.index(design.get('compression_steel_type', 'DB12')),
+                                              disabled=compression_steel_count == 0)
+
+st.sidebar.subheader("3. การสุ่ม")
+samples = st.sidebar.select_slider("จำนวนตัวอย่าง", SAMPLE_SIZES, value=1_000_000, format_func=lambda n: f"{n:,}")
+workers = st.sidebar.number_input("จำนวน process", min_value=1, max_value=os.cpu_count() or 1, value=1, step=1)
+seed = st.sidebar.number_input("seed", min_value=0, value=0, step=1)
+confidence = st.sidebar.select_slider("ระดับความเชื่อมั่น", [0.90, 0.95, 0.99], value=0.95,
+                                      format_func=lambda x: f"{x:.0%}")
+
+st.subheader("การแจกแจงของตัวแปรสุ่ม")
+st.caption("bias = ค่าเฉลี่ย ÷ ค่าที่ป้อน, cov = ส่วนเบี่ยงเบนมาตรฐาน ÷ ค่าเฉลี่ย "
+           "(Mu, Vu ที่ป้อนคูณตัวคูณน้ำหนักแล้ว ค่าเฉลี่ยของแรงกระทำจริงจึงต่ำกว่า 1 เท่า)")
+variables_table = st.data_editor(
+    pd.DataFrame([{'ตัวแปร': VARIABLE_LABELS[name], **spec} for name, spec in DEFAULT_VARIABLES.items()],
+                 index=list(DEFAULT_VARIABLES)),
+    column_config={
+        'ตัวแปร': st.column_config.TextColumn(disabled=True),
+        'distribution': st.column_config.SelectboxColumn("การแจกแจง", options=DISTRIBUTIONS, required=True),
+        'bias': st.column_config.NumberColumn("bias", min_value=0.01, step=0.01, format="%.2f", required=True),
+        'cov': st.column_config.NumberColumn("cov", min_value=0.0, max_value=1.0, step=0.01, format="%.2f",
+                                             required=True),
+    },
+    hide_index=True, use_container_width=True, key='reliability_variables',
+)
+
+run = st.sidebar.button("🎲 ประเมินความน่าเชื่อถือ", type="primary")
+
+if run:
+    beam = {
+        'fc': fc, 'fy': fy, 'b': b, 'h': h, 'cover': cover, 'Mu': Mu, 'Vu': Vu,
+        'stirrup_type': design.get('stirrup_type', list(STIRRUP_AREAS)[0]),
+        'stirrup_legs': design.get('stirrup_legs', 2), 'stirrup_spacing': design.get('stirrup_spacing', 15),
+        'tension_steel_type': tension_steel_type, 'tension_steel_count': tension_steel_count,
+        'compression_steel': compression_steel_count > 0, 'compression_steel_type': compression_steel_type,
+        'compression_steel_count': compression_steel_count, 'd_prime': design.get('d_prime', 4),
+    }
+    variables = {name: {key: row[key] for key in ('distribution', 'bias', 'cov')}
+                 for name, row in variables_table.iterrows()}
+    progress = st.progress(0.0, text="กำลังสุ่ม...")
+    live = st.empty()
+    history = []
+    try:
+        for estimate in iter_reliability(beam, variables, samples, RELIABILITY_CHUNKSIZE, workers, seed, confidence):
+            history.append(estimate)
+            progress.progress(estimate['samples'] / samples,
+                              text=f"{estimate['samples']:,} / {samples:,} ตัวอย่าง ({estimate['seconds']:.1f} s)")
+            live.markdown(f"$P_f$ ≈ {estimate['pf']:.3e} | β ≈ {_beta_text(estimate['beta'])} "
+                          f"[{_beta_text(estimate['beta_low'])}, {_beta_text(estimate['beta_high'])}]")
+    except ValueError as e:
+        st.error(f"❌ {e}")
+    else:
+        st.session_state['reliability_result'] = {'beam': beam, 'history': history}
+    progress.empty()
+    live.empty()
+
+found = st.session_state.get('reliability_result')
+if found is None:
+    st.info("👈 กำหนดข้อมูลคานในแถบด้านซ้าย (ค่าเริ่มต้นจากหน้าออกแบบ) แล้วกดปุ่ม 'ประเมินความน่าเชื่อถือ'")
+else:
+    history = found['history']
+    final = history[-1]
+    level = f"{final['confidence']:.0%}"
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("ความน่าจะเป็นที่จะวิบัติ $P_f$", f"{final['pf']:.3e}",
+                help=f"ช่วงความเชื่อมั่น {level}: {final['pf_low']:.3e} – {final['pf_high']:.3e}")
+    col2.metric("ดัชนีความน่าเชื่อถือ β", _beta_text(final['beta']),
+                help=f"ช่วงความเชื่อมั่น {level}: {_beta_text(final['beta_low'])} – {_beta_text(final['beta_high'])}")
+    col3.metric("จำนวนตัวอย่าง", f"{final['samples']:,}", f"วิบัติ {final['failures']:,}", delta_color='off')
+    col4.metric("เวลาที่ใช้", f"{final['seconds']:.2f} s", f"{final['samples'] / final['seconds']:,.0f} ตัวอย่าง/s",
+                delta_color='off')
+    if final['failures'] < 100:
+        st.warning(f"⚠️ พบการวิบัติเพียง {final['failures']:,} ครั้ง ค่าประมาณยังไม่แม่นยำ (cov ≈ "
+                   f"{final['cov']:.0%}) ควรเพิ่มจำนวนตัวอย่าง")
+
+    st.dataframe(pd.DataFrame([
+        {'โหมดการวิบัติ': name, 'P_f': final[f'pf{suffix}'],
+         f'P_f ต่ำ ({level})': final[f'pf{suffix}_low'], f'P_f สูง ({level})': final[f'pf{suffix}_high'],
+         'β': _beta_text(final[f'beta{suffix}']),
+         f'β ({level})': f"{_beta_text(final[f'beta{suffix}_low'])} – {_beta_text(final[f'beta{suffix}_high'])}"}
+        for name, suffix in (("ดัด (Mn < M)", '_flexure'), ("เฉือน (Vc < V)", '_shear'), ("รวม (อย่างใดอย่างหนึ่ง)", ''))
+    ]), hide_index=True, use_container_width=True,
+        column_config={col: st.column_config.NumberColumn(format="%.3e")
+                       for col in ('P_f', f'P_f ต่ำ ({level})', f'P_f สูง ({level})')})
+    st.plotly_chart(convergence_chart(history), use_container_width=True)
+
+page_run.finish()
@@ -0,0 +1,105 @@
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from beam_design.design_tables import DEFAULT_TABLES_DIR, build_tables, open_tables
+from beam_design.metrics import CHART_BUILDS, AppRun
+from beam_design.payload import compact_figure
+
+
+@CHART_BUILDS.time(chart='design_table')
+def design_chart(table, x_title, series_title):
+    """
+    กราฟช่วยออกแบบ: φMn ตามความสูง h หนึ่งเส้นต่อคอลัมน์ของตาราง
+    """
+    fig = go.Figure()
+    for column in table.columns:
+        fig.add_trace(go.Scatter(x=table.index, y=table[column], mode='lines+markers', name=f"{series_title} {column}",
+                                 marker=dict(size=4)))
+    fig.update_layout(
+        xaxis_title=x_title, yaxis_title="φMn (kg-m)", height=450,
+        plot_bgcolor='white', paper_bgcolor='white', margin=dict(l=50, r=20, t=30, b=50),
+        legend=dict(orientation='h', y=-0.2),
+    )
+    fig.update_xaxes(gridcolor='lightgray')
+    fig.update_yaxes(gridcolor='lightgray')
+    return compact_figure(fig)
+
+
+def print_table(table, caption, file_name):
+    """
+    ตารางแบบพิมพ์ได้ (แสดงทุกแถว) พร้อมปุ่มดาวน์โหลด CSV
+    """
+    st.caption(caption)
+    st.table(table.style.format("{:,.0f}"))
+    st.download_button("📥 ดาวน์โหลด CSV", table.to_csv().encode('utf-8-sig'), file_name=file_name, mime='text/csv')
+
+
+# ตั้งค่าหน้าเว็บ
+st.set_page_config(
+    page_title="ตารางช่วยออกแบบ",
+    page_icon="📋",
+    layout="wide"
+)
+page_run = AppRun('design_tables')
+
+st.title("📋 ตารางช่วยออกแบบ (Design Aids)")
+st.markdown("**กำลังรับโมเมนต์ φMn และแรงเฉือน φVc ของหน้าตัดมาตรฐาน จากตารางที่คำนวณไว้ล่วงหน้า พิมพ์ได้ (Ctrl+P)**")
+
+tables = open_tables()
+if tables is None:
+    st.info(f"ยังไม่มีตารางในโฟลเดอร์ `{DEFAULT_TABLES_DIR}` (หรือตารางสร้างจากสูตรรุ่นก่อน) "
+            "สร้างด้วยปุ่มด้านล่าง หรือ `python -m beam_design tables build`")
+    if st.button("🛠️ สร้างตาราง", type="primary"):
+        build_tables()
+        st.rerun()
+    st.stop()
+
+axes = tables.axes
+st.sidebar.header("📝 เลือกตาราง")
+fc = st.sidebar.selectbox("กำลังอัดคอนกรีต $f'_c$ (kg/cm²)", axes['fc'], format_func=lambda x: f"{x:g}",
+                          index=min(1, len(axes['fc']) - 1))
+fy = st.sidebar.selectbox("กำลังดึงเหล็ก $f_y$ (kg/cm²)", axes['fy'], format_func=lambda x: f"{x:g}",
+                          index=len(axes['fy']) - 1)
+bar_type = st.sidebar.selectbox("ขนาดเหล็กรับแรงดึง", tables.bar_types, index=min(1, len(tables.bar_types) - 1))
+mode = st.sidebar.radio("รูปแบบ", ['section', 'count'],
+                        format_func=lambda x: "h × b (จำนวนเส้นคงที่)" if x == 'section' else "h × จำนวนเส้น (b คงที่)")
+if mode == 'section':
+    count = st.sidebar.slider("จำนวนเส้น", 1, tables.max_bars, 3)
+else:
+    b = st.sidebar.selectbox("ความกว้าง b (cm)", axes['b'], format_func=lambda x: f"{x:g}",
+                             index=len(axes['b']) // 2)
+
+i_fc, i_fy = tables.axis_index('fc', fc), tables.axis_index('fy', fy)
+i_bar = tables.bar_types.index(bar_type)
+h_labels = pd.Index([f"{h:g}" for h in axes['h']], name="h (cm)")
+phi_Mn = tables.arrays['phi_Mn'][i_fc, i_fy]
+
+st.caption(f"d = h − {tables.cover:g} cm | ρmin = {tables.arrays['rho_min'][i_fc, i_fy, 0, 0]:.4f}, "
+           f"ρmax = {tables.arrays['rho_max'][i_fc, i_fy, 0, 0]:.4f} | ค่าระหว่างช่องใช้การประมาณเชิงเส้น "
+           "(ตรวจสอบค่าจริงในหน้าออกแบบ)")
+
+if mode == 'section':
+    title = f"φMn (kg-m) ของ {count} {bar_type}, f'c = {fc:g}, fy = {fy:g} kg/cm²"
+    table = pd.DataFrame(phi_Mn[:, :, i_bar, count - 1].T, index=h_labels,
+                         columns=pd.Index([f"{b:g}" for b in axes['b']], name="b (cm)"))
+    series = "b ="
+    file_name = f"phiMn_{count}{bar_type}_fc{fc:g}_fy{fy:g}.csv"
+else:
+    title = f"φMn (kg-m) ของ {bar_type}, b = {b:g} cm, f'c = {fc:g}, fy = {fy:g} kg/cm²"
+    table = pd.DataFrame(phi_Mn[tables.axis_index('b', b), :, i_bar, :], index=h_labels,
+                         columns=pd.Index([f"{n}" for n in range(1, tables.max_bars + 1)], name="จำนวนเส้น"))
+    series = f"{bar_type} ×"
+    file_name = f"phiMn_{bar_type}_b{b:g}_fc{fc:g}_fy{fy:g}.csv"
+
+st.subheader(title)
+st.plotly_chart(design_chart(table.set_axis(axes['h'], axis=0), "h (cm)", series), use_container_width=True)
+print_table(table, "แถว: ความสูง h | คอลัมน์: " + table.columns.name, file_name)
+
+st.subheader(f"φVc (kg), f'c = {fc:g} kg/cm²")
+shear = pd.DataFrame(tables.arrays['phi_Vc'][i_fc, i_fy].T, index=h_labels,
+                     columns=pd.Index([f"{b:g}" for b in axes['b']], name="b (cm)"))
+print_table(shear, "แถว: ความสูง h | คอลัมน์: ความกว้าง b (เหล็กปลอกไม่นับรวม เหมือนหน้าออกแบบ)",
+            f"phiVc_fc{fc:g}.csv")
+
+page_run.finish()